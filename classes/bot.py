@@ -21,6 +21,7 @@ import json
 import logging
 import os
 import sys
+import time
 import traceback
 
 from decimal import Decimal
@@ -38,39 +39,29 @@ from json import JSONDecoder, JSONEncoder
 
 from redis import asyncio as aioredis
 
+from classes import crates, raidstats
 from classes.badges import Badge
 from classes.bucket_cooldown import Cooldown, CooldownMapping
-from classes.classes import (
-    Bard,
-    Beastmaster,
-    Mage,
-    Paladin,
-    Paragon,
-    Raider,
-    Ranger,
-    Reaper,
-    Ritualist,
-    SantasHelper,
-    Tank,
-    Thief,
-    Warrior,
-)
+from classes.classes import Raider
 from classes.classes import from_string as class_from_string
+from classes.content import ContentRegistry
 from classes.context import Context
-from classes.endgame import (
-    apply_item_progression_bonus,
-    soulbound_level_from_xp,
-)
+from classes.cooldowns import USER, CooldownRegistry
 from classes.enums import DonatorRank
 from classes.exceptions import GlobalCooldown
 from classes.http import ProxiedClientSession
-from classes.items import ALL_ITEM_TYPES, Hand, ItemType
+from classes.items import ALL_ITEM_TYPES, RANDOM_ITEM_ELEMENTS, Hand, ItemType
+from classes.leaderboard import Leaderboards
+from classes.patron_tiers import PatronTiers
+from classes.profile_cache import ProfileCache
+from classes.transaction_log import TransactionLog, write_entry
 from utils import i18n, paginator, random
 from utils import misc as rpgtools
 from utils.cache import cache
 from utils.checks import user_is_patron
 from utils.config import ConfigLoader
 from utils.i18n import _
+from utils.startup_cache import startup_cache
 
 
 LEVEL_100_ANNOUNCE_CHANNEL_ID = 1406296535443963935
@@ -109,7 +100,11 @@ class Bot(commands.AutoShardedBot):
         self.bans = set()
         self.support_server_id = self.config.game.support_server_id
         self.linecount = 0
+        # name -> seconds, reported by setup_hook with bot.profile_startup
+        self.startup_timings = {}
+        started = time.perf_counter()
         self.make_linecount()
+        self.startup_timings["linecount"] = time.perf_counter() - started
 
         self.all_prefixes = {}
         self.activity = discord.Game(
@@ -124,8 +119,6 @@ class Bot(commands.AutoShardedBot):
 
         # we assume the bot is created for use right now
         self.launch_time = datetime.datetime.now()
-        self.eligible_for_cooldown_reduce = set()  # caching
-        self.not_eligible_for_cooldown_reduce = set()  # caching
 
         self.normal_cooldown = CooldownMapping(
             Cooldown(3, 3, 1, 3, commands.BucketType.user)
@@ -154,17 +147,10 @@ class Bot(commands.AutoShardedBot):
         A function that enables a global per-user cooldown
         and raises a special exception based on CommandOnCooldown
         """
-        if ctx.author.id in self.not_eligible_for_cooldown_reduce:
-            bucket = self.normal_cooldown.get_bucket(ctx.message)
-        elif ctx.author.id in self.eligible_for_cooldown_reduce:
+        if await user_is_patron(self, ctx.author, "bronze"):
             bucket = self.donator_cooldown.get_bucket(ctx.message)
         else:
-            if await user_is_patron(self, ctx.author, "bronze"):
-                self.eligible_for_cooldown_reduce.add(ctx.author.id)
-                bucket = self.donator_cooldown.get_bucket(ctx.message)
-            else:
-                self.not_eligible_for_cooldown_reduce.add(ctx.author.id)
-                bucket = self.normal_cooldown.get_bucket(ctx.message)
+            bucket = self.normal_cooldown.get_bucket(ctx.message)
         retry_after = bucket.update_rate_limit()
 
         if retry_after:
@@ -180,20 +166,27 @@ class Bot(commands.AutoShardedBot):
                 continue
             for file_ in files:
                 if file_.endswith(".py"):
-                    with open(os.sep.join([root, file_]), encoding="utf-8") as f:
-                        self.linecount += len(f.readlines())
+                    self.linecount += startup_cache.line_count(
+                        os.sep.join([root, file_])
+                    )
 
     async def close(self):
         await super().close()
 
         await self.session.close()
         await self.trusted_session.close()
+        await self.leaderboards.close()
+        await self.cooldowns.close()
+        await self.patron_tiers.close()
+        await self.profile_cache.close()
+        await self.transaction_log.close()
         await self.pool.close()
         await self.second_pool.close()
         await self.redis.close()
 
     async def setup_hook(self):
         """Connects all databases and initializes sessions"""
+        started = time.perf_counter()
         proxy_url = self.config.external.proxy_url
         if proxy_url is None:
             self.session = aiohttp.ClientSession()
@@ -205,6 +198,11 @@ class Bot(commands.AutoShardedBot):
             max_connections=20,
         )
         self.redis = aioredis.Redis(connection_pool=pool)
+        self.leaderboards = Leaderboards(self)
+        self.cooldowns = CooldownRegistry(self.redis)
+        self.profile_cache = ProfileCache(self)
+        self.patron_tiers = PatronTiers(self)
+        self.content = ContentRegistry(self)
         database_creds = {
             "database": self.config.database.postgres_name,
             "user": self.config.database.postgres_user,
@@ -213,8 +211,15 @@ class Bot(commands.AutoShardedBot):
             "port": self.config.database.postgres_port,
         }
         self.pool = await asyncpg.create_pool(
-            **database_creds, min_size=10, max_size=20, command_timeout=60.0
+            **database_creds,
+            min_size=10,
+            max_size=20,
+            command_timeout=60.0,
+            connection_class=self.profile_cache.connection_class,
         )
+        await self.profile_cache.start()
+        self.transaction_log = TransactionLog(self.pool)
+        self.transaction_log.start()
 
         second_database_creds = {
             "database": self.config.second_database.postgres_name,
@@ -227,19 +232,44 @@ class Bot(commands.AutoShardedBot):
             **second_database_creds, min_size=10, max_size=20, command_timeout=60.0
         )
 
+        self.startup_timings["connections"] = time.perf_counter() - started
+
         extensions = list(self.config.bot.initial_extensions)
         if "cogs.aiplayer" not in extensions:
             extensions.append("cogs.aiplayer")
         for extension in extensions:
+            started = time.perf_counter()
             try:
                 await self.load_extension(extension)
             except Exception:
                 print(f"Failed to load extension {extension}.", file=sys.stderr)
                 traceback.print_exc()
+            self.startup_timings[extension] = time.perf_counter() - started
+        startup_cache.save()
+        if self.config.bot.profile_startup:
+            self.log_startup_profile()
 
         self.redis_version = await self.get_redis_version()
         await self.load_bans()
-
+        self.leaderboards.start()
+        self.cooldowns.start()
+        self.patron_tiers.start()
+
+
+    def log_startup_profile(self):
+        """Logs the slowest startup steps and the total of all of them."""
+        timings = sorted(self.startup_timings.items(), key=lambda item: -item[1])
+        lines = [f"{seconds * 1000:9.1f} ms  {name}" for name, seconds in timings]
+        total = sum(self.startup_timings.values())
+        self.logger.info(
+            "Startup profile of cluster %s (%.2f s, startup cache %d hits, %d misses)"
+            ":\n%s",
+            self.cluster_name,
+            total,
+            startup_cache.hits,
+            startup_cache.misses,
+            "\n".join(lines),
+        )
 
     async def get_redis_version(self):
         """Parses the Redis version out of the INFO command"""
@@ -268,7 +298,13 @@ class Bot(commands.AutoShardedBot):
         """Handler for i18n, executes before any other commands or checks run"""
         locale = await self.get_cog("Locale").locale(ctx.message.author.id)
         i18n.current_locale.set(locale)
-        await super().invoke(ctx)
+        snapshot = self.profile_cache.open_snapshot(
+            ctx.author.id, ctx.command.qualified_name if ctx.command else None
+        )
+        try:
+            await super().invoke(ctx)
+        finally:
+            self.profile_cache.close_snapshot(snapshot)
 
     @property
     def uptime(self):
@@ -278,23 +314,9 @@ class Bot(commands.AutoShardedBot):
     async def get_ranks_for(self, thing, conn=None):
         """Returns the rank in money and xp for a user"""
         v = self._coerce_user_id(thing)
-        if conn is None:
-            conn = await self.pool.acquire()
-            local = True
-        else:
-            local = False
-
-        xp = await conn.fetchval(
-            'SELECT COUNT(*) FROM profile WHERE "xp">=(SELECT "xp" FROM profile WHERE "user"=$1);',
-            v,
-        )
-        money = await conn.fetchval(
-            'SELECT COUNT(*) FROM profile WHERE "money">=(SELECT "money" FROM profile WHERE "user"=$1);',
-            v,
-        )
-        if local:
-            await self.pool.release(conn)
-        return money, xp
+        money = await self.leaderboards.rank("money", v, inclusive=True)
+        xp = await self.leaderboards.rank("xp", v, inclusive=True)
+        return (money[0] if money else 0), (xp[0] if xp else 0)
 
     async def get_raidstats(
         self,
@@ -325,7 +347,7 @@ class Bot(commands.AutoShardedBot):
             or statatk is None
             or statdef is None
         ):
-            row = await conn.fetchrow('SELECT * FROM profile WHERE "user"=$1;', v)
+            row = await self.profile_cache.get(v, conn=conn)
             atkmultiply, defmultiply, classes, race, guild, user_god, statatk, statdef = (
                 row["atkmultiply"],
                 row["defmultiply"],
@@ -339,78 +361,40 @@ class Bot(commands.AutoShardedBot):
             unspent_statpoints = row["statpoints"]
             if god is not None and god != user_god:
                 raise ValueError()
-        damage, armor = await self.get_damage_armor_for(
-            v, classes=classes, race=race, conn=conn
+        if not classes or not race:
+            row = await self.profile_cache.get(v, conn=conn)
+            classes, race = row["class"], row["race"]
+        dmg, deff, breakdown = await raidstats.fetch_raidstats(
+            conn,
+            v,
+            atkmultiply=atkmultiply,
+            defmultiply=defmultiply,
+            classes=classes,
+            race=race,
+            guild=guild,
+            statatk=statatk,
+            statdef=statdef,
+            unspent_statpoints=unspent_statpoints,
         )
-        profile_attack_multiplier = atkmultiply
-        profile_defense_multiplier = defmultiply
-        city_raid_building_level = 0
-        if buildings := await self.get_city_buildings(guild, conn=conn):
-            city_raid_building_level = int(buildings["raid_building"] or 0)
-            atkmultiply += city_raid_building_level * Decimal("0.1")
-            defmultiply += city_raid_building_level * Decimal("0.1")
-        classes = [class_from_string(c) for c in classes]
-
-        statatk = Decimal(statatk)
-        statdef = Decimal(statdef)
-
-        # Now perform the operation with all Decimal components
-
-        atkmultiply += statatk * Decimal('0.1')
-        defmultiply += statdef * Decimal('0.1')
-
-        #for c in classes:
-            #if c and c.in_class_line(Raider):
-                #grade = c.class_grade()
-                #atkmultiply = atkmultiply + Decimal("0.1") * grade
-                #defmultiply = defmultiply + Decimal("0.1") * grade
-        dmg = damage * atkmultiply
-        deff = armor * defmultiply
-        pre_amulet_damage = dmg
-        pre_amulet_defense = deff
-
-        # Apply equipped amulet stats as a flat bonus
-        amulet = await conn.fetchrow('SELECT attack, defense FROM amulets WHERE user_id=$1 AND equipped=true', v)
-        amulet_attack = 0
-        amulet_defense = 0
-        if amulet:
-            amulet_attack = amulet["attack"] or 0
-            amulet_defense = amulet["defense"] or 0
-            dmg += amulet_attack
-            deff += amulet_defense
-
-
         if local:
             await self.pool.release(conn)
         if return_breakdown:
-            return dmg, deff, {
-                "equipment_class_race_attack": damage,
-                "equipment_class_race_defense": armor,
-                "profile_attack_multiplier": profile_attack_multiplier,
-                "profile_defense_multiplier": profile_defense_multiplier,
-                "city_raid_building_level": city_raid_building_level,
-                "city_multiplier_bonus": Decimal(city_raid_building_level) * Decimal("0.1"),
-                "allocated_attack_points": statatk,
-                "allocated_defense_points": statdef,
-                "unspent_stat_points": unspent_statpoints,
-                "stat_point_effects": {
-                    "attack": "+0.1 attack multiplier per point",
-                    "defense": "+0.1 defense multiplier per point",
-                    "health": "+50 maximum HP per point",
-                },
-                "allocated_attack_multiplier_bonus": statatk * Decimal("0.1"),
-                "allocated_defense_multiplier_bonus": statdef * Decimal("0.1"),
-                "applied_attack_multiplier": atkmultiply,
-                "applied_defense_multiplier": defmultiply,
-                "pre_amulet_attack": pre_amulet_damage,
-                "pre_amulet_defense": pre_amulet_defense,
-                "amulet_attack": amulet_attack,
-                "amulet_defense": amulet_defense,
-                "raid_attack_before_specialization": dmg,
-                "raid_defense_before_specialization": deff,
-            }
+            return dmg, deff, breakdown
         return dmg, deff
 
+    async def get_raidstats_many(self, things, conn=None):
+        """Raid damage, armor and HP for many users at once.
+
+        Returns a dict of user id to ``RaidStats`` for every user with a
+        character, computed with a fixed number of queries. The numbers match
+        ``get_raidstats`` with the users' own profile values.
+        """
+        user_ids = [self._coerce_user_id(thing) for thing in things]
+        if conn is None:
+            async with self.pool.acquire() as conn:
+                return await raidstats.fetch_raidstats_many(conn, user_ids)
+        return await raidstats.fetch_raidstats_many(conn, user_ids)
+
     async def get_raidstatsjug(
         self,
         thing,
@@ -435,7 +419,7 @@ class Bot(commands.AutoShardedBot):
             or classes is None
             or guild is None
         ):
-            row = await conn.fetchrow('SELECT * FROM profile WHERE "user"=$1;', v)
+            row = await self.profile_cache.get(v, conn=conn)
             atkmultiply, defmultiply, classes, race, guild, user_god = (
                 row["atkmultiply"],
                 row["defmultiply"],
@@ -477,11 +461,7 @@ class Bot(commands.AutoShardedBot):
         if conn is None:
             conn = await self.pool.acquire()
             local = True
-        items = await conn.fetch(
-            "SELECT ai.* FROM profile p JOIN allitems ai ON (p.user=ai.owner) JOIN"
-            " inventory i ON (ai.id=i.item) WHERE i.equipped IS TRUE AND p.user=$1;",
-            v,
-        )
+        items = await conn.fetch(raidstats.EQUIPPED_ITEMS_QUERY, v)
         if local:
             await self.pool.release(conn)
         return items
@@ -577,13 +557,7 @@ class Bot(commands.AutoShardedBot):
         else:
             user_id = ctx_or_user_id
 
-        await self.redis.execute_command(
-            "SET",
-            f"cd:{user_id}:{cmd_id}",
-            cmd_id,
-            "EX",
-            cooldown,
-        )
+        await self.cooldowns.set(USER, user_id, cmd_id, cooldown)
 
     async def activate_booster(self, user, type_):
         """Activates a boost of type_ for a user"""
@@ -746,22 +720,70 @@ class Bot(commands.AutoShardedBot):
             await self.pool.release(conn)
         return item
 
+    async def create_items(self, items, owner, equipped=False, conn=None):
+        """Inserts many items of one owner, one statement per chunk of items.
+
+        ``items`` are dicts like the ones ``create_random_item`` builds with
+        ``insert=False``. Returns the new ``allitems`` rows.
+        """
+        owner = self._coerce_user_id(owner)
+        if conn is None:
+            conn = await self.pool.acquire()
+            local = True
+        else:
+            local = False
+        rows = []
+        try:
+            # 8 parameters per item, well below the 32767 a statement takes
+            for start in range(0, len(items), 1000):
+                chunk = items[start : start + 1000]
+                values = ", ".join(
+                    "({})".format(
+                        ", ".join(f"${8 * i + column + 2}" for column in range(8))
+                    )
+                    for i in range(len(chunk))
+                )
+                args = [equipped]
+                for item in chunk:
+                    args.extend(
+                        (
+                            owner,
+                            item["name"],
+                            item["value"],
+                            item["type_"],
+                            item["damage"],
+                            item["armor"],
+                            item["hand"],
+                            item["element"],
+                        )
+                    )
+                rows.extend(
+                    await conn.fetch(
+                        'WITH new AS (INSERT INTO allitems ("owner", "name", "value",'
+                        ' "type", "damage", "armor", "hand", "element") VALUES'
+                        f" {values} RETURNING *), inventory_rows AS (INSERT INTO"
+                        ' inventory ("item", "equipped") SELECT "id", $1 FROM new)'
+                        " SELECT * FROM new;",
+                        *args,
+                    )
+                )
+        finally:
+            if local:
+                await self.pool.release(conn)
+        return rows
+
+    async def create_random_items(self, rarity, amount, owner, rng, conn=None):
+        """Mints ``amount`` items of a crate rarity in bulk, see ``classes.crates``."""
+        items = crates.draw_items(rng, rarity, amount)
+        for item in items:
+            item["name"] = fn.weapon_name(item["type_"])
+        return await self.create_items(items, owner, conn=conn)
+
     async def create_random_item(
         self, minstat, maxstat, minvalue, maxvalue, owner, insert=True, conn=None
     ):
-        elements = [
-            "Light",
-            "Dark",
-            "Corrupted",
-            "Fire",
-            "Water",
-            "Electric",
-            "Nature",
-            "Wind"
-        ]
-
         # Randomly select an element
-        element = random.choice(elements)
+        element = random.choice(RANDOM_ITEM_ELEMENTS)
         owner = self._coerce_user_id(owner)
         item = {}
         item["owner"] = owner
@@ -1344,27 +1366,14 @@ class Bot(commands.AutoShardedBot):
     async def get_effective_donator_tier(self, user_id, *, sync_profile: bool = False) -> int:
         user_id = self._coerce_user_id(user_id)
 
-        row = await self.pool.fetchrow(
-            'SELECT "tier" FROM profile WHERE "user" = $1;',
-            user_id,
-        )
+        row = await self.profile_cache.get(user_id)
         stored_tier = row["tier"] if row else 0
         try:
             effective_tier = int(stored_tier or 0)
         except (TypeError, ValueError):
             effective_tier = 0
 
-        role_tier = 0
-        found_member = False
-        for guild_id in self._get_patreon_tier_lookup_guild_ids():
-            try:
-                member = await self.http.get_member(guild_id, user_id)
-            except discord.NotFound:
-                continue
-
-            found_member = True
-            member_roles = [int(i) for i in member.get("roles", [])]
-            role_tier = max(role_tier, self._resolve_numeric_patreon_tier_from_role_ids(member_roles))
+        role_tier, found_member = await self.patron_tiers.get(user_id)
 
         if role_tier < 1 and not found_member:
             role_rank = await self.get_donator_rank(user_id)
@@ -1400,148 +1409,15 @@ class Bot(commands.AutoShardedBot):
         if items is None:
             items = await self.get_equipped_items_for(user, conn=conn)
         if not classes or not race:
-            row = await conn.fetchrow('SELECT * FROM profile WHERE "user"=$1;', user)
+            row = await self.profile_cache.get(user, conn=conn)
             classes, race = row["class"], row["race"]
-
-        def item_field(raw_item, key, default=None):
-            try:
-                return raw_item[key]
-            except (KeyError, IndexError, TypeError):
-                return default
-
-        item_ids = [
-            int(item_field(item, "id"))
-            for item in items
-            if item_field(item, "id") is not None
-        ]
-        star_map: dict[int, int] = {}
-        soulbound_item_id: int | None = None
-        soulbound_level = 0
-        if item_ids:
-            try:
-                star_table_exists = await conn.fetchval(
-                    "SELECT to_regclass('public.starforged_items') IS NOT NULL;"
-                )
-                if star_table_exists:
-                    star_rows = await conn.fetch(
-                        """
-                        SELECT item_id, stars
-                        FROM starforged_items
-                        WHERE item_id = ANY($1)
-                        """,
-                        item_ids,
-                    )
-                    star_map = {
-                        int(row["item_id"]): int(row["stars"] or 0)
-                        for row in star_rows
-                    }
-                soulbound_table_exists = await conn.fetchval(
-                    "SELECT to_regclass('public.soulbound') IS NOT NULL;"
-                )
-                if soulbound_table_exists:
-                    soulbound_row = await conn.fetchrow(
-                        """
-                        SELECT item_id, xp
-                        FROM soulbound
-                        WHERE user_id = $1 AND item_id = ANY($2)
-                        """,
-                        user,
-                        item_ids,
-                    )
-                    if soulbound_row:
-                        soulbound_item_id = int(soulbound_row["item_id"])
-                        soulbound_level = soulbound_level_from_xp(soulbound_row["xp"])
-            except Exception:
-                star_map = {}
-                soulbound_item_id = None
-                soulbound_level = 0
-
-        if local:
-            await self.pool.release(conn)
-
-        damage = 0
-        armor = 0
-
-        classes = [i for c in classes if (i := class_from_string(c))]
-        is_paragon = any(c.in_class_line(Paragon) for c in classes)
-        is_ranger = any(c.in_class_line(Ranger) for c in classes)
-        is_warrior = any(c.in_class_line(Warrior) for c in classes)
-        is_thief = any(c.in_class_line(Thief) for c in classes)
-        is_raider = any(c.in_class_line(Raider) for c in classes)
-        is_paladin = any(c.in_class_line(Paladin) for c in classes)
-        is_reaper = any(c.in_class_line(Reaper) for c in classes)
-        is_tank = any(c.in_class_line(Tank) for c in classes)
-        is_bard = any(c.in_class_line(Bard) for c in classes)
-        is_beastmaster = any(c.in_class_line(Beastmaster) for c in classes)
-        is_santas_helper = any(c.in_class_line(SantasHelper) for c in classes)
-        is_caster = any(
-            c.in_class_line(Mage) or c.in_class_line(Ritualist) for c in classes
-        )
-
-        for item in items:
-            item_id = int(item_field(item, "id")) if item_field(item, "id") is not None else 0
-            item_soulbound_level = soulbound_level if item_id == soulbound_item_id else 0
-            item_damage, item_armor, _bonus_pct = apply_item_progression_bonus(
-                item_field(item, "damage", 0),
-                item_field(item, "armor", 0),
-                stars=star_map.get(item_id, 0),
-                soulbound_level=item_soulbound_level,
+        try:
+            return await raidstats.fetch_damage_armor(
+                conn, user, classes, race, items=items
             )
-            damage += item_damage
-            armor += item_armor
-
-            type_ = ItemType.from_string(item["type"])
-            if type_ == ItemType.Spear and (is_paragon or is_beastmaster):
-                damage += 5
-            elif (type_ == ItemType.Dagger or type_ == ItemType.Knife) and (
-                is_thief or is_bard
-            ):
-                damage += 5
-            elif type_ == ItemType.Sword and is_warrior:
-                damage += 5
-            elif type_ == ItemType.Bow and is_ranger:
-                damage += 10
-            elif type_ == ItemType.Wand and is_caster:
-                damage += 5
-            elif type_ == ItemType.Axe and is_raider:
-                damage += 5
-            elif type_ == ItemType.Hammer and is_paladin:
-                damage += 5
-            elif type_ == ItemType.Scythe and is_reaper:
-                damage += 10
-            elif type_ == ItemType.Mace and is_santas_helper:
-                damage += 5
-            elif type_ == ItemType.Shield and is_tank:
-                armor += 7
-
-        lines = [class_.get_class_line() for class_ in classes]
-        grades = [class_.class_grade() for class_ in classes]
-        for line, grade in zip(lines, grades):
-            if line == Mage:
-                damage += grade
-            if line == Paragon:
-                damage += grade
-                armor += grade
-        if race == "Human":
-            damage += 2
-            armor += 2
-        elif race == "Dwarf":
-            damage += 1
-            armor += 3
-        elif race == "Elf":
-            damage += 3
-            armor += 1
-        elif race == "Orc":
-            armor += 4
-        elif race == "Jikill":
-            damage += 4
-        elif race == "Djinn":
-            damage += 5
-            armor += -1
-        elif race == "Shadeborn":
-            damage += -1
-            armor += 5
-        return damage, armor
+        finally:
+            if local:
+                await self.pool.release(conn)
 
     async def log_transaction(self, ctx, from_, to, subject, data, conn=None):
         """Logs a transaction."""
@@ -1586,29 +1462,10 @@ class Bot(commands.AutoShardedBot):
         Data: {data_}
         """
 
-        if conn is None:
-            conn = await self.pool.acquire()
-            local = True
-        else:
-            local = False
-        try:
-            await conn.execute(
-                'INSERT INTO transactions ("from", "to", "subject", "info", "data", "timestamp") VALUES ($1, $2, $3, $4, '
-                '$5, $6);',
-                from_,
-                to,
-                subject,
-                description,
-                data_,
-                timestamp,
-            )
-        except Exception as e:
-            await ctx.send(e)
+        transaction = (from_, to, subject, description, data_, timestamp)
+        market = None
         if subject == "shop":
-            await conn.execute(
-                'INSERT INTO market_history ("item", "name", "value", "type",'
-                ' "damage", "armor", "signature", "price", "offer") VALUES ($1, $2,'
-                " $3, $4, $5, $6, $7, $8, $9);",
+            market = (
                 data["id"],
                 data["name"],
                 data["value"],
@@ -1619,8 +1476,16 @@ class Bot(commands.AutoShardedBot):
                 data["price"],
                 data["offer"],
             )
-        if local:
-            await self.pool.release(conn)
+
+        # Inside a transaction the log rows commit or roll back with the
+        # caller's writes, everything else goes through the write-behind log.
+        if conn is None or not conn.is_in_transaction():
+            await self.transaction_log.enqueue(transaction, market)
+            return
+        try:
+            await write_entry(conn, transaction, market)
+        except Exception as e:
+            await ctx.send(e)
 
     async def _ensure_xp_watch_tables(self) -> None:
         if self._xp_watch_tables_ready:
@@ -2273,11 +2138,7 @@ class Bot(commands.AutoShardedBot):
         if not guild_id:  # also catches guild_id = 0
             return False
         obj = conn or self.pool
-        res = await obj.fetchrow(
-            'SELECT c.* FROM city c JOIN guild g ON c."owner"=g."id" WHERE'
-            ' g."id"=(SELECT alliance FROM guild WHERE "id"=$1);',
-            guild_id,
-        )
+        res = await obj.fetchrow(raidstats.CITY_QUERY, guild_id)
         if not res:
             return False
 
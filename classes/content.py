@@ -0,0 +1,381 @@
+"""Shared, hot-reloaded game content.
+
+``monsters.json`` and the battle tower files used to be opened and parsed by
+every cog that needed them, some on each command. ``ContentRegistry`` parses
+each data file once and keeps it until the file's mtime or size changes, which
+is checked at most every ``CHECK_INTERVAL`` seconds. The monster roster is
+served as a ``MonsterIndex`` with lookups by name, level, element and the
+public/frontier flags.
+
+``MonsterSearch`` is the ranked name/alias/element/level search of the
+FableAssistant listen channel, ``$monsters`` and the GM pet and egg commands,
+built once per loaded roster.
+
+The splice PvE pool comes from ``splice_combinations``. The registry keeps the
+rows together with a version stamp, the row count and highest id of that
+table and of the pending ``splice_requests``, and only fetches them again when
+the stamp moved or ``SPLICE_TTL`` passed, which covers in-place updates.
+
+``$reloadcontent`` drops everything on every cluster.
+"""
+from __future__ import annotations
+
+import difflib
+import json
+import logging
+import os
+import re
+import time
+
+from collections import Counter
+from typing import Any, Callable, NamedTuple, Optional
+
+log = logging.getLogger(__name__)
+
+CHECK_INTERVAL = 5.0
+SPLICE_TTL = 10 * 60
+MONSTERS_PATH = "monsters.json"
+# fuzzy lookups only run difflib on the names sharing the most trigrams
+FUZZY_CANDIDATES = 40
+
+
+class MonsterIndex:
+    """Read-only view of ``monsters.json``, keyed by level strings.
+
+    Lists returned by the lookups are shared, callers copy the monsters they
+    modify.
+    """
+
+    def __init__(self, data: Any) -> None:
+        self.data: dict[str, list[dict]] = data if isinstance(data, dict) else {}
+        self.by_name: dict[str, dict] = {}
+        self.level_of: dict[str, int] = {}
+        self.by_level: dict[int, list[dict]] = {}
+        self.by_element: dict[str, list[dict]] = {}
+        self.public_by_level: dict[int, list[dict]] = {}
+        self.frontier_by_level: dict[int, list[dict]] = {}
+        self._derived: dict[str, Any] = {}
+
+        for level_key, monsters in self.data.items():
+            if not isinstance(monsters, list):
+                continue
+            try:
+                level = int(level_key)
+            except (TypeError, ValueError):
+                continue
+            self.by_level[level] = []
+            self.public_by_level[level] = []
+            self.frontier_by_level[level] = []
+            for monster in monsters:
+                if not isinstance(monster, dict):
+                    continue
+                self.by_level[level].append(monster)
+                name = str(monster.get("name") or "").strip()
+                if name:
+                    # the first entry wins, like the linear scans did
+                    self.by_name.setdefault(name.casefold(), monster)
+                    self.level_of.setdefault(name.casefold(), level)
+                element = str(monster.get("element") or "").strip().casefold()
+                if element:
+                    self.by_element.setdefault(element, []).append(monster)
+                if monster.get("ispublic", True):
+                    self.frontier_by_level[level].append(monster)
+                    if not monster.get("frontier_only", False):
+                        self.public_by_level[level].append(monster)
+
+    @property
+    def names(self) -> set[str]:
+        return {
+            str(monster.get("name")).strip()
+            for monster in self.iter_monsters()
+            if isinstance(monster.get("name"), str) and monster["name"].strip()
+        }
+
+    def iter_monsters(self):
+        for monsters in self.by_level.values():
+            yield from monsters
+
+    def get(self, name: str) -> Optional[dict]:
+        return self.by_name.get(str(name or "").strip().casefold())
+
+    def public(self, *, include_frontier_only: bool = False) -> dict[int, list[dict]]:
+        return self.frontier_by_level if include_frontier_only else self.public_by_level
+
+    def derived(self, key: str, build: Callable[["MonsterIndex"], Any]) -> Any:
+        """Returns ``build(self)``, computed once per loaded roster."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = self._derived[key] = build(self)
+            return value
+
+    def search(self, *, public_only: bool = True) -> "MonsterSearch":
+        return self.derived(
+            f"search:{public_only}",
+            lambda index: MonsterSearch.from_index(index, public_only=public_only),
+        )
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class MonsterSearch:
+    """Name, alias, element and level lookups over a monster roster.
+
+    ``monsters`` maps names to monster copies with their ``level`` added, in
+    roster order; a name listed twice keeps its first position and its last
+    entry. Substring and fuzzy name lookups go through a trigram index, so
+    only a handful of names are compared per query.
+    """
+
+    def __init__(self, monsters: dict[str, dict]) -> None:
+        self.monsters = monsters
+        self.names = list(monsters)
+        self.order = {name: position for position, name in enumerate(self.names)}
+        self.by_level: dict[Any, list[str]] = {}
+        self.by_element: dict[str, list[str]] = {}
+        # lowercased name or alias -> names it refers to
+        self.keys: dict[str, list[str]] = {}
+        self.trigrams: dict[str, set[str]] = {}
+
+        for name, monster in monsters.items():
+            self.by_level.setdefault(monster.get("level"), []).append(name)
+            element = str(monster.get("element") or "").lower()
+            if element:
+                self.by_element.setdefault(element, []).append(name)
+            aliases = monster.get("aliases") or []
+            for key in {name.lower(), *(str(alias).lower() for alias in aliases)}:
+                self.keys.setdefault(key, []).append(name)
+                for trigram in _trigrams(key):
+                    self.trigrams.setdefault(trigram, set()).add(key)
+        self.elements = sorted(self.by_element)
+
+    @classmethod
+    def from_index(cls, index: MonsterIndex, *, public_only: bool = True):
+        monsters: dict[str, dict] = {}
+        for level_key, monster_list in index.data.items():
+            if not isinstance(monster_list, list):
+                continue
+            level = int(level_key) if level_key.isdigit() else level_key
+            for monster in monster_list:
+                if not isinstance(monster, dict) or "name" not in monster:
+                    continue
+                if public_only and not monster.get("ispublic", True):
+                    continue
+                monster_copy = monster.copy()
+                monster_copy["level"] = level
+                monsters[monster["name"]] = monster_copy
+        return cls(monsters)
+
+    def _entries(self, names) -> list[tuple[str, dict]]:
+        return [
+            (name, self.monsters[name])
+            for name in sorted(set(names), key=self.order.__getitem__)
+        ]
+
+    def _containing(self, query: str) -> set[str]:
+        """Names with a name or alias containing ``query``."""
+        if len(query) < 3:
+            keys = [key for key in self.keys if query in key]
+        else:
+            inner = f"  {query} "[2:-1]
+            postings = [
+                self.trigrams.get(inner[i : i + 3], set())
+                for i in range(len(inner) - 2)
+            ]
+            keys = [key for key in set.intersection(*postings) if query in key]
+        return {name for key in keys for name in self.keys[key]}
+
+    def exact(self, query: str) -> list[tuple[str, dict]]:
+        """Monsters whose name contains ``query``, or of the level or element
+        named in it, in roster order."""
+        query = query.lower().strip()
+        names = self._containing(query)
+
+        level_search = re.search(r"level\s*(\d+)", query)
+        if level_search:
+            names.update(self.by_level.get(int(level_search.group(1)), ()))
+        for element in self.elements:
+            if re.search(r"\b" + re.escape(element) + r"\b", query):
+                names.update(self.by_element[element])
+                break
+        return self._entries(names)
+
+    def close_names(self, query: str, n: int = 10, cutoff: float = 0.6) -> list[str]:
+        """Up to ``n`` names or aliases closest to ``query``, best first."""
+        query = query.lower().strip()
+        shared: Counter = Counter()
+        for trigram in _trigrams(query):
+            shared.update(self.trigrams.get(trigram, ()))
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(query)
+        scored = []
+        for key, _count in shared.most_common(FUZZY_CANDIDATES):
+            matcher.set_seq1(key)
+            if (
+                matcher.real_quick_ratio() >= cutoff
+                and matcher.quick_ratio() >= cutoff
+                and matcher.ratio() >= cutoff
+            ):
+                scored.append((matcher.ratio(), key))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        names: list[str] = []
+        for _score, key in scored:
+            for name in self.keys[key]:
+                if name not in names:
+                    names.append(name)
+        return names[:n]
+
+    def fuzzy(self, query: str, threshold: float = 0.6) -> list[tuple[str, dict]]:
+        """``exact`` matches, else close names, else a misspelled level or
+        element query."""
+        query = query.lower().strip()
+        results = self.exact(query)
+        if results:
+            return results
+
+        close = self.close_names(query, cutoff=threshold)
+        if close:
+            return [(name, self.monsters[name]) for name in close]
+
+        level_match = re.search(r"l[ve][ve][le]\s*(\d+)", query)
+        if level_match:
+            return self._entries(self.by_level.get(int(level_match.group(1)), ()))
+
+        for element in self.elements:
+            if difflib.SequenceMatcher(None, query, element).ratio() > threshold:
+                return self._entries(self.by_element[element])
+        return []
+
+
+class ContentFile:
+    """A JSON file parsed on first use and again after it changed on disk."""
+
+    def __init__(self, path: str, build: Optional[Callable[[Any], Any]] = None):
+        self.path = path
+        self.build = build
+        self.version = 0
+        self._value: Any = None
+        self._signature: Optional[tuple[int, int]] = None
+        self._checked = 0.0
+
+    def invalidate(self) -> None:
+        self._signature = None
+        self._checked = 0.0
+
+    def get(self) -> Any:
+        now = time.monotonic()
+        if self._signature is not None and now - self._checked < CHECK_INTERVAL:
+            return self._value
+        self._checked = now
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._value = self.build(data) if self.build else data
+            self._signature = signature
+            self.version += 1
+            if self.version > 1:
+                log.info("Reloaded %s", self.path)
+        return self._value
+
+
+class SpliceRows(NamedTuple):
+    version: tuple
+    completed: list
+    pending_parent_names: list
+
+
+class ContentRegistry:
+    def __init__(self, bot=None) -> None:
+        self.bot = bot
+        self._files: dict[str, ContentFile] = {}
+        self._splice: Optional[SpliceRows] = None
+        self._splice_fetched = 0.0
+        self._has_splice_requests: Optional[bool] = None
+
+    def file(self, path: str, build: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Returns the parsed content of ``path``, built with ``build`` if given.
+
+        Raises ``OSError`` or ``ValueError`` like reading the file directly.
+        """
+        content = self._files.get(path)
+        if content is None:
+            content = self._files[path] = ContentFile(path, build)
+        return content.get()
+
+    def monsters(self, *, missing_ok: bool = True) -> MonsterIndex:
+        """The ``monsters.json`` index, empty if the file does not exist."""
+        try:
+            return self.file(MONSTERS_PATH, MonsterIndex)
+        except FileNotFoundError:
+            if not missing_ok:
+                raise
+            return MonsterIndex({})
+
+    def invalidate(self) -> None:
+        for content in self._files.values():
+            content.invalidate()
+        self._splice = None
+        self._has_splice_requests = None
+
+    async def reload(self) -> None:
+        """Drops the content of every cluster, it is reloaded on next use."""
+        await self.bot.cogs["Sharding"].handler("reload_content", 0)
+
+    async def splice_rows(self) -> SpliceRows:
+        """Completed splices and parents of pending ones, for the PvE pool."""
+        async with self.bot.pool.acquire() as conn:
+            if self._has_splice_requests is None:
+                self._has_splice_requests = await conn.fetchval(
+                    "SELECT to_regclass('public.splice_requests') IS NOT NULL;"
+                )
+            pending_stamp = (
+                "SELECT count(*), coalesce(max(id), 0) FROM splice_requests"
+                " WHERE status = 'pending'"
+                if self._has_splice_requests
+                else "SELECT 0, 0"
+            )
+            version = tuple(
+                await conn.fetchrow(
+                    "SELECT c.*, p.* FROM (SELECT count(*), coalesce(max(id), 0)"
+                    f" FROM splice_combinations) c, ({pending_stamp}) p;"
+                )
+            )
+            if (
+                self._splice is not None
+                and self._splice.version == version
+                and time.monotonic() - self._splice_fetched < SPLICE_TTL
+            ):
+                return self._splice
+
+            completed = await conn.fetch(
+                """
+                SELECT id, pet1_default, pet2_default, result_name, hp, attack, defense, element, url, created_at
+                FROM splice_combinations
+                ORDER BY created_at ASC, id ASC
+                """
+            )
+            pending = []
+            if self._has_splice_requests:
+                pending = await conn.fetch(
+                    """
+                    SELECT DISTINCT parent_name
+                    FROM (
+                        SELECT pet1_default AS parent_name
+                        FROM splice_requests
+                        WHERE status = 'pending'
+                        UNION
+                        SELECT pet2_default AS parent_name
+                        FROM splice_requests
+                        WHERE status = 'pending'
+                    ) pending_parent_names
+                    """
+                )
+        self._splice = SpliceRows(version, completed, pending)
+        self._splice_fetched = time.monotonic()
+        return self._splice
@@ -129,6 +129,16 @@ class Context(commands.Context):
     def __repr__(self):
         return "<Context>"
 
+    async def get_profile(self, *, refresh: bool = False):
+        """Returns the author's profile row, read at most once per invocation.
+
+        The row is also stored as ``character_data`` for the command body.
+        """
+        self.character_data = await self.bot.profile_cache.get(
+            self.author.id, refresh=refresh
+        )
+        return self.character_data
+
     async def confirm(
         self,
         message: str,
@@ -0,0 +1,218 @@
+"""Per-owner cooldown registry on top of the ``cd:`` Redis keys.
+
+Each cooldown is still a string key ``{scope}:{owner}:{command}`` with a TTL,
+so code that reads, deletes or shortens those keys directly keeps working.
+Next to them every owner gets a registry ZSET ``cdreg:{scope}:{owner}`` of
+command names scored by their expiry. Check-and-set and listing are single
+Lua scripts run through ``EVALSHA``, which replaces the ``TTL``/``SET`` round
+trips and the ``KEYS cd:{id}:*`` scans.
+
+The key TTL stays authoritative: listing drops registry members whose key is
+gone. Keys written before the registry existed are indexed once by
+``CooldownRegistry.migrate`` with an incremental ``SCAN``.
+
+The scripts build cooldown key names from registry members, which is fine on
+a single Redis instance but would need hash tags under Redis Cluster.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+USER = "cd"
+GUILD = "guildcd"
+ALLIANCE = "alliancecd"
+SCOPES = (USER, GUILD, ALLIANCE)
+
+MIGRATION_KEY = "cdreg:migration"
+# one migration per restart wave, clusters starting later skip it
+MIGRATION_LOCK = 10 * 60
+MIGRATION_BATCH = 500
+# registry score for legacy keys without expiry
+PERSISTENT_TTL = 24 * 60 * 60
+
+# KEYS: cooldown key, registry
+# ARGV: mode (nx, set, index), command, value, seconds, now
+_START_SCRIPT = """
+local ttl = redis.call('TTL', KEYS[1])
+local mode = ARGV[1]
+if mode == 'index' then
+    if ttl == -2 then return -2 end
+elseif mode == 'nx' and ttl ~= -2 then
+    return ttl
+else
+    redis.call('SET', KEYS[1], ARGV[3], 'EX', ARGV[4])
+    ttl = tonumber(ARGV[4])
+end
+local now = tonumber(ARGV[5])
+if ttl < 0 then ttl = tonumber(ARGV[6]) end
+redis.call('ZADD', KEYS[2], now + ttl, ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+local last = redis.call('ZRANGE', KEYS[2], -1, -1, 'WITHSCORES')
+if last[2] then
+    redis.call('EXPIREAT', KEYS[2], math.ceil(tonumber(last[2])) + 1)
+else
+    -- an indexed key with TTL 0 is pruned right away and may leave nothing
+    redis.call('DEL', KEYS[2])
+end
+if mode == 'nx' then return -2 end
+return ttl
+"""
+
+# KEYS: registry
+# ARGV: cooldown key prefix
+_LIST_SCRIPT = """
+local members = redis.call('ZRANGE', KEYS[1], 0, -1)
+local timers = {}
+for _, member in ipairs(members) do
+    local ttl = redis.call('TTL', ARGV[1] .. member)
+    if ttl == -2 then
+        redis.call('ZREM', KEYS[1], member)
+    else
+        timers[#timers + 1] = member
+        timers[#timers + 1] = ttl
+    end
+end
+return timers
+"""
+
+# KEYS: registry
+# ARGV: cooldown key prefix
+_CLEAR_SCRIPT = """
+local members = redis.call('ZRANGE', KEYS[1], 0, -1)
+local deleted = 0
+for _, member in ipairs(members) do
+    deleted = deleted + redis.call('DEL', ARGV[1] .. member)
+end
+redis.call('DEL', KEYS[1])
+return deleted
+"""
+
+
+def cooldown_key(scope: str, owner, command: str) -> str:
+    return f"{scope}:{owner}:{command}"
+
+
+def registry_key(scope: str, owner) -> str:
+    return f"cdreg:{scope}:{owner}"
+
+
+def parse_cooldown_key(key: str | bytes) -> tuple[str, str, str] | None:
+    """Splits a cooldown key into scope, owner and command.
+
+    Command names may contain colons themselves, e.g. ``spin_approval:gate``.
+    """
+    if isinstance(key, bytes):
+        key = key.decode()
+    parts = key.split(":", 2)
+    if len(parts) != 3 or parts[0] not in SCOPES:
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+class CooldownRegistry:
+    def __init__(self, redis) -> None:
+        self.redis = redis
+        self._start = redis.register_script(_START_SCRIPT)
+        self._list = redis.register_script(_LIST_SCRIPT)
+        self._clear = redis.register_script(_CLEAR_SCRIPT)
+        self._migration: asyncio.Task | None = None
+
+    def _start_args(self, scope, owner, command, mode, seconds, value):
+        return {
+            "keys": [cooldown_key(scope, owner, command), registry_key(scope, owner)],
+            "args": [
+                mode,
+                command,
+                command if value is None else value,
+                int(seconds),
+                int(time.time()),
+                PERSISTENT_TTL,
+            ],
+        }
+
+    async def acquire(
+        self, scope: str, owner, command: str, seconds: int, *, value=None
+    ) -> int | None:
+        """Starts a cooldown unless one is running.
+
+        Returns None if the cooldown was started, otherwise the remaining TTL
+        of the running one.
+        """
+        ttl = await self._start(
+            **self._start_args(scope, owner, command, "nx", seconds, value)
+        )
+        return None if ttl == -2 else ttl
+
+    async def set(
+        self, scope: str, owner, command: str, seconds: int, *, value=None
+    ) -> None:
+        """Starts a cooldown, overwriting a running one."""
+        await self._start(
+            **self._start_args(scope, owner, command, "set", seconds, value)
+        )
+
+    async def timers(self, scope: str, owner) -> dict[str, int]:
+        """Returns all running cooldowns of an owner as command -> TTL."""
+        flat = await self._list(
+            keys=[registry_key(scope, owner)], args=[f"{scope}:{owner}:"]
+        )
+        return {
+            (command.decode() if isinstance(command, bytes) else command): int(ttl)
+            for command, ttl in zip(flat[::2], flat[1::2])
+        }
+
+    async def clear(self, scope: str, owner) -> int:
+        """Deletes all cooldowns of an owner and returns how many there were."""
+        return await self._clear(
+            keys=[registry_key(scope, owner)], args=[f"{scope}:{owner}:"]
+        )
+
+    # Migration of keys written before the registry
+
+    def start(self) -> None:
+        self._migration = asyncio.create_task(self._run_migration())
+
+    async def _run_migration(self) -> None:
+        try:
+            indexed = await self.migrate()
+        except Exception:
+            log.exception("Cooldown registry migration failed")
+        else:
+            if indexed:
+                log.info("Indexed %d legacy cooldown keys", indexed)
+
+    async def migrate(self) -> int:
+        if not await self.redis.set(MIGRATION_KEY, 1, nx=True, ex=MIGRATION_LOCK):
+            return 0
+        indexed = 0
+        batch = []
+        for scope in SCOPES:
+            async for key in self.redis.scan_iter(match=f"{scope}:*", count=1000):
+                parsed = parse_cooldown_key(key)
+                if parsed is None:
+                    continue
+                batch.append(parsed)
+                if len(batch) >= MIGRATION_BATCH:
+                    indexed += await self._index(batch)
+                    batch = []
+        if batch:
+            indexed += await self._index(batch)
+        return indexed
+
+    async def _index(self, batch) -> int:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for scope, owner, command in batch:
+                await self._start(
+                    **self._start_args(scope, owner, command, "index", 0, None),
+                    client=pipe,
+                )
+            results = await pipe.execute()
+        return sum(1 for ttl in results if ttl != -2)
+
+    async def close(self) -> None:
+        if self._migration is not None:
+            self._migration.cancel()
@@ -0,0 +1,149 @@
+"""Vectorized crate outcome draws for bulk opening.
+
+Opening crates used to roll every crate separately with ``utils.random``. The
+draws here produce the same distributions for a whole batch at once: category
+outcomes come from one multinomial or categorical sample, per-crate values
+from one array draw. Each opening uses its own NumPy generator seeded from
+``secrets``.
+"""
+from __future__ import annotations
+
+import secrets
+
+from collections import Counter
+from typing import NamedTuple
+
+import numpy as np
+
+from classes.items import ALL_ITEM_TYPES, RANDOM_ITEM_ELEMENTS, Hand, ItemType
+
+# a mystery crate rolls randint(0, 10000), these are the widths of each range
+MYSTERY_ODDS = (
+    ("divine", 5),
+    ("fortune", 5),
+    ("legendary", 40),
+    ("materials", 200),
+    ("magic", 250),
+    ("rare", 2000),
+    ("uncommon", 2500),
+    ("common", 5001),
+)
+
+# (chance out of 10, (minstat, maxstat)) per item crate rarity
+STAT_BANDS = {
+    "common": ((2, (20, 25)), (3, (10, 19)), (5, (1, 9))),
+    "uncommon": ((2, (30, 35)), (3, (20, 29)), (5, (10, 19))),
+    "rare": ((2, (35, 40)), (3, (30, 34)), (5, (20, 29))),
+    "magic": ((2, (40, 55)), (3, (35, 40)), (5, (30, 34))),
+    "legendary": ((2, (70, 80)), (3, (60, 69)), (5, (50, 59))),
+    "divine": ((1, (90, 100)), (4, (81, 89)), (5, (75, 80))),
+}
+
+# (chance, (min, max)) of the dragon coin bonus per crate
+DRAGON_COIN_ODDS = {"legendary": (0.2, (1, 15)), "divine": (0.4, (1, 50))}
+
+ITEM_VALUE_RANGE = (1, 250)
+MATERIALS_PER_CRATE = (3, 10)
+FORTUNE_LOW_MONEY_CHANCE = 0.75
+FORTUNE_MONEY_RANGES = ((250000, 470000), (470001, 850000))
+
+
+class FortuneDraw(NamedTuple):
+    xp: int
+    money: int
+    xp_crates: int
+    money_crates: int
+
+
+def make_rng() -> np.random.Generator:
+    return np.random.default_rng(secrets.randbits(128))
+
+
+def draw_mystery(rng: np.random.Generator, amount: int) -> dict[str, int]:
+    """Returns how many crates of each rarity ``amount`` mystery crates hold."""
+    weights = np.array([weight for _rarity, weight in MYSTERY_ODDS], dtype=float)
+    counts = rng.multinomial(amount, weights / weights.sum())
+    return {rarity: int(count) for (rarity, _w), count in zip(MYSTERY_ODDS, counts)}
+
+
+def draw_stats(rng: np.random.Generator, rarity: str, amount: int) -> np.ndarray:
+    bands = STAT_BANDS[rarity]
+    chances = np.array([chance for chance, _range in bands], dtype=float) / 10
+    band = rng.choice(len(bands), size=amount, p=chances)
+    low = np.array([low for _c, (low, _high) in bands])[band]
+    high = np.array([high for _c, (_low, high) in bands])[band]
+    return rng.integers(low, high, endpoint=True)
+
+
+def draw_items(rng: np.random.Generator, rarity: str, amount: int) -> list[dict]:
+    """Draws ``amount`` unnamed items like ``Bot.create_random_item`` would."""
+    stats = draw_stats(rng, rarity, amount)
+    types = rng.integers(len(ALL_ITEM_TYPES), size=amount)
+    elements = rng.integers(len(RANDOM_ITEM_ELEMENTS), size=amount)
+    values = rng.integers(*ITEM_VALUE_RANGE, endpoint=True, size=amount)
+    uneven = rng.integers(2, size=amount)
+
+    items = []
+    for stat, type_index, element, value, odd in zip(
+        stats.tolist(),
+        types.tolist(),
+        elements.tolist(),
+        values.tolist(),
+        uneven.tolist(),
+    ):
+        type_ = ALL_ITEM_TYPES[type_index]
+        hand = type_.get_hand()
+        damage = 0 if type_ == ItemType.Shield else stat
+        if hand == Hand.Both:
+            # doubled, and forced uneven half of the time like single rolls
+            damage = damage * 2 - int(odd)
+        items.append(
+            {
+                "type_": type_.value,
+                "hand": hand.value,
+                "damage": damage,
+                "armor": stat if type_ == ItemType.Shield else 0,
+                "element": RANDOM_ITEM_ELEMENTS[element],
+                "value": value,
+            }
+        )
+    return items
+
+
+def draw_dragon_coins(rng: np.random.Generator, rarity: str, amount: int) -> int:
+    if rarity not in DRAGON_COIN_ODDS:
+        return 0
+    chance, (low, high) = DRAGON_COIN_ODDS[rarity]
+    hits = rng.binomial(amount, chance)
+    return int(rng.integers(low, high, endpoint=True, size=hits).sum())
+
+
+def draw_fortune(rng: np.random.Generator, amount: int, level: int) -> FortuneDraw:
+    xp_crates = int(rng.binomial(amount, 0.5))
+    money_crates = amount - xp_crates
+    xp = rng.integers(
+        1000 * min(level, 50), 2000 * level + 1500, endpoint=True, size=xp_crates
+    )
+
+    low_crates = int(rng.binomial(money_crates, FORTUNE_LOW_MONEY_CHANCE))
+    money = 0
+    for count, (low, high) in zip(
+        (low_crates, money_crates - low_crates), FORTUNE_MONEY_RANGES
+    ):
+        rewards = rng.integers(low, high, endpoint=True, size=count)
+        # np.round rounds halves to even, like round() did per crate
+        money += int(np.round(rewards, -2).sum())
+    return FortuneDraw(int(xp.sum()), money, xp_crates, money_crates)
+
+
+def draw_materials(
+    rng: np.random.Generator, amount: int, odds: dict[str, float]
+) -> Counter:
+    """Draws the materials of ``amount`` crates from per-resource ``odds``."""
+    total = int(rng.integers(*MATERIALS_PER_CRATE, endpoint=True, size=amount).sum())
+    resources = list(odds)
+    weights = np.array([odds[resource] for resource in resources], dtype=float)
+    counts = rng.multinomial(total, weights / weights.sum())
+    return Counter(
+        {resource: int(count) for resource, count in zip(resources, counts) if count}
+    )
@@ -0,0 +1,305 @@
+"""Avatar filters for the Images cog, computed in a local process pool.
+
+``pixel``, ``edges``, ``invert`` and ``oil`` are NumPy implementations over
+RGBA arrays, decoded and encoded with Pillow. ``ImageOps`` runs them in a
+small spawn-based process pool. The avatar bytes reach the worker through a
+shared memory block instead of being pickled into the call.
+
+Results are kept in a size-bounded LRU keyed by ``(avatar hash, operation,
+params)``, so a repeat of the same filter on an unchanged avatar does not
+even download it. Identical requests made while one is running share its
+result. At most ``MAX_PENDING`` jobs are pending, their downloads included,
+anything beyond that raises ``ImageOpsBusy`` right away instead of queueing.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from multiprocessing import shared_memory
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+
+from PIL import Image
+
+log = logging.getLogger(__name__)
+
+SIZE = 512
+WORKERS = 2
+MAX_PENDING = 8
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+OIL_RADIUS = 4
+EDGE_FLOOR = 64.0
+PNG_COMPRESS_LEVEL = 3
+RESAMPLE = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
+
+# BT.601 luma weights
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+class ImageOpsBusy(Exception):
+    """Raised when the pool already has ``MAX_PENDING`` jobs waiting."""
+
+
+def pixel(rgba: np.ndarray, blocks: int = 128) -> np.ndarray:
+    """Averages ``blocks`` x ``blocks`` squares, fewer blocks is coarser."""
+    height, width, channels = rgba.shape
+    block = max(1, height // blocks)
+    blocks = height // block
+    cropped = rgba[: blocks * block, : blocks * block].astype(np.float32)
+    means = cropped.reshape(blocks, block, blocks, block, channels).mean(axis=(1, 3))
+    scaled = np.repeat(np.repeat(means, block, axis=0), block, axis=1)
+    out = rgba.copy()
+    out[: blocks * block, : blocks * block] = np.rint(scaled).astype(np.uint8)
+    return out
+
+
+def invert(rgba: np.ndarray) -> np.ndarray:
+    out = rgba.copy()
+    out[..., :3] = 255 - rgba[..., :3]
+    return out
+
+
+def edges(rgba: np.ndarray) -> np.ndarray:
+    """Sobel edge strength, shown in the colors of the original image."""
+    rgb = rgba[..., :3].astype(np.float32)
+    padded = np.pad(rgb @ LUMA, 1, mode="edge")
+    gx = (
+        padded[:-2, 2:] + 2 * padded[1:-1, 2:] + padded[2:, 2:]
+        - padded[:-2, :-2] - 2 * padded[1:-1, :-2] - padded[2:, :-2]
+    )
+    gy = (
+        padded[2:, :-2] + 2 * padded[2:, 1:-1] + padded[2:, 2:]
+        - padded[:-2, :-2] - 2 * padded[:-2, 1:-1] - padded[:-2, 2:]
+    )
+    magnitude = np.hypot(gx, gy)
+    # scaled to the strongest edge, the floor keeps near flat images dark,
+    # and the square root lifts the weaker edges
+    strength = np.sqrt(magnitude / max(float(magnitude.max()), EDGE_FLOOR))
+    glow = np.maximum(rgb, 64) * (1.5 * strength)[..., None]
+    out = rgba.copy()
+    out[..., :3] = np.clip(glow, 0, 255).astype(np.uint8)
+    return out
+
+
+def oil(rgba: np.ndarray, radius: int = OIL_RADIUS) -> np.ndarray:
+    """Kuwahara filter: every pixel takes the mean color of the least varied
+    of the four ``(radius + 1)`` squares it is a corner of."""
+    height, width = rgba.shape[:2]
+    size = radius + 1
+    rgb = rgba[..., :3].astype(np.float64)
+    luma = rgb @ LUMA.astype(np.float64)
+    planes = np.concatenate(
+        [rgb, luma[..., None], (luma * luma)[..., None]], axis=2
+    )
+    padded = np.pad(planes, ((radius, radius), (radius, radius), (0, 0)), mode="edge")
+    integral = np.zeros(
+        (padded.shape[0] + 1, padded.shape[1] + 1, padded.shape[2]), dtype=np.float64
+    )
+    np.cumsum(np.cumsum(padded, axis=0), axis=1, out=integral[1:, 1:])
+    # sums of every size x size square, indexed by its top left corner
+    boxes = (
+        integral[size:, size:] - integral[:-size, size:]
+        - integral[size:, :-size] + integral[:-size, :-size]
+    ) / (size * size)
+
+    quadrants = np.stack(
+        [
+            boxes[top : top + height, left : left + width]
+            for top in (0, radius)
+            for left in (0, radius)
+        ]
+    )
+    variance = quadrants[..., 4] - quadrants[..., 3] ** 2
+    best = np.argmin(variance, axis=0)
+    means = np.take_along_axis(quadrants[..., :3], best[None, ..., None], axis=0)[0]
+    out = rgba.copy()
+    out[..., :3] = np.clip(np.rint(means), 0, 255).astype(np.uint8)
+    return out
+
+
+OPERATIONS: dict[str, Callable[..., np.ndarray]] = {
+    "pixel": pixel,
+    "edges": edges,
+    "invert": invert,
+    "oil": oil,
+}
+
+
+def decode(data: bytes) -> np.ndarray:
+    with Image.open(BytesIO(data)) as image:
+        image = image.convert("RGBA")
+        if image.size != (SIZE, SIZE):
+            image = image.resize((SIZE, SIZE), RESAMPLE)
+        return np.asarray(image)
+
+
+def encode(rgba: np.ndarray) -> bytes:
+    output = BytesIO()
+    Image.fromarray(rgba).save(
+        output, format="PNG", compress_level=PNG_COMPRESS_LEVEL
+    )
+    return output.getvalue()
+
+
+def apply(data: bytes, operation: str, params: tuple = ()) -> bytes:
+    """Decodes ``data``, applies the operation and returns it as a PNG."""
+    return encode(OPERATIONS[operation](decode(data), *params))
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        # the parent owns and unlinks the block
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+def apply_shared(name: str, length: int, operation: str, params: tuple) -> bytes:
+    """``apply`` on image bytes placed in the shared memory block ``name``."""
+    block = _attach(name)
+    try:
+        data = bytes(block.buf[:length])
+    finally:
+        block.close()
+    return apply(data, operation, params)
+
+
+def preload() -> None:
+    """Worker initializer, warms NumPy and the PNG codec."""
+    encode(np.zeros((8, 8, 4), dtype=np.uint8))
+
+
+class ImageOps:
+    def __init__(
+        self,
+        *,
+        workers: int = WORKERS,
+        max_pending: int = MAX_PENDING,
+        cache_max_bytes: int = CACHE_MAX_BYTES,
+    ) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.cache_max_bytes = cache_max_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cache: OrderedDict[tuple, bytes] = OrderedDict()
+        self._cache_bytes = 0
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self.pending = 0
+        self.runs = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, forking the bot would copy its sockets and running threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=preload,
+            )
+        return self._pool
+
+    def _reserve(self, operation: str) -> None:
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown image operation {operation!r}")
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ImageOpsBusy()
+        self.pending += 1
+
+    async def _execute(self, data: bytes, operation: str, params: tuple) -> bytes:
+        block = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+        try:
+            block.buf[: len(data)] = data
+            self.runs += 1
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor(), apply_shared, block.name, len(data), operation, params
+            )
+        finally:
+            block.close()
+            block.unlink()
+
+    async def run(self, data: bytes, operation: str, params: tuple = ()) -> bytes:
+        """Applies ``operation`` to ``data`` in the pool, uncached."""
+        self._reserve(operation)
+        try:
+            return await self._execute(data, operation, params)
+        finally:
+            self.pending -= 1
+
+    def _remember(self, key: tuple, data: bytes) -> None:
+        if len(data) > self.cache_max_bytes:
+            return
+        self._cache[key] = data
+        self._cache_bytes += len(data)
+        while self._cache_bytes > self.cache_max_bytes:
+            _key, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+
+    async def process(
+        self,
+        avatar: str,
+        operation: str,
+        params: tuple,
+        read: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """The filtered image for the avatar with hash ``avatar``.
+
+        ``read`` downloads the avatar and is only called on a cache miss.
+        """
+        key = (avatar, operation, params)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        # the slot is taken before the download, so a burst beyond
+        # max_pending fails fast instead of downloading first
+        self._reserve(operation)
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            data = await self._execute(await read(), operation, params)
+            self._remember(key, data)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # retrieved here so an uncontended failure is not logged twice
+            future.exception()
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            self.pending -= 1
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "runs": self.runs,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "cached": len(self._cache),
+            "cached_bytes": self._cache_bytes,
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
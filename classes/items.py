@@ -68,3 +68,13 @@ ANY_HANDED_ITEM_TYPES = (
     ItemType.Knife,
     ItemType.Hammer,
 )
+RANDOM_ITEM_ELEMENTS = (
+    "Light",
+    "Dark",
+    "Corrupted",
+    "Fire",
+    "Water",
+    "Electric",
+    "Nature",
+    "Wind",
+)
@@ -0,0 +1,344 @@
+"""Redis sorted-set leaderboards for the profile rankings.
+
+Every board is a ZSET keyed by user id. Ranks are answered with ``ZCOUNT`` on
+the user's score, which is O(log n) and gives the same numbers as the old
+``SELECT COUNT(*) ... WHERE col > $1`` queries, ties included.
+
+Postgres triggers publish every changed leaderboard column with
+``pg_notify``, so all the scattered ``UPDATE profile`` call sites write through
+to Redis without touching them. The ``profile`` trigger is shared with the
+profile cache (``utils.notify_triggers``). The cluster holding the leaderboard
+lease listens for those notifications, rebuilds the boards in bulk on startup
+and reconciles them periodically. Until a board has been built, reads fall
+back to the SQL queries.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+
+from utils.notify_triggers import (
+    PROFILE_CHANNEL,
+    ensure_profile_trigger,
+    ensure_triggers,
+)
+from utils.scheduling import ClusterLease
+
+log = logging.getLogger(__name__)
+
+PROFILE_BOARDS = ("money", "xp", "pvpwins", "whored")
+BATTLETOWER_BOARD = "battletower"
+ALL_BOARDS = (*PROFILE_BOARDS, BATTLETOWER_BOARD)
+
+NOTIFY_CHANNEL = "leaderboard_update"
+TRIGGERS = ("leaderboard_battletower_notify",)
+LEASE_NAME = "leaderboards"
+READY_KEY = "lb:ready"
+RECONCILE_INTERVAL = 30 * 60
+REBUILD_CHUNK = 5000
+FLUSH_INTERVAL = 0.1
+
+# Battle Tower is ordered by prestige, then level; both fit into one score.
+BATTLETOWER_LEVEL_FACTOR = 1_000_000
+
+_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION leaderboard_battletower_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('{channel}', json_build_object(
+            'battletower', OLD."id", 'deleted', true
+        )::text);
+        RETURN OLD;
+    END IF;
+    PERFORM pg_notify('{channel}', json_build_object(
+        'battletower', NEW."id", 'prestige', NEW."prestige", 'level', NEW."level"
+    )::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'leaderboard_battletower_notify') THEN
+        CREATE TRIGGER leaderboard_battletower_notify
+        AFTER INSERT OR DELETE OR UPDATE OF "prestige", "level" ON battletower
+        FOR EACH ROW EXECUTE FUNCTION leaderboard_battletower_notify();
+    END IF;
+END;
+$$;
+""".format(channel=NOTIFY_CHANNEL)
+
+
+def board_key(board: str) -> str:
+    return f"lb:{board}"
+
+
+def battletower_score(prestige: int, level: int) -> int:
+    return int(prestige or 0) * BATTLETOWER_LEVEL_FACTOR + int(level or 0)
+
+
+def split_battletower_score(score: float) -> tuple[int, int]:
+    prestige, level = divmod(int(score), BATTLETOWER_LEVEL_FACTOR)
+    return prestige, level
+
+
+def scores_from_payload(payload: dict) -> tuple[int, dict[str, int | None]]:
+    """Translates a trigger payload into ``(user_id, {board: score})``.
+
+    A score of ``None`` removes the user from that board.
+    """
+    if "battletower" in payload:
+        user_id = int(payload["battletower"])
+        if payload.get("deleted"):
+            return user_id, {BATTLETOWER_BOARD: None}
+        return user_id, {
+            BATTLETOWER_BOARD: battletower_score(
+                payload.get("prestige"), payload.get("level")
+            )
+        }
+
+    user_id = int(payload["user"])
+    if payload.get("deleted"):
+        return user_id, {board: None for board in ALL_BOARDS}
+    # the profile trigger leaves the columns out when none of them changed
+    return user_id, {
+        board: payload[board] for board in PROFILE_BOARDS if board in payload
+    }
+
+
+class Leaderboards:
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.lease = ClusterLease(bot.redis, LEASE_NAME, ttl=60)
+        self._pending: dict[tuple[str, int], int | None] = {}
+        self._flush_event = asyncio.Event()
+        self._listen_conn = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        await self._stop_listening()
+        await self.lease.release()
+
+    # Reads
+
+    async def is_ready(self) -> bool:
+        return bool(await self.bot.redis.exists(READY_KEY))
+
+    async def top(self, board: str, limit: int = 10) -> list[tuple[int, int]]:
+        """Returns the ``(user_id, score)`` pairs of the top ``limit`` users."""
+        if await self.is_ready():
+            entries = await self.bot.redis.zrevrange(
+                board_key(board), 0, limit - 1, withscores=True
+            )
+            return [(int(member), int(score)) for member, score in entries]
+
+        if board == BATTLETOWER_BOARD:
+            rows = await self.bot.pool.fetch(
+                'SELECT "id", "prestige", "level" FROM battletower ORDER BY'
+                ' "prestige" DESC, "level" DESC LIMIT $1;',
+                limit,
+            )
+            return [
+                (row["id"], battletower_score(row["prestige"], row["level"]))
+                for row in rows
+            ]
+        rows = await self.bot.pool.fetch(
+            f'SELECT "user", "{board}" FROM profile ORDER BY "{board}" DESC LIMIT $1;',
+            limit,
+        )
+        return [(row["user"], row[board]) for row in rows]
+
+    async def rank(
+        self, board: str, user_id: int, *, inclusive: bool = False
+    ) -> tuple[int, int] | None:
+        """Returns ``(rank, score)`` for a user or None if they are not ranked.
+
+        The rank is one more than the number of users with a higher score. With
+        ``inclusive`` it is the number of users with at least the same score,
+        which is what the profile cards have always shown.
+        """
+        if await self.is_ready():
+            key = board_key(board)
+            score = await self.bot.redis.zscore(key, user_id)
+            if score is None:
+                return None
+            if inclusive:
+                return await self.bot.redis.zcount(key, score, "+inf"), int(score)
+            higher = await self.bot.redis.zcount(key, f"({score}", "+inf")
+            return higher + 1, int(score)
+
+        if board == BATTLETOWER_BOARD:
+            row = await self.bot.pool.fetchrow(
+                'SELECT "prestige", "level" FROM battletower WHERE "id"=$1;', user_id
+            )
+            if row is None:
+                return None
+            comparison = ">=" if inclusive else ">"
+            count = await self.bot.pool.fetchval(
+                'SELECT COUNT(*) FROM battletower WHERE "prestige" > $1 OR'
+                f' ("prestige" = $1 AND "level" {comparison} $2);',
+                row["prestige"],
+                row["level"],
+            )
+            return (
+                count if inclusive else count + 1,
+                battletower_score(row["prestige"], row["level"]),
+            )
+
+        score = await self.bot.pool.fetchval(
+            f'SELECT "{board}" FROM profile WHERE "user"=$1;', user_id
+        )
+        if score is None:
+            return None
+        comparison = ">=" if inclusive else ">"
+        count = await self.bot.pool.fetchval(
+            f'SELECT COUNT(*) FROM profile WHERE "{board}" {comparison} $1;', score
+        )
+        return (count if inclusive else count + 1), score
+
+    # Writes
+
+    def _queue(self, board: str, user_id: int, score: int | None) -> None:
+        self._pending[(board, user_id)] = score
+        self._flush_event.set()
+
+    def _on_notification(self, _conn, _pid, _channel, payload: str) -> None:
+        try:
+            user_id, scores = scores_from_payload(json.loads(payload))
+        except (ValueError, KeyError, TypeError):
+            log.warning("Ignoring malformed leaderboard payload %r", payload)
+            return
+        for board, score in scores.items():
+            self._queue(board, user_id, score)
+
+    async def _apply(self, updates: dict[tuple[str, int], int | None], suffix="") -> None:
+        async with self.bot.redis.pipeline(transaction=False) as pipe:
+            for (board, user_id), score in updates.items():
+                key = board_key(board) + suffix
+                if score is None:
+                    pipe.zrem(key, user_id)
+                else:
+                    pipe.zadd(key, {user_id: score})
+            await pipe.execute()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        updates, self._pending = self._pending, {}
+        await self._apply(updates)
+
+    # Owner loop
+
+    async def _start_listening(self) -> None:
+        if self._listen_conn is not None:
+            return
+        self._listen_conn = await self.bot.pool.acquire()
+        await ensure_profile_trigger(self._listen_conn)
+        await ensure_triggers(self._listen_conn, TRIGGERS, _TRIGGER_SQL)
+        await self._listen_conn.add_listener(PROFILE_CHANNEL, self._on_notification)
+        await self._listen_conn.add_listener(NOTIFY_CHANNEL, self._on_notification)
+
+    async def _stop_listening(self) -> None:
+        if self._listen_conn is None:
+            return
+        conn, self._listen_conn = self._listen_conn, None
+        try:
+            await conn.remove_listener(PROFILE_CHANNEL, self._on_notification)
+            await conn.remove_listener(NOTIFY_CHANNEL, self._on_notification)
+        finally:
+            await self.bot.pool.release(conn)
+
+    async def rebuild(self) -> None:
+        """Rebuilds every board from Postgres and swaps them in atomically.
+
+        Notifications arriving meanwhile stay queued and are flushed on top
+        of the new boards afterwards, so the swap does not lose updates.
+        """
+        suffix = ":rebuild"
+        written: set[str] = set()
+        await self.bot.redis.delete(*(board_key(board) + suffix for board in ALL_BOARDS))
+        async with self.bot.pool.acquire() as conn:
+            async with conn.transaction():
+                await self._copy_rows(
+                    conn,
+                    'SELECT "user", "money", "xp", "pvpwins", "whored" FROM profile;',
+                    lambda row: {
+                        (board, row["user"]): row[board]
+                        for board in PROFILE_BOARDS
+                        if row[board] is not None
+                    },
+                    suffix,
+                    written,
+                )
+                await self._copy_rows(
+                    conn,
+                    'SELECT "id", "prestige", "level" FROM battletower;',
+                    lambda row: {
+                        (BATTLETOWER_BOARD, row["id"]): battletower_score(
+                            row["prestige"], row["level"]
+                        )
+                    },
+                    suffix,
+                    written,
+                )
+        async with self.bot.redis.pipeline(transaction=True) as pipe:
+            for board in ALL_BOARDS:
+                if board in written:
+                    pipe.rename(board_key(board) + suffix, board_key(board))
+                else:
+                    pipe.delete(board_key(board))
+            pipe.set(READY_KEY, 1)
+            await pipe.execute()
+
+    async def _copy_rows(self, conn, query, to_scores, suffix, written) -> None:
+        chunk: dict[tuple[str, int], int] = {}
+        async for row in conn.cursor(query, prefetch=REBUILD_CHUNK):
+            chunk.update(to_scores(row))
+            if len(chunk) >= REBUILD_CHUNK:
+                await self._apply(chunk, suffix)
+                written.update(board for board, _user_id in chunk)
+                chunk = {}
+        if chunk:
+            await self._apply(chunk, suffix)
+            written.update(board for board, _user_id in chunk)
+
+    async def _run(self) -> None:
+        await self.bot.wait_until_ready()
+        loop = asyncio.get_running_loop()
+        next_reconcile = 0.0
+        while True:
+            try:
+                if not await self.lease.acquire():
+                    await self._stop_listening()
+                    self._pending.clear()
+                    next_reconcile = 0.0
+                    await asyncio.sleep(self.lease.renew_interval)
+                    continue
+                await self._start_listening()
+                if loop.time() >= next_reconcile:
+                    await self.rebuild()
+                    next_reconcile = loop.time() + RECONCILE_INTERVAL
+                await self.flush()
+                self._flush_event.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._flush_event.wait(), timeout=self.lease.renew_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    # coalesce bursts of notifications into one pipeline
+                    await asyncio.sleep(FLUSH_INTERVAL)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Leaderboard maintenance failed")
+                await self._stop_listening()
+                next_reconcile = 0.0
+                await asyncio.sleep(5)
@@ -0,0 +1,222 @@
+"""Paged market listings for the ``shop`` command.
+
+Listings are read one page at a time with keyset pagination: a page continues
+after the sort key of the previous page's last row instead of using
+``OFFSET``, so with the ``market (price, id)`` index the default price order
+and the newest order read one page worth of rows however large the market is.
+The listing count is capped at ``COUNT_CAP``.
+
+First pages are what nearly every ``shop`` call shows, they are kept for
+``FIRST_PAGE_TTL`` seconds. ``sell``, ``buy``, ``remove`` and the GM commands
+that change the market bump a generation counter in Redis, which drops the
+cached pages on every cluster.
+"""
+from __future__ import annotations
+
+import logging
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+GENERATION_KEY = "market:generation"
+PAGE_SIZE = 25
+COUNT_CAP = 1000
+FIRST_PAGE_TTL = 15.0
+FIRST_PAGE_CACHE_SIZE = 256
+
+# sort mode -> (SQL expression, descending) keys, the last one is unique
+SORT_KEYS = {
+    "price": (("m.price", False), ("m.id", False)),
+    "stat": (("(ai.damage + ai.armor)", True), ("m.price", False), ("m.id", False)),
+    "efficiency": (
+        ("(ai.damage + ai.armor) / GREATEST(m.price, 1)", True),
+        ("m.id", False),
+    ),
+    "newest": (("m.id", True),),
+}
+
+INDEXES = {
+    "market_price_id_idx": "ON market (price, id)",
+    "allitems_type_damage_idx": 'ON allitems ("type", damage)',
+    "allitems_type_armor_idx": 'ON allitems ("type", armor)',
+}
+
+
+@dataclass(frozen=True)
+class MarketQuery:
+    item_types: tuple[str, ...] = ()
+    minstat: float = 0.0
+    highestprice: int = 1_000_000_000
+    sort: str = "price"
+
+    def sorted_by(self, sort: str) -> MarketQuery:
+        return replace(self, sort=sort)
+
+
+@dataclass
+class MarketPage:
+    items: list
+    # the sort key of the last row, None on the last page
+    cursor: Optional[tuple]
+    # number of matching listings up to COUNT_CAP, only set on first pages
+    total: Optional[int] = None
+
+
+async def create_indexes(pool) -> None:
+    """Builds the listing indexes without locking the tables.
+
+    Runs once at startup on a single cluster, concurrent builds of the same
+    index fail. A build that failed before leaves an invalid index behind
+    that ``IF NOT EXISTS`` would skip, those are dropped and rebuilt.
+    """
+    async with pool.acquire() as conn:
+        invalid = await conn.fetch(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON (c.oid=i.indexrelid)"
+            " WHERE NOT i.indisvalid AND c.relname = ANY($1::text[]);",
+            list(INDEXES),
+        )
+        for row in invalid:
+            log.warning("Rebuilding invalid index %s", row["relname"])
+            await conn.execute(
+                f'DROP INDEX CONCURRENTLY IF EXISTS {row["relname"]};', timeout=None
+            )
+        for name, definition in INDEXES.items():
+            try:
+                await conn.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition};",
+                    timeout=None,
+                )
+            except Exception:
+                log.exception("Could not create index %s", name)
+
+
+def _filters(query: MarketQuery) -> tuple[str, list]:
+    clauses = ['m."price" <= $1', '(ai."damage" >= $2 OR ai."armor" >= $2)']
+    args = [query.highestprice, query.minstat]
+    if query.item_types:
+        args.append(list(query.item_types))
+        clauses.append(f'ai."type" = ANY(${len(args)})')
+    return " AND ".join(clauses), args
+
+
+def _after(keys, first: int) -> str:
+    # rows strictly after the cursor in ORDER BY order; the leading range
+    # condition on the first key lets Postgres start the index scan there
+    alternatives = []
+    for i, (expression, descending) in enumerate(keys):
+        equal = [f"{keys[j][0]} = ${first + j}" for j in range(i)]
+        alternatives.append(
+            " AND ".join([*equal, f"{expression} {'<' if descending else '>'} ${first + i}"])
+        )
+    expression, descending = keys[0]
+    return (
+        f"{expression} {'<=' if descending else '>='} ${first} AND"
+        f" (({') OR ('.join(alternatives)}))"
+    )
+
+
+def page_sql(query: MarketQuery, cursor: Optional[tuple] = None) -> tuple[str, list]:
+    """The statement and arguments for the page after ``cursor``."""
+    keys = SORT_KEYS[query.sort]
+    where, args = _filters(query)
+    if cursor is not None:
+        where += " AND " + _after(keys, len(args) + 1)
+        args.extend(cursor)
+    selected = ", ".join(f"{expression} AS k{i}" for i, (expression, _desc) in enumerate(keys))
+    order = ", ".join(
+        f"{expression} {'DESC' if descending else 'ASC'}" for expression, descending in keys
+    )
+    args.append(PAGE_SIZE + 1)
+    return (
+        f"SELECT ai.*, m.id AS offer, m.item, m.price, m.published, {selected}"
+        f" FROM market m JOIN allitems ai ON (ai.id=m.item) WHERE {where}"
+        f" ORDER BY {order} LIMIT ${len(args)};"
+    ), args
+
+
+def count_sql(query: MarketQuery) -> tuple[str, list]:
+    where, args = _filters(query)
+    args.append(COUNT_CAP + 1)
+    return (
+        "SELECT count(*) FROM (SELECT 1 FROM market m JOIN allitems ai ON"
+        f" (ai.id=m.item) WHERE {where} LIMIT ${len(args)}) AS capped;"
+    ), args
+
+
+class MarketBrowser:
+    def __init__(
+        self,
+        bot,
+        *,
+        ttl: float = FIRST_PAGE_TTL,
+        maxsize: int = FIRST_PAGE_CACHE_SIZE,
+    ) -> None:
+        self.bot = bot
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.first_pages: OrderedDict[MarketQuery, tuple[float, int, MarketPage]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    async def _generation(self) -> Optional[int]:
+        try:
+            return int(await self.bot.redis.get(GENERATION_KEY) or 0)
+        except Exception:
+            log.exception("Could not read the market generation")
+            return None
+
+    async def invalidate(self) -> None:
+        """Drops the cached first pages on every cluster."""
+        self.first_pages.clear()
+        try:
+            await self.bot.redis.incr(GENERATION_KEY)
+        except Exception:
+            log.exception("Could not bump the market generation")
+
+    async def page(self, query: MarketQuery, cursor: Optional[tuple] = None) -> MarketPage:
+        if cursor is not None:
+            return await self._fetch(query, cursor)
+
+        generation = await self._generation()
+        cached = self.first_pages.get(query)
+        if (
+            cached is not None
+            and generation is not None
+            and cached[0] > time.monotonic()
+            and cached[1] == generation
+        ):
+            self.first_pages.move_to_end(query)
+            self.hits += 1
+            return cached[2]
+        self.misses += 1
+
+        page = await self._fetch(query, None)
+        if generation is not None:
+            self.first_pages[query] = (time.monotonic() + self.ttl, generation, page)
+            self.first_pages.move_to_end(query)
+            while len(self.first_pages) > self.maxsize:
+                self.first_pages.popitem(last=False)
+        return page
+
+    async def _fetch(self, query: MarketQuery, cursor: Optional[tuple]) -> MarketPage:
+        statement, args = page_sql(query, cursor)
+        async with self.bot.pool.acquire() as conn:
+            rows = await conn.fetch(statement, *args)
+            total = None
+            if cursor is None:
+                statement, args = count_sql(query)
+                total = await conn.fetchval(statement, *args)
+
+        keys = len(SORT_KEYS[query.sort])
+        items = [dict(row) for row in rows[:PAGE_SIZE]]
+        next_cursor = None
+        if len(rows) > PAGE_SIZE:
+            last = rows[PAGE_SIZE - 1]
+            next_cursor = tuple(last[f"k{i}"] for i in range(keys))
+        return MarketPage(items, next_cursor, total)
@@ -0,0 +1,436 @@
+"""In-memory book of the open weapon and crate buy orders.
+
+Postgres stays the source of truth, the book is an index over it that every
+cluster keeps in memory. Weapon orders are bucketed by weapon type and
+``(min_stat, max_stat)`` band, every band keeps its orders in price-time
+priority (highest price first, then oldest), and each possible stat value
+points at the bands that cover it. The best order for an item is then the
+best head among the bands of its stat, and a search only looks at the
+weapon or crate types it asks for.
+
+The book is loaded once and then kept current by a trigger that notifies
+every change to the order tables. Notifications are only sent on commit, so
+creating, cancelling and filling orders update the book transactionally.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import datetime
+import heapq
+import json
+import logging
+import math
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+from utils.notify_triggers import ensure_triggers
+
+log = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "buy_order_changed"
+TRIGGERS = ("weapon_buy_order_notify", "crate_buy_order_notify")
+
+WEAPON = "weapon"
+CRATE = "crate"
+
+_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION buy_order_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('{channel}', json_build_object(
+            'table', TG_TABLE_NAME, 'id', OLD.id, 'deleted', true
+        )::text);
+        RETURN OLD;
+    END IF;
+    PERFORM pg_notify('{channel}', json_build_object(
+        'table', TG_TABLE_NAME, 'row', row_to_json(NEW)
+    )::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'weapon_buy_order_notify') THEN
+        CREATE TRIGGER weapon_buy_order_notify
+        AFTER INSERT OR UPDATE OR DELETE ON weapon_buy_orders
+        FOR EACH ROW EXECUTE FUNCTION buy_order_notify();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'crate_buy_order_notify') THEN
+        CREATE TRIGGER crate_buy_order_notify
+        AFTER INSERT OR UPDATE OR DELETE ON crate_buy_orders
+        FOR EACH ROW EXECUTE FUNCTION buy_order_notify();
+    END IF;
+END;
+$$;
+""".format(channel=NOTIFY_CHANNEL)
+
+_TABLE_KINDS = {"weapon_buy_orders": WEAPON, "crate_buy_orders": CRATE}
+
+
+@dataclass
+class BuyOrder:
+    kind: str
+    id: int
+    user_id: int
+    item_type: str
+    price: int
+    quantity: int
+    quantity_filled: int
+    created_at: datetime.datetime
+    min_stat: int = 0
+    max_stat: int = 0
+
+    @classmethod
+    def from_row(cls, kind: str, row) -> BuyOrder:
+        created_at = row["created_at"]
+        if isinstance(created_at, str):
+            created_at = datetime.datetime.fromisoformat(created_at)
+        if kind == WEAPON:
+            return cls(
+                WEAPON,
+                row["id"],
+                row["user_id"],
+                row["weapon_type"].lower(),
+                row["price"],
+                row["quantity"],
+                row["quantity_filled"],
+                created_at,
+                row["min_stat"],
+                row["max_stat"],
+            )
+        return cls(
+            CRATE,
+            row["id"],
+            row["user_id"],
+            row["crate_type"].lower(),
+            row["price_each"],
+            row["quantity"],
+            row["quantity_filled"],
+            created_at,
+        )
+
+    @property
+    def remaining(self) -> int:
+        return self.quantity - self.quantity_filled
+
+    @property
+    def priority(self) -> tuple:
+        return (-self.price, self.created_at, self.id)
+
+    def as_record(self) -> dict:
+        """The order with the column names of its table."""
+        record = {
+            "id": self.id,
+            "user_id": self.user_id,
+            "quantity": self.quantity,
+            "quantity_filled": self.quantity_filled,
+            "created_at": self.created_at,
+        }
+        if self.kind == WEAPON:
+            record.update(
+                weapon_type=self.item_type,
+                min_stat=self.min_stat,
+                max_stat=self.max_stat,
+                price=self.price,
+            )
+        else:
+            record.update(crate_type=self.item_type, price_each=self.price)
+        return record
+
+
+class _Band:
+    """Orders of one bucket in price-time priority."""
+
+    __slots__ = ("keys", "orders")
+
+    def __init__(self) -> None:
+        self.keys: list[tuple] = []
+        self.orders: dict[int, BuyOrder] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, order: BuyOrder) -> None:
+        bisect.insort(self.keys, order.priority)
+        self.orders[order.id] = order
+
+    def remove(self, order: BuyOrder) -> None:
+        index = bisect.bisect_left(self.keys, order.priority)
+        del self.keys[index]
+        del self.orders[order.id]
+
+    def __iter__(self) -> Iterator[BuyOrder]:
+        for key in self.keys:
+            yield self.orders[key[2]]
+
+
+class OrderBook:
+    def __init__(self) -> None:
+        self.orders: dict[tuple[str, int], BuyOrder] = {}
+        # weapon type -> (min_stat, max_stat) -> band
+        self.weapon_bands: dict[str, dict[tuple[int, int], _Band]] = {}
+        # weapon type -> stat -> bands covering that stat
+        self.stat_bands: dict[str, dict[int, set[tuple[int, int]]]] = {}
+        self.crate_bands: dict[str, _Band] = {}
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def get(self, kind: str, order_id: int) -> Optional[BuyOrder]:
+        return self.orders.get((kind, order_id))
+
+    def clear(self) -> None:
+        self.orders.clear()
+        self.weapon_bands.clear()
+        self.stat_bands.clear()
+        self.crate_bands.clear()
+
+    def upsert(self, order: BuyOrder, *, active: bool = True) -> None:
+        """Adds, replaces or (if inactive or filled) removes an order."""
+        self.remove(order.kind, order.id)
+        if active and order.remaining > 0:
+            self._add(order)
+
+    def _add(self, order: BuyOrder) -> None:
+        self.orders[(order.kind, order.id)] = order
+        if order.kind == CRATE:
+            self.crate_bands.setdefault(order.item_type, _Band()).add(order)
+            return
+        bands = self.weapon_bands.setdefault(order.item_type, {})
+        key = (order.min_stat, order.max_stat)
+        band = bands.get(key)
+        if band is None:
+            band = bands[key] = _Band()
+            slots = self.stat_bands.setdefault(order.item_type, {})
+            for stat in range(order.min_stat, order.max_stat + 1):
+                slots.setdefault(stat, set()).add(key)
+        band.add(order)
+
+    def remove(self, kind: str, order_id: int) -> None:
+        order = self.orders.pop((kind, order_id), None)
+        if order is None:
+            return
+        if kind == CRATE:
+            band = self.crate_bands[order.item_type]
+            band.remove(order)
+            if not band:
+                del self.crate_bands[order.item_type]
+            return
+        bands = self.weapon_bands[order.item_type]
+        key = (order.min_stat, order.max_stat)
+        band = bands[key]
+        band.remove(order)
+        if band:
+            return
+        del bands[key]
+        slots = self.stat_bands[order.item_type]
+        for stat in range(order.min_stat, order.max_stat + 1):
+            slots[stat].discard(key)
+            if not slots[stat]:
+                del slots[stat]
+
+    def weapon_orders(self, weapon_type: str, stat: int) -> Iterator[BuyOrder]:
+        """Open orders accepting a weapon of this type and stat, best first."""
+        bands = self.weapon_bands.get(weapon_type, {})
+        # a heap of (priority, band, position) over the heads of the bands
+        heads = [
+            (band.keys[0], band, 0)
+            for band in (
+                bands[key]
+                for key in self.stat_bands.get(weapon_type, {}).get(math.floor(stat), ())
+                if key[0] <= stat <= key[1]
+            )
+        ]
+        heapq.heapify(heads)
+        while heads:
+            priority, band, position = heads[0]
+            yield band.orders[priority[2]]
+            position += 1
+            if position < len(band.keys):
+                heapq.heapreplace(heads, (band.keys[position], band, position))
+            else:
+                heapq.heappop(heads)
+
+    def crate_orders(self, crate_type: str) -> Iterator[BuyOrder]:
+        return iter(self.crate_bands.get(crate_type, ()))
+
+    def best_weapon_order(
+        self, weapon_type: str, stat: int, *, exclude_user: Optional[int] = None
+    ) -> Optional[BuyOrder]:
+        for order in self.weapon_orders(weapon_type, stat):
+            if order.user_id != exclude_user:
+                return order
+        return None
+
+    def match_weapons(
+        self, items: Iterable[tuple[int, str, int]], *, exclude_user: Optional[int] = None
+    ) -> list[tuple[int, BuyOrder]]:
+        """Assigns ``(item_id, weapon_type, stat)`` items to the best orders.
+
+        Higher stat items are placed first, every order takes at most its
+        remaining quantity.
+        """
+        taken: dict[int, int] = {}
+        matches = []
+        for item_id, weapon_type, stat in sorted(items, key=lambda item: -item[2]):
+            for order in self.weapon_orders(weapon_type, stat):
+                if order.user_id == exclude_user:
+                    continue
+                if taken.get(order.id, 0) >= order.remaining:
+                    continue
+                taken[order.id] = taken.get(order.id, 0) + 1
+                matches.append((item_id, order))
+                break
+        return matches
+
+    def search(
+        self,
+        *,
+        kind: Optional[str] = None,
+        weapon_type: Optional[str] = None,
+        crate_type: Optional[str] = None,
+        min_stat: Optional[int] = None,
+        max_stat: Optional[int] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        sort: str = "newest",
+        limit: int = 30,
+    ) -> tuple[list[BuyOrder], list[BuyOrder]]:
+        """Weapon and crate orders matching the ``buyorder search`` filters.
+
+        Type filters match substrings like the old ``ILIKE '%...%'``.
+        """
+        def priced(order: BuyOrder) -> bool:
+            return (min_price is None or order.price >= min_price) and (
+                max_price is None or order.price <= max_price
+            )
+
+        weapons: list[BuyOrder] = []
+        if kind != CRATE:
+            for name, bands in self.weapon_bands.items():
+                if weapon_type and weapon_type not in name:
+                    continue
+                for (low, high), band in bands.items():
+                    if min_stat is not None and low < min_stat:
+                        continue
+                    if max_stat is not None and high > max_stat:
+                        continue
+                    weapons.extend(order for order in band if priced(order))
+        crates: list[BuyOrder] = []
+        if kind != WEAPON:
+            for name, band in self.crate_bands.items():
+                if crate_type and crate_type not in name:
+                    continue
+                crates.extend(order for order in band if priced(order))
+        return _top(weapons, sort, limit), _top(crates, sort, limit)
+
+
+_SORTS = {
+    "price": (lambda order: (order.price, order.id), False),
+    "price_desc": (lambda order: (order.price, order.id), True),
+    "newest": (lambda order: (order.created_at, order.id), True),
+    "oldest": (lambda order: (order.created_at, order.id), False),
+}
+
+
+def _top(orders: list[BuyOrder], sort: str, limit: int) -> list[BuyOrder]:
+    key, descending = _SORTS[sort]
+    if descending:
+        return heapq.nlargest(limit, orders, key=key)
+    return heapq.nsmallest(limit, orders, key=key)
+
+
+class BuyOrderBook(OrderBook):
+    """The order book of this cluster, loaded from and kept in sync with Postgres."""
+
+    def __init__(self, bot) -> None:
+        super().__init__()
+        self.bot = bot
+        self._listen_conn = None
+        self._lock = asyncio.Lock()
+        # changes notified while the book is being loaded
+        self._pending: Optional[list[str]] = None
+        self.ready = False
+
+    async def start(self) -> None:
+        await self.ensure_ready()
+
+    async def ensure_ready(self) -> None:
+        """Listens for changes and loads the book unless that is already done."""
+        if self.ready:
+            return
+        async with self._lock:
+            if self.ready:
+                return
+            if self._listen_conn is None:
+                conn = await self.bot.pool.acquire()
+                try:
+                    await ensure_triggers(conn, TRIGGERS, _TRIGGER_SQL)
+                    await conn.add_listener(NOTIFY_CHANNEL, self._on_notification)
+                except Exception:
+                    await self.bot.pool.release(conn)
+                    raise
+                conn.add_termination_listener(self._on_terminated)
+                self._listen_conn = conn
+            await self.rebuild()
+            self.ready = True
+
+    async def rebuild(self) -> None:
+        # Changes committed while loading are replayed afterwards. Notifications
+        # carry whole rows, so replaying one the load already saw is harmless.
+        self._pending = []
+        try:
+            async with self.bot.pool.acquire() as conn:
+                weapons = await conn.fetch(
+                    "SELECT * FROM weapon_buy_orders WHERE active = TRUE;"
+                )
+                crates = await conn.fetch(
+                    "SELECT * FROM crate_buy_orders WHERE active = TRUE;"
+                )
+            self.clear()
+            for kind, rows in ((WEAPON, weapons), (CRATE, crates)):
+                for row in rows:
+                    self.upsert(BuyOrder.from_row(kind, row))
+            pending = self._pending
+        finally:
+            self._pending = None
+        for payload in pending:
+            self.apply(payload)
+        log.info("Loaded %d open buy orders", len(self))
+
+    def _on_notification(self, _conn, _pid, _channel, payload: str) -> None:
+        if self._pending is not None:
+            self._pending.append(payload)
+            return
+        self.apply(payload)
+
+    def apply(self, payload: str) -> None:
+        try:
+            change = json.loads(payload)
+            kind = _TABLE_KINDS[change["table"]]
+            if change.get("deleted"):
+                self.remove(kind, change["id"])
+                return
+            row = change["row"]
+            self.upsert(BuyOrder.from_row(kind, row), active=bool(row["active"]))
+        except Exception:
+            log.exception("Could not apply buy order change %s", payload)
+            self.ready = False
+
+    def _on_terminated(self, _conn) -> None:
+        log.warning("Buy order book lost its notification connection")
+        self._listen_conn = None
+        self.ready = False
+
+    async def close(self) -> None:
+        self.ready = False
+        if self._listen_conn is None:
+            return
+        conn, self._listen_conn = self._listen_conn, None
+        try:
+            await conn.remove_listener(NOTIFY_CHANNEL, self._on_notification)
+        finally:
+            await self.bot.pool.release(conn)
@@ -0,0 +1,178 @@
+"""Role-derived patron tiers shared by every cluster through Redis.
+
+``Bot.get_effective_donator_tier`` used to fetch the member from every patron
+guild over REST on each call. ``PatronTiers`` keeps one hash per lookup guild,
+``patron:roles:{guild_id}``, mapping the ids of members with a patron role to
+the tier those roles grant. The cluster that has a guild in its cache fills the
+hash from a member scan when it becomes ready, rescans it periodically and
+keeps it current from member update, join and remove events. Role changes are
+broadcast through ``clear_donator_cache`` so every cluster drops the tier from
+its short-lived local cache.
+
+Reads only fall back to REST for guilds whose hash is not marked ready, which
+is the case while no cluster owns the guild or its first scan is running.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import discord
+
+from lru import LRU
+
+log = logging.getLogger(__name__)
+
+READY_TTL = 2 * 60 * 60
+RESCAN_INTERVAL = 60 * 60
+
+
+def roles_key(guild_id: int) -> str:
+    return f"patron:roles:{guild_id}"
+
+
+def ready_key(guild_id: int) -> str:
+    return f"patron:roles:{guild_id}:ready"
+
+
+class PatronTiers:
+    def __init__(self, bot, *, maxsize: int = 8192, ttl: float = 60.0) -> None:
+        self.bot = bot
+        self.ttl = ttl
+        self._tiers = LRU(maxsize)
+        self._owned: set[int] = set()
+        self._task: asyncio.Task | None = None
+        self.rest_lookups = 0
+
+    def start(self) -> None:
+        self.bot.add_listener(self.on_member_update)
+        self.bot.add_listener(self.on_member_join)
+        self.bot.add_listener(self.on_member_remove)
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        self.bot.remove_listener(self.on_member_update)
+        self.bot.remove_listener(self.on_member_join)
+        self.bot.remove_listener(self.on_member_remove)
+
+    # Reads
+
+    async def get(self, user_id: int) -> tuple[int, bool]:
+        """Returns ``(role tier, resolved)`` over all lookup guilds.
+
+        ``resolved`` is false when the user was looked up over REST in every
+        guild and was not a member of any of them.
+        """
+        entry = self._tiers.get(user_id)
+        if entry is not None and time.monotonic() - entry[2] < self.ttl:
+            return entry[0], entry[1]
+
+        guild_ids = self.bot._get_patreon_tier_lookup_guild_ids()
+        async with self.bot.redis.pipeline(transaction=False) as pipe:
+            for guild_id in guild_ids:
+                pipe.exists(ready_key(guild_id))
+                pipe.hget(roles_key(guild_id), user_id)
+            replies = await pipe.execute()
+
+        tier, resolved = 0, False
+        for guild_id, ready, stored in zip(guild_ids, replies[::2], replies[1::2]):
+            if ready:
+                resolved = True
+                if stored is not None:
+                    tier = max(tier, int(stored))
+                continue
+            self.rest_lookups += 1
+            try:
+                member = await self.bot.http.get_member(guild_id, user_id)
+            except discord.NotFound:
+                continue
+            resolved = True
+            tier = max(tier, self.tier_for_roles(member.get("roles", [])))
+
+        self._tiers[user_id] = (tier, resolved, time.monotonic())
+        return tier, resolved
+
+    def invalidate(self, user_id: int) -> None:
+        try:
+            del self._tiers[user_id]
+        except KeyError:
+            pass
+
+    # Writes
+
+    def tier_for_roles(self, role_ids) -> int:
+        return self.bot._resolve_numeric_patreon_tier_from_role_ids(
+            [int(role_id) for role_id in role_ids]
+        )
+
+    def member_tier(self, member) -> int:
+        return self.tier_for_roles(role.id for role in member.roles)
+
+    async def scan(self, guild) -> int:
+        """Replaces the guild's hash with its members' tiers, returns their count."""
+        if not guild.chunked:
+            await guild.chunk()
+        tiers = {}
+        for member in guild.members:
+            tier = self.member_tier(member)
+            if tier:
+                tiers[member.id] = tier
+
+        key = roles_key(guild.id)
+        async with self.bot.redis.pipeline(transaction=True) as pipe:
+            if tiers:
+                pipe.delete(key + ":scan")
+                pipe.hset(key + ":scan", mapping=tiers)
+                pipe.rename(key + ":scan", key)
+            else:
+                pipe.delete(key)
+            pipe.set(ready_key(guild.id), 1, ex=READY_TTL)
+            await pipe.execute()
+        return len(tiers)
+
+    async def _store(self, member, tier: int) -> None:
+        key = roles_key(member.guild.id)
+        previous = await self.bot.redis.hget(key, member.id)
+        if (int(previous) if previous is not None else 0) == tier:
+            return
+        if tier:
+            await self.bot.redis.hset(key, member.id, tier)
+        else:
+            await self.bot.redis.hdel(key, member.id)
+        await self.bot.clear_donator_cache(member.id)
+
+    async def on_member_update(self, before, after) -> None:
+        if after.guild.id in self._owned and before.roles != after.roles:
+            await self._store(after, self.member_tier(after))
+
+    async def on_member_join(self, member) -> None:
+        if member.guild.id in self._owned:
+            await self._store(member, self.member_tier(member))
+
+    async def on_member_remove(self, member) -> None:
+        if member.guild.id in self._owned:
+            await self._store(member, 0)
+
+    # Owner loop
+
+    async def _run(self) -> None:
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                for guild_id in self.bot._get_patreon_tier_lookup_guild_ids():
+                    guild = self.bot.get_guild(guild_id)
+                    if guild is None:
+                        self._owned.discard(guild_id)
+                        continue
+                    self._owned.add(guild_id)
+                    count = await self.scan(guild)
+                    log.info("Indexed %d patrons of guild %d", count, guild_id)
+                await asyncio.sleep(RESCAN_INTERVAL)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Patron role scan failed")
+                await asyncio.sleep(60)
@@ -0,0 +1,266 @@
+"""Per-invocation profile snapshots with a short-lived shared LRU behind them.
+
+``Bot.invoke`` opens a ``ProfileSnapshot`` for the author of every command.
+The checks in ``utils.checks``, ``Context.get_profile`` and the stat helpers on
+``Bot`` all read the author's ``profile`` row through ``ProfileCache.get``, so
+it is fetched at most once per invocation.
+
+Writes are picked up without touching the call sites. The pool's connections
+check every statement before it is sent and again when it returns, so a
+command that writes to ``profile`` drops its snapshot and reads through for
+the rest of the invocation, before it can read the row again. A trigger
+notifies every cluster of changed rows so the LRU never outlives a write by
+more than the notification latency.
+
+A snapshot only serves the task that runs the command, and only until the
+command returns. Tasks the command spawns inherit it but read through.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+import time
+
+from collections import defaultdict
+from contextvars import ContextVar
+
+import asyncpg
+
+from lru import LRU
+
+from utils.notify_triggers import PROFILE_CHANNEL, ensure_profile_trigger
+
+log = logging.getLogger(__name__)
+
+PROFILE_QUERY = 'SELECT * FROM profile WHERE "user"=$1;'
+
+_PROFILE_TABLE = re.compile(r'\b(FROM|JOIN|UPDATE|INTO)\s+"?profile"?(?![\w"])', re.I)
+
+
+class ProfileSnapshot:
+    """The author's profile row for the duration of one command invocation."""
+
+    __slots__ = (
+        "user_id",
+        "command",
+        "task",
+        "row",
+        "loaded",
+        "written",
+        "closed",
+        "queries",
+        "hits",
+    )
+
+    def __init__(self, user_id: int, command: str | None) -> None:
+        self.user_id = user_id
+        self.command = command
+        self.task = asyncio.current_task()
+        self.row = None
+        self.loaded = False
+        # the invocation wrote to profile, its reads go to the database from then on
+        self.written = False
+        self.closed = False
+        self.queries = 0
+        self.hits = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether the snapshot may serve the running task."""
+        return not self.closed and self.task is asyncio.current_task()
+
+    def store(self, row) -> None:
+        self.row = row
+        self.loaded = True
+
+    def invalidate(self) -> None:
+        self.row = None
+        self.loaded = False
+
+
+current_snapshot: ContextVar[ProfileSnapshot | None] = ContextVar(
+    "current_snapshot", default=None
+)
+
+
+class ProfileWriteTracking:
+    """Connection mixin that reports statements to ``profile_cache`` as they run.
+
+    asyncpg query loggers are scheduled with ``call_soon``, after the awaiting
+    task has already moved on, so writes are caught here instead.
+    """
+
+    profile_cache: ProfileCache
+
+    async def execute(self, query, *args, **kwargs):
+        write = self.profile_cache.track(query)
+        try:
+            return await super().execute(query, *args, **kwargs)
+        finally:
+            if write:
+                self.profile_cache.written()
+
+    async def executemany(self, command, args, **kwargs):
+        write = self.profile_cache.track(command)
+        try:
+            return await super().executemany(command, args, **kwargs)
+        finally:
+            if write:
+                self.profile_cache.written()
+
+    async def fetch(self, query, *args, **kwargs):
+        write = self.profile_cache.track(query)
+        try:
+            return await super().fetch(query, *args, **kwargs)
+        finally:
+            if write:
+                self.profile_cache.written()
+
+    async def fetchrow(self, query, *args, **kwargs):
+        write = self.profile_cache.track(query)
+        try:
+            return await super().fetchrow(query, *args, **kwargs)
+        finally:
+            if write:
+                self.profile_cache.written()
+
+    async def fetchval(self, query, *args, **kwargs):
+        write = self.profile_cache.track(query)
+        try:
+            return await super().fetchval(query, *args, **kwargs)
+        finally:
+            if write:
+                self.profile_cache.written()
+
+
+class ProfileCache:
+    def __init__(self, bot, *, maxsize: int = 4096, ttl: float = 5.0) -> None:
+        self.bot = bot
+        self.ttl = ttl
+        self._rows = LRU(maxsize)
+        self._listen_conn = None
+        # passed as the pool's connection_class
+        self.connection_class = type(
+            "ProfileCacheConnection",
+            (ProfileWriteTracking, asyncpg.Connection),
+            {"profile_cache": self},
+        )
+        # command name -> [invocations, profile queries, served from cache]
+        self.command_stats: dict[str, list[int]] = defaultdict(lambda: [0, 0, 0])
+
+    # Snapshots
+
+    def open_snapshot(self, user_id: int, command: str | None) -> ProfileSnapshot:
+        snapshot = ProfileSnapshot(user_id, command)
+        current_snapshot.set(snapshot)
+        return snapshot
+
+    def close_snapshot(self, snapshot: ProfileSnapshot) -> None:
+        snapshot.closed = True
+        if snapshot.command is None:
+            return
+        stats = self.command_stats[snapshot.command]
+        stats[0] += 1
+        stats[1] += snapshot.queries
+        stats[2] += snapshot.hits
+
+    async def get(self, user_id: int, *, conn=None, refresh: bool = False):
+        """Returns the profile row of a user, or None if they have no character.
+
+        Connections inside a transaction always read through, the transaction
+        may have written the row already.
+        """
+        if conn is not None and conn.is_in_transaction():
+            return await conn.fetchrow(PROFILE_QUERY, user_id)
+
+        snapshot = current_snapshot.get()
+        if snapshot is not None and not snapshot.active:
+            snapshot = None
+        if snapshot is not None and snapshot.written:
+            return await (conn or self.bot.pool).fetchrow(PROFILE_QUERY, user_id)
+        if snapshot is not None and snapshot.user_id != user_id:
+            snapshot = None
+        if not refresh:
+            if snapshot is not None and snapshot.loaded:
+                snapshot.hits += 1
+                return snapshot.row
+            # the LRU is only trusted while invalidations can reach us
+            entry = self._rows.get(user_id) if self._listen_conn is not None else None
+            if entry is not None and time.monotonic() - entry[1] < self.ttl:
+                if snapshot is not None:
+                    snapshot.hits += 1
+                    snapshot.store(entry[0])
+                return entry[0]
+
+        row = await (conn or self.bot.pool).fetchrow(PROFILE_QUERY, user_id)
+        if row is not None and self._listen_conn is not None:
+            self._rows[user_id] = (row, time.monotonic())
+        if snapshot is not None:
+            snapshot.store(row)
+        return row
+
+    def invalidate(self, user_id: int) -> None:
+        try:
+            del self._rows[user_id]
+        except KeyError:
+            pass
+        snapshot = current_snapshot.get()
+        if snapshot is not None and snapshot.user_id == user_id:
+            snapshot.invalidate()
+
+    # Write detection
+
+    def track(self, query: str) -> bool:
+        """Called before every statement, returns whether it writes to profile."""
+        if not _PROFILE_TABLE.search(query):
+            return False
+        if query.lstrip()[:6].upper() == "SELECT":
+            snapshot = current_snapshot.get()
+            if snapshot is not None and snapshot.active:
+                snapshot.queries += 1
+            return False
+        self.written()
+        return True
+
+    def written(self) -> None:
+        """Drops what the running invocation has cached, once as a write is sent
+        and again when it returns, in case a read raced with it."""
+        snapshot = current_snapshot.get()
+        if snapshot is None:
+            return
+        snapshot.written = True
+        self.invalidate(snapshot.user_id)
+
+    # Cross-cluster invalidation
+
+    def _on_notification(self, _conn, _pid, _channel, payload: str) -> None:
+        try:
+            user_id = int(json.loads(payload)["user"])
+        except (ValueError, KeyError, TypeError):
+            return
+        try:
+            del self._rows[user_id]
+        except KeyError:
+            pass
+
+    async def start(self) -> None:
+        self._listen_conn = await self.bot.pool.acquire()
+        await ensure_profile_trigger(self._listen_conn)
+        await self._listen_conn.add_listener(PROFILE_CHANNEL, self._on_notification)
+        self._listen_conn.add_termination_listener(self._on_terminated)
+
+    def _on_terminated(self, _conn) -> None:
+        log.warning("Profile cache lost its notification connection, LRU disabled")
+        self._listen_conn = None
+        self._rows.clear()
+
+    async def close(self) -> None:
+        if self._listen_conn is None:
+            return
+        conn, self._listen_conn = self._listen_conn, None
+        try:
+            await conn.remove_listener(PROFILE_CHANNEL, self._on_notification)
+        finally:
+            await self.bot.pool.release(conn)
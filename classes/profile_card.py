@@ -0,0 +1,975 @@
+"""Profile card rendering off the event loop, with a shared result cache.
+
+``render_rpg_card`` composites the ``profilerpg`` card from plain data and
+image bytes, so it can run in a worker process. Workers load fonts, element
+icons and the static card background once, in ``preload``.
+
+``ProfileCardRenderer`` hands renders to a small process pool and caches the
+finished images in Redis under a hash of their inputs, evicting the least
+recently used ones past ``CACHE_MAX_ENTRIES``. Identical renders requested
+while one is running share its result.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from decimal import ROUND_HALF_UP, Decimal
+from io import BytesIO
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageOps
+
+from utils import misc as rpgtools
+
+log = logging.getLogger(__name__)
+
+# bump whenever the rendered output changes, it is part of every cache key
+STYLE = 1
+CACHE_PREFIX = "cardcache:"
+CACHE_INDEX = "cardcache:lru"
+CACHE_MAX_ENTRIES = 2000
+CACHE_TTL = 24 * 60 * 60
+WORKERS = 2
+
+CARD_SIZE = (1660, 940)
+RESAMPLE = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
+COLORS = {
+    "panel": (74, 49, 30, 220),
+    "panel_inner": (103, 72, 45, 180),
+    "border": (198, 156, 90, 255),
+    "border_dim": (132, 98, 54, 235),
+    "text": (247, 231, 196, 255),
+    "muted": (214, 186, 140, 255),
+    "bar_bg": (65, 48, 34, 255),
+}
+FONT_PATHS = (
+    Path("EightBitDragon-anqx.ttf"),
+    Path("assets") / "EightBitDragon-anqx.ttf",
+)
+FONT_SIZES = (19, 20, 24, 25, 31, 44)
+ELEMENT_ICON_DIR = Path("assets") / "elements"
+ELEMENT_ICON_STEMS = {
+    "wind": "Wind",
+    "electric": "Electric",
+    "light": "Light",
+    "dark": "Dark",
+    "corrupted": "Corrupted",
+    "earth": "Earth",
+    "water": "Water",
+    "fire": "Fire",
+}
+ELEMENT_ALIASES = {
+    "lightning": "electric",
+    "electricity": "electric",
+    "nature": "earth",
+}
+
+ITEM_FIELDS = (
+    "hand",
+    "element",
+    "type",
+    "type_",
+    "name",
+    "damage",
+    "armor",
+    "effective_damage",
+    "effective_armor",
+)
+PROFILE_FIELDS = ("xp", "luck", "health", "pvpwins", "money", "name", "race", "god")
+PET_FIELDS = (
+    "name",
+    "default_name",
+    "level",
+    "growth_stage",
+    "element",
+    "happiness",
+    "hunger",
+    "trust_level",
+    "hp",
+    "attack",
+    "defense",
+    "IV",
+    "url",
+)
+
+
+def safe_int(value, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def safe_float(value, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def decimal_or_zero(value) -> Decimal:
+    try:
+        return Decimal(str(value or 0))
+    except Exception:
+        return Decimal("0")
+
+
+def format_stat_value(value) -> str:
+    number = decimal_or_zero(value)
+    if number == number.to_integral_value():
+        return f"{int(number):,}"
+    rounded = number.quantize(Decimal("0.1"), rounding=ROUND_HALF_UP)
+    return f"{float(rounded):,.1f}"
+
+
+def effective_item_damage(item) -> Decimal:
+    if not item:
+        return Decimal("0")
+    return decimal_or_zero(item.get("effective_damage", item.get("damage", 0)))
+
+
+def effective_item_armor(item) -> Decimal:
+    if not item:
+        return Decimal("0")
+    return decimal_or_zero(item.get("effective_armor", item.get("armor", 0)))
+
+
+def effective_item_primary_stat(item) -> Decimal:
+    damage = effective_item_damage(item)
+    armor = effective_item_armor(item)
+    return damage if damage > 0 else armor
+
+
+def compact_number(value: int) -> str:
+    number = int(value)
+    units = (
+        (1_000_000_000_000, "T"),
+        (1_000_000_000, "B"),
+        (1_000_000, "M"),
+        (1_000, "K"),
+    )
+    for amount, suffix in units:
+        if abs(number) >= amount:
+            compact = number / amount
+            if compact >= 100:
+                return f"{compact:.0f}{suffix}"
+            if compact >= 10:
+                return f"{compact:.1f}{suffix}"
+            return f"{compact:.2f}{suffix}"
+    return f"{number:,}"
+
+
+# Assets, loaded once per process
+
+_fonts: dict[int, ImageFont.ImageFont] = {}
+_icons: dict[tuple[str, int], Optional[Image.Image]] = {}
+_base: Optional[Image.Image] = None
+
+
+def font(size: int) -> ImageFont.ImageFont:
+    if size in _fonts:
+        return _fonts[size]
+    for font_path in FONT_PATHS:
+        if font_path.exists():
+            try:
+                _fonts[size] = ImageFont.truetype(str(font_path), size=size)
+                return _fonts[size]
+            except OSError:
+                continue
+    _fonts[size] = ImageFont.load_default()
+    return _fonts[size]
+
+
+def find_element_icon(element_name: str) -> Optional[Path]:
+    if not element_name:
+        return None
+
+    raw = str(element_name).strip()
+    if not raw:
+        return None
+
+    normalized = ELEMENT_ALIASES.get(raw.lower(), raw.lower())
+    preferred_stem = ELEMENT_ICON_STEMS.get(normalized, raw.capitalize())
+
+    direct_candidate = ELEMENT_ICON_DIR / f"{preferred_stem}.png"
+    if direct_candidate.exists():
+        return direct_candidate
+
+    if not ELEMENT_ICON_DIR.exists():
+        return None
+
+    # Fallback to case-insensitive stem matching.
+    for candidate in ELEMENT_ICON_DIR.iterdir():
+        if candidate.is_file() and candidate.suffix.lower() in {
+            ".png",
+            ".webp",
+            ".jpg",
+            ".jpeg",
+        }:
+            if candidate.stem.lower() == normalized:
+                return candidate
+    return None
+
+
+def element_icon(element_name: str, size: int) -> Optional[Image.Image]:
+    """The element's icon fitted to ``size``, or None if there is none."""
+    key = (element_name, size)
+    if key not in _icons:
+        icon = None
+        icon_path = find_element_icon(element_name)
+        if icon_path:
+            try:
+                icon = Image.open(icon_path).convert("RGBA")
+                icon = ImageOps.fit(icon, (size, size), method=RESAMPLE)
+            except Exception:
+                icon = None
+        _icons[key] = icon
+    return _icons[key]
+
+
+def open_image(data: Optional[bytes]) -> Optional[Image.Image]:
+    if not data:
+        return None
+    try:
+        return Image.open(BytesIO(data)).convert("RGBA")
+    except Exception:
+        return None
+
+
+def base_canvas() -> Image.Image:
+    """Background, frame and empty panels, the parts every card shares."""
+    global _base
+    if _base is not None:
+        return _base
+
+    width, height = CARD_SIZE
+    colors = COLORS
+    canvas = Image.new("RGBA", (width, height), (58, 38, 22, 255))
+    draw = ImageDraw.Draw(canvas)
+
+    for y in range(height):
+        t = y / max(1, height - 1)
+        r = int(44 + (150 - 44) * t)
+        g = int(30 + (111 - 30) * t)
+        b = int(18 + (72 - 18) * t)
+        draw.line([(0, y), (width, y)], fill=(r, g, b, 255))
+
+    if hasattr(Image, "effect_noise"):
+        try:
+            noise = Image.effect_noise((width, height), 14).convert("L")
+            tex = ImageOps.colorize(noise, (46, 31, 20), (170, 132, 86)).convert("RGBA")
+            tex.putalpha(42)
+            canvas.alpha_composite(tex)
+        except Exception:
+            pass
+
+    for path in (
+        Path("assets") / "other" / "dragon.webp",
+        Path("assets") / "other" / "dragon.jpg",
+        Path("assets") / "other" / "dragon.jpeg",
+    ):
+        if path.exists():
+            try:
+                dragon = Image.open(path).convert("RGBA")
+                dragon = ImageOps.fit(dragon, (1060, 680), method=RESAMPLE)
+                dragon = ImageOps.grayscale(dragon).convert("RGBA")
+                tint = Image.new("RGBA", dragon.size, (210, 166, 100, 255))
+                dragon = Image.blend(dragon, tint, 0.58)
+                dragon.putalpha(dragon.split()[3].point(lambda p: int(p * 0.18)))
+                canvas.alpha_composite(dragon, (480, 150))
+                break
+            except Exception:
+                continue
+
+    draw.rounded_rectangle((24, 24, width - 24, height - 24), radius=34, fill=(39, 24, 14, 242), outline=colors["border"], width=4)
+    draw.rounded_rectangle((40, 40, width - 40, height - 40), radius=30, outline=colors["border_dim"], width=2)
+
+    heading_font = font(31)
+
+    def tw(text, font):
+        box = draw.textbbox((0, 0), str(text), font=font)
+        return max(0, box[2] - box[0])
+
+    def clip(text, font, max_w):
+        txt = str(text or "")
+        if max_w <= 0 or tw(txt, font) <= max_w:
+            return txt
+        while txt and tw(f"{txt}...", font) > max_w:
+            txt = txt[:-1]
+        return f"{txt}..." if txt else "..."
+
+    def panel(rect, title):
+        x1, y1, x2, y2 = rect
+        draw.rounded_rectangle(rect, radius=24, fill=colors["panel"], outline=colors["border_dim"], width=3)
+        draw.rounded_rectangle((x1 + 4, y1 + 4, x2 - 4, y2 - 4), radius=20, outline=colors["panel_inner"], width=1)
+        title_text = clip(title, heading_font, max(64, (x2 - x1) - 36))
+        draw.text((x1 + 18, y1 + 14), title_text, font=heading_font, fill=colors["border"])
+        draw.line((x1 + 18, y1 + 56, x2 - 18, y1 + 56), fill=colors["border_dim"], width=2)
+
+    panel((56, 66, 390, 884), "Hero Sigil")
+    panel((412, 66, 1268, 450), "Dragonforged Chronicle")
+    panel((412, 470, 850, 884), "Adventurer Ledger")
+    panel((868, 470, 1268, 884), "Armory and Quests")
+    panel((1286, 66, width - 56, 884), "Pet Status")
+
+    _base = canvas
+    return canvas
+
+
+def preload() -> None:
+    """Process pool initializer, loads every static asset up front."""
+    for size in FONT_SIZES:
+        font(size)
+    for element_name in ("Unknown", *(stem for stem in ELEMENT_ICON_STEMS.values())):
+        element_icon(element_name, 62)
+    element_icon("Nature", 62)
+    base_canvas()
+
+
+def render_rpg_card(
+    card: dict, avatar_data: Optional[bytes], pet_image_data: Optional[bytes]
+) -> bytes:
+    """Composites the card described by ``card`` and returns it as a PNG.
+
+    ``card`` is built by ``Profile._build_profile_rpg_card`` and holds plain
+    values only, the images are passed as the bytes that were downloaded.
+    """
+    profile = card["profile"]
+    items = card["items"]
+    pet_data = card["pet"]
+    pet_name = card["pet_name"]
+    amulet_data = card["amulet"]
+    guild_name = card["guild_name"]
+    marriage_name = card["marriage_name"]
+    raid_attack = card["raid_attack"]
+    raid_defense = card["raid_defense"]
+    total_health = card["total_health"]
+
+    width, height = CARD_SIZE
+    canvas = base_canvas().copy()
+    draw = ImageDraw.Draw(canvas)
+    resample = RESAMPLE
+    colors = COLORS
+
+    title_font = font(44)
+    subtitle_font = font(24)
+    heading_font = font(31)
+    label_font = font(24)
+    value_font = font(25)
+    tiny_font = font(20)
+    micro_font = font(19)
+
+    def tw(text, font):
+        box = draw.textbbox((0, 0), str(text), font=font)
+        return max(0, box[2] - box[0])
+
+    def clip(text, font, max_w):
+        txt = str(text or "")
+        if max_w <= 0 or tw(txt, font) <= max_w:
+            return txt
+        while txt and tw(f"{txt}...", font) > max_w:
+            txt = txt[:-1]
+        return f"{txt}..." if txt else "..."
+
+    header_rect = (412, 66, 1268, 450)
+    ledger_rect = (412, 470, 850, 884)
+    gear_rect = (868, 470, 1268, 884)
+    pet_rect = (1286, 66, width - 56, 884)
+
+    xp_value = safe_int(profile.get("xp"), 0)
+    level = int(rpgtools.xptolevel(xp_value))
+    luck_raw = float(profile.get("luck") or 0.3)
+    luck_percent = 20.0 if luck_raw <= 0.3 else ((luck_raw - 0.3) / 1.2) * 80 + 20
+    luck_percent = round(max(0.0, min(100.0, luck_percent)), 2)
+    damage_total = sum(effective_item_damage(i) for i in items)
+    armor_total = sum(effective_item_armor(i) for i in items)
+    raid_attack_value = max(0, int(round(safe_float(raid_attack, float(damage_total)))))
+    raid_defense_value = max(0, int(round(safe_float(raid_defense, float(armor_total)))))
+    total_health_value = max(
+        0,
+        int(
+            round(
+                safe_float(
+                    total_health,
+                    safe_float(profile.get("health"), 0.0),
+                )
+            )
+        ),
+    )
+    pvp_wins = safe_int(profile.get("pvpwins"), 0)
+    money = safe_int(profile.get("money"), 0)
+    # Power uses full raid-facing combat values. Attack/defense already include
+    # equipped amulet bonuses from get_raidstats(), and total health includes HP
+    # stat + level scaling + equipped amulet HP.
+    attack_power = raid_attack_value
+    defense_power = raid_defense_value
+    health_power = total_health_value
+    progression_power = int(luck_percent * 2) + level * 12 + pvp_wins * 2
+    power = max(1, attack_power + defense_power + health_power + progression_power)
+    rarity = "Mythic" if level >= 90 else "Legendary" if level >= 70 else "Epic" if level >= 50 else "Rare" if level >= 30 else "Adventurer"
+
+    card_name = str(profile.get("name") or card["display_name"])
+    race_name = str(profile.get("race") or "Unknown")
+    classes = card["classes"]
+    god_name = str(profile.get("god") or "No God")
+    ascension_title = card["ascension_title"]
+
+    avatar = open_image(avatar_data) or Image.new("RGBA", (512, 512), (44, 52, 68, 255))
+    avatar = ImageOps.fit(avatar, (212, 212), method=resample)
+    mask = Image.new("L", (212, 212), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, 211, 211), fill=255)
+    ring = Image.new("RGBA", (238, 238), (0, 0, 0, 0))
+    rd = ImageDraw.Draw(ring)
+    rd.ellipse((0, 0, 237, 237), fill=(255, 241, 209, 12), outline=colors["border"], width=6)
+    rd.ellipse((13, 13, 224, 224), outline=colors["border_dim"], width=2)
+    canvas.alpha_composite(ring, (102, 146))
+    canvas.paste(avatar, (115, 159), mask)
+
+    draw.text((80, 404), clip(f"Level {level}  {rarity}", value_font, 286), font=value_font, fill=colors["border"])
+    draw.text((80, 436), clip(race_name, tiny_font, 286), font=tiny_font, fill=colors["muted"])
+    badge_lines = card["badge_lines"] or ["No badges yet"]
+    draw.text((80, 506), "Relics and Badges", font=label_font, fill=colors["border"])
+    draw.multiline_text(
+        (80, 542),
+        "\n".join(badge_lines),
+        font=tiny_font,
+        fill=colors["muted"],
+        spacing=6,
+    )
+    draw.text((80, 748), "Ascension", font=label_font, fill=colors["border"])
+    draw.text((80, 784), clip(ascension_title, tiny_font, 286), font=tiny_font, fill=colors["muted"])
+
+    draw.text((80, 852), f"ID {card['user_id']}", font=tiny_font, fill=colors["muted"])
+
+    right_hand, left_hand = None, None
+    any_count = sum(1 for i in items if i.get("hand") == "any")
+    if len(items) == 2 and any_count == 1 and items[0].get("hand") == "any":
+        items = [items[1], items[0]]
+    for i in items:
+        h = i.get("hand")
+        if h == "both":
+            right_hand = left_hand = i
+        elif h == "left":
+            left_hand = i
+        elif h == "right":
+            right_hand = i
+        elif h == "any":
+            if not right_hand:
+                right_hand = i
+            else:
+                left_hand = i
+
+    icon_size, icon_gap = 74, 10
+    display_right = right_hand or left_hand
+    display_left = left_hand if right_hand else None
+    element_slots = [display_right, display_left]
+    equipped_elements = []
+    for weapon_item in element_slots:
+        if not weapon_item:
+            continue
+        raw = str(weapon_item.get("element") or "").strip().lower()
+        if raw:
+            equipped_elements.append(raw)
+    one_unique_element = len(set(equipped_elements)) == 1 and bool(equipped_elements)
+    icon_count = len(element_slots)
+    icon_start = header_rect[2] - 22 - (icon_size * icon_count + icon_gap * (icon_count - 1))
+    name_x = header_rect[0] + 22
+    name_max = max(80, icon_start - name_x - 20)
+    draw.text((name_x, 150), clip(card_name, title_font, name_max), font=title_font, fill=colors["text"])
+    draw.text((name_x, 208), clip(f"{race_name} | {classes}", subtitle_font, name_max), font=subtitle_font, fill=colors["muted"])
+    stars = max(1, min(5, math.ceil(level / 20)))
+    ribbon = clip(f"{rarity} Tier {'*' * stars}", label_font, 420)
+    rw = tw(ribbon, label_font) + 34
+    draw.rounded_rectangle((name_x, 250, name_x + rw, 294), radius=16, fill=(164, 120, 64, 245), outline=colors["border"], width=2)
+    draw.text((name_x + 16, 260), ribbon, font=label_font, fill=colors["text"])
+    draw.text((name_x, 310), clip(f"Power {power:,}", value_font, 390), font=value_font, fill=colors["border"])
+    draw.text((844, 310), clip(f"Luck Blessing {luck_percent:.2f}%", value_font, 390), font=value_font, fill=colors["muted"])
+
+    for idx, weapon_item in enumerate(element_slots):
+        raw_element = str(weapon_item.get("element") if weapon_item else "").strip()
+        if raw_element:
+            element_key = raw_element.lower()
+            element_name = "Nature" if element_key == "earth" else element_key.capitalize()
+        else:
+            element_name = "Unknown"
+        x = icon_start + idx * (icon_size + icon_gap)
+        slot = (x, 146, x + icon_size, 146 + icon_size)
+        draw.rounded_rectangle(slot, radius=14, fill=(70, 48, 28, 220), outline=colors["border_dim"], width=2)
+        if one_unique_element and idx == 1:
+            pad = 18
+            x1, y1 = x + pad, 146 + pad
+            x2, y2 = x + icon_size - pad, 146 + icon_size - pad
+            # Draw a crisp outlined X so the placeholder is consistent across fonts.
+            draw.line((x1, y1, x2, y2), fill=(72, 16, 16, 255), width=10)
+            draw.line((x2, y1, x1, y2), fill=(72, 16, 16, 255), width=10)
+            draw.line((x1, y1, x2, y2), fill=(214, 42, 42, 255), width=6)
+            draw.line((x2, y1, x1, y2), fill=(214, 42, 42, 255), width=6)
+            continue
+        icon = element_icon(element_name, icon_size - 12)
+        if icon is not None:
+            canvas.paste(icon, (x + 6, 152), icon)
+        else:
+            draw.text((x + 25, 170), (element_name[:1] or "?").upper(), font=heading_font, fill=colors["text"])
+
+    def stat_bar(x, y, w, label, value, ratio, color):
+        v = clip(value, tiny_font, 120)
+        draw.text((x, y), clip(label, label_font, w - 120), font=label_font, fill=colors["muted"])
+        draw.text((x + w - tw(v, tiny_font), y + 3), v, font=tiny_font, fill=colors["text"])
+        by = y + 28
+        draw.rounded_rectangle((x, by, x + w, by + 16), radius=8, fill=colors["bar_bg"], outline=colors["border_dim"], width=1)
+        fw = int(max(0.0, min(1.0, ratio)) * (w - 2))
+        if fw > 0:
+            draw.rounded_rectangle((x + 1, by + 1, x + 1 + fw, by + 15), radius=7, fill=color)
+
+    stat_bar(434, 340, 390, "Level", f"{level}", level / 100.0, (178, 133, 70, 255))
+    stat_bar(844, 340, 390, "Attack", f"{raid_attack_value:,}", min(1.0, raid_attack_value / 5000.0), (171, 84, 64, 255))
+    stat_bar(434, 394, 390, "Health", f"{total_health_value:,}", min(1.0, total_health_value / 20000.0), (112, 151, 93, 255))
+    stat_bar(844, 394, 390, "Defense", f"{raid_defense_value:,}", min(1.0, raid_defense_value / 5000.0), (88, 118, 164, 255))
+
+    amulet_text = "None"
+    if amulet_data:
+        amulet_tier = safe_int(amulet_data.get("tier"), 0)
+        raw_amulet_type = str(amulet_data.get("type") or "").strip().lower()
+        amulet_type_map = {
+            "health": "HP",
+            "defense": "Def",
+            "attack": "Attack",
+            "balanced": "Balanced",
+        }
+        amulet_type_label = amulet_type_map.get(raw_amulet_type, raw_amulet_type.capitalize() or "Unknown")
+        amulet_text = f"Tier {amulet_tier} {amulet_type_label}"
+
+    ledger = [
+        ("Money", f"${compact_number(money)}"),
+        ("Guild", guild_name or "None"),
+        ("God", god_name),
+        ("Raid ATK", f"{raid_attack_value:,}"),
+        ("Raid DEF", f"{raid_defense_value:,}"),
+        ("Amulet", amulet_text),
+        ("Health", f"{total_health_value:,}"),
+        ("PvP Wins", f"{pvp_wins:,}"),
+        ("Pet", pet_name or "None"),
+        ("Marriage", marriage_name or "None"),
+    ]
+    max_value = ledger_rect[2] - ledger_rect[0] - 224
+    y = 546
+    for k, v in ledger:
+        draw.text((ledger_rect[0] + 18, y), f"{k}:", font=label_font, fill=colors["muted"])
+        draw.text((ledger_rect[0] + 210, y), clip(v, value_font, max_value), font=value_font, fill=colors["text"])
+        y += 33
+
+    px1, py1, px2, py2 = pet_rect
+    pet_w = px2 - px1 - 28
+
+    def trust_tier(value: int) -> tuple[str, int]:
+        if value >= 81:
+            return "Devoted", 10
+        if value >= 61:
+            return "Loyal", 8
+        if value >= 41:
+            return "Trusting", 5
+        if value >= 21:
+            return "Cautious", 0
+        return "Distrustful", -10
+
+    def pet_bar(y_pos: int, label: str, value: int, color: tuple[int, int, int, int]) -> int:
+        clamped = max(0, min(100, int(value)))
+        draw.text(
+            (px1 + 14, y_pos),
+            clip(f"{label} {clamped}%", micro_font, pet_w),
+            font=micro_font,
+            fill=colors["muted"],
+        )
+        bar_y = y_pos + 22
+        draw.rounded_rectangle(
+            (px1 + 14, bar_y, px2 - 14, bar_y + 14),
+            radius=6,
+            fill=colors["bar_bg"],
+            outline=colors["border_dim"],
+            width=1,
+        )
+        fill_w = int(((px2 - px1 - 30) * clamped) / 100)
+        if fill_w > 0:
+            draw.rounded_rectangle(
+                (px1 + 15, bar_y + 1, px1 + 15 + fill_w, bar_y + 13),
+                radius=5,
+                fill=color,
+            )
+        return bar_y + 18
+
+    def pet_combat_bar(
+        y_pos: int,
+        label: str,
+        value: int,
+        cap: int,
+        color: tuple[int, int, int, int],
+    ) -> int:
+        safe_cap = max(1, cap)
+        clamped = max(0, int(value))
+        draw.text(
+            (px1 + 20, y_pos),
+            clip(f"{label} {clamped:,}", micro_font, pet_w - 12),
+            font=micro_font,
+            fill=colors["muted"],
+        )
+        bar_y = y_pos + 22
+        draw.rounded_rectangle(
+            (px1 + 20, bar_y, px2 - 20, bar_y + 16),
+            radius=6,
+            fill=colors["bar_bg"],
+            outline=colors["border_dim"],
+            width=1,
+        )
+        fill_w = int(((px2 - px1 - 42) * min(1.0, clamped / safe_cap)))
+        if fill_w > 0:
+            draw.rounded_rectangle(
+                (px1 + 21, bar_y + 1, px1 + 21 + fill_w, bar_y + 15),
+                radius=5,
+                fill=color,
+            )
+        return bar_y + 16
+
+    portrait_size = min(max(210, pet_w - 24), 320)
+    portrait_x = px1 + ((px2 - px1) - portrait_size) // 2
+    portrait_y = py1 + 78
+    draw.rounded_rectangle(
+        (portrait_x - 10, portrait_y - 10, portrait_x + portrait_size + 10, portrait_y + portrait_size + 10),
+        radius=18,
+        fill=(63, 41, 25, 235),
+        outline=colors["border_dim"],
+        width=2,
+    )
+
+    if pet_data:
+        pet_display_name = str(
+            pet_data.get("name") or pet_data.get("default_name") or pet_name or "Unknown"
+        )
+        pet_level = max(1, min(100, safe_int(pet_data.get("level"), 1)))
+        pet_stage = str(pet_data.get("growth_stage") or "Unknown").capitalize()
+        pet_element_key = str(pet_data.get("element") or "").strip().lower()
+        pet_element = "Nature" if pet_element_key == "earth" else (pet_element_key.capitalize() if pet_element_key else "Unknown")
+        pet_happiness = max(0, min(100, safe_int(pet_data.get("happiness"), 0)))
+        pet_hunger = max(0, min(100, safe_int(pet_data.get("hunger"), 0)))
+        pet_trust = max(0, min(100, safe_int(pet_data.get("trust_level"), 0)))
+        pet_hp_base = safe_float(pet_data.get("hp"), 0.0)
+        pet_attack_base = safe_float(pet_data.get("attack"), 0.0)
+        pet_defense_base = safe_float(pet_data.get("defense"), 0.0)
+        pet_iv = safe_int(pet_data.get("IV"), 0)
+        trust_name, trust_bonus = trust_tier(pet_trust)
+        level_multiplier = 1 + (pet_level * 0.01)
+        trust_multiplier = 1 + (trust_bonus / 100.0)
+        pet_hp = max(0, int(round(pet_hp_base * level_multiplier * trust_multiplier)))
+        pet_attack = max(0, int(round(pet_attack_base * level_multiplier * trust_multiplier)))
+        pet_defense = max(0, int(round(pet_defense_base * level_multiplier * trust_multiplier)))
+
+        pet_img = open_image(pet_image_data)
+        if pet_img:
+            pet_img = ImageOps.fit(pet_img, (portrait_size, portrait_size), method=resample)
+            rounded_mask = Image.new("L", (portrait_size, portrait_size), 0)
+            ImageDraw.Draw(rounded_mask).rounded_rectangle(
+                (0, 0, portrait_size - 1, portrait_size - 1), radius=14, fill=255
+            )
+            src_alpha = pet_img.split()[3]
+            combined_alpha = ImageChops.multiply(src_alpha, rounded_mask)
+            pet_img.putalpha(combined_alpha)
+            canvas.paste(pet_img, (portrait_x, portrait_y), pet_img)
+        else:
+            draw.rounded_rectangle(
+                (portrait_x, portrait_y, portrait_x + portrait_size, portrait_y + portrait_size),
+                radius=14,
+                fill=(82, 59, 38, 240),
+                outline=colors["border_dim"],
+                width=1,
+            )
+            draw.text(
+                (portrait_x + 24, portrait_y + portrait_size // 2 - 16),
+                "No Pet Image",
+                font=tiny_font,
+                fill=colors["muted"],
+            )
+
+        y_cursor = portrait_y + portrait_size + 20
+        draw.text(
+            (px1 + 14, y_cursor),
+            clip(pet_display_name, tiny_font, pet_w),
+            font=tiny_font,
+            fill=colors["text"],
+        )
+        y_cursor += 34
+        draw.text(
+            (px1 + 14, y_cursor),
+            clip(f"Lv {pet_level} | {pet_element}", micro_font, pet_w),
+            font=micro_font,
+            fill=colors["muted"],
+        )
+        y_cursor += 26
+        draw.text(
+            (px1 + 14, y_cursor),
+            clip(f"Stage: {pet_stage}", micro_font, pet_w),
+            font=micro_font,
+            fill=colors["muted"],
+        )
+        y_cursor += 26
+        draw.text(
+            (px1 + 14, y_cursor),
+            clip(f"Bond: {trust_name} ({trust_bonus:+d}%)", micro_font, pet_w),
+            font=micro_font,
+            fill=colors["muted"],
+        )
+        y_cursor += 32
+
+        y_cursor = pet_bar(y_cursor, "Happy", pet_happiness, (112, 151, 93, 255))
+        y_cursor = pet_bar(y_cursor, "Hunger", pet_hunger, (171, 84, 64, 255))
+        y_cursor = pet_bar(y_cursor, "Trust", pet_trust, (88, 118, 164, 255))
+
+        combat_top = max(y_cursor + 12, py2 - 248)
+        draw.rounded_rectangle(
+            (px1 + 12, combat_top, px2 - 12, py2 - 18),
+            radius=14,
+            fill=(76, 53, 32, 220),
+            outline=colors["border_dim"],
+            width=2,
+        )
+        draw.text(
+            (px1 + 20, combat_top + 10),
+            clip(f"Combat Readout | IV {pet_iv}%", micro_font, pet_w - 10),
+            font=micro_font,
+            fill=colors["border"],
+        )
+        combat_y = combat_top + 40
+        combat_y = pet_combat_bar(combat_y, "HP", pet_hp, 30000, (112, 151, 93, 255))
+        combat_y = pet_combat_bar(combat_y + 4, "ATK", pet_attack, 6000, (171, 84, 64, 255))
+        pet_combat_bar(combat_y + 4, "DEF", pet_defense, 6000, (88, 118, 164, 255))
+    else:
+        draw.rounded_rectangle(
+            (portrait_x, portrait_y, portrait_x + portrait_size, portrait_y + portrait_size),
+            radius=14,
+            fill=(82, 59, 38, 240),
+            outline=colors["border_dim"],
+            width=1,
+        )
+        draw.text(
+            (portrait_x + 24, portrait_y + portrait_size // 2 - 16),
+            "No Pet Equipped",
+            font=tiny_font,
+            fill=colors["muted"],
+        )
+        draw.text(
+            (px1 + 14, portrait_y + portrait_size + 24),
+            "Use $pets equip",
+            font=micro_font,
+            fill=colors["muted"],
+        )
+
+    def item_type_name(item) -> str:
+        if not item:
+            return ""
+        return str(item.get("type") or item.get("type_") or "").strip().title()
+
+    def combo_stance(right_item, left_item) -> str:
+        r_type = item_type_name(right_item)
+        l_type = item_type_name(left_item)
+        types = [t for t in (r_type, l_type) if t]
+
+        if not types:
+            return "Traveler's Poise"
+
+        if len(types) == 2 and r_type == l_type:
+            twin_map = {
+                "Bow": "Eagle Volley",
+                "Scythe": "Reaper's Arc",
+                "Mace": "Titan Maul",
+                "Shield": "Twin Aegis",
+                "Sword": "Twinblade Dance",
+                "Dagger": "Twin Fang",
+                "Knife": "Twin Fang",
+                "Wand": "Twin Sigils",
+                "Axe": "Blood Reavers",
+                "Hammer": "Stonebreak Pair",
+                "Spear": "Dual Pike Drill",
+            }
+            return twin_map.get(r_type, f"Twin {r_type} Form")
+
+        # One shield + one weapon
+        if "Shield" in types and any(t != "Shield" for t in types):
+            weapon = next((t for t in types if t != "Shield"), "")
+            shield_map = {
+                "Sword": "Guardian Knight",
+                "Axe": "Bulwark Reaver",
+                "Hammer": "Citadel Breaker",
+                "Wand": "Arcane Bastion",
+                "Spear": "Phalanx Pike",
+                "Dagger": "Viper Bulwark",
+                "Knife": "Viper Bulwark",
+                "Bow": "Aegis Archer",
+                "Scythe": "Gravewarden",
+                "Mace": "Sanctified Bastion",
+            }
+            return shield_map.get(weapon, "Aegis Stance")
+
+        # Dual wield non-shields
+        if len(types) == 2 and all(t != "Shield" for t in types):
+            pair = tuple(sorted(types))
+            dual_map = {
+                ("Dagger", "Knife"): "Shadow Fang",
+                ("Axe", "Hammer"): "Ravager Pair",
+                ("Dagger", "Sword"): "Duelist's Dance",
+                ("Knife", "Sword"): "Duelist's Dance",
+                ("Dagger", "Wand"): "Spellblade Tempo",
+                ("Knife", "Wand"): "Spellblade Tempo",
+                ("Spear", "Sword"): "Dragoon Cross",
+            }
+            return dual_map.get(pair, "Twinblade Tempo")
+
+        # Single weapon
+        single = types[0]
+        single_map = {
+            "Bow": "Ranger's Focus",
+            "Wand": "Arcanist Focus",
+            "Spear": "Lancer Reach",
+            "Dagger": "Assassin Veil",
+            "Knife": "Assassin Veil",
+            "Sword": "Duelist Guard",
+            "Axe": "Berserker Rush",
+            "Hammer": "Warden Crush",
+            "Scythe": "Reaper's Poise",
+            "Mace": "Crusader Weight",
+            "Shield": "Fortress Stance",
+        }
+        return single_map.get(single, "Balanced Form")
+
+    stance = combo_stance(right_hand, left_hand)
+    draw.text(
+        (gear_rect[0] + 20, 548),
+        clip(f"Battle Stance: {stance}", tiny_font, gear_rect[2] - gear_rect[0] - 40),
+        font=tiny_font,
+        fill=colors["muted"],
+    )
+
+    gear_x = gear_rect[0] + 16
+    gear_w = gear_rect[2] - gear_rect[0] - 32
+
+    def item_block(x, y, width_px, title, item):
+        draw.rounded_rectangle((x, y, x + width_px, y + 108), radius=14, fill=(76, 53, 32, 220), outline=colors["border_dim"], width=2)
+        draw.text((x + 14, y + 10), title, font=label_font, fill=colors["border"])
+        if item:
+            name = clip(str(item.get("name", "Unknown")), value_font, max(120, width_px - 28))
+            kind = clip(str(item.get("type", "Unknown")), tiny_font, max(80, width_px - 170))
+            power_val = format_stat_value(effective_item_primary_stat(item))
+            draw.text((x + 14, y + 44), name, font=value_font, fill=colors["text"])
+            draw.text((x + 14, y + 76), f"{kind} | Power {power_val}", font=tiny_font, fill=colors["muted"])
+        else:
+            draw.text((x + 14, y + 52), "None Equipped", font=value_font, fill=colors["muted"])
+
+    item_block(gear_x, 580, gear_w, "Right Hand", right_hand)
+    item_block(gear_x, 708, gear_w, "Left Hand", left_hand)
+
+    mission_text = card["mission_text"] or "No active mission"
+    draw.rounded_rectangle((gear_x, 830, gear_x + gear_w, 876), radius=12, fill=(76, 53, 32, 230), outline=colors["border_dim"], width=2)
+    draw.text((gear_x + 16, 842), "Quest:", font=label_font, fill=colors["border"])
+    draw.text((gear_x + 118, 844), clip(mission_text, tiny_font, max(80, gear_w - 132)), font=tiny_font, fill=colors["text"])
+
+    footer = "Fable Reborn - Dragon Chronicle"
+    draw.text((width - 12 - tw(footer, tiny_font), height - 22), footer, font=tiny_font, fill=colors["muted"])
+
+    output = BytesIO()
+    canvas.convert("RGB").save(output, format="PNG", optimize=True)
+    return output.getvalue()
+
+
+class ProfileCardRenderer:
+    def __init__(self, redis, *, workers: int = WORKERS) -> None:
+        self.redis = redis
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.renders = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def cache_key(kind: str, inputs) -> str:
+        payload = json.dumps([STYLE, kind, inputs], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, forking the bot would copy its sockets and running threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=preload,
+            )
+        return self._pool
+
+    async def run(self, func, *args):
+        """Runs ``func(*args)`` in the render pool."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor(), func, *args
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        data = await self.redis.get(CACHE_PREFIX + key)
+        if data is not None:
+            await self.redis.zadd(CACHE_INDEX, {key: time.time()})
+        return data
+
+    async def put(self, key: str, data: bytes) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(CACHE_PREFIX + key, data, ex=CACHE_TTL)
+            pipe.zadd(CACHE_INDEX, {key: time.time()})
+            pipe.zcard(CACHE_INDEX)
+            *_, size = await pipe.execute()
+        if size > CACHE_MAX_ENTRIES:
+            evicted = await self.redis.zpopmin(CACHE_INDEX, size - CACHE_MAX_ENTRIES)
+            if evicted:
+                await self.redis.delete(
+                    *(CACHE_PREFIX + member.decode() for member, _score in evicted)
+                )
+
+    async def render(self, key: str, produce: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Returns the cached image for ``key``, or produces and caches it.
+
+        Callers asking for a key that is being produced wait for that result
+        instead of producing it again.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            data = await self.get(key)
+            if data is not None:
+                self.cache_hits += 1
+            else:
+                self.renders += 1
+                data = await produce()
+                await self.put(key, data)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # retrieved here so an uncontended failure is not logged twice
+            future.exception()
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            del self._inflight[key]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
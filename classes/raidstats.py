@@ -0,0 +1,366 @@
+"""Raid attack, defense and HP from a user's profile, gear, city and amulet.
+
+``fetch_raidstats`` is the single-user path behind ``Bot.get_raidstats``.
+``fetch_raidstats_many`` computes the same numbers for a whole raid with a
+fixed number of ``ANY($1)`` queries instead of several queries per raider.
+Both share the item and multiplier math below, so they cannot drift apart.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+
+from classes.classes import (
+    Bard,
+    Beastmaster,
+    Mage,
+    Paladin,
+    Paragon,
+    Raider,
+    Ranger,
+    Reaper,
+    Ritualist,
+    SantasHelper,
+    Tank,
+    Thief,
+    Warrior,
+)
+from classes.classes import from_string as class_from_string
+from classes.endgame import apply_item_progression_bonus, soulbound_level_from_xp
+from classes.items import ItemType
+from utils import misc as rpgtools
+
+PROFILES_QUERY = 'SELECT * FROM profile WHERE "user"=ANY($1);'
+EQUIPPED_ITEMS_QUERY = (
+    "SELECT ai.* FROM profile p JOIN allitems ai ON (p.user=ai.owner) JOIN"
+    " inventory i ON (ai.id=i.item) WHERE i.equipped IS TRUE AND p.user=$1;"
+)
+EQUIPPED_ITEMS_MANY_QUERY = (
+    "SELECT ai.* FROM profile p JOIN allitems ai ON (p.user=ai.owner) JOIN"
+    " inventory i ON (ai.id=i.item) WHERE i.equipped IS TRUE AND p.user=ANY($1);"
+)
+PROGRESSION_TABLES_QUERY = (
+    "SELECT to_regclass('public.starforged_items') IS NOT NULL AS starforged,"
+    " to_regclass('public.soulbound') IS NOT NULL AS soulbound;"
+)
+STARFORGED_QUERY = "SELECT item_id, stars FROM starforged_items WHERE item_id=ANY($1);"
+SOULBOUND_QUERY = (
+    "SELECT user_id, item_id, xp FROM soulbound"
+    " WHERE user_id=ANY($1) AND item_id=ANY($2);"
+)
+CITY_QUERY = (
+    'SELECT c.* FROM city c JOIN guild g ON c."owner"=g."id" WHERE'
+    ' g."id"=(SELECT alliance FROM guild WHERE "id"=$1);'
+)
+CITY_MANY_QUERY = (
+    'SELECT m."id" AS member_guild, c.* FROM guild m JOIN guild g ON'
+    ' g."id"=m.alliance JOIN city c ON c."owner"=g."id" WHERE m."id"=ANY($1);'
+)
+AMULETS_QUERY = (
+    "SELECT user_id, attack, defense, hp FROM amulets"
+    " WHERE user_id=ANY($1) AND equipped=true;"
+)
+
+RACE_BONUSES = {
+    "Human": (2, 2),
+    "Dwarf": (1, 3),
+    "Elf": (3, 1),
+    "Orc": (0, 4),
+    "Jikill": (4, 0),
+    "Djinn": (5, -1),
+    "Shadeborn": (-1, 5),
+}
+
+
+@dataclass(frozen=True)
+class RaidStats:
+    damage: Decimal
+    armor: Decimal
+    hp: int
+    amulet_hp: int
+    profile: object
+
+
+def raid_hp(profile) -> int:
+    """Base raid HP: health, level and allocated HP points, no amulet."""
+    level = rpgtools.xptolevel(profile["xp"])
+    return profile["health"] + 200 + (level * 15) + profile["stathp"] * 50
+
+
+def _item_field(raw_item, key, default=None):
+    try:
+        return raw_item[key]
+    except (KeyError, IndexError, TypeError):
+        return default
+
+
+def equipped_item_ids(items) -> list[int]:
+    return [
+        int(_item_field(item, "id"))
+        for item in items
+        if _item_field(item, "id") is not None
+    ]
+
+
+async def fetch_item_progression(conn, user_ids, item_ids):
+    """Star levels by item id and the soulbound (item id, level) by user.
+
+    Either table may be missing on older databases; any error counts as no
+    progression at all, like the stat helpers always did.
+    """
+    star_map: dict[int, int] = {}
+    soulbound: dict[int, tuple[int, int]] = {}
+    if not item_ids:
+        return star_map, soulbound
+    try:
+        tables = await conn.fetchrow(PROGRESSION_TABLES_QUERY)
+        if tables["starforged"]:
+            for row in await conn.fetch(STARFORGED_QUERY, item_ids):
+                star_map[int(row["item_id"])] = int(row["stars"] or 0)
+        if tables["soulbound"]:
+            for row in await conn.fetch(SOULBOUND_QUERY, user_ids, item_ids):
+                soulbound.setdefault(
+                    int(row["user_id"]),
+                    (int(row["item_id"]), soulbound_level_from_xp(row["xp"])),
+                )
+    except Exception:
+        return {}, {}
+    return star_map, soulbound
+
+
+def damage_armor_for_items(items, classes, race, star_map, soulbound=None):
+    """Equipment damage and armor with class weapon and race bonuses."""
+    soulbound_item_id, soulbound_level = soulbound or (None, 0)
+    damage = 0
+    armor = 0
+
+    classes = [i for c in classes if (i := class_from_string(c))]
+    is_paragon = any(c.in_class_line(Paragon) for c in classes)
+    is_ranger = any(c.in_class_line(Ranger) for c in classes)
+    is_warrior = any(c.in_class_line(Warrior) for c in classes)
+    is_thief = any(c.in_class_line(Thief) for c in classes)
+    is_raider = any(c.in_class_line(Raider) for c in classes)
+    is_paladin = any(c.in_class_line(Paladin) for c in classes)
+    is_reaper = any(c.in_class_line(Reaper) for c in classes)
+    is_tank = any(c.in_class_line(Tank) for c in classes)
+    is_bard = any(c.in_class_line(Bard) for c in classes)
+    is_beastmaster = any(c.in_class_line(Beastmaster) for c in classes)
+    is_santas_helper = any(c.in_class_line(SantasHelper) for c in classes)
+    is_caster = any(
+        c.in_class_line(Mage) or c.in_class_line(Ritualist) for c in classes
+    )
+
+    for item in items:
+        item_id = int(_item_field(item, "id")) if _item_field(item, "id") is not None else 0
+        item_soulbound_level = soulbound_level if item_id == soulbound_item_id else 0
+        item_damage, item_armor, _bonus_pct = apply_item_progression_bonus(
+            _item_field(item, "damage", 0),
+            _item_field(item, "armor", 0),
+            stars=star_map.get(item_id, 0),
+            soulbound_level=item_soulbound_level,
+        )
+        damage += item_damage
+        armor += item_armor
+
+        type_ = ItemType.from_string(item["type"])
+        if type_ == ItemType.Spear and (is_paragon or is_beastmaster):
+            damage += 5
+        elif (type_ == ItemType.Dagger or type_ == ItemType.Knife) and (
+            is_thief or is_bard
+        ):
+            damage += 5
+        elif type_ == ItemType.Sword and is_warrior:
+            damage += 5
+        elif type_ == ItemType.Bow and is_ranger:
+            damage += 10
+        elif type_ == ItemType.Wand and is_caster:
+            damage += 5
+        elif type_ == ItemType.Axe and is_raider:
+            damage += 5
+        elif type_ == ItemType.Hammer and is_paladin:
+            damage += 5
+        elif type_ == ItemType.Scythe and is_reaper:
+            damage += 10
+        elif type_ == ItemType.Mace and is_santas_helper:
+            damage += 5
+        elif type_ == ItemType.Shield and is_tank:
+            armor += 7
+
+    for class_ in classes:
+        line, grade = class_.get_class_line(), class_.class_grade()
+        if line == Mage:
+            damage += grade
+        if line == Paragon:
+            damage += grade
+            armor += grade
+    race_damage, race_armor = RACE_BONUSES.get(race, (0, 0))
+    return damage + race_damage, armor + race_armor
+
+
+def apply_raid_multipliers(
+    damage,
+    armor,
+    atkmultiply,
+    defmultiply,
+    statatk,
+    statdef,
+    buildings,
+    amulet,
+    unspent_statpoints=None,
+):
+    """Scales equipment stats by the profile, city and stat point multipliers
+    and adds the equipped amulet. Returns damage, defense and a breakdown."""
+    profile_attack_multiplier = atkmultiply
+    profile_defense_multiplier = defmultiply
+    city_raid_building_level = 0
+    if buildings:
+        city_raid_building_level = int(buildings["raid_building"] or 0)
+        atkmultiply += city_raid_building_level * Decimal("0.1")
+        defmultiply += city_raid_building_level * Decimal("0.1")
+
+    statatk = Decimal(statatk)
+    statdef = Decimal(statdef)
+    atkmultiply += statatk * Decimal("0.1")
+    defmultiply += statdef * Decimal("0.1")
+
+    dmg = damage * atkmultiply
+    deff = armor * defmultiply
+    pre_amulet_damage = dmg
+    pre_amulet_defense = deff
+
+    amulet_attack = 0
+    amulet_defense = 0
+    if amulet:
+        amulet_attack = amulet["attack"] or 0
+        amulet_defense = amulet["defense"] or 0
+        dmg += amulet_attack
+        deff += amulet_defense
+
+    return dmg, deff, {
+        "equipment_class_race_attack": damage,
+        "equipment_class_race_defense": armor,
+        "profile_attack_multiplier": profile_attack_multiplier,
+        "profile_defense_multiplier": profile_defense_multiplier,
+        "city_raid_building_level": city_raid_building_level,
+        "city_multiplier_bonus": Decimal(city_raid_building_level) * Decimal("0.1"),
+        "allocated_attack_points": statatk,
+        "allocated_defense_points": statdef,
+        "unspent_stat_points": unspent_statpoints,
+        "stat_point_effects": {
+            "attack": "+0.1 attack multiplier per point",
+            "defense": "+0.1 defense multiplier per point",
+            "health": "+50 maximum HP per point",
+        },
+        "allocated_attack_multiplier_bonus": statatk * Decimal("0.1"),
+        "allocated_defense_multiplier_bonus": statdef * Decimal("0.1"),
+        "applied_attack_multiplier": atkmultiply,
+        "applied_defense_multiplier": defmultiply,
+        "pre_amulet_attack": pre_amulet_damage,
+        "pre_amulet_defense": pre_amulet_defense,
+        "amulet_attack": amulet_attack,
+        "amulet_defense": amulet_defense,
+        "raid_attack_before_specialization": dmg,
+        "raid_defense_before_specialization": deff,
+    }
+
+
+async def fetch_damage_armor(conn, user_id, classes, race, items=None):
+    if items is None:
+        items = await conn.fetch(EQUIPPED_ITEMS_QUERY, user_id)
+    star_map, soulbound = await fetch_item_progression(
+        conn, [user_id], equipped_item_ids(items)
+    )
+    return damage_armor_for_items(
+        items, classes, race, star_map, soulbound.get(user_id)
+    )
+
+
+async def fetch_raidstats(
+    conn,
+    user_id,
+    *,
+    atkmultiply,
+    defmultiply,
+    classes,
+    race,
+    guild,
+    statatk,
+    statdef,
+    unspent_statpoints=None,
+):
+    """Raid damage, defense and breakdown of one user with the given profile values."""
+    damage, armor = await fetch_damage_armor(conn, user_id, classes, race)
+    buildings = await conn.fetchrow(CITY_QUERY, guild) if guild else None
+    amulet = await conn.fetchrow(AMULETS_QUERY, [user_id])
+    return apply_raid_multipliers(
+        damage,
+        armor,
+        atkmultiply,
+        defmultiply,
+        statatk,
+        statdef,
+        buildings,
+        amulet,
+        unspent_statpoints,
+    )
+
+
+async def fetch_raidstats_many(conn, user_ids) -> dict[int, RaidStats]:
+    """Raid stats of every user with a character, keyed by user id.
+
+    Runs the same lookups as ``fetch_raidstats`` for all users at once, so the
+    query count does not grow with the number of raiders.
+    """
+    user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+    if not user_ids:
+        return {}
+    profiles = {row["user"]: row for row in await conn.fetch(PROFILES_QUERY, user_ids)}
+    if not profiles:
+        return {}
+    user_ids = list(profiles)
+
+    items_by_user: dict[int, list] = {user_id: [] for user_id in user_ids}
+    for item in await conn.fetch(EQUIPPED_ITEMS_MANY_QUERY, user_ids):
+        items_by_user[item["owner"]].append(item)
+    item_ids = [
+        item_id for items in items_by_user.values() for item_id in equipped_item_ids(items)
+    ]
+    star_map, soulbound = await fetch_item_progression(conn, user_ids, item_ids)
+
+    guild_ids = list({row["guild"] for row in profiles.values() if row["guild"]})
+    cities = {}
+    if guild_ids:
+        for row in await conn.fetch(CITY_MANY_QUERY, guild_ids):
+            cities.setdefault(row["member_guild"], row)
+    amulets = {}
+    for row in await conn.fetch(AMULETS_QUERY, user_ids):
+        amulets.setdefault(row["user_id"], row)
+
+    stats = {}
+    for user_id, profile in profiles.items():
+        damage, armor = damage_armor_for_items(
+            items_by_user[user_id],
+            profile["class"],
+            profile["race"],
+            star_map,
+            soulbound.get(user_id),
+        )
+        amulet = amulets.get(user_id)
+        dmg, deff, _breakdown = apply_raid_multipliers(
+            damage,
+            armor,
+            profile["atkmultiply"],
+            profile["defmultiply"],
+            profile["statatk"],
+            profile["statdef"],
+            cities.get(profile["guild"]),
+            amulet,
+        )
+        stats[user_id] = RaidStats(
+            damage=dmg,
+            armor=deff,
+            hp=raid_hp(profile),
+            amulet_hp=(amulet["hp"] or 0) if amulet else 0,
+            profile=profile,
+        )
+    return stats
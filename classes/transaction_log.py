@@ -0,0 +1,153 @@
+"""Write-behind buffer for the ``transactions`` and ``market_history`` logs.
+
+``Bot.log_transaction`` used to insert its rows with a round trip of its own
+in the middle of every economy command. Rows that do not have to commit
+together with the command's own writes are now queued here and written by a
+background task with one ``COPY`` per batch, at the latest ``FLUSH_INTERVAL``
+seconds after they were queued or as soon as ``BATCH_SIZE`` rows are waiting.
+
+At most ``MAX_PENDING`` rows are held, ``enqueue`` waits for the writer when
+the queue is full. ``close`` writes everything still queued.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 0.25
+BATCH_SIZE = 500
+MAX_PENDING = 10_000
+
+TRANSACTION_COLUMNS = ("from", "to", "subject", "info", "data", "timestamp")
+INSERT_TRANSACTION = (
+    'INSERT INTO transactions ("from", "to", "subject", "info", "data", "timestamp")'
+    " VALUES ($1, $2, $3, $4, $5, $6);"
+)
+INSERT_MARKET_HISTORY = (
+    'INSERT INTO market_history ("item", "name", "value", "type", "damage", "armor",'
+    ' "signature", "price", "offer") VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9);'
+)
+
+# a queued log entry: the transactions row and the market_history row, if any
+Entry = tuple[tuple, Optional[tuple]]
+
+
+async def write_entry(conn, transaction: tuple, market: Optional[tuple]) -> None:
+    await conn.execute(INSERT_TRANSACTION, *transaction)
+    if market is not None:
+        await conn.execute(INSERT_MARKET_HISTORY, *market)
+
+
+class TransactionLog:
+    def __init__(
+        self,
+        pool,
+        *,
+        flush_interval: float = FLUSH_INTERVAL,
+        batch_size: int = BATCH_SIZE,
+        max_pending: int = MAX_PENDING,
+    ) -> None:
+        self.pool = pool
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue: asyncio.Queue[Optional[Entry]] = asyncio.Queue(max_pending)
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def enqueue(self, transaction: tuple, market: Optional[tuple] = None) -> None:
+        if self.closed or self._task is None:
+            async with self.pool.acquire() as conn:
+                await write_entry(conn, transaction, market)
+            return
+        await self.queue.put((transaction, market))
+        if self.queue.qsize() >= self.batch_size:
+            self._full.set()
+
+    async def close(self) -> None:
+        """Stops taking rows and waits until every queued row is written."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._task is None:
+            return
+        await self.queue.put(None)
+        self._full.set()
+        await self._task
+        # rows of callers that were waiting for space when we closed
+        while not self.queue.empty():
+            batch = [entry for entry in self._take(self.queue.qsize()) if entry]
+            if batch:
+                await self.write(batch)
+            await asyncio.sleep(0)
+
+    def _take(self, count: int) -> list[Optional[Entry]]:
+        return [self.queue.get_nowait() for _ in range(min(count, self.queue.qsize()))]
+
+    async def _run(self) -> None:
+        while True:
+            entry = await self.queue.get()
+            if entry is not None and self.queue.qsize() + 1 < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+            batch = [entry, *self._take(self.batch_size - 1)]
+            stopping = None in batch
+            batch = [entry for entry in batch if entry is not None]
+            if batch:
+                await self.write(batch)
+            if stopping:
+                return
+
+    async def write(self, batch: list[Entry]) -> None:
+        transactions = [transaction for transaction, _market in batch]
+        markets = [market for _transaction, market in batch if market is not None]
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.copy_records_to_table(
+                        "transactions", records=transactions, columns=TRANSACTION_COLUMNS
+                    )
+                    if markets:
+                        await conn.executemany(INSERT_MARKET_HISTORY, markets)
+        except Exception:
+            log.exception(
+                "Failed to write %d transaction log rows, retrying one by one",
+                len(batch),
+            )
+            await self._write_each(batch)
+        else:
+            self.written += len(batch)
+        self.batches += 1
+
+    async def _write_each(self, batch: list[Entry]) -> None:
+        for transaction, market in batch:
+            try:
+                async with self.pool.acquire() as conn:
+                    async with conn.transaction():
+                        await write_entry(conn, transaction, market)
+            except Exception as e:
+                self.dropped += 1
+                log.error("Dropped transaction log row %r %r: %s", transaction, market, e)
+            else:
+                self.written += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": self.queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+        }
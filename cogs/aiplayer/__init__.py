@@ -45,6 +45,7 @@ from classes.class_mastery import (
     get_class_mastery,
     get_free_mastery_claim,
 )
+from classes.cooldowns import USER
 from classes.endgame import apply_item_progression_bonus, soulbound_level_from_xp
 from classes.specs import RESPEC_COST, SPECS, describe_spec, specs_for_line
 from cogs.aiplayer.strategy import (
@@ -118,7 +119,6 @@ PET_CARE_MONEY_RESERVE = 50_000
 PAID_RAID_UPGRADE_MONEY_RESERVE = 50_000
 CLASS_CHANGE_COST = 5_000
 CLASS_CHANGE_COOLDOWN_SECONDS = 3_600
-CLASS_CHANGE_COOLDOWN_KEY = f"cd:{DENSETSU_USER_ID}:class"
 CLASS_PLAN_KEY = f"aiplayer:{DENSETSU_USER_ID}:class_plan"
 CLASS_CHANGE_PROPOSAL_KEY = f"aiplayer:{DENSETSU_USER_ID}:class_change_proposal"
 CLASS_CHANGE_PROPOSAL_TTL_SECONDS = 6 * 3_600
@@ -4063,8 +4063,8 @@ class AIPlayer(commands.Cog):
                     'INSERT INTO pets ("user") VALUES ($1) ON CONFLICT DO NOTHING;',
                     DENSETSU_USER_ID,
                 )
-        await self.bot.redis.set(
-            CLASS_CHANGE_COOLDOWN_KEY, "1", ex=CLASS_CHANGE_COOLDOWN_SECONDS
+        await self.bot.cooldowns.set(
+            USER, DENSETSU_USER_ID, "class", CLASS_CHANGE_COOLDOWN_SECONDS, value="1"
         )
         await self._record_class_plan(
             decision=decision,
@@ -4174,8 +4174,8 @@ class AIPlayer(commands.Cog):
                     conn=connection,
                 )
 
-        await self.bot.redis.set(
-            CLASS_CHANGE_COOLDOWN_KEY, "1", ex=CLASS_CHANGE_COOLDOWN_SECONDS
+        await self.bot.cooldowns.set(
+            USER, DENSETSU_USER_ID, "class", CLASS_CHANGE_COOLDOWN_SECONDS, value="1"
         )
         await self.bot.redis.delete(CLASS_CHANGE_PROPOSAL_KEY)
         await self._record_class_plan(
@@ -32,6 +32,7 @@ from discord.ui.button import Button
 from classes.bot import Bot
 from classes.context import Context
 from classes.converters import MemberWithCharacter
+from classes.cooldowns import ALLIANCE
 from cogs.battles.core.combatant import Combatant
 from cogs.battles.core.team import Team
 from cogs.shard_communication import alliance_on_cooldown as alliance_cooldown
@@ -3201,18 +3202,13 @@ class Alliance(commands.Cog):
             'SELECT alliance FROM guild WHERE "id"=$1;',
             ctx.character_data["guild"],
         )
-        cooldowns = await self.bot.redis.execute_command(
-            "KEYS", f"alliancecd:{alliance}:*"
-        )
+        cooldowns = await self.bot.cooldowns.timers(ALLIANCE, alliance)
         if not cooldowns:
             return await ctx.send(
                 _("Your alliance does not have any active cooldown at the moment.")
             )
         timers = _("Commands on cooldown:")
-        for key in cooldowns:
-            key = key.decode()
-            cooldown = await self.bot.redis.execute_command("TTL", key)
-            cmd = key.replace(f"alliancecd:{alliance}:", "")
+        for cmd, cooldown in cooldowns.items():
             text = _("{cmd} is on cooldown and will be available after {time}").format(
                 cmd=cmd, time=timedelta(seconds=int(cooldown))
             )
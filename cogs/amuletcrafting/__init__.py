@@ -701,6 +701,78 @@ class AmuletCrafting(commands.Cog):
             print(f"Error giving crafting resource: {e}")
             return False
 
+    async def give_crafting_resources(self, user_id: int, amounts: dict, conn=None):
+        """
+        Gives many crafting resources to a player in two statements.
+
+        Args:
+            user_id (int): Discord user ID
+            amounts (dict): resource_type -> amount to give
+            conn: Optional connection to run on, e.g. inside a transaction
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        amounts = {
+            resource: int(amount)
+            for resource, amount in amounts.items()
+            if resource in self.ALL_RESOURCES and amount > 0
+        }
+        if not amounts:
+            return True
+
+        async def give(conn):
+            updated = await conn.fetch(
+                'UPDATE crafting_resources c SET amount = c.amount + g.amount'
+                ' FROM unnest($2::text[], $3::bigint[]) AS g(resource_type, amount)'
+                ' WHERE c.user_id=$1 AND c.resource_type=g.resource_type'
+                ' RETURNING c.resource_type',
+                user_id, list(amounts), list(amounts.values())
+            )
+            missing = amounts.keys() - {row['resource_type'] for row in updated}
+            if missing:
+                await conn.executemany(
+                    'INSERT INTO crafting_resources (user_id, resource_type, amount) VALUES ($1, $2, $3)',
+                    [(user_id, resource, amounts[resource]) for resource in missing]
+                )
+
+        try:
+            if conn is not None:
+                await give(conn)
+            else:
+                async with self.bot.pool.acquire() as conn:
+                    async with conn.transaction():
+                        await give(conn)
+            return True
+        except Exception as e:
+            print(f"Error giving crafting resources: {e}")
+            return False
+
+    def resource_odds(self):
+        """
+        Chance of every resource to be picked by get_random_resource() without
+        a category or level, for drawing many resources at once.
+
+        Returns:
+            dict: resource_type -> probability
+        """
+        resources = list(self.ALL_RESOURCES)
+        odds = dict.fromkeys(resources, 0.0)
+        total_chance = 0
+        for rarity, data in self.RESOURCE_RARITY.items():
+            total_chance += data["chance"]
+            pool = [r for r in data["resources"] if r in self.ALL_RESOURCES] or resources
+            for resource in pool:
+                odds[resource] += data["chance"] / 100 / len(pool)
+        # rolls above the summed chances fall back to common
+        if total_chance < 100 and "common" in self.RESOURCE_RARITY:
+            pool = [
+                r for r in self.RESOURCE_RARITY["common"]["resources"] if r in self.ALL_RESOURCES
+            ] or resources
+            for resource in pool:
+                odds[resource] += (100 - total_chance) / 100 / len(pool)
+        return odds
+
     async def get_player_resources(self, user_id: int):
         """
         Helper function to get all crafting resources for a player.
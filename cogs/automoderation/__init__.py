@@ -2,10 +2,11 @@ import discord
 from discord.ext import commands, tasks
 from discord.ui import View, Button
 import aiohttp
-import re
 import asyncio
 import logging
 
+from utils.wordfilter import WordMatcher
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('AutoModeration')
@@ -36,7 +37,7 @@ class AutoModeration(commands.Cog):
         self.nsfw_word_list_url = "https://gist.githubusercontent.com/ryanlewis/a37739d710ccdb4b406d/raw/0fbd315eb2900bb736609ea894b9bde8217b991a/google_twunter_lol"
 
         self.nsfw_words = set()
-        self.nsfw_pattern = None
+        self.nsfw_matcher = None
 
         # Initialize the word list using asyncio.create_task
         asyncio.create_task(self.fetch_nsfw_words())
@@ -90,14 +91,13 @@ class AutoModeration(commands.Cog):
                             word.strip().lower() for word in words
                             if word.strip() and len(word.strip()) >= 2
                         )
-                        # Recompile the regex pattern
+                        # Rebuild the matcher
                         if self.nsfw_words:
-                            pattern = r'\b(' + '|'.join(re.escape(word) for word in self.nsfw_words) + r')\b'
-                            self.nsfw_pattern = re.compile(pattern, re.IGNORECASE)
+                            self.nsfw_matcher = WordMatcher(self.nsfw_words)
                             #await self.send_log_dm("✅ NSFW word list successfully updated.")
                             logger.info("NSFW word list successfully updated.")
                         else:
-                            self.nsfw_pattern = None
+                            self.nsfw_matcher = None
                             #await self.send_log_dm("⚠️ NSFW word list is empty after fetching.")
                             logger.warning("NSFW word list is empty after fetching.")
                     else:
@@ -126,9 +126,9 @@ class AutoModeration(commands.Cog):
             await self.handle_nsfw_message(message)
 
     def is_nsfw(self, content):
-        if not self.nsfw_pattern:
+        if not self.nsfw_matcher:
             return False
-        return bool(self.nsfw_pattern.search(content))
+        return self.nsfw_matcher.search(content) is not None
 
     async def handle_nsfw_message(self, message):
         admin_channel = self.bot.get_channel(self.admin_channel_id)
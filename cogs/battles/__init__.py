@@ -1,6 +1,5 @@
 import asyncio
 import datetime
-import json
 import logging
 import math
 import os
@@ -29,10 +28,13 @@ from .jury_tower_data import (
 from .settings import BattleSettings
 from .utils import create_hp_bar
 from classes.badges import Badge
+from classes.content import MonsterIndex
 from .core.battle import Battle
 from .core.team import Team
 from .core.combatant import Combatant
+from .core.display import DisplayScheduler
 from .core.numbers import to_decimal
+from .core.replay import REPLAY_TABLE_SQL
 from .dragon_party_card import render_dragon_party_card
 from .types.tower import TowerBattle
 from .types.training_dummy import TRAINING_DUMMY_DURATION, TrainingDummyBattle
@@ -40,6 +42,7 @@ from .types.omnithrone import ensure_omnithrone_schema
 from .types.ffa import FreeForAllBattle
 from classes.classes import from_string as class_from_string
 from classes.converters import IntGreaterThan
+from classes.cooldowns import USER
 from classes.errors import NoChoice
 from classes.items import ItemType, Hand
 from cogs.shard_communication import user_on_cooldown as user_cooldown
@@ -1662,6 +1665,7 @@ class Battles(commands.Cog):
         self.debug_user_id = battles_ids.get("debug_user_id")
         self.forceleg = False
         self.battle_factory = BattleFactory(bot)
+        self.display_scheduler = DisplayScheduler()
         # A player can participate in more than one battle when a mode allows it.
         # Values are battle-scoped registration keys so one battle's cleanup does
         # not erase another battle's active state.
@@ -1708,6 +1712,9 @@ class Battles(commands.Cog):
         # Initialize database tables
         asyncio.create_task(self.initialize_tables())
     
+    def cog_unload(self):
+        self.display_scheduler.close()
+
     async def initialize_tables(self):
         """Initialize database tables for battles"""
         async with self.bot.pool.acquire() as conn:
@@ -2000,6 +2007,8 @@ class Battles(commands.Cog):
                     "DROP TRIGGER IF EXISTS trg_track_god_pet_ownership_lock ON monster_pets;"
                 )
             await conn.execute("DROP FUNCTION IF EXISTS track_god_pet_ownership_lock();")
+            # Compact replays live in a bytea column, older rows keep their JSONB
+            await conn.execute(REPLAY_TABLE_SQL)
 
             ability_seed = [
                     ("Ice Breath", "move", "Effect: freeze. Damage: 600. Chance: 30%", 600, "freeze", 0.3),
@@ -2114,59 +2123,65 @@ class Battles(commands.Cog):
     def load_data_files(self):
         """Load all necessary data files for battles"""
         battles_dir = os.path.dirname(__file__)
+        content = self.bot.content
 
-        # Load battle tower data (base + optional remastered override)
-        with open(os.path.join(battles_dir, "battle_tower_data.json"), "r", encoding="utf-8") as f:
-            battle_data = json.load(f)
+        def optional_file(name):
+            path = os.path.join(battles_dir, name)
+            return content.file(path) if os.path.exists(path) else None
 
-        remastered_battle_path = os.path.join(battles_dir, "battle_tower_data_remastered.json")
-        if os.path.exists(remastered_battle_path):
-            with open(remastered_battle_path, "r", encoding="utf-8") as f:
-                remastered_battle_data = json.load(f)
+        # Load battle tower data (base + optional remastered override).
+        # The registry shares parsed files, so merge into copies.
+        battle_data = dict(content.file(os.path.join(battles_dir, "battle_tower_data.json")))
+        remastered_battle_data = optional_file("battle_tower_data_remastered.json")
+        if remastered_battle_data:
             for key, value in remastered_battle_data.items():
                 if key == "victories" and isinstance(value, dict):
-                    battle_data.setdefault("victories", {})
-                    battle_data["victories"].update(value)
+                    battle_data["victories"] = {**battle_data.get("victories", {}), **value}
                 else:
                     battle_data[key] = value
         self.battle_data = battle_data
 
         # Load game levels
-        with open(os.path.join(battles_dir, 'game_levels.json'), 'r') as f:
-            data = json.load(f)
-            self.levels = data['levels']
+        self.levels = content.file(os.path.join(battles_dir, 'game_levels.json'))['levels']
 
         # Load dialogue data (base + optional remastered override)
-        with open(os.path.join(battles_dir, "battle_tower_dialogues.json"), "r", encoding="utf-8") as f:
-            dialogue_data = json.load(f)
-
-        remastered_dialogue_path = os.path.join(battles_dir, "battle_tower_dialogues_remastered.json")
-        if os.path.exists(remastered_dialogue_path):
-            with open(remastered_dialogue_path, "r", encoding="utf-8") as f:
-                remastered_dialogue_data = json.load(f)
-            if isinstance(remastered_dialogue_data.get("dialogues"), dict):
-                dialogue_data.setdefault("dialogues", {})
-                dialogue_data["dialogues"].update(remastered_dialogue_data["dialogues"])
+        dialogue_data = dict(
+            content.file(os.path.join(battles_dir, "battle_tower_dialogues.json"))
+        )
+        remastered_dialogue_data = optional_file("battle_tower_dialogues_remastered.json")
+        if remastered_dialogue_data and isinstance(remastered_dialogue_data.get("dialogues"), dict):
+            dialogue_data["dialogues"] = {
+                **dialogue_data.get("dialogues", {}),
+                **remastered_dialogue_data["dialogues"],
+            }
         self.dialogue_data = dialogue_data
 
-        # Load monsters if file exists
-        try:
-            with open("monsters.json", "r") as f:
-                self.monsters_data = json.load(f)
-        except FileNotFoundError:
-            self.monsters_data = {}
-
         # Initialize element extension
         from .extensions.elements import ElementExtension
         self.element_ext = ElementExtension()
 
         # Load couples battle tower data
-        with open("cogs/battles/couples_battletower_data.json", "r") as f:
-            self.couples_battle_tower_data = json.load(f)
-        with open("cogs/battles/couples_game_levels.json", "r") as f:
-            self.couples_game_levels = json.load(f)
+        self.couples_battle_tower_data = content.file(
+            "cogs/battles/couples_battletower_data.json"
+        )
+        self.couples_game_levels = content.file("cogs/battles/couples_game_levels.json")
         self.jury_tower_data = build_jury_tower_data()
 
+    @property
+    def monsters(self) -> MonsterIndex:
+        """The monsters.json roster, reloaded by the content registry."""
+        pinned = self.__dict__.get("_pinned_monsters")
+        return pinned if pinned is not None else self.bot.content.monsters()
+
+    @property
+    def monsters_data(self) -> dict:
+        return self.monsters.data
+
+    @monsters_data.setter
+    def monsters_data(self, data) -> None:
+        # pins a fixed roster instead of the registry's
+        self._pinned_monsters = MonsterIndex(data)
+
     def _canonical_god_shard_name(self, god_name: str) -> str:
         return self.GOD_SHARD_CANONICAL_NAMES.get(god_name, god_name)
     
@@ -2668,6 +2683,22 @@ class Battles(commands.Cog):
         except Exception as e:
             await ctx.send(f"Error getting debug info: {str(e)}")
 
+    @commands.command(hidden=True)
+    @commands.is_owner()
+    async def display_debug(self, ctx):
+        """View battle display scheduler metrics (Owner only)"""
+        metrics = self.display_scheduler.metrics()
+        await ctx.send(
+            "```\n"
+            f"Frames submitted: {metrics['frames_submitted']}\n"
+            f"Frames dropped:   {metrics['frames_dropped']}\n"
+            f"Edits sent:       {metrics['edits']}\n"
+            f"Pending:          {metrics['pending']}\n"
+            f"Edit latency:     p50 {metrics['edit_latency_p50']:.2f}s,"
+            f" p95 {metrics['edit_latency_p95']:.2f}s, max {metrics['edit_latency_max']:.2f}s\n"
+            "```"
+        )
+
     @commands.command()
     @commands.is_owner()
     async def macro_debug(self, ctx):
@@ -3046,56 +3077,21 @@ class Battles(commands.Cog):
         include_frontier_only: bool = False,
     ) -> dict[int, list[dict]]:
         """Load public pools while keeping Frontier exclusives out of normal PvE."""
-        if not self.monsters_data:
-            with open("monsters.json", "r") as f:
-                self.monsters_data = json.load(f)
-
         monsters: dict[int, list[dict]] = {}
         tier12_data = await self._get_godofgods_monster_data()
 
-        for level_str, monster_list in self.monsters_data.items():
-            try:
-                level = int(level_str)
-            except (TypeError, ValueError):
-                continue
-
+        pools = self.monsters.public(include_frontier_only=include_frontier_only)
+        for level, monster_list in pools.items():
             if level == 12:
                 monsters[level] = [dict(tier12_data)] if tier12_data else []
                 continue
-
-            public_monsters = [
-                dict(monster)
-                for monster in monster_list
-                if monster.get("ispublic", True)
-                and (
-                    include_frontier_only
-                    or not monster.get("frontier_only", False)
-                )
-            ]
-            monsters[level] = public_monsters
+            monsters[level] = [dict(monster) for monster in monster_list]
 
         return monsters
 
     def _load_base_pve_monster_names(self) -> set[str]:
         """Load base monsters from monsters.json for splice generation mapping."""
-        if not self.monsters_data:
-            with open("monsters.json", "r", encoding="utf-8") as f:
-                self.monsters_data = json.load(f)
-
-        base_names = set()
-        if isinstance(self.monsters_data, dict):
-            for monster_list in self.monsters_data.values():
-                if not isinstance(monster_list, list):
-                    continue
-                for monster in monster_list:
-                    if not isinstance(monster, dict):
-                        continue
-                    name = monster.get("name")
-                    if isinstance(name, str):
-                        cleaned = name.strip()
-                        if cleaned:
-                            base_names.add(cleaned)
-        return base_names
+        return self.monsters.names
 
     def _build_splice_generation_map_for_pve(
         self,
@@ -3212,68 +3208,21 @@ class Battles(commands.Cog):
 
         return cleaned_name
 
-    async def _get_splice_pve_monsters_by_level(
-        self,
-        sample_per_generation: int | None = None,
-    ) -> dict[int, list[dict]]:
-        """
-        Build a splice-only PvE pool from splice_combinations.
-        Samples up to N monsters from Gen0, then buckets by power into tiers 1-10.
-        """
-        try:
-            base_monster_names = self._load_base_pve_monster_names()
-        except Exception:
-            return {}
-
-        if not base_monster_names:
-            return {}
-
-        try:
-            async with self.bot.pool.acquire() as conn:
-                completed_rows = await conn.fetch(
-                    """
-                    SELECT id, pet1_default, pet2_default, result_name, hp, attack, defense, element, url, created_at
-                    FROM splice_combinations
-                    ORDER BY created_at ASC, id ASC
-                    """
-                )
-                pending_splice_parent_keys: set[str] = set()
-                splice_requests_exists = await conn.fetchval(
-                    "SELECT to_regclass('public.splice_requests') IS NOT NULL;"
-                )
-                if splice_requests_exists:
-                    pending_parent_rows = await conn.fetch(
-                        """
-                        SELECT DISTINCT parent_name
-                        FROM (
-                            SELECT pet1_default AS parent_name
-                            FROM splice_requests
-                            WHERE status = 'pending'
-                            UNION
-                            SELECT pet2_default AS parent_name
-                            FROM splice_requests
-                            WHERE status = 'pending'
-                        ) pending_parent_names
-                        """
-                    )
-                    pending_splice_parent_keys = (
-                        self._build_pending_splice_parent_keys(pending_parent_rows)
-                    )
-        except Exception:
-            return {}
-
-        if not completed_rows:
-            return {}
+    def _build_splice_generation_buckets(self, base_monster_names, splice) -> dict[int, list[dict]]:
+        """Group usable splice results by generation, see _get_splice_pve_monsters_by_level."""
+        generation_buckets = {generation: [] for generation in self.PVE_SPLICE_GENERATIONS}
+        completed_rows = splice.completed
+        if not base_monster_names or not completed_rows:
+            return generation_buckets
+        pending_splice_parent_keys = self._build_pending_splice_parent_keys(
+            splice.pending_parent_names
+        )
 
         generation_map = self._build_splice_generation_map_for_pve(
             base_monster_names,
             completed_rows,
         )
 
-        target_sample = int(sample_per_generation or self.PVE_SPLICE_SAMPLE_PER_GENERATION)
-        target_sample = max(1, target_sample)
-
-        generation_buckets = {generation: [] for generation in self.PVE_SPLICE_GENERATIONS}
         seen_by_generation = {generation: set() for generation in self.PVE_SPLICE_GENERATIONS}
 
         for row in completed_rows:
@@ -3321,9 +3270,39 @@ class Battles(commands.Cog):
                 }
             )
 
+        return generation_buckets
+
+    async def _get_splice_pve_monsters_by_level(
+        self,
+        sample_per_generation: int | None = None,
+    ) -> dict[int, list[dict]]:
+        """
+        Build a splice-only PvE pool from splice_combinations.
+        Samples up to N monsters from Gen0, then buckets by power into tiers 1-10.
+        """
+        try:
+            monsters = self.monsters
+            splice = await self.bot.content.splice_rows()
+        except Exception:
+            return {}
+
+        target_sample = int(sample_per_generation or self.PVE_SPLICE_SAMPLE_PER_GENERATION)
+        target_sample = max(1, target_sample)
+
+        # Bucketing only depends on the roster and the splice rows, the
+        # sampling below stays per call
+        cached = self.__dict__.get("_splice_generation_buckets")
+        if cached is not None and cached[0] is monsters and cached[1] == splice.version:
+            generation_buckets = cached[2]
+        else:
+            generation_buckets = self._build_splice_generation_buckets(
+                monsters.names, splice
+            )
+            self._splice_generation_buckets = (monsters, splice.version, generation_buckets)
+
         selected_monsters = []
         for generation in self.PVE_SPLICE_GENERATIONS:
-            candidates = generation_buckets[generation]
+            candidates = list(generation_buckets[generation])
             random.shuffle(candidates)
             selected_monsters.extend(candidates[:target_sample])
 
@@ -11051,11 +11030,7 @@ class Battles(commands.Cog):
                             break
                         
                         # Set a temporary cooldown to prevent race conditions
-                        await ctx.bot.redis.execute_command(
-                            "SET", f"cd:{ctx.author.id}:pve",
-                            "pve",
-                            "EX", 60 * 30
-                        )
+                        await ctx.bot.cooldowns.set(USER, ctx.author.id, "pve", 60 * 30)
                         
                         await message.delete()
                         ctx.monster_override = monster_data
@@ -12832,16 +12807,10 @@ class Battles(commands.Cog):
 
             
             # Apply cooldown to both partners at the start
-            await self.bot.redis.execute_command(
-                "SET", f"cd:{ctx.author.id}:couples_battletower start",
-                "couples_battletower start",
-                "EX", 3600
-            )
-            await self.bot.redis.execute_command(
-                "SET", f"cd:{partner_id}:couples_battletower start", 
-                "couples_battletower start",
-                "EX", 3600
-            )
+            for user_id in (ctx.author.id, partner_id):
+                await self.bot.cooldowns.set(
+                    USER, user_id, "couples_battletower start", 3600
+                )
 
 
 
@@ -13169,16 +13138,10 @@ class Battles(commands.Cog):
                  return await ctx.send(_("One of you is already in a fight."))
 
             # Apply cooldown to both partners at the start
-            await self.bot.redis.execute_command(
-                "SET", f"cd:{ctx.author.id}:couples_battletower begin",
-                "couples_battletower begin",
-                "EX", 300
-            )
-            await self.bot.redis.execute_command(
-                "SET", f"cd:{partner_id}:couples_battletower begin", 
-                "couples_battletower begin",
-                "EX", 300
-            )
+            for user_id in (ctx.author.id, partner_id):
+                await self.bot.cooldowns.set(
+                    USER, user_id, "couples_battletower begin", 300
+                )
 
             progress = await self.get_couple_progress(author.id, partner.id)
             if not progress:
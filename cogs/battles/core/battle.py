@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 import asyncio
 import datetime
 from .numbers import scaled_int
+from .replay import UPSERT_REPLAY_SQL, ReplayRecorder, decode_replay
 import uuid
 from collections import deque
 from dataclasses import dataclass, field
@@ -122,9 +123,9 @@ class Battle(ABC):
         self.battle_id = str(uuid.uuid4())
         self.battle_type = self.__class__.__name__
         
-        # Enhanced replay system - store turn-by-turn states
-        self.turn_states = []  # List of detailed battle states per turn
-        self.initial_state = None  # Store initial battle state
+        # Enhanced replay system - keyframe plus per-action deltas
+        self.replay = ReplayRecorder()
+        self._element_to_emoji = None
         
         hp_bar_style = self.normalize_hp_bar_style(
             kwargs.get(
@@ -400,7 +401,27 @@ class Battle(ABC):
             allow_not_found=True,
         )
 
+    @property
+    def display_scheduler(self):
+        cog = getattr(self.bot, "cogs", {}).get("Battles")
+        return getattr(cog, "display_scheduler", None)
+
     async def publish_battle_message(self, **kwargs):
+        """Shows a frame; later frames go through the cog's display scheduler.
+
+        The first message is sent right away since callers keep it, and frames
+        of a finished battle are edited directly once older ones have landed.
+        """
+        scheduler = self.display_scheduler
+        if scheduler is None:
+            return await self.publish_battle_message_now(**kwargs)
+        if self.battle_message and not self.finished:
+            scheduler.submit(self, kwargs)
+            return self.battle_message
+        await scheduler.flush(self)
+        return await self.publish_battle_message_now(**kwargs)
+
+    async def publish_battle_message_now(self, **kwargs):
         if self.battle_message:
             edit_result = await self.edit_with_retry(self.battle_message, **kwargs)
             if edit_result not in (None, False):
@@ -2835,86 +2856,31 @@ class Battle(ABC):
     async def save_battle_to_database(self):
         """Save battle data to database for replay"""
         try:
-            # Initialize the battle_replays table if it doesn't exist
-            await self.initialize_replay_table()
-            
-            battle_data = await self.serialize_enhanced_battle_data()
-            battle_log = self.serialize_battle_log()
-            participants = self.get_participants()
-            
+            replay = self.replay.encode(
+                self.serialize_battle_data(), self.serialize_battle_log()
+            )
             async with self.bot.pool.acquire() as conn:
-                # Check if this battle already exists (upsert logic)
-                existing = await conn.fetchrow(
-                    "SELECT battle_id FROM battle_replays WHERE battle_id = $1",
-                    self.battle_id
+                await conn.execute(
+                    UPSERT_REPLAY_SQL,
+                    self.battle_id,
+                    self.battle_type,
+                    json.dumps(self.get_participants(), cls=DecimalEncoder),
+                    replay,
+                    datetime.datetime.utcnow(),
                 )
-                
-                if existing:
-                    # Update existing record
-                    await conn.execute(
-                        """
-                        UPDATE battle_replays SET 
-                            participants = $2, battle_data = $3, battle_log = $4
-                        WHERE battle_id = $1
-                        """,
-                        self.battle_id,
-                        json.dumps(participants, cls=DecimalEncoder),
-                        json.dumps(battle_data, cls=DecimalEncoder),
-                        json.dumps(battle_log, cls=DecimalEncoder)
-                    )
-                else:
-                    # Insert new record
-                    await conn.execute(
-                        """
-                        INSERT INTO battle_replays (
-                            battle_id, battle_type, participants, battle_data, battle_log, created_at
-                        ) VALUES ($1, $2, $3, $4, $5, $6)
-                        """,
-                        self.battle_id,
-                        self.battle_type,
-                        json.dumps(participants, cls=DecimalEncoder),
-                        json.dumps(battle_data, cls=DecimalEncoder),
-                        json.dumps(battle_log, cls=DecimalEncoder),
-                        datetime.datetime.utcnow()
-                    )
-                
         except Exception as e:
             # Don't let replay saving break the battle
             print(f"Error saving battle replay {self.battle_id}: {e}")
             import traceback
             traceback.print_exc()
     
-    async def initialize_replay_table(self):
-        """Initialize the battle_replays table if it doesn't exist"""
-        try:
-            async with self.bot.pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS battle_replays (
-                        battle_id VARCHAR(36) PRIMARY KEY,
-                        battle_type VARCHAR(50) NOT NULL,
-                        participants JSONB NOT NULL,
-                        battle_data JSONB NOT NULL,
-                        battle_log JSONB NOT NULL,
-                        created_at TIMESTAMP NOT NULL,
-                        CONSTRAINT unique_battle_id UNIQUE (battle_id)
-                    )
-                    """
-                )
-                
-                # Create indexes for better performance
-                await conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_battle_replays_type ON battle_replays (battle_type)"
-                )
-                await conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_battle_replays_created_at ON battle_replays (created_at)"
-                )
-        except Exception as e:
-            print(f"Error initializing battle replay table: {e}")
-    
     @staticmethod
     async def get_battle_replay(bot, battle_id):
-        """Retrieve battle replay data by ID"""
+        """Retrieve battle replay data by ID
+
+        Frames of compact replays are rebuilt lazily as ``turn_states`` is
+        indexed; replays saved before the compact format are plain JSON.
+        """
         try:
             async with bot.pool.acquire() as conn:
                 row = await conn.fetchrow(
@@ -2922,16 +2888,24 @@ class Battle(ABC):
                     battle_id
                 )
                 
-                if row:
-                    return {
-                        'battle_id': row['battle_id'],
-                        'battle_type': row['battle_type'],
-                        'participants': json.loads(row['participants']),
-                        'battle_data': json.loads(row['battle_data']),
-                        'battle_log': json.loads(row['battle_log']),
-                        'created_at': row['created_at']
-                    }
-                return None
+                if not row:
+                    return None
+                if row['replay'] is None:
+                    battle_data = json.loads(row['battle_data'])
+                    battle_log = json.loads(row['battle_log'])
+                else:
+                    battle_data, battle_log, frames = decode_replay(row['replay'])
+                    battle_data['turn_states'] = frames
+                    battle_data['initial_state'] = frames[0] if frames else None
+                    battle_data['has_enhanced_replay'] = True
+                return {
+                    'battle_id': row['battle_id'],
+                    'battle_type': row['battle_type'],
+                    'participants': json.loads(row['participants']),
+                    'battle_data': battle_data,
+                    'battle_log': battle_log,
+                    'created_at': row['created_at']
+                }
         except Exception as e:
             print(f"Error retrieving battle replay {battle_id}: {e}")
             return None
@@ -2986,11 +2960,7 @@ class Battle(ABC):
                     # Get element emoji for this combatant
                     element_emoji = "❓"
                     if hasattr(combatant, 'element') and combatant.element:
-                        # Get element emoji mapping from Battles cog
-                        if hasattr(self.ctx.bot.cogs["Battles"], "emoji_to_element"):
-                            emoji_to_element = self.ctx.bot.cogs["Battles"].emoji_to_element
-                            element_to_emoji = {v: k for k, v in emoji_to_element.items()}
-                            element_emoji = element_to_emoji.get(combatant.element, "❓")
+                        element_emoji = self._element_emoji_map().get(combatant.element, "❓")
                     
                     combatant_state = {
                         'name': actual_name,
@@ -3042,25 +3012,26 @@ class Battle(ABC):
             if hasattr(self, 'current_opponent_index'):
                 state['battle_info']['current_opponent_index'] = self.current_opponent_index
             
-            self.turn_states.append(state)
-            
-            # Store initial state if this is the first capture
-            if self.initial_state is None:
-                self.initial_state = state.copy()
+            self.replay.record(state)
                 
         except Exception as e:
             # Don't let state capture break battles
             print(f"Error capturing turn state for battle {self.battle_id}: {e}")
             import traceback
             traceback.print_exc()
-    
-    async def serialize_enhanced_battle_data(self):
-        """Serialize enhanced battle data including turn states"""
-        base_data = self.serialize_battle_data()
-        base_data['turn_states'] = self.turn_states
-        base_data['initial_state'] = self.initial_state
-        base_data['has_enhanced_replay'] = True
-        
 
-        
-        return base_data
+    def _element_emoji_map(self):
+        """Element -> emoji from the Battles cog, built once per battle."""
+        if self._element_to_emoji is None:
+            emoji_to_element = getattr(self.ctx.bot.cogs["Battles"], "emoji_to_element", {})
+            self._element_to_emoji = {v: k for k, v in emoji_to_element.items()}
+        return self._element_to_emoji
+
+    @property
+    def turn_states(self):
+        """All captured states of this battle, rebuilt from the replay deltas."""
+        return self.replay.frames()
+
+    @property
+    def initial_state(self):
+        return self.replay.keyframe
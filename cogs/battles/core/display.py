@@ -0,0 +1,162 @@
+"""Shared, rate-paced battle message edits.
+
+Battles render a new embed after every action. With several battles running
+in one channel, editing each frame as it is rendered queues the edits behind
+Discord's per-channel limit and stalls the turns that wait on them.
+``DisplayScheduler`` takes the latest frame of each battle instead: a frame
+that has not been sent yet is merged into by a newer one, and one flusher
+task per channel edits the pending messages in turn, at most
+``EDITS_PER_WINDOW`` edits per ``WINDOW`` seconds. Message edits only change
+the fields they pass, so a merged frame keeps e.g. a ``view`` set by an older
+one.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class _Channel:
+    __slots__ = ("pending", "inflight", "edits", "task", "wakeup")
+
+    def __init__(self) -> None:
+        # battle id -> (battle, kwargs, first submission time); insertion order
+        # is the order the battles get edited in
+        self.pending = {}
+        self.inflight = {}
+        self.edits = deque()
+        self.task = None
+        self.wakeup = asyncio.Event()
+
+
+class DisplayScheduler:
+    """Coalesces battle frames and paces their edits per channel."""
+
+    EDITS_PER_WINDOW = 5
+    WINDOW = 5.0
+    LATENCY_SAMPLES = 500
+
+    def __init__(self, *, edits_per_window=None, window=None, clock=time.monotonic) -> None:
+        self.edits_per_window = edits_per_window or self.EDITS_PER_WINDOW
+        self.window = window or self.WINDOW
+        self.clock = clock
+        self._channels = {}
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.edits = 0
+        self.latencies = deque(maxlen=self.LATENCY_SAMPLES)
+
+    @staticmethod
+    def _channel_id(battle):
+        channel = getattr(battle.ctx, "channel", None)
+        return getattr(channel, "id", None)
+
+    def submit(self, battle, kwargs) -> None:
+        """Queues ``kwargs`` as the next edit of the battle's message."""
+        channel_id = self._channel_id(battle)
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = self._channels[channel_id] = _Channel()
+        self.frames_submitted += 1
+
+        previous = channel.pending.get(battle.battle_id)
+        if previous is not None:
+            self.frames_dropped += 1
+            channel.pending[battle.battle_id] = (
+                battle,
+                {**previous[1], **kwargs},
+                previous[2],
+            )
+        else:
+            channel.pending[battle.battle_id] = (battle, kwargs, self.clock())
+
+        channel.wakeup.set()
+        if channel.task is None or channel.task.done():
+            channel.task = asyncio.create_task(self._run(channel_id, channel))
+
+    async def flush(self, battle) -> None:
+        """Drops the battle's pending frame and waits for an edit in flight.
+
+        Called before a battle edits its message directly, so an older frame
+        cannot land after the newer one.
+        """
+        channel = self._channels.get(self._channel_id(battle))
+        if channel is None:
+            return
+        if channel.pending.pop(battle.battle_id, None) is not None:
+            self.frames_dropped += 1
+        inflight = channel.inflight.get(battle.battle_id)
+        if inflight is not None:
+            await asyncio.shield(inflight)
+
+    async def _wait_for_slot(self, channel: _Channel) -> None:
+        while True:
+            now = self.clock()
+            while channel.edits and now - channel.edits[0] >= self.window:
+                channel.edits.popleft()
+            if len(channel.edits) < self.edits_per_window:
+                channel.edits.append(now)
+                return
+            await asyncio.sleep(self.window - (now - channel.edits[0]))
+
+    async def _run(self, channel_id, channel: _Channel) -> None:
+        while True:
+            if not channel.pending:
+                # linger for a window so the edit history keeps pacing the
+                # next burst, then forget the channel
+                channel.wakeup.clear()
+                try:
+                    await asyncio.wait_for(channel.wakeup.wait(), self.window)
+                except asyncio.TimeoutError:
+                    if not channel.pending:
+                        del self._channels[channel_id]
+                        return
+                continue
+            await self._wait_for_slot(channel)
+            if not channel.pending:
+                continue
+            battle_id = next(iter(channel.pending))
+            battle, kwargs, submitted = channel.pending.pop(battle_id)
+            done = channel.inflight[battle_id] = asyncio.get_running_loop().create_future()
+            try:
+                await battle.publish_battle_message_now(**kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Battle %s display update failed", battle_id)
+            else:
+                self.edits += 1
+                self.latencies.append(self.clock() - submitted)
+            finally:
+                del channel.inflight[battle_id]
+                done.set_result(None)
+
+    def metrics(self) -> dict:
+        """Frame counters and edit latency (seconds from first queued frame)."""
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+        return {
+            "frames_submitted": self.frames_submitted,
+            "frames_dropped": self.frames_dropped,
+            "edits": self.edits,
+            "pending": sum(len(channel.pending) for channel in self._channels.values()),
+            "edit_latency_p50": percentile(0.5),
+            "edit_latency_p95": percentile(0.95),
+            "edit_latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+    def close(self) -> None:
+        for channel in self._channels.values():
+            if channel.task is not None:
+                channel.task.cancel()
+        self._channels.clear()
@@ -0,0 +1,195 @@
+"""Compact battle replays: one keyframe plus a delta per action.
+
+``Battle.capture_turn_state`` still builds the full battle state on every log
+entry, but ``ReplayRecorder`` only keeps the first frame and, for every later
+one, an orjson-encoded patch of the fields that changed since the previous
+frame. Saving compresses them with zlib into the ``replay`` bytea column.
+``ReplayFrames`` rebuilds full frames on demand from the nearest checkpoint.
+
+Patches are JSON objects of one of three shapes:
+
+* ``{"v": value}`` replaces the value outright,
+* ``{"d": {key: patch}, "x": [removed keys]}`` patches a dict,
+* ``{"l": {"index": patch}}`` patches a list of unchanged length.
+"""
+from __future__ import annotations
+
+import zlib
+
+from collections.abc import Sequence
+from decimal import Decimal
+
+import orjson
+
+REPLAY_FORMAT = 1
+ZLIB_LEVEL = 6
+
+REPLAY_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS battle_replays (
+    battle_id VARCHAR(36) PRIMARY KEY,
+    battle_type VARCHAR(50) NOT NULL,
+    participants JSONB NOT NULL,
+    battle_data JSONB,
+    battle_log JSONB,
+    replay BYTEA,
+    created_at TIMESTAMP NOT NULL
+);
+ALTER TABLE battle_replays ADD COLUMN IF NOT EXISTS replay BYTEA;
+ALTER TABLE battle_replays ALTER COLUMN battle_data DROP NOT NULL;
+ALTER TABLE battle_replays ALTER COLUMN battle_log DROP NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_battle_replays_type ON battle_replays (battle_type);
+CREATE INDEX IF NOT EXISTS idx_battle_replays_created_at ON battle_replays (created_at);
+"""
+
+UPSERT_REPLAY_SQL = """
+INSERT INTO battle_replays (battle_id, battle_type, participants, replay, created_at)
+VALUES ($1, $2, $3, $4, $5)
+ON CONFLICT (battle_id) DO UPDATE
+SET participants = EXCLUDED.participants, replay = EXCLUDED.replay;
+"""
+
+_SAME = object()
+_MISSING = object()
+_EMPTY_PATCH = {"d": {}}
+
+
+def diff(old, new):
+    """Returns the patch turning ``old`` into ``new``, or ``_SAME``."""
+    if type(old) is dict and type(new) is dict:
+        changed = {}
+        for key, value in new.items():
+            patch = diff(old.get(key, _MISSING), value)
+            if patch is not _SAME:
+                changed[key] = patch
+        removed = [key for key in old if key not in new]
+        if not changed and not removed:
+            return _SAME
+        patch = {"d": changed}
+        if removed:
+            patch["x"] = removed
+        return patch
+    if type(old) is list and type(new) is list and len(old) == len(new):
+        changed = {}
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            patch = diff(old_item, new_item)
+            if patch is not _SAME:
+                changed[str(index)] = patch
+        return {"l": changed} if changed else _SAME
+    if type(old) is type(new) and old == new:
+        return _SAME
+    return {"v": new}
+
+
+def apply_patch(old, patch):
+    """Applies a patch, sharing every unchanged container with ``old``."""
+    if "v" in patch:
+        return patch["v"]
+    if "l" in patch:
+        new = list(old)
+        for index, item_patch in patch["l"].items():
+            index = int(index)
+            new[index] = apply_patch(old[index], item_patch)
+        return new
+    new = dict(old)
+    for key in patch.get("x", ()):
+        new.pop(key, None)
+    for key, value_patch in patch["d"].items():
+        new[key] = apply_patch(old.get(key), value_patch)
+    return new
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+def _dumps(obj) -> bytes:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ReplayFrames(Sequence):
+    """Full replay frames, rebuilt from the keyframe and deltas when read."""
+
+    CHECKPOINT_INTERVAL = 32
+
+    def __init__(self, keyframe, deltas) -> None:
+        self._deltas = deltas
+        self._checkpoints = {} if keyframe is None else {0: keyframe}
+        self._cursor = (0, keyframe)
+
+    def __len__(self) -> int:
+        return len(self._deltas) + 1 if self._checkpoints else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("replay frame index out of range")
+
+        start = index - index % self.CHECKPOINT_INTERVAL
+        while start not in self._checkpoints:
+            start -= self.CHECKPOINT_INTERVAL
+        frame = self._checkpoints[start]
+        cursor_index, cursor_frame = self._cursor
+        if start < cursor_index <= index:
+            start, frame = cursor_index, cursor_frame
+
+        for position in range(start + 1, index + 1):
+            frame = apply_patch(frame, self._deltas[position - 1])
+            if position % self.CHECKPOINT_INTERVAL == 0:
+                self._checkpoints[position] = frame
+        self._cursor = (index, frame)
+        return frame
+
+
+class ReplayRecorder:
+    """Keeps the first frame of a battle and the deltas of all later ones."""
+
+    def __init__(self) -> None:
+        self.keyframe = None
+        self.deltas = []
+        self._last = None
+
+    def __len__(self) -> int:
+        return len(self.deltas) + 1 if self.keyframe is not None else 0
+
+    def record(self, frame) -> None:
+        if self.keyframe is None:
+            self.keyframe = frame
+        else:
+            patch = diff(self._last, frame)
+            # kept serialized, a few hundred bytes instead of nested dicts; as
+            # str because orjson's bytes keep their oversized output buffer
+            self.deltas.append(_dumps(_EMPTY_PATCH if patch is _SAME else patch).decode())
+        self._last = frame
+
+    def frames(self) -> ReplayFrames:
+        return ReplayFrames(
+            orjson.loads(_dumps(self.keyframe)) if self.keyframe is not None else None,
+            [orjson.loads(delta) for delta in self.deltas],
+        )
+
+    def encode(self, battle_data, battle_log) -> bytes:
+        return zlib.compress(
+            _dumps(
+                {
+                    "format": REPLAY_FORMAT,
+                    "battle": battle_data,
+                    "log": battle_log,
+                    "keyframe": self.keyframe,
+                    "deltas": [orjson.Fragment(delta) for delta in self.deltas],
+                }
+            ),
+            ZLIB_LEVEL,
+        )
+
+
+def decode_replay(blob: bytes):
+    """Returns ``(battle_data, battle_log, frames)`` of an encoded replay."""
+    payload = orjson.loads(zlib.decompress(blob))
+    frames = ReplayFrames(payload["keyframe"], payload["deltas"])
+    return payload["battle"], payload["log"], frames
@@ -473,7 +473,10 @@ class PetExtension:
 
     def _tick_timed_multiplier(self, target, effect_key, messages, *, fade_message=None, extra_attrs=None):
         duration_attr = f'{effect_key}_duration'
-        turns_left = int(getattr(target, duration_attr, 0) or 0)
+        turns_left = getattr(target, duration_attr, 0)
+        if not turns_left:
+            return
+        turns_left = int(turns_left)
         if turns_left <= 0:
             return
 
@@ -486,7 +489,10 @@ class PetExtension:
         setattr(target, duration_attr, turns_left - 1)
 
     def _tick_simple_duration(self, target, attr_name, messages, *, fade_message=None, clear_attrs=None):
-        turns_left = int(getattr(target, attr_name, 0) or 0)
+        turns_left = getattr(target, attr_name, 0)
+        if not turns_left:
+            return
+        turns_left = int(turns_left)
         if turns_left <= 0:
             return
 
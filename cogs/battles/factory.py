@@ -1,5 +1,4 @@
 # battles/factory.py
-import json
 import random
 from decimal import Decimal
 import asyncio
@@ -124,34 +123,15 @@ class BattleFactory:
         scaled_monster["pve_stat_multiplier"] = float(scale_multiplier)
         return scaled_monster
 
-    def _get_monsters_data(self, ctx):
+    def _get_monster_index(self, ctx):
         battle_cog = ctx.bot.cogs.get("Battles") if hasattr(ctx.bot, "cogs") else None
-        monsters_data = getattr(battle_cog, "monsters_data", None) if battle_cog else None
-        if isinstance(monsters_data, dict) and monsters_data:
-            return monsters_data
-
-        try:
-            with open("monsters.json", "r", encoding="utf-8") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        if battle_cog is not None:
+            return battle_cog.monsters
+        return ctx.bot.content.monsters()
 
     def _get_monster_data_by_name(self, ctx, monster_name):
-        target_name = str(monster_name or "").strip().lower()
-        if not target_name:
-            return None
-
-        monsters_data = self._get_monsters_data(ctx)
-        if not isinstance(monsters_data, dict):
-            return None
-
-        for monster_list in monsters_data.values():
-            if not isinstance(monster_list, list):
-                continue
-            for monster in monster_list:
-                if str(monster.get("name", "")).strip().lower() == target_name:
-                    return dict(monster)
-        return None
+        monster = self._get_monster_index(ctx).get(monster_name)
+        return dict(monster) if monster is not None else None
 
     def _build_jury_scale_snapshot_from_combatants(self, player_combatant, pet_combatant=None):
         player_hp = Decimal(str(getattr(player_combatant, "max_hp", getattr(player_combatant, "hp", 0)) or 0))
@@ -525,9 +505,12 @@ class BattleFactory:
         if not normalized_members:
             raise ValueError("Team requires at least one member")
 
+        raidstats = await ctx.bot.get_raidstats_many(normalized_members)
         combatants = []
         for member in normalized_members:
-            player_combatant = await self.create_player_combatant(ctx, member, include_pet=allow_pets)
+            player_combatant = await self.create_player_combatant(
+                ctx, member, include_pet=allow_pets, raidstats=raidstats.get(member.id)
+            )
             combatants.append(player_combatant)
 
             if allow_pets:
@@ -785,10 +768,13 @@ class BattleFactory:
         
         # Create player team
         player_combatants = []
+        raidstats = await self.bot.get_raidstats_many(party_members)
         async with self.bot.pool.acquire() as conn:
             for member in party_members:
                 # Create player combatant
-                player_combatant = await self.create_player_combatant(ctx, member, include_pet=True)
+                player_combatant = await self.create_player_combatant(
+                    ctx, member, include_pet=True, raidstats=raidstats.get(member.id)
+                )
                 player_combatants.append(player_combatant)
                 
                 # Add pet if available and enabled
@@ -931,8 +917,12 @@ class BattleFactory:
         team2 = Team("B", [p2_combatant])
         return BrawlBattle(ctx, [team1, team2], **kwargs)
 
-    async def create_player_combatant(self, ctx, player, include_pet=False):
-        """Create a combatant object for a player with full stats"""
+    async def create_player_combatant(self, ctx, player, include_pet=False, raidstats=None):
+        """Create a combatant object for a player with full stats
+
+        ``raidstats`` takes the player's entry from ``Bot.get_raidstats_many``
+        when a whole team is built at once.
+        """
         if not player:
             raise ValueError("Player cannot be None")
             
@@ -974,13 +964,17 @@ class BattleFactory:
             stathp = result['stathp'] * 50
             total_health = health + (level * 15) + stathp
 
-            # Add equipped amulet HP
-            amulet = await conn.fetchrow('SELECT hp FROM amulets WHERE user_id=$1 AND equipped=true', player.id)
-            if amulet:
-                total_health += amulet['hp']
-            
-            # Get damage and armor
-            dmg, deff = await ctx.bot.get_raidstats(player, conn=conn)
+            if raidstats is not None:
+                total_health += raidstats.amulet_hp
+                dmg, deff = raidstats.damage, raidstats.armor
+            else:
+                # Add equipped amulet HP
+                amulet = await conn.fetchrow('SELECT hp FROM amulets WHERE user_id=$1 AND equipped=true', player.id)
+                if amulet:
+                    total_health += amulet['hp']
+
+                # Get damage and armor
+                dmg, deff = await ctx.bot.get_raidstats(player, conn=conn)
             
             equipped_items = await conn.fetch(
                 "SELECT ai.type, ai.damage, ai.armor, ai.element FROM profile p "
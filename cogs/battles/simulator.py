@@ -0,0 +1,357 @@
+"""Headless battle simulation for balance work.
+
+Runs the real battle types (PvE, raid-style PvP, tower and city war) on plain
+combatant specs, with no Discord context, database, display or sleeps. Every
+battle seeds the global ``random`` module from the base seed and its index, so
+results do not depend on how the battles are split across worker processes.
+
+    report = simulate(
+        SimulationSpec(
+            mode="pvp",
+            teams=(
+                (CombatantSpec("Mage", hp=2400, damage=310, armor=120),),
+                (CombatantSpec("Tank", hp=3200, damage=220, armor=210),),
+            ),
+            battles=2000,
+        ),
+        workers=4,
+    )
+    print(report.format())
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+import statistics
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from .core.combatant import Combatant
+from .core.team import Team
+from .extensions.classes import ClassBuffExtension
+from .extensions.elements import ElementExtension
+from .extensions.pets import PetExtension
+from .types.city_war import CityWarBattle
+from .types.pve import PvEBattle
+from .types.raid import RaidBattle
+from .types.tower import TowerBattle
+
+MODES = {
+    "pve": PvEBattle,
+    "pvp": RaidBattle,
+    "tower": TowerBattle,
+    "citywar": CityWarBattle,
+}
+DEFAULT_MAX_TURNS = 500
+CHUNK_SIZE = 50
+
+
+@dataclass(frozen=True)
+class CombatantSpec:
+    """Stats of one simulated combatant.
+
+    ``owner`` names the combatant in the same team a pet belongs to, and
+    ``attributes`` are set on the combatant after creation (for example
+    ``{"city_role": "structure"}`` or class evolutions).
+    """
+
+    name: str
+    hp: float
+    damage: float
+    armor: float
+    element: str = "Unknown"
+    luck: float = 50
+    is_pet: bool = False
+    owner: Optional[str] = None
+    pet_skills: Tuple[str, ...] = ()
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class SimulationSpec:
+    mode: str
+    teams: Tuple[Tuple[CombatantSpec, ...], ...]
+    battles: int = 1000
+    seed: int = 0
+    max_turns: int = DEFAULT_MAX_TURNS
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class BattleResult:
+    seed: int
+    winner: Optional[int]
+    turns: int
+    damage: Tuple[float, ...]
+
+
+@dataclass
+class SimulationReport:
+    spec: SimulationSpec
+    results: List[BattleResult]
+    elapsed: float
+
+    @property
+    def turns(self) -> int:
+        return sum(result.turns for result in self.results)
+
+    @property
+    def turns_per_second(self) -> float:
+        return self.turns / self.elapsed if self.elapsed else 0.0
+
+    def win_rates(self) -> Dict[str, float]:
+        total = len(self.results) or 1
+        winners = [result.winner for result in self.results]
+        rates = {
+            f"team_{index}": winners.count(index) / total
+            for index in range(len(self.spec.teams))
+        }
+        rates["draw"] = winners.count(None) / total
+        return rates
+
+    def turn_distribution(self) -> Dict[str, float]:
+        return _distribution([result.turns for result in self.results])
+
+    def damage_distribution(self) -> Dict[str, Dict[str, float]]:
+        return {
+            f"team_{index}": _distribution(
+                [result.damage[index] for result in self.results]
+            )
+            for index in range(len(self.spec.teams))
+        }
+
+    def format(self) -> str:
+        win_rates = self.win_rates().items()
+        lines = [
+            f"{self.spec.mode}: {len(self.results)} battles, {self.turns} turns in"
+            f" {self.elapsed:.2f}s ({self.turns_per_second:,.0f} turns/s)",
+            "win rate: " + ", ".join(f"{name} {rate:.1%}" for name, rate in win_rates),
+            "turns: " + _format_distribution(self.turn_distribution()),
+        ]
+        for name, distribution in self.damage_distribution().items():
+            lines.append(f"damage by {name}: " + _format_distribution(distribution))
+        return "\n".join(lines)
+
+
+def _distribution(values) -> Dict[str, float]:
+    if not values:
+        return {"mean": 0.0, "p10": 0.0, "p50": 0.0, "p90": 0.0, "min": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def percentile(fraction):
+        return float(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))])
+
+    return {
+        "mean": float(statistics.fmean(ordered)),
+        "p10": percentile(0.1),
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "min": float(ordered[0]),
+        "max": float(ordered[-1]),
+    }
+
+
+def _format_distribution(distribution) -> str:
+    return ", ".join(f"{name} {value:,.1f}" for name, value in distribution.items())
+
+
+class HeadlessBattleMixin:
+    """Turns every Discord, database and display call of a battle into a no-op.
+
+    Battles end as a draw once ``max_turns`` turns have been played, through
+    ``is_timed_out`` like the wall-clock limit they replace.
+    """
+
+    max_turns = DEFAULT_MAX_TURNS
+    turns_played = 0
+
+    async def save_battle_to_database(self):
+        return None
+
+    async def capture_turn_state(self, action_message):
+        return None
+
+    async def publish_battle_message(self, **kwargs):
+        return None
+
+    async def send_with_retry(self, **kwargs):
+        return None
+
+    async def edit_with_retry(self, message, **kwargs):
+        return None
+
+    async def create_battle_embed(self):
+        return None
+
+    async def create_battle_embeds(self):
+        return []
+
+    async def update_display(self, *args, **kwargs):
+        return None
+
+    async def is_timed_out(self):
+        return self.turns_played >= self.max_turns
+
+    async def end_battle(self):
+        self.finished = True
+        return None
+
+
+_HEADLESS_TYPES = {}
+
+
+def headless_battle_type(battle_type):
+    """The headless subclass of a battle type."""
+    headless = _HEADLESS_TYPES.get(battle_type)
+    if headless is None:
+        headless = _HEADLESS_TYPES[battle_type] = type(
+            f"Headless{battle_type.__name__}", (HeadlessBattleMixin, battle_type), {}
+        )
+    return headless
+
+
+def headless_context():
+    """A stand-in command context with the extensions the battles look up."""
+    battles_cog = SimpleNamespace(
+        element_ext=ElementExtension(),
+        emoji_to_element={},
+        battle_factory=SimpleNamespace(
+            pet_ext=PetExtension(), class_ext=ClassBuffExtension()
+        ),
+    )
+    cogs = {"Battles": battles_cog}
+    bot = SimpleNamespace(
+        cogs=cogs,
+        get_cog=cogs.get,
+        config=SimpleNamespace(game=SimpleNamespace(primary_colour=0)),
+    )
+    author = SimpleNamespace(id=0, display_name="Simulator", mention="Simulator")
+    return SimpleNamespace(bot=bot, author=author, channel=None, send=None)
+
+
+def build_teams(spec: SimulationSpec, pet_ext: PetExtension) -> List[Team]:
+    teams = []
+    user_id = 0
+    for index, combatant_specs in enumerate(spec.teams):
+        users = {}
+        combatants = []
+        for combatant_spec in combatant_specs:
+            user_id += 1
+            user = SimpleNamespace(id=user_id, display_name=combatant_spec.name)
+            users[combatant_spec.name] = user
+            combatant = Combatant(
+                user,
+                combatant_spec.hp,
+                combatant_spec.hp,
+                combatant_spec.damage,
+                combatant_spec.armor,
+                element=combatant_spec.element,
+                luck=combatant_spec.luck,
+                is_pet=combatant_spec.is_pet,
+                owner=users.get(combatant_spec.owner),
+                name=combatant_spec.name,
+            )
+            for attribute, value in combatant_spec.attributes.items():
+                setattr(combatant, attribute, value)
+            if combatant_spec.pet_skills:
+                pet_ext.apply_skill_effects(combatant, list(combatant_spec.pet_skills))
+            combatants.append(combatant)
+        teams.append(Team(f"Team {index}", combatants))
+    for team in teams:
+        for combatant in team.combatants:
+            combatant.team = team
+            combatant.enemy_team = next(other for other in teams if other is not team)
+    return teams
+
+
+def _winner(teams) -> Optional[int]:
+    alive = [index for index, team in enumerate(teams) if not team.is_defeated()]
+    return alive[0] if len(alive) == 1 else None
+
+
+async def run_battle(spec: SimulationSpec, seed: int, ctx=None) -> BattleResult:
+    """Plays one battle of ``spec`` to the end."""
+    random.seed(seed)
+    ctx = ctx or headless_context()
+    pet_ext = ctx.bot.cogs["Battles"].battle_factory.pet_ext
+    teams = build_teams(spec, pet_ext)
+    starting_hp = [sum(Decimal(c.hp) for c in team.combatants) for team in teams]
+
+    battle = headless_battle_type(MODES[spec.mode])(ctx, teams, **spec.options)
+    battle.max_turns = spec.max_turns
+    await battle.start_battle()
+    while not await battle.is_battle_over():
+        if not await battle.process_turn():
+            break
+        battle.turns_played += 1
+    await battle.end_battle()
+
+    lost = []
+    for start, team in zip(starting_hp, battle.teams):
+        remaining = sum(max(Decimal(0), c.hp) for c in team.combatants)
+        lost.append(float(max(Decimal(0), start - remaining)))
+    damage = tuple(sum(lost) - own for own in lost)
+    if battle.turns_played >= spec.max_turns:
+        winner = None
+    else:
+        winner = _winner(battle.teams)
+    return BattleResult(
+        seed=seed, winner=winner, turns=battle.turns_played, damage=damage
+    )
+
+
+@contextlib.contextmanager
+def _instant_sleep():
+    # the battle types pace turns with module-level asyncio.sleep calls
+    sleep = asyncio.sleep
+
+    async def no_sleep(delay=0, result=None):
+        return await sleep(0, result)
+
+    asyncio.sleep = no_sleep
+    try:
+        yield
+    finally:
+        asyncio.sleep = sleep
+
+
+def battle_seed(spec: SimulationSpec, index: int) -> int:
+    return spec.seed * 1_000_003 + index
+
+
+def run_chunk(spec: SimulationSpec, indices) -> List[BattleResult]:
+    """Runs the battles at ``indices`` of ``spec`` in this process."""
+
+    async def run():
+        ctx = headless_context()
+        return [
+            await run_battle(spec, battle_seed(spec, index), ctx) for index in indices
+        ]
+
+    with _instant_sleep():
+        return asyncio.run(run())
+
+
+def simulate(spec: SimulationSpec, *, workers: int = 1) -> SimulationReport:
+    """Runs ``spec.battles`` battles, across ``workers`` processes if above one."""
+    if spec.mode not in MODES:
+        raise ValueError(f"Unknown simulation mode: {spec.mode}")
+    chunks = [
+        range(start, min(start + CHUNK_SIZE, spec.battles))
+        for start in range(0, spec.battles, CHUNK_SIZE)
+    ]
+    started = time.perf_counter()
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(run_chunk, [spec] * len(chunks), chunks))
+    else:
+        parts = [run_chunk(spec, chunk) for chunk in chunks]
+    elapsed = time.perf_counter() - started
+    results = [result for part in parts for result in part]
+    return SimulationReport(spec=spec, results=results, elapsed=elapsed)
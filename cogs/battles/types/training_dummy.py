@@ -86,7 +86,9 @@ class TrainingDummyBattle(PvEBattle):
         started = await super().start_battle()
         if self.battle_message is not None:
             self.control_view.message = self.battle_message
-            await self.edit_with_retry(self.battle_message, view=self.control_view)
+            # through the scheduler, a frame still pending there would
+            # otherwise be edited after the view
+            await self.publish_battle_message(view=self.control_view)
         return started
 
     async def create_battle_embed(self):
@@ -33,6 +33,7 @@ from classes.converters import (
     IntGreaterThan,
     MemberWithCharacter,
 )
+from classes.order_book import BuyOrderBook
 from utils.checks import has_char
 from utils.i18n import _, locale_doc
 
@@ -49,8 +50,13 @@ class BuyOrders(commands.Cog):
         self.crate_emotes = None
         if hasattr(self.bot.cogs.get("Crates", None), "emotes"):
             self.crate_emotes = self.bot.cogs["Crates"].emotes
+        self.book = BuyOrderBook(self.bot)
         self._init_db.start()
 
+    def cog_unload(self):
+        self._init_db.cancel()
+        asyncio.create_task(self.book.close())
+
     @tasks.loop(count=1)
     async def _init_db(self):
         """Create necessary database tables if they don't exist."""
@@ -101,6 +107,9 @@ class BuyOrders(commands.Cog):
                 );
             """)
 
+        # Load the open orders and follow changes to them
+        await self.book.start()
+
     @_init_db.before_loop
     async def before_init_db(self):
         await self.bot.wait_until_ready()
@@ -130,6 +139,7 @@ class BuyOrders(commands.Cog):
             f"`{ctx.clean_prefix}buyorder list` - List all active buy orders\n"
             f"`{ctx.clean_prefix}buyorder history` - View your buy order history\n"
             f"`{ctx.clean_prefix}buyorder fulfill` - Fulfill a buy order\n"
+            f"`{ctx.clean_prefix}buyorder match` - Find the best orders for your items\n"
             f"`{ctx.clean_prefix}buyorder search` - Search for buy orders\n"
         ))
 
@@ -958,26 +968,18 @@ class BuyOrders(commands.Cog):
                     if weapon_order['user_id'] == ctx.author.id:
                         return await ctx.send(_("You cannot fulfill your own buy order."))
 
-                    # Get user's owned weapons
-                    owned_weapons = await conn.fetch(
-                        'SELECT * FROM allitems WHERE "owner"=$1 AND "type"=$2;',
+                    # Get the user's weapons within the order's stat range,
+                    # shields use the armor column and other weapons damage
+                    stat_column = "armor" if weapon_order['weapon_type'] == 'shield' else "damage"
+                    matching_weapons = await conn.fetch(
+                        f'SELECT * FROM allitems WHERE "owner"=$1 AND "type"=$2 AND'
+                        f' "{stat_column}" BETWEEN $3 AND $4 ORDER BY "id";',
                         ctx.author.id,
-                        weapon_order['weapon_type']
+                        weapon_order['weapon_type'].capitalize(),
+                        weapon_order['min_stat'],
+                        weapon_order['max_stat']
                     )
 
-                    # Filter weapons that match the buy order criteria
-                    matching_weapons = []
-                    for weapon in owned_weapons:
-                        # Check the appropriate stat column based on weapon type
-                        if weapon_order['weapon_type'] == 'shield':
-                            # Shields use armor column
-                            if weapon_order['min_stat'] <= weapon['armor'] <= weapon_order['max_stat']:
-                                matching_weapons.append(weapon)
-                        else:
-                            # Other weapons use damage column
-                            if weapon_order['min_stat'] <= weapon['damage'] <= weapon_order['max_stat']:
-                                matching_weapons.append(weapon)
-
                     if not matching_weapons:
                         return await ctx.send(
                             _("You don't have any {type} weapons with stats between {min_stat} and {max_stat}.").format(
@@ -1469,6 +1471,100 @@ class BuyOrders(commands.Cog):
             return "📦"
 
 
+    @has_char()
+    @buyorder.command(name="match", brief=_("Find the best buy orders for your items"))
+    @locale_doc
+    async def buyorder_match(self, ctx):
+        _("""Find the highest paying buy orders for the weapons and crates you own.""")
+        try:
+            await self.book.ensure_ready()
+            items = await self.bot.pool.fetch(
+                'SELECT "id", "type", "damage", "armor" FROM allitems WHERE "owner"=$1;',
+                ctx.author.id
+            )
+            weapon_matches = self.book.match_weapons(
+                (
+                    (
+                        item["id"],
+                        item["type"].lower(),
+                        item["armor"] if item["type"] == "Shield" else item["damage"]
+                    )
+                    for item in items
+                ),
+                exclude_user=ctx.author.id
+            )
+
+            # Group the matched weapons by order
+            matched_orders = {}
+            for item_id, order in weapon_matches:
+                matched_orders.setdefault(order.id, (order, []))[1].append(item_id)
+
+            crate_matches = []
+            for crate_type in self.book.crate_bands:
+                owned = ctx.character_data.get(f"crates_{crate_type}") or 0
+                for order in self.book.crate_orders(crate_type):
+                    if owned <= 0:
+                        break
+                    if order.user_id == ctx.author.id:
+                        continue
+                    amount = min(owned, order.remaining)
+                    crate_matches.append((order, amount))
+                    owned -= amount
+
+            if not matched_orders and not crate_matches:
+                return await ctx.send(_("None of your items match an active buy order."))
+
+            total = sum(
+                order.price * len(item_ids) for order, item_ids in matched_orders.values()
+            ) + sum(order.price * amount for order, amount in crate_matches)
+            embed = discord.Embed(
+                title=_("Best Buy Orders For Your Items"),
+                color=discord.Color.gold(),
+                description=_("Selling everything below would earn you **${total}**.").format(total=total)
+            )
+
+            fields = 0
+            for order, item_ids in sorted(
+                matched_orders.values(), key=lambda match: -match[0].price
+            ):
+                if fields == 20:
+                    break
+                embed.add_field(
+                    name=_("Weapon Order #{id}").format(id=order.id),
+                    value=_(
+                        "**Type:** {weapon_type} | **Price:** ${price} each\n"
+                        "**Your items:** {items}"
+                    ).format(
+                        weapon_type=order.item_type.title(),
+                        price=order.price,
+                        items=", ".join(str(item_id) for item_id in item_ids)
+                    ),
+                    inline=False
+                )
+                fields += 1
+            for order, amount in crate_matches:
+                if fields == 25:
+                    break
+                crate_emoji = await self.get_crate_emoji(order.item_type)
+                embed.add_field(
+                    name=_("Crate Order #{id}").format(id=order.id),
+                    value=_("{emoji} {amount}x {crate_type} | **Price:** ${price} each").format(
+                        emoji=crate_emoji,
+                        amount=amount,
+                        crate_type=order.item_type.title(),
+                        price=order.price
+                    ),
+                    inline=False
+                )
+                fields += 1
+
+            embed.set_footer(text=_("Use {prefix}buyorder fulfill <id> to fulfill an order").format(
+                prefix=ctx.clean_prefix
+            ))
+            await ctx.send(embed=embed)
+        except Exception as e:
+            await ctx.send(e)
+
     @has_char()
     @buyorder.command(name="search", brief=_("Search for buy orders"))
     @locale_doc
@@ -1496,7 +1592,7 @@ class BuyOrders(commands.Cog):
         try:
             # Parse search parameters
             params = {}
-            sort_by = "created_at DESC"
+            sort_by = "newest"
             order_type = None
             
             if query:
@@ -1559,115 +1655,23 @@ class BuyOrders(commands.Cog):
                                 return await ctx.send(_("Price must be a number, e.g. price:5000"))
                     elif key == 'sort':
                         if value in ['price', 'p']:
-                            sort_by = "price ASC"
-                            if order_type == 'crate':
-                                sort_by = "price_each ASC"
+                            sort_by = "price"
                         elif value in ['price_desc', 'pd']:
-                            sort_by = "price DESC"
-                            if order_type == 'crate':
-                                sort_by = "price_each DESC"
+                            sort_by = "price_desc"
                         elif value in ['newest', 'new', 'n']:
-                            sort_by = "created_at DESC"
+                            sort_by = "newest"
                         elif value in ['oldest', 'old', 'o']:
-                            sort_by = "created_at ASC"
-            
-            # Build queries based on the parameters
-            weapon_conditions = ["active = TRUE"]
-            crate_conditions = ["active = TRUE"]
-            weapon_params = []
-            crate_params = []
-            param_index = 1
-            
-            # Add conditions based on parsed parameters
-            if 'weapon_type' in params:
-                weapon_conditions.append(f"weapon_type ILIKE ${param_index}")
-                weapon_params.append(f"%{params['weapon_type']}%")
-                param_index += 1
-            
-            if 'crate_type' in params:
-                crate_conditions.append(f"crate_type ILIKE ${param_index}")
-                crate_params.append(f"%{params['crate_type']}%")
-                param_index += 1
-            
-            if 'min_stat' in params:
-                weapon_conditions.append(f"min_stat >= ${param_index}")
-                weapon_params.append(params['min_stat'])
-                param_index += 1
-            
-            if 'max_stat' in params:
-                weapon_conditions.append(f"max_stat <= ${param_index}")
-                weapon_params.append(params['max_stat'])
-                param_index += 1
-            
-            if 'min_price' in params:
-                weapon_conditions.append(f"price >= ${param_index}")
-                weapon_params.append(params['min_price'])
-                crate_conditions.append(f"price_each >= ${param_index}")
-                crate_params.append(params['min_price'])
-                param_index += 1
-            
-            if 'max_price' in params:
-                weapon_conditions.append(f"price <= ${param_index}")
-                weapon_params.append(params['max_price'])
-                crate_conditions.append(f"price_each <= ${param_index}")
-                crate_params.append(params['max_price'])
-                param_index += 1
-            
-            # Create SQL queries
-            weapon_query = f"""
-            SELECT 
-                w.id, 
-                w.user_id, 
-                w.weapon_type, 
-                w.min_stat, 
-                w.max_stat, 
-                w.price, 
-                w.quantity, 
-                w.quantity_filled, 
-                w.created_at,
-                p."user" 
-            FROM 
-                weapon_buy_orders w 
-            JOIN 
-                profile p ON w.user_id = p."user" 
-            WHERE 
-                {' AND '.join(weapon_conditions)} 
-            ORDER BY 
-                {sort_by} 
-            LIMIT 30;
-            """
-            
-            crate_query = f"""
-            SELECT 
-                c.id, 
-                c.user_id, 
-                c.crate_type, 
-                c.price_each, 
-                c.quantity, 
-                c.quantity_filled, 
-                c.created_at,
-                p."user" 
-            FROM 
-                crate_buy_orders c 
-            JOIN 
-                profile p ON c.user_id = p."user" 
-            WHERE 
-                {' AND '.join(crate_conditions)} 
-            ORDER BY 
-                {sort_by} 
-            LIMIT 30;
-            """
-            
-            # Execute queries
-            async with self.bot.pool.acquire() as conn:
-                weapon_orders = []
-                crate_orders = []
-                
-                if order_type != 'crate':
-                    weapon_orders = await conn.fetch(weapon_query, *weapon_params)
-                
-                if order_type != 'weapon':
-                    crate_orders = await conn.fetch(crate_query, *crate_params)
+                            sort_by = "oldest"
+            
+            # Look the orders up in the order book
+            await self.book.ensure_ready()
+            weapon_orders, crate_orders = self.book.search(
+                kind=order_type,
+                sort=sort_by,
+                **params
+            )
+            weapon_orders = [order.as_record() for order in weapon_orders]
+            crate_orders = [order.as_record() for order in crate_orders]
             
             # Initialize pages
             pages = []
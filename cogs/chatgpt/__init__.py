@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import ast
+import asyncio
+import bisect
 import difflib
+import hashlib
+import itertools
 import json
+import math
+import os
+import pickle
 import re
 import textwrap
+import threading
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable
 
@@ -50,6 +59,11 @@ FUZZY_TERM_CUTOFF = 0.74
 QUERY_NORMALIZATION_CUTOFF = 0.74
 COMPACT_MATCH_MIN_LENGTH = 8
 MAX_GLOSSARY_PHRASES = 4000
+MAX_CANDIDATE_FILES = 96
+BM25_K1 = 1.2
+BM25_B = 0.75
+INDEX_CACHE_PATH = Path(".cache") / "chatgpt_repo_index.pickle"
+INDEX_CACHE_VERSION = 1
 SOURCE_EXTENSIONS = {".py", ".md", ".json", ".toml", ".sql"}
 ROOT_SOURCE_FILES = {"README.md", "config.py", "idlerpg.py", "launcher.py"}
 SOURCE_DIRS = {"cogs", "classes", "utils", "scripts", "tests"}
@@ -406,6 +420,122 @@ class RepoSourceRecord:
     text: str
 
 
+@dataclass
+class RepoSourceEntry:
+    path_text: str
+    mtime_ns: int
+    size: int
+    digest: str
+    text: str
+    text_phrases: list[str]
+    term_counts: dict[str, int]
+    imported_symbol_paths: dict[str, str] | None
+    python_blocks: list[tuple[int, int, str, str, list[str]]]
+    named_value_blocks: list[tuple[int, int, str, str]]
+
+
+class RepoTermIndex:
+    """Postings lists over source tokens, ranking whole files with BM25."""
+
+    def __init__(self, postings: dict[str, dict[str, int]], doc_lengths: dict[str, int]):
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self.avg_doc_length = (sum(doc_lengths.values()) / len(doc_lengths)) if doc_lengths else 1.0
+        self._matching_tokens: dict[str, list[str]] = {}
+        self._line_texts_by_path: dict[str, list[tuple[str, list[int]]]] = {}
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[RepoSourceEntry]) -> RepoTermIndex:
+        postings: dict[str, dict[str, int]] = {}
+        doc_lengths: dict[str, int] = {}
+        for entry in entries:
+            doc_lengths[entry.path_text] = max(1, sum(entry.term_counts.values()))
+            for token, count in entry.term_counts.items():
+                postings.setdefault(token, {})[entry.path_text] = count
+        return cls(postings, doc_lengths)
+
+    def _tokens_for_term(self, term: str) -> list[str]:
+        # query terms match inside tokens, the same way the block scoring counts them
+        tokens = self._matching_tokens.get(term)
+        if tokens is None:
+            tokens = [token for token in self.postings if term in token]
+            self._matching_tokens[term] = tokens
+        return tokens
+
+    def term_frequencies(self, term: str) -> dict[str, int]:
+        frequencies: dict[str, int] = {}
+        for token in self._tokens_for_term(term):
+            for path_text, count in self.postings[token].items():
+                frequencies[path_text] = frequencies.get(path_text, 0) + count
+
+        if len(term) >= COMPACT_MATCH_MIN_LENGTH and term.isalpha():
+            # compact matches, e.g. "battletower" against battle_tower
+            for split in range(2, len(term) - 1):
+                left = self.postings.get(term[:split])
+                right = self.postings.get(term[split:])
+                if not left or not right:
+                    continue
+                for path_text in left.keys() & right.keys():
+                    count = min(left[path_text], right[path_text])
+                    frequencies[path_text] = max(frequencies.get(path_text, 0), count)
+        return frequencies
+
+    def _line_texts(self, path_text: str, text: str) -> list[tuple[str, list[int]]]:
+        """The casefolded and the compacted lines of a file, each joined with their offsets."""
+        line_texts = self._line_texts_by_path.get(path_text)
+        if line_texts is None:
+            lowered_lines = [line.casefold() for line in text.splitlines()]
+            compact_lines = [re.sub(r"[\s_-]+", "", line) for line in lowered_lines]
+            line_texts = [
+                ("\n".join(lines), list(itertools.accumulate((len(line) + 1 for line in lines), initial=0)))
+                for lines in (lowered_lines, compact_lines)
+            ]
+            self._line_texts_by_path[path_text] = line_texts
+        return line_texts
+
+    def matching_lines(self, path_text: str, text: str, terms: list[str], phrases: list[str]) -> list[int]:
+        """Indices of the lines _line_matches_query accepts, found without a per-line scan."""
+        (lowered, lowered_starts), (compact, compact_starts) = self._line_texts(path_text, text)
+        matches: set[int] = set()
+
+        def collect(haystack: str, starts: list[int], needle: str) -> None:
+            position = haystack.find(needle)
+            while position != -1:
+                line_index = bisect.bisect_right(starts, position) - 1
+                matches.add(line_index)
+                position = haystack.find(needle, starts[line_index + 1])
+
+        for phrase in phrases:
+            for form in _phrase_forms(phrase):
+                collect(lowered, lowered_starts, form)
+        for term in terms:
+            if not term:
+                continue
+            if term.isdigit():
+                for match in re.finditer(rf"(?<!\d){re.escape(term)}(?!\d)", lowered):
+                    matches.add(bisect.bisect_right(lowered_starts, match.start()) - 1)
+                continue
+            collect(lowered, lowered_starts, term)
+            if len(term) >= COMPACT_MATCH_MIN_LENGTH and term.isalpha():
+                collect(compact, compact_starts, term)
+        return sorted(matches)
+
+    def rank(self, terms: Iterable[str]) -> list[tuple[float, str]]:
+        doc_count = len(self.doc_lengths)
+        scores: dict[str, float] = {}
+        for term in dict.fromkeys(terms):
+            frequencies = self.term_frequencies(term)
+            if not frequencies:
+                continue
+            idf = math.log(1 + (doc_count - len(frequencies) + 0.5) / (len(frequencies) + 0.5))
+            for path_text, count in frequencies.items():
+                length_norm = 1 - BM25_B + BM25_B * self.doc_lengths[path_text] / self.avg_doc_length
+                scores[path_text] = scores.get(path_text, 0.0) + idf * count * (BM25_K1 + 1) / (
+                    count + BM25_K1 * length_norm
+                )
+        return sorted(((score, path_text) for path_text, score in scores.items()), reverse=True)
+
+
 @dataclass
 class RepoSearchIndex:
     repo_root: Path
@@ -417,6 +547,7 @@ class RepoSearchIndex:
     python_imported_symbol_paths: dict[str, dict[str, str]]
     source_text_by_path: dict[str, str]
     repo_paths_by_basename: dict[str, list[str]]
+    term_index: RepoTermIndex | None = None
 
 
 def _normalize_repo_path(path: Path, repo_root: Path) -> str:
@@ -667,6 +798,8 @@ def _best_glossary_phrase_match(
         phrase_tokens = phrase.split()
         if len(phrase_tokens) != len(query_tokens):
             continue
+        if not any(query_token == phrase_token for query_token, phrase_token in zip(query_tokens, phrase_tokens)):
+            continue
 
         ratios = [
             1.0 if query_token == phrase_token else difflib.SequenceMatcher(None, query_token, phrase_token).ratio()
@@ -843,6 +976,11 @@ def _phrase_forms(phrase: str) -> set[str]:
     }
 
 
+@lru_cache(maxsize=512)
+def _compact_text(text: str) -> str:
+    return re.sub(r"[\s_-]+", "", text)
+
+
 def _count_term_occurrences(text: str, term: str) -> int:
     if not term:
         return 0
@@ -853,12 +991,25 @@ def _count_term_occurrences(text: str, term: str) -> int:
     if len(term) < COMPACT_MATCH_MIN_LENGTH or not term.isalpha():
         return direct_hits
 
-    compact_text = re.sub(r"[\s_-]+", "", text)
+    compact_text = _compact_text(text)
     if compact_text == text:
         return direct_hits
     return max(direct_hits, compact_text.count(term))
 
 
+def _term_occurs(text: str, term: str) -> bool:
+    """Same as ``_count_term_occurrences(text, term) > 0`` without counting."""
+    if not term:
+        return False
+    if term.isdigit():
+        return re.search(rf"(?<!\d){re.escape(term)}(?!\d)", text) is not None
+    if term in text:
+        return True
+    if len(term) < COMPACT_MATCH_MIN_LENGTH or not term.isalpha():
+        return False
+    return term in _compact_text(text)
+
+
 def _path_priority_score(path_text: str, question_lower: str) -> float:
     score = 0.0
     path_lower = path_text.casefold()
@@ -1140,7 +1291,7 @@ def _score_text_block(
             score += min(text_hits, 10) * 2
 
     for term in dict.fromkeys(entity_terms):
-        if _count_term_occurrences(path_lower, term) or _count_term_occurrences(text_lower, term):
+        if _term_occurs(path_lower, term) or _term_occurs(text_lower, term):
             entity_matched_terms += 1
 
     score += (matched_terms * 4) + (matched_terms * matched_terms * 4)
@@ -1322,13 +1473,34 @@ def _iter_line_windows(text: str, window_size: int = WINDOW_SIZE) -> Iterable[tu
             break
 
 
+def _iter_matching_line_windows(
+    text: str,
+    matching_lines: list[int],
+    window_size: int = WINDOW_SIZE,
+) -> Iterable[tuple[int, int, str]]:
+    """The windows of _iter_line_windows that contain one of the matching lines."""
+    lines = text.splitlines()
+    step = max(1, window_size - WINDOW_OVERLAP)
+    last_start = max(0, -(-(len(lines) - window_size) // step)) * step
+    starts: set[int] = set()
+    for index in matching_lines:
+        start = -(-max(0, index - window_size + 1) // step) * step
+        while start <= min(index, last_start):
+            starts.add(start)
+            start += step
+
+    for start in sorted(starts):
+        window = lines[start : start + window_size]
+        yield start + 1, start + len(window), "\n".join(window)
+
+
 def _line_matches_query(line_text: str, terms: list[str], phrases: list[str]) -> bool:
     line_lower = line_text.casefold()
     for phrase in phrases:
         if any(form in line_lower for form in _phrase_forms(phrase)):
             return True
     for term in terms:
-        if _count_term_occurrences(line_lower, term):
+        if _term_occurs(line_lower, term):
             return True
     return False
 
@@ -1338,16 +1510,19 @@ def _iter_targeted_windows(
     terms: list[str],
     phrases: list[str],
     window_size: int = WINDOW_SIZE,
+    matching_lines: list[int] | None = None,
 ) -> Iterable[tuple[int, int, str]]:
     lines = text.splitlines()
     if not lines:
         return
 
+    if matching_lines is None:
+        matching_lines = [
+            index for index, line in enumerate(lines) if _line_matches_query(line, terms, phrases)
+        ]
     seen_ranges: set[tuple[int, int]] = set()
     half_window = max(1, window_size // 2)
-    for index, line in enumerate(lines):
-        if not _line_matches_query(line, terms, phrases):
-            continue
+    for index in matching_lines:
         start_index = max(0, index - half_window)
         end_index = min(len(lines), start_index + window_size)
         window = lines[start_index:end_index]
@@ -2449,8 +2624,67 @@ def _assemble_context_snippets(
     return selected
 
 
-def _build_repo_search_index(repo_root: Path) -> RepoSearchIndex:
+def _count_source_terms(path_text: str, text: str) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for token in re.findall(r"[a-z0-9]+", f"{path_text}\n{text}".casefold()):
+        counts[token] = counts.get(token, 0) + 1
+    return counts
+
+
+def _parse_repo_source(
+    repo_root: Path,
+    path: Path,
+    previous: RepoSourceEntry | None = None,
+) -> RepoSourceEntry | None:
+    try:
+        stat = path.stat()
+        data = path.read_bytes()
+    except OSError:
+        return None
+
+    digest = hashlib.sha1(data).hexdigest()
+    if previous is not None and previous.digest == digest:
+        previous.mtime_ns = stat.st_mtime_ns
+        previous.size = stat.st_size
+        return previous
+
+    # same decoding as _read_text, including universal newlines
+    text = data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+    path_text = _normalize_repo_path(path, repo_root)
+    entry = RepoSourceEntry(
+        path_text=path_text,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        digest=digest,
+        text=text,
+        text_phrases=[],
+        term_counts={},
+        imported_symbol_paths=None,
+        python_blocks=[],
+        named_value_blocks=[],
+    )
+    if not text.strip():
+        return entry
+
+    entry.text_phrases = list(_extract_glossary_phrases_from_text(path_text, text))
+    entry.term_counts = _count_source_terms(path_text, text)
+    if path.suffix.lower() == ".py":
+        entry.imported_symbol_paths = _extract_python_imported_symbol_paths(
+            text,
+            repo_root=repo_root,
+            path_text=path_text,
+        )
+        entry.python_blocks = [
+            (start_line, end_line, block_text, symbol_name, _extract_self_assigned_symbols(block_text))
+            for start_line, end_line, block_text, symbol_name in _iter_python_blocks(text)
+        ]
+        entry.named_value_blocks = list(_iter_python_named_value_blocks(text))
+    return entry
+
+
+def _assemble_repo_search_index(repo_root: Path, entries: Iterable[RepoSourceEntry]) -> RepoSearchIndex:
     repo_root = Path(repo_root)
+    entries = [entry for entry in entries if entry.text.strip()]
     source_records: list[RepoSourceRecord] = []
     repo_vocabulary: set[str] = set()
     glossary_phrases: set[str] = set()
@@ -2460,16 +2694,10 @@ def _build_repo_search_index(repo_root: Path) -> RepoSearchIndex:
     source_text_by_path: dict[str, str] = {}
     repo_paths_by_basename: dict[str, list[str]] = {}
 
-    for path in iter_repo_source_paths(repo_root):
-        try:
-            text = _read_text(path)
-        except OSError:
-            continue
-
-        if not text.strip():
-            continue
-
-        path_text = _normalize_repo_path(path, repo_root)
+    for entry in entries:
+        path_text = entry.path_text
+        text = entry.text
+        path = repo_root / path_text
         source_records.append(RepoSourceRecord(path=path, path_text=path_text, text=text))
         source_text_by_path[path_text] = text
         repo_paths_by_basename.setdefault(path.name, []).append(path_text)
@@ -2477,30 +2705,26 @@ def _build_repo_search_index(repo_root: Path) -> RepoSearchIndex:
 
         if len(glossary_phrases) < MAX_GLOSSARY_PHRASES:
             glossary_phrases.update(
-                set(list(_extract_glossary_phrases_from_text(path_text, text))[:MAX_GLOSSARY_PHRASES - len(glossary_phrases)])
+                set(entry.text_phrases[:MAX_GLOSSARY_PHRASES - len(glossary_phrases)])
             )
 
-        if path.suffix.lower() == ".py":
-            python_imported_symbol_paths[path_text] = _extract_python_imported_symbol_paths(
-                text,
-                repo_root=repo_root,
-                path_text=path_text,
-            )
+        if entry.imported_symbol_paths is not None:
+            python_imported_symbol_paths[path_text] = entry.imported_symbol_paths
             path_symbol_defs = python_symbol_defs_by_path.setdefault(path_text, {})
-            for start_line, end_line, block_text, symbol_name in _iter_python_blocks(text):
+            for start_line, end_line, block_text, symbol_name, assigned_symbols in entry.python_blocks:
                 block = (path_text, start_line, end_line, block_text)
                 python_symbol_defs.setdefault(symbol_name, []).append(block)
                 path_symbol_defs.setdefault(symbol_name, []).append(block)
                 repo_vocabulary.update(_extract_repo_vocabulary_terms(symbol_name))
                 if len(glossary_phrases) < MAX_GLOSSARY_PHRASES:
                     glossary_phrases.update(_extract_glossary_phrases_from_symbol(symbol_name))
-                for assigned_symbol in _extract_self_assigned_symbols(block_text):
+                for assigned_symbol in assigned_symbols:
                     python_symbol_defs.setdefault(assigned_symbol, []).append(block)
                     path_symbol_defs.setdefault(assigned_symbol, []).append(block)
                     repo_vocabulary.update(_extract_repo_vocabulary_terms(assigned_symbol))
                     if len(glossary_phrases) < MAX_GLOSSARY_PHRASES:
                         glossary_phrases.update(_extract_glossary_phrases_from_symbol(assigned_symbol))
-            for start_line, end_line, block_text, symbol_name in _iter_python_named_value_blocks(text):
+            for start_line, end_line, block_text, symbol_name in entry.named_value_blocks:
                 block = (path_text, start_line, end_line, block_text)
                 python_symbol_defs.setdefault(symbol_name, []).append(block)
                 path_symbol_defs.setdefault(symbol_name, []).append(block)
@@ -2521,9 +2745,87 @@ def _build_repo_search_index(repo_root: Path) -> RepoSearchIndex:
         python_imported_symbol_paths=python_imported_symbol_paths,
         source_text_by_path=source_text_by_path,
         repo_paths_by_basename=repo_paths_by_basename,
+        term_index=RepoTermIndex.from_entries(entries),
     )
 
 
+def _build_repo_search_index(repo_root: Path) -> RepoSearchIndex:
+    repo_root = Path(repo_root)
+    entries = (_parse_repo_source(repo_root, path) for path in iter_repo_source_paths(repo_root))
+    return _assemble_repo_search_index(repo_root, [entry for entry in entries if entry is not None])
+
+
+class RepoIndexStore:
+    """Keeps the parsed repo sources between questions and across restarts.
+
+    ``refresh`` re-reads only files whose size or mtime changed and re-parses
+    only those whose content hash changed too. It is blocking and meant to run
+    in a worker thread.
+    """
+
+    def __init__(self, repo_root: Path, cache_path: Path | None = None):
+        self.repo_root = Path(repo_root)
+        self.cache_path = cache_path or self.repo_root / INDEX_CACHE_PATH
+        self._entries: dict[str, RepoSourceEntry] | None = None
+        self._index: RepoSearchIndex | None = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> RepoSearchIndex:
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+
+            entries: dict[str, RepoSourceEntry] = {}
+            changed = False
+            for path in iter_repo_source_paths(self.repo_root):
+                path_text = _normalize_repo_path(path, self.repo_root)
+                entry = self._entries.get(path_text)
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if entry is None or (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size):
+                    entry = _parse_repo_source(self.repo_root, path, previous=entry)
+                    changed = True
+                if entry is not None:
+                    entries[path_text] = entry
+
+            changed = changed or entries.keys() != self._entries.keys()
+            self._entries = entries
+            if changed:
+                self._save()
+            if changed or self._index is None:
+                self._index = _assemble_repo_search_index(self.repo_root, entries.values())
+            return self._index
+
+    def _load(self) -> dict[str, RepoSourceEntry]:
+        try:
+            with open(self.cache_path, "rb") as cache_file:
+                payload = pickle.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            # a stale or truncated cache only costs one full rebuild
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_CACHE_VERSION:
+            return {}
+        return payload.get("entries", {})
+
+    def _save(self) -> None:
+        temp_path = self.cache_path.with_suffix(".tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "wb") as cache_file:
+                pickle.dump(
+                    {"version": INDEX_CACHE_VERSION, "entries": self._entries},
+                    cache_file,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            pass
+
+
 def _prepare_query_terms_and_phrases(
     question: str,
     repo_vocabulary: set[str],
@@ -2583,6 +2885,28 @@ def _build_query_variants(
     return variants
 
 
+def _candidate_source_records(
+    index: RepoSearchIndex,
+    terms: list[str],
+    phrases: list[str],
+) -> list[RepoSourceRecord]:
+    if index.term_index is None:
+        return index.source_records
+
+    query_terms = list(terms)
+    for phrase in phrases:
+        words = re.findall(r"[a-z0-9]+", phrase.casefold())
+        query_terms.extend(words)
+        if len(words) > 1:
+            query_terms.append("".join(words))
+    ranked = index.term_index.rank(query_terms)
+    if not ranked:
+        return index.source_records
+
+    candidate_paths = {path_text for _, path_text in ranked[:MAX_CANDIDATE_FILES]}
+    return [record for record in index.source_records if record.path_text in candidate_paths]
+
+
 def _search_repo_context_with_query(
     question: str,
     index: RepoSearchIndex,
@@ -2600,7 +2924,7 @@ def _search_repo_context_with_query(
     )
 
     file_candidates: list[tuple[float, RepoSourceRecord]] = []
-    for record in index.source_records:
+    for record in _candidate_source_records(index, terms, phrases):
         path = record.path
         path_text = record.path_text
         text = record.text
@@ -2686,13 +3010,24 @@ def _search_repo_context_with_query(
             (path.suffix.lower() == ".json" and has_structured_json_windows)
             or has_structured_text_windows
         ):
-            for start_line, end_line, window_text in _iter_targeted_windows(text, terms, phrases):
+            if index.term_index is None:
+                matching_lines = None
+                line_windows = _iter_line_windows(text)
+            else:
+                matching_lines = index.term_index.matching_lines(path_text, text, terms, phrases)
+                line_windows = _iter_matching_line_windows(text, matching_lines)
+            for start_line, end_line, window_text in _iter_targeted_windows(
+                text,
+                terms,
+                phrases,
+                matching_lines=matching_lines,
+            ):
                 if (start_line, end_line) in seen_window_refs:
                     continue
                 candidate_windows.append((start_line, end_line, window_text, None))
                 seen_window_refs.add((start_line, end_line))
 
-            for start_line, end_line, window_text in _iter_line_windows(text):
+            for start_line, end_line, window_text in line_windows:
                 if (start_line, end_line) in seen_window_refs:
                     continue
                 candidate_windows.append((start_line, end_line, window_text, None))
@@ -3443,6 +3778,17 @@ class ChatGPTCog(commands.Cog):
         self.max_output_tokens = int(self.settings.get("max_output_tokens", DEFAULT_MAX_OUTPUT_TOKENS))
         openai_key = getattr(self.bot.config.external, "openai", None)
         self.client = AsyncOpenAI(api_key=openai_key) if openai_key else None
+        self.index_store = RepoIndexStore(self.repo_root)
+
+    async def cog_load(self) -> None:
+        # warm the index so the first question does not pay for a full parse
+        asyncio.create_task(asyncio.to_thread(self.index_store.refresh))
+
+    async def _load_repo_index(self) -> RepoSearchIndex:
+        store = getattr(self, "index_store", None)
+        if store is None:
+            store = self.index_store = RepoIndexStore(self.repo_root)
+        return await asyncio.to_thread(store.refresh)
 
     def _load_settings(self) -> dict:
         ids_section = getattr(self.bot.config, "ids", None)
@@ -3605,8 +3951,9 @@ class ChatGPTCog(commands.Cog):
         if self.client is None:
             raise RuntimeError("Missing OpenAI API key in config.toml under [external].openai.")
 
-        index = _build_repo_search_index(self.repo_root)
-        initial_snippets = _build_repo_context_from_index(
+        index = await self._load_repo_index()
+        initial_snippets = await asyncio.to_thread(
+            _build_repo_context_from_index,
             question,
             index,
             max_snippets=max(self.max_snippets, DEFAULT_MAX_SNIPPETS),
@@ -3682,7 +4029,7 @@ class ChatGPTCog(commands.Cog):
                     {
                         "type": "function_call_output",
                         "call_id": tool_call.call_id,
-                        "output": self._execute_repo_tool(session, tool_call),
+                        "output": await asyncio.to_thread(self._execute_repo_tool, session, tool_call),
                     }
                     for tool_call in tool_calls
                 ]
@@ -18,13 +18,14 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 import asyncio
 
-import chess.engine
 import discord
 from discord.ui import Button, View
 
 from discord.ext import commands
 
-from utils.chess import ChessGame, ProtocolAdapter
+from utils.checks import is_gm
+from utils.chess import ChessGame, connect_engine
+from utils.chess_engines import EnginePool
 from utils.i18n import _, locale_doc
 
 
@@ -131,18 +132,17 @@ class Chess(commands.Cog):
 
     async def initialize(self):
         await self.bot.wait_until_ready()
+        pool = EnginePool(connect_engine, self.bot.config.external.stockfish_backends)
         try:
-            _, adapter = await asyncio.get_running_loop().create_connection(
-                lambda: ProtocolAdapter(chess.engine.UciProtocol()), "127.0.0.1", 4000
-            )
-        except ConnectionRefusedError:
+            await pool.start()
+        except ConnectionError:
             self.bot.logger.warning(
                 "FAILED to connect to stockfish backend, unloading chess cog..."
             )
             self.bot.unload_extension("cogs.chess")
             return
-        self.engine = adapter.protocol
-        await self.engine.initialize()
+        # matches call engine.play, the pool picks a backend for each search
+        self.engine = pool
 
     @commands.group(invoke_without_command=True, brief=_("Play chess."))
     @locale_doc
@@ -398,6 +398,27 @@ class Chess(commands.Cog):
         
         await ctx.send(embed=embed)
     
+    @is_gm()
+    @chess.command(hidden=True, brief=_("Shows the chess engine pool status."))
+    @locale_doc
+    async def engines(self, ctx):
+        _("""Shows the load of each chess engine, the cache hit rate and queue waits.""")
+        if not hasattr(self, "engine"):
+            return await ctx.send(_("No chess engine is connected."))
+        stats = self.engine.stats()
+        lines = [
+            f"`{name}`: {load} running/queued, {searches} searches"
+            for name, (load, searches) in stats["engines"].items()
+        ]
+        lines.append(
+            f"Cache: {stats['cached']} positions, {stats['hit_rate']:.1%} hit rate"
+        )
+        lines.append(
+            f"Queue wait: {stats['mean_wait'] * 1000:.0f}ms mean,"
+            f" {stats['max_wait'] * 1000:.0f}ms max"
+        )
+        await ctx.send("\n".join(lines))
+
     def _get_difficulty_description(self, mode):
         descriptions = {
             "beginner": "Perfect for new players",
@@ -48,6 +48,13 @@ from classes.converters import (
     MemberWithCharacter,
 )
 from cogs.shard_communication import user_on_cooldown as user_cooldown
+from classes.crates import (
+    draw_dragon_coins,
+    draw_fortune,
+    draw_materials,
+    draw_mystery,
+    make_rng,
+)
 from utils import random
 from utils.checks import has_char, has_money, is_gm, is_class
 from utils.i18n import _, locale_doc
@@ -326,6 +333,24 @@ class Crates(commands.Cog):
         view.message = await ctx.send(embed=view.build_embed(), view=view)
 
 
+    async def _take_crates(self, conn, user_id, rarity, amount, gains):
+        """Takes crates and adds ``gains`` to other profile columns in one UPDATE.
+
+        Returns the remaining crates of that rarity, or None if the user has
+        fewer than ``amount``.
+        """
+        gains = {column: value for column, value in gains.items() if value}
+        updates = [f'"crates_{rarity}"="crates_{rarity}"-$1'] + [
+            f'"{column}"="{column}"+${index}' for index, column in enumerate(gains, 3)
+        ]
+        return await conn.fetchval(
+            f'UPDATE profile SET {", ".join(updates)} WHERE "user"=$2 AND'
+            f' "crates_{rarity}">=$1 RETURNING "crates_{rarity}";',
+            amount,
+            user_id,
+            *gains.values(),
+        )
+
     @commands.cooldown(1, 10, commands.BucketType.user)
     @has_char()
     @commands.command(name="open", brief=_("Open a crate"))
@@ -402,153 +427,60 @@ class Crates(commands.Cog):
                     ).format(amount=amount)
                 )
 
-            async with self.bot.pool.acquire() as conn:
-                remaining = await conn.fetchval(
-                    f'UPDATE profile SET "crates_{rarity}"="crates_{rarity}"-$1 WHERE'
-                    f' "user"=$2 AND "crates_{rarity}">=$1 RETURNING "crates_{rarity}";',
-                    amount,
-                    ctx.author.id,
-                )
-                if remaining is None:
-                    return await ctx.send(
-                        _("Your crate balance changed. Refresh the vault and try again.")
-                    )
-
-                if rarity == "mystery":
-                    crates = {
-                        "common": 0,
-                        "uncommon": 0,
-                        "rare": 0,
-                        "magic": 0,
-                        "legendary": 0,
-                        "fortune": 0,
-                        "divine": 0,
-                        "materials": 0,
-                    }
-
-                    for _i in range(amount):
-                        rng = random.randint(0, 10000)
-
-                        if rng < 5:
-                            new_rarity = "divine"
-                        elif rng < 10:
-                            new_rarity = "fortune"
-                        elif rng < 50:
-                            new_rarity = "legendary"
-                        elif rng < 250:
-                            new_rarity = "materials"
-                        elif rng < 500:
-                            new_rarity = "magic"
-                        elif rng < 2500:
-                            new_rarity = "rare"
-                        elif rng < 5000:
-                            new_rarity = "uncommon"
-                        else:
-                            new_rarity = "common"
-
-                        crates[new_rarity] += 1
-
-                    await conn.execute(
-                        'UPDATE profile SET "crates_common"="crates_common"+$1, "crates_uncommon"="crates_uncommon"+$2, "crates_rare"="crates_rare"+$3, "crates_magic"="crates_magic"+$4, "crates_legendary"="crates_legendary"+$5, "crates_fortune"="crates_fortune"+$6, "crates_divine"="crates_divine"+$7, "crates_materials"="crates_materials"+$8 WHERE "user"=$9;',
-                        crates["common"],
-                        crates["uncommon"],
-                        crates["rare"],
-                        crates["magic"],
-                        crates["legendary"],
-                        crates["fortune"],
-                        crates["divine"],
-                        crates["materials"],
-                        ctx.author.id,
-                    )
-
-                    for r, a in crates.items():
-                        if a > 0:
-                            await self.bot.log_transaction(
-                                ctx,
-                                from_=1,
-                                to=ctx.author.id,
-                                subject="crates",
-                                data={"Rarity": r, "Amount": a},
-                                conn=conn,
-                            )
+            # Every outcome is drawn up front, the database work is one
+            # aggregated profile UPDATE plus bulk inserts in one transaction
+            rng = make_rng()
+            gains = {}
+            if rarity == "mystery":
+                crates = draw_mystery(rng, amount)
+                gains = {f"crates_{r}": a for r, a in crates.items()}
+            elif rarity == "fortune":
+                level = rpgtools.xptolevel(ctx.character_data["xp"])
+                current_xp = ctx.character_data["xp"]
+                fortune = draw_fortune(rng, amount, level)
+                total_xp, total_money = fortune.xp, fortune.money
+                xp_crates, money_crates = fortune.xp_crates, fortune.money_crates
+                gains = {"xp": total_xp, "money": total_money}
+            elif rarity == "materials":
+                amulet_cog = self.bot.get_cog('AmuletCrafting')
+                if not amulet_cog:
+                    await ctx.send("Materials crate system not available.")
+                    return
+                materials = draw_materials(rng, amount, amulet_cog.resource_odds())
+            else:
+                total_dragon_coins_gained = draw_dragon_coins(rng, rarity, amount)
+                gains = {"dragoncoins": total_dragon_coins_gained}
 
-                    text = _(
-                        "{name}, you opened {mystery_amount} {mystery_emoji} and received:\n"
-                        "- {common_amount} {common_emoji}\n"
-                        "- {uncommon_amount} {uncommon_emoji}\n"
-                        "- {rare_amount} {rare_emoji}\n"
-                        "- {magic_amount} {magic_emoji}\n"
-                        "- {legendary_amount} {legendary_emoji}\n"
-                        "- {fortune_amount} {fortune_emoji}\n"
-                        "- {divine_amount} {divine_emoji}\n"
-                        "- {materials_amount} {materials_emoji}\n"
-                    ).format(
-                        name=name,
-                        mystery_amount=amount,
-                        mystery_emoji=self.emotes.mystery,
-                        common_amount=crates["common"],
-                        common_emoji=self.emotes.common,
-                        uncommon_amount=crates["uncommon"],
-                        uncommon_emoji=self.emotes.uncommon,
-                        rare_amount=crates["rare"],
-                        rare_emoji=self.emotes.rare,
-                        magic_amount=crates["magic"],
-                        magic_emoji=self.emotes.magic,
-                        legendary_amount=crates["legendary"],
-                        legendary_emoji=self.emotes.legendary,
-                        fortune_amount=crates["fortune"],
-                        fortune_emoji=self.emotes.fortune,
-                        divine_amount=crates["divine"],
-                        divine_emoji=self.emotes.divine,
-                        materials_amount=crates["materials"],
-                        materials_emoji=self.emotes.materials,
+            async with self.bot.pool.acquire() as conn:
+                async with conn.transaction():
+                    remaining = await self._take_crates(
+                        conn, ctx.author.id, rarity, amount, gains
                     )
+                    if remaining is None:
+                        return await ctx.send(
+                            _("Your crate balance changed. Refresh the vault and try again.")
+                        )
 
-                    await ctx.send(text)
-
-                elif rarity == "fortune":
-                    level = rpgtools.xptolevel(ctx.character_data["xp"])
-                    current_xp = ctx.character_data["xp"]
-                    total_xp = 0
-                    total_money = 0
-                    xp_crates = 0
-                    money_crates = 0
-
-                    for _i in range(amount):
-                        random_number = random.randint(1, 100)
-                        if random_number <= 50:  # Lower half, reward with XP
-                            reward_type = "xp"
-                        else:  # Upper half, reward with money
-                            if random.randint(1, 100) <= 75:  # Simulating 70% chance
-                                min_value, max_value = 250000, 470000
-                            else:
-                                min_value, max_value = 470001, 850000
-                            reward_type = "money"
-
-                        if reward_type == "xp":
-                            nurflevel = level
-                            if level > 50:
-                                nurflevel = 50
-                            xpvar = 2000 * level + 1500
-                            random_xp = random.randint(1000 * nurflevel, xpvar)
-                            total_xp += random_xp
-                            xp_crates += 1
-                        else:
-                            reward = round(random.randint(min_value, max_value), -2)
-                            total_money += reward
-                            money_crates += 1
-
-                    async with self.bot.pool.acquire() as conn:
-                        user_id = ctx.author.id
+                    if rarity == "mystery":
+                        await self.bot.log_transaction(
+                            ctx,
+                            from_=1,
+                            to=ctx.author.id,
+                            subject="crates",
+                            data={
+                                "Rarity": rarity,
+                                "Amount": amount,
+                                "Received": ", ".join(
+                                    f"{a} {r}" for r, a in crates.items() if a > 0
+                                ),
+                            },
+                            conn=conn,
+                        )
+                    elif rarity == "fortune":
                         if total_xp > 0:
-                            await conn.execute(
-                                'UPDATE profile SET "xp" = "xp" + $1 WHERE "user" = $2',
-                                total_xp,
-                                user_id,
-                            )
                             await self.bot.log_xp_watch_event(
                                 ctx=ctx,
-                                user_id=user_id,
+                                user_id=ctx.author.id,
                                 delta=int(total_xp),
                                 source="crates.open.fortune",
                                 details={
@@ -560,372 +492,323 @@ class Crates(commands.Cog):
                                 after_xp=current_xp + total_xp,
                                 conn=conn,
                             )
-                        if total_money > 0:
-                            await conn.execute(
-                                'UPDATE profile SET "money" = "money" + $1 WHERE "user" = $2',
-                                total_money,
-                                user_id,
-                            )
-
-                    name = ctx.character_data["name"]
-                    crate_label = "crate" if amount == 1 else "crates"
-                    title = f"{name} opened {amount} Fortune {crate_label}!"
-                    summary_lines = []
-                    if total_xp > 0:
-                        summary_lines.append(f"**XP gained:** {total_xp:,}")
-                    if total_money > 0:
-                        summary_lines.append(f"**Money gained:** ${total_money:,}")
-                    if xp_crates and money_crates:
-                        summary_lines.append(f"**Rolls:** {xp_crates} XP, {money_crates} money")
-                    elif xp_crates:
-                        summary_lines.append(f"**Rolls:** {xp_crates} XP")
-                    elif money_crates:
-                        summary_lines.append(f"**Rolls:** {money_crates} money")
-
-                    embed = discord.Embed(
-                        title=title,
-                        description="\n".join(summary_lines) if summary_lines else None,
-                        color=discord.Color.gold(),
-                    )
-                    embed.set_thumbnail(url=ctx.author.display_avatar.url)
-                    await ctx.send(embed=embed)
-
-                    log_parts = []
-                    if total_xp > 0:
-                        log_parts.append(f"**{total_xp:,} XP**")
-                    if total_money > 0:
-                        log_parts.append(f"**${total_money:,}**")
-                    if log_parts:
-                        log_text = " and ".join(log_parts)
-                        await self.bot.public_log(
-                            f"**{ctx.author}** opened {amount} fortune {crate_label} and received {log_text}."
-                        )
-
-                    if total_xp > 0:
-                        try:
-                            new_level = int(rpgtools.xptolevel(current_xp + total_xp))
-                            if level != new_level:
-                                await self.bot.process_levelup(ctx, new_level, level)
-                        except Exception:
-                            pass
-
-                elif rarity == "materials":
-                    premiumshop_cog = self.bot.get_cog('PremiumShop')
-                    if not premiumshop_cog:
-                        await ctx.send("Materials crate system not available.")
-                        return
-
-                    all_materials = []
-                    for _i in range(amount):
-                        success, message, materials = await premiumshop_cog.open_materials_crate(
-                            ctx,
-                            return_details=True,
-                        )
-                        if not success:
-                            await ctx.send(f"Error: {message}")
-                            return
-                        all_materials.extend(materials)
-
-                    amulet_cog = self.bot.get_cog('AmuletCrafting')
-                    rarity_emojis = {
-                        "common": "🟤",
-                        "uncommon": "🥈",
-                        "rare": "🟡",
-                        "epic": "🟣",
-                        "legendary": "🥇",
-                    }
-                    rarity_art = {
-                        "legendary": (
-                            "<:legendary_0_0:1471117612854280402><:legendary_1_0:1471117618961453157>"
-                            "<:legendary_2_0:1471117626141970585><:legendary_3_0:1471117632978550814>"
-                            "<:legendary_4_0:1471117639295307796>\n"
-                            "<:legendary_0_1:1471117616650256434><:legendary_1_1:1471117621641609216>"
-                            "<:legendary_2_1:1471117629820370945><:legendary_3_1:1471117636170547383>"
-                            "<:legendary_4_1:1471117642755739688>"
-                        ),
-                        "epic": (
-                            "<:epic_0_0:1471117653379645582><:epic_1_0:1471117660250177732>"
-                            "<:epic_2_0:1471117667933880414><:epic_3_0:1471117672853934173>"
-                            "<:epic_4_0:1471117681242673295>\n"
-                            "<:epic_0_1:1471117656613716137><:epic_1_1:1471117663785713735>"
-                            "<:epic_2_1:1471117670454661322><:epic_3_1:1471117676968673498>"
-                            "<:epic_4_1:1471117685193572526>"
-                        ),
-                        "rare": (
-                            "<:rare_0_0:1471117692168835213><:rare_1_0:1471117697264652450>"
-                            "<:rare_2_0:1471117705888399580><:rare_3_0:1471117710669647883>"
-                            "<:rare_4_0:1471117715845681338>\n"
-                            "<:rare_0_1:1471117694207135886><:rare_1_1:1471117701354098698>"
-                            "<:rare_2_1:1471117708014649447><:rare_3_1:1471117713530421319>"
-                            "<:rare_4_1:1471117719972741140>"
-                        ),
-                        "uncommon": (
-                            "<:uncommon_0_0:1471117727170301984><:uncommon_1_0:1471117731930701919>"
-                            "<:uncommon_2_0:1471117737739682047><:uncommon_3_0:1471117743951577170>"
-                            "<:uncommon_4_0:1471117749529874569>\n"
-                            "<:uncommon_0_1:1471117729950859395><:uncommon_1_1:1471117735546327040>"
-                            "<:uncommon_2_1:1471117740457590867><:uncommon_3_1:1471117746602508289>"
-                            "<:uncommon_4_1:1471117751689937027>"
-                        ),
-                        "common": (
-                            "<:common_0_0:1471126951153369109><:common_1_0:1471126956480139285>"
-                            "<:common_2_0:1471126961513435136><:common_3_0:1471126966173438168>"
-                            "<:common_4_0:1471126970808008877>\n"
-                            "<:common_0_1:1471126953330479235><:common_1_1:1471126959315488810>"
-                            "<:common_2_1:1471126963866566656><:common_3_1:1471126968417386617>"
-                            "<:common_4_1:1471126973471395891>"
-                        ),
-                    }
-                    rarity_order = ["common", "uncommon", "rare", "epic", "legendary"]
-
-                    def _truncate_entries(entries, max_len):
-                        if not entries:
-                            return ""
-                        selected = []
-                        for i, entry in enumerate(entries):
-                            candidate = ", ".join(selected + [entry]) if selected else entry
-                            if len(candidate) > max_len:
-                                remaining = len(entries) - i
-                                if remaining > 0:
-                                    suffix = f"+{remaining} more"
-                                    candidate_suffix = ", ".join(selected + [suffix]) if selected else suffix
-                                    if len(candidate_suffix) <= max_len:
-                                        selected.append(suffix)
-                                break
-                            selected.append(entry)
-                        return ", ".join(selected)
-
-                    resources_by_rarity = {rarity: Counter() for rarity in rarity_order}
-                    for resource in all_materials:
-                        rarity_name = amulet_cog.get_resource_rarity(resource) if amulet_cog else None
-                        if not rarity_name:
-                            rarity_name = "common"
-                        resources_by_rarity.setdefault(rarity_name, Counter())
-                        resources_by_rarity[rarity_name][resource] += 1
-
-                    blocks = []
-                    for rarity_name in rarity_order:
-                        counter = resources_by_rarity.get(rarity_name)
-                        if not counter:
-                            continue
-                        entries = [
-                            f"{res.replace('_', ' ').title()} x{count}" if count > 1 else res.replace('_', ' ').title()
-                            for res, count in counter.most_common()
-                        ]
-                        entries_text = _truncate_entries(entries, 700)
-                        if entries_text:
-                            art = rarity_art.get(rarity_name)
-                            if art:
-                                blocks.append(f"{art}\n{entries_text}")
-                            else:
-                                blocks.append(f"{entries_text}")
-
-                    total_materials = len(all_materials)
-                    crate_label = "crate" if amount == 1 else "crates"
-                    title = "Materials Crate Opened!" if amount == 1 else "Materials Crates Opened!"
-
-                    if blocks:
-                        description = (
-                            f"You opened **{amount}** materials {crate_label} and found **{total_materials}** crafting materials:\n\n"
-                            + "\n\n".join(blocks)
-                        )
+                    elif rarity == "materials":
+                        if not await amulet_cog.give_crafting_resources(
+                            ctx.author.id, materials, conn=conn
+                        ):
+                            raise RuntimeError("Error: could not add the crafting materials.")
                     else:
-                        description = (
-                            f"You opened **{amount}** materials {crate_label} but found no materials."
-                        )
-
-                    embed = discord.Embed(
-                        title=title,
-                        description=description,
-                        color=discord.Color.green(),
-                    )
-                    embed.set_thumbnail(url=ctx.author.display_avatar.url)
-                    await ctx.send(embed=embed)
-                    return
-
-                else:
-                    items = []
-                    total_dragon_coins_gained = 0
-                    for _i in range(amount):
-                        # A number to detemine the crate item range
-
-                        rand = random.randint(0, 9)
-                        if rarity == "common":
-                            if rand < 2:  # 20% 20-30
-                                minstat, maxstat = (20, 25)
-                            elif rand < 5:  # 30% 10-19
-                                minstat, maxstat = (10, 19)
-                            else:  # 50% 1-9
-                                minstat, maxstat = (1, 9)
-                        elif rarity == "uncommon":
-                            if rand < 2:  # 20% 30-35
-                                minstat, maxstat = (30, 35)
-                            elif rand < 5:  # 30% 20-29
-                                minstat, maxstat = (20, 29)
-                            else:  # 50% 10-19
-                                minstat, maxstat = (10, 19)
-                        elif rarity == "rare":
-                            if rand < 2:  # 20% 35-40
-                                minstat, maxstat = (35, 40)
-                            elif rand < 5:  # 30% 30-34
-                                minstat, maxstat = (30, 34)
-                            else:  # 50% 20-29
-                                minstat, maxstat = (20, 29)
-                        elif rarity == "magic":
-                            if rand < 2:  # 20% 41-45
-                                minstat, maxstat = (40, 55)
-                            elif rand < 5:  # 30% 35-40
-                                minstat, maxstat = (35, 40)
-                            else:
-                                minstat, maxstat = (30, 34)
-                        elif rarity == "legendary":  # no else because why
-                            if rand < 2:  # 20% 49-50
-                                minstat, maxstat = (70, 80)
-                            elif rand < 5:  # 30% 46-48
-                                minstat, maxstat = (60, 69)
-                            else:  # 50% 41-45
-                                minstat, maxstat = (50, 59)
-                        elif rarity == "divine":
-                            if rand < 1:  # 10% 90-100
-                                minstat, maxstat = (90, 100)
-                            elif rand < 5:  # 40% 81-89
-                                minstat, maxstat = (81, 89)
-                            else:  # 50% 75-80
-                                minstat, maxstat = (75, 80)
-                        # Check for Dragon Coin chance on legendary crates (20% chance)
-                        dragon_coins_gained = 0
-                        if rarity == "legendary" and random.randint(1, 100) <= 20:
-                            dragon_coins_gained = random.randint(1, 15)
-                            await conn.execute(
-                                'UPDATE profile SET dragoncoins = dragoncoins + $1 WHERE "user" = $2;',
-                                dragon_coins_gained, ctx.author.id
-                            )
-                            if amount > 1:
-                                total_dragon_coins_gained += dragon_coins_gained
-                        # Check for Dragon Coin chance on divine crates (40% chance)
-                        elif rarity == "divine" and random.randint(1, 100) <= 40:
-                            dragon_coins_gained = random.randint(1, 50)
-                            await conn.execute(
-                                'UPDATE profile SET dragoncoins = dragoncoins + $1 WHERE "user" = $2;',
-                                dragon_coins_gained, ctx.author.id
-                            )
-                            if amount > 1:
-                                total_dragon_coins_gained += dragon_coins_gained
-                        
-                        item = await self.bot.create_random_item(
-                            minstat=minstat,
-                            maxstat=maxstat,
-                            minvalue=1,
-                            maxvalue=250,
-                            owner=ctx.author,
-                            conn=conn,
+                        items = await self.bot.create_random_items(
+                            rarity, amount, ctx.author, rng, conn=conn
                         )
-                        items.append(item)
                         await self.bot.log_transaction(
                             ctx,
                             from_=1,
                             to=ctx.author.id,
-                            subject="crate open item",
-                            data={"Name": item["name"], "Value": item["value"]},
+                            subject="crates",
+                            data={
+                                "Rarity": rarity,
+                                "Amount": amount,
+                                "Items": ", ".join(
+                                    f"{i['id']} {i['name']} (${i['value']})" for i in items
+                                ),
+                            },
                             conn=conn,
                         )
 
-                    if amount == 1:
-                        embed = discord.Embed(
-                            title=_(f"{name}, you gained an item!"),
-                            description=_("You found a new item when opening a crate!"),
-                            color=0xFF0000,
+            if rarity == "mystery":
+                text = _(
+                    "{name}, you opened {mystery_amount} {mystery_emoji} and received:\n"
+                    "- {common_amount} {common_emoji}\n"
+                    "- {uncommon_amount} {uncommon_emoji}\n"
+                    "- {rare_amount} {rare_emoji}\n"
+                    "- {magic_amount} {magic_emoji}\n"
+                    "- {legendary_amount} {legendary_emoji}\n"
+                    "- {fortune_amount} {fortune_emoji}\n"
+                    "- {divine_amount} {divine_emoji}\n"
+                    "- {materials_amount} {materials_emoji}\n"
+                ).format(
+                    name=name,
+                    mystery_amount=amount,
+                    mystery_emoji=self.emotes.mystery,
+                    common_amount=crates["common"],
+                    common_emoji=self.emotes.common,
+                    uncommon_amount=crates["uncommon"],
+                    uncommon_emoji=self.emotes.uncommon,
+                    rare_amount=crates["rare"],
+                    rare_emoji=self.emotes.rare,
+                    magic_amount=crates["magic"],
+                    magic_emoji=self.emotes.magic,
+                    legendary_amount=crates["legendary"],
+                    legendary_emoji=self.emotes.legendary,
+                    fortune_amount=crates["fortune"],
+                    fortune_emoji=self.emotes.fortune,
+                    divine_amount=crates["divine"],
+                    divine_emoji=self.emotes.divine,
+                    materials_amount=crates["materials"],
+                    materials_emoji=self.emotes.materials,
+                )
+
+                await ctx.send(text)
+
+            elif rarity == "fortune":
+                name = ctx.character_data["name"]
+                crate_label = "crate" if amount == 1 else "crates"
+                title = f"{name} opened {amount} Fortune {crate_label}!"
+                summary_lines = []
+                if total_xp > 0:
+                    summary_lines.append(f"**XP gained:** {total_xp:,}")
+                if total_money > 0:
+                    summary_lines.append(f"**Money gained:** ${total_money:,}")
+                if xp_crates and money_crates:
+                    summary_lines.append(f"**Rolls:** {xp_crates} XP, {money_crates} money")
+                elif xp_crates:
+                    summary_lines.append(f"**Rolls:** {xp_crates} XP")
+                elif money_crates:
+                    summary_lines.append(f"**Rolls:** {money_crates} money")
+
+                embed = discord.Embed(
+                    title=title,
+                    description="\n".join(summary_lines) if summary_lines else None,
+                    color=discord.Color.gold(),
+                )
+                embed.set_thumbnail(url=ctx.author.display_avatar.url)
+                await ctx.send(embed=embed)
+
+                log_parts = []
+                if total_xp > 0:
+                    log_parts.append(f"**{total_xp:,} XP**")
+                if total_money > 0:
+                    log_parts.append(f"**${total_money:,}**")
+                if log_parts:
+                    log_text = " and ".join(log_parts)
+                    await self.bot.public_log(
+                        f"**{ctx.author}** opened {amount} fortune {crate_label} and received {log_text}."
+                    )
+
+                if total_xp > 0:
+                    try:
+                        new_level = int(rpgtools.xptolevel(current_xp + total_xp))
+                        if level != new_level:
+                            await self.bot.process_levelup(ctx, new_level, level)
+                    except Exception:
+                        pass
+
+            elif rarity == "materials":
+                rarity_emojis = {
+                    "common": "🟤",
+                    "uncommon": "🥈",
+                    "rare": "🟡",
+                    "epic": "🟣",
+                    "legendary": "🥇",
+                }
+                rarity_art = {
+                    "legendary": (
+                        "<:legendary_0_0:1471117612854280402><:legendary_1_0:1471117618961453157>"
+                        "<:legendary_2_0:1471117626141970585><:legendary_3_0:1471117632978550814>"
+                        "<:legendary_4_0:1471117639295307796>\n"
+                        "<:legendary_0_1:1471117616650256434><:legendary_1_1:1471117621641609216>"
+                        "<:legendary_2_1:1471117629820370945><:legendary_3_1:1471117636170547383>"
+                        "<:legendary_4_1:1471117642755739688>"
+                    ),
+                    "epic": (
+                        "<:epic_0_0:1471117653379645582><:epic_1_0:1471117660250177732>"
+                        "<:epic_2_0:1471117667933880414><:epic_3_0:1471117672853934173>"
+                        "<:epic_4_0:1471117681242673295>\n"
+                        "<:epic_0_1:1471117656613716137><:epic_1_1:1471117663785713735>"
+                        "<:epic_2_1:1471117670454661322><:epic_3_1:1471117676968673498>"
+                        "<:epic_4_1:1471117685193572526>"
+                    ),
+                    "rare": (
+                        "<:rare_0_0:1471117692168835213><:rare_1_0:1471117697264652450>"
+                        "<:rare_2_0:1471117705888399580><:rare_3_0:1471117710669647883>"
+                        "<:rare_4_0:1471117715845681338>\n"
+                        "<:rare_0_1:1471117694207135886><:rare_1_1:1471117701354098698>"
+                        "<:rare_2_1:1471117708014649447><:rare_3_1:1471117713530421319>"
+                        "<:rare_4_1:1471117719972741140>"
+                    ),
+                    "uncommon": (
+                        "<:uncommon_0_0:1471117727170301984><:uncommon_1_0:1471117731930701919>"
+                        "<:uncommon_2_0:1471117737739682047><:uncommon_3_0:1471117743951577170>"
+                        "<:uncommon_4_0:1471117749529874569>\n"
+                        "<:uncommon_0_1:1471117729950859395><:uncommon_1_1:1471117735546327040>"
+                        "<:uncommon_2_1:1471117740457590867><:uncommon_3_1:1471117746602508289>"
+                        "<:uncommon_4_1:1471117751689937027>"
+                    ),
+                    "common": (
+                        "<:common_0_0:1471126951153369109><:common_1_0:1471126956480139285>"
+                        "<:common_2_0:1471126961513435136><:common_3_0:1471126966173438168>"
+                        "<:common_4_0:1471126970808008877>\n"
+                        "<:common_0_1:1471126953330479235><:common_1_1:1471126959315488810>"
+                        "<:common_2_1:1471126963866566656><:common_3_1:1471126968417386617>"
+                        "<:common_4_1:1471126973471395891>"
+                    ),
+                }
+                rarity_order = ["common", "uncommon", "rare", "epic", "legendary"]
+
+                def _truncate_entries(entries, max_len):
+                    if not entries:
+                        return ""
+                    selected = []
+                    for i, entry in enumerate(entries):
+                        candidate = ", ".join(selected + [entry]) if selected else entry
+                        if len(candidate) > max_len:
+                            remaining = len(entries) - i
+                            if remaining > 0:
+                                suffix = f"+{remaining} more"
+                                candidate_suffix = ", ".join(selected + [suffix]) if selected else suffix
+                                if len(candidate_suffix) <= max_len:
+                                    selected.append(suffix)
+                            break
+                        selected.append(entry)
+                    return ", ".join(selected)
+
+                resources_by_rarity = {rarity: Counter() for rarity in rarity_order}
+                for resource, count in materials.items():
+                    rarity_name = amulet_cog.get_resource_rarity(resource)
+                    if not rarity_name:
+                        rarity_name = "common"
+                    resources_by_rarity.setdefault(rarity_name, Counter())
+                    resources_by_rarity[rarity_name][resource] += count
+
+                blocks = []
+                for rarity_name in rarity_order:
+                    counter = resources_by_rarity.get(rarity_name)
+                    if not counter:
+                        continue
+                    entries = [
+                        f"{res.replace('_', ' ').title()} x{count}" if count > 1 else res.replace('_', ' ').title()
+                        for res, count in counter.most_common()
+                    ]
+                    entries_text = _truncate_entries(entries, 700)
+                    if entries_text:
+                        art = rarity_art.get(rarity_name)
+                        if art:
+                            blocks.append(f"{art}\n{entries_text}")
+                        else:
+                            blocks.append(f"{entries_text}")
+
+                total_materials = sum(materials.values())
+                crate_label = "crate" if amount == 1 else "crates"
+                title = "Materials Crate Opened!" if amount == 1 else "Materials Crates Opened!"
+
+                if blocks:
+                    description = (
+                        f"You opened **{amount}** materials {crate_label} and found **{total_materials}** crafting materials:\n\n"
+                        + "\n\n".join(blocks)
+                    )
+                else:
+                    description = (
+                        f"You opened **{amount}** materials {crate_label} but found no materials."
+                    )
+
+                embed = discord.Embed(
+                    title=title,
+                    description=description,
+                    color=discord.Color.green(),
+                )
+                embed.set_thumbnail(url=ctx.author.display_avatar.url)
+                await ctx.send(embed=embed)
+
+            else:
+                item = items[0]
+                dragon_coins_gained = total_dragon_coins_gained
+                if amount == 1:
+                    embed = discord.Embed(
+                        title=_(f"{name}, you gained an item!"),
+                        description=_("You found a new item when opening a crate!"),
+                        color=0xFF0000,
+                    )
+                    embed.set_thumbnail(url=ctx.author.display_avatar.url)
+                    embed.add_field(name=_("ID"), value=item["id"], inline=False)
+                    embed.add_field(name=_("Name"), value=item["name"], inline=False)
+                    embed.add_field(name=_("Element"), value=item["element"], inline=False)
+                    embed.add_field(name=_("Type"), value=item["type"], inline=False)
+                    embed.add_field(name=_("Damage"), value=item["damage"], inline=True)
+                    embed.add_field(name=_("Armor"), value=item["armor"], inline=True)
+                    embed.add_field(
+                        name=_("Value"), value=f"${item['value']}", inline=False
+                    )
+                    embed.set_footer(
+                        text=_("Remaining {rarity} crates: {crates}").format(
+                            crates=remaining,
+                            rarity=rarity,
                         )
-                        embed.set_thumbnail(url=ctx.author.display_avatar.url)
-                        embed.add_field(name=_("ID"), value=item["id"], inline=False)
-                        embed.add_field(name=_("Name"), value=item["name"], inline=False)
-                        embed.add_field(name=_("Element"), value=item["element"], inline=False)
-                        embed.add_field(name=_("Type"), value=item["type"], inline=False)
-                        embed.add_field(name=_("Damage"), value=item["damage"], inline=True)
-                        embed.add_field(name=_("Armor"), value=item["armor"], inline=True)
+                    )
+                    
+                    # Add Dragon Coin message if gained
+                    if dragon_coins_gained > 0:
                         embed.add_field(
-                            name=_("Value"), value=f"${item['value']}", inline=False
+                            name="🎉 Bonus Dragon Coins!",
+                            value=f"You also found **{dragon_coins_gained} <:dragoncoin:1404860657366728788> Dragon Coins**!",
+                            inline=False
                         )
-                        embed.set_footer(
-                            text=_("Remaining {rarity} crates: {crates}").format(
-                                crates=ctx.character_data[f"crates_{rarity}"] - 1,
-                                rarity=rarity,
-                            )
+                    
+                    await ctx.send(embed=embed)
+                    if rarity == "legendary":
+                        await self.bot.public_log(
+                            f"**{ctx.author}** opened a legendary crate and received"
+                            f" {item['name']}, a **{item['type']}** with **{item['damage'] or item['armor']}"
+                            f" {'damage' if item['damage'] else 'armor'}**."
                         )
-                        
-                        # Add Dragon Coin message if gained
-                        if dragon_coins_gained > 0:
-                            embed.add_field(
-                                name="🎉 Bonus Dragon Coins!",
-                                value=f"You also found **{dragon_coins_gained} <:dragoncoin:1404860657366728788> Dragon Coins**!",
-                                inline=False
-                            )
-                        
-                        await ctx.send(embed=embed)
-                        if rarity == "legendary":
-                            await self.bot.public_log(
-                                f"**{ctx.author}** opened a legendary crate and received"
-                                f" {item['name']}, a **{item['type']}** with **{item['damage'] or item['armor']}"
-                                f" {'damage' if item['damage'] else 'armor'}**."
-                            )
-                        if rarity == "divine":
+                    if rarity == "divine":
+                        await self.bot.public_log(
+                            f"**{ctx.author}** opened a divine crate and received"
+                            f" {item['name']}, a **{item['type']}** with **{item['damage'] or item['armor']}"
+                            f" {'damage' if item['damage'] else 'armor'}**."
+                        )
+                    elif rarity == "magic" and item["damage"] + item["armor"] >= 41:
+                        if item["damage"] >= 41:
                             await self.bot.public_log(
-                                f"**{ctx.author}** opened a divine crate and received"
+                                f"**{ctx.author}** opened a magic crate and received"
                                 f" {item['name']}, a **{item['type']}** with **{item['damage'] or item['armor']}"
                                 f" {'damage' if item['damage'] else 'armor'}**."
                             )
-                        elif rarity == "magic" and item["damage"] + item["armor"] >= 41:
-                            if item["damage"] >= 41:
-                                await self.bot.public_log(
-                                    f"**{ctx.author}** opened a magic crate and received"
-                                    f" {item['name']}, a **{item['type']}** with **{item['damage'] or item['armor']}"
-                                    f" {'damage' if item['damage'] else 'armor'}**."
-                                )
-                    else:
-                        stats_raw = [i["damage"] + i["armor"] for i in items]
-                        stats = Counter(stats_raw)
-                        types = Counter([i["type"] for i in items])
-                        most_common = "\n".join(
-                            [f"- {i[0]} (x{i[1]})" for i in stats.most_common(5)]
+                else:
+                    stats_raw = [i["damage"] + i["armor"] for i in items]
+                    stats = Counter(stats_raw)
+                    types = Counter([i["type"] for i in items])
+                    most_common = "\n".join(
+                        [f"- {i[0]} (x{i[1]})" for i in stats.most_common(5)]
+                    )
+                    most_common_types = "\n".join(
+                        [f"- {i[0]} (x{i[1]})" for i in types.most_common()]
+                    )
+                    top = "\n".join([f"- {i}" for i in sorted(stats, reverse=True)[:5]])
+                    average_stat = round(sum(stats_raw) / amount, 2)
+                    message = _(
+                        "Successfully opened {amount} {rarity} crates. Average stat:"
+                        " {average_stat}\nMost common stats:\n```\n{most_common}\n```\nBest"
+                        " stats:\n```\n{top}\n```\nTypes:\n```\n{most_common_types}\n```"
+                    ).format(
+                        amount=amount,
+                        rarity=rarity,
+                        average_stat=average_stat,
+                        most_common=most_common,
+                        top=top,
+                        most_common_types=most_common_types,
+                    )
+                    
+                    # Add Dragon Coin message if gained
+                    if total_dragon_coins_gained > 0:
+                        message += f"\n\n🎉 **Bonus Dragon Coins:** You also found **{total_dragon_coins_gained} <:dragoncoin:1404860657366728788> Dragon Coins**!"
+                    
+                    await ctx.send(message)
+                    if rarity == "legendary":
+                        await self.bot.public_log(
+                            f"**{ctx.author}** opened {amount} legendary crates and received"
+                            f" stats:\n```\n{most_common}\n```\nAverage: {average_stat}"
                         )
-                        most_common_types = "\n".join(
-                            [f"- {i[0]} (x{i[1]})" for i in types.most_common()]
+                    if rarity == "divine":
+                        await self.bot.public_log(
+                            f"**{ctx.author}** opened {amount} divine crates and received"
+                            f" stats:\n```\n{most_common}\n```\nAverage: {average_stat}"
                         )
-                        top = "\n".join([f"- {i}" for i in sorted(stats, reverse=True)[:5]])
-                        average_stat = round(sum(stats_raw) / amount, 2)
-                        message = _(
-                            "Successfully opened {amount} {rarity} crates. Average stat:"
-                            " {average_stat}\nMost common stats:\n```\n{most_common}\n```\nBest"
-                            " stats:\n```\n{top}\n```\nTypes:\n```\n{most_common_types}\n```"
-                        ).format(
-                            amount=amount,
-                            rarity=rarity,
-                            average_stat=average_stat,
-                            most_common=most_common,
-                            top=top,
-                            most_common_types=most_common_types,
+                    elif rarity == "magic":
+                        await self.bot.public_log(
+                            f"**{ctx.author}** opened {amount} magic crates and received"
+                            f" stats:\n```\n{most_common}\n```\nAverage: {average_stat}"
                         )
-                        
-                        # Add Dragon Coin message if gained
-                        if total_dragon_coins_gained > 0:
-                            message += f"\n\n🎉 **Bonus Dragon Coins:** You also found **{total_dragon_coins_gained} <:dragoncoin:1404860657366728788> Dragon Coins**!"
-                        
-                        await ctx.send(message)
-                        if rarity == "legendary":
-                            await self.bot.public_log(
-                                f"**{ctx.author}** opened {amount} legendary crates and received"
-                                f" stats:\n```\n{most_common}\n```\nAverage: {average_stat}"
-                            )
-                        if rarity == "divine":
-                            await self.bot.public_log(
-                                f"**{ctx.author}** opened {amount} divine crates and received"
-                                f" stats:\n```\n{most_common}\n```\nAverage: {average_stat}"
-                            )
-                        elif rarity == "magic":
-                            await self.bot.public_log(
-                                f"**{ctx.author}** opened {amount} magic crates and received"
-                                f" stats:\n```\n{most_common}\n```\nAverage: {average_stat}"
-                            )
         except Exception as e:
             await ctx.send(f"{e}")
 
@@ -19,12 +19,10 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import discord
 from discord.ext import commands
 from discord import app_commands
-import json
-import re
-import difflib
 from typing import List, Dict, Tuple, Optional, Any, Union
 import asyncio
 
+from classes.content import MonsterSearch
 from utils.checks import is_gm
 
 UNKNOWN_TIER_LEVEL = 12
@@ -566,39 +564,41 @@ class FableAssistant(commands.Cog):
             assistant_ids = {}
         listen_channels = assistant_ids.get("listen_channel_ids", [])
         self.LISTEN_CHANNEL_ID = listen_channels if isinstance(listen_channels, list) else []
-        
-        # Load monster data from monsters.json
+
+    @property
+    def monster_search(self) -> MonsterSearch:
+        """Search index over the public monsters of the shared roster."""
         try:
-            with open('monsters.json', 'r') as file:
-                self.monsters_json = json.load(file)
-                
-            # Process monster data into a dictionary with monster name as key
-            self.monster_data = {}
-            for level, monsters in self.monsters_json.items():
-                for monster in monsters:
-                    if 'name' in monster and monster.get('ispublic', True):
-                        # Add level info to monster data
-                        monster_copy = monster.copy()
-                        monster_copy['level'] = int(level) if level.isdigit() else level
-                        self.monster_data[monster['name']] = monster_copy
-            
-            # Extract all possible elements for dropdown filtering
-            self.elements = sorted(set(monster.get("element", "").lower() 
-                                   for monster in self.monster_data.values() 
-                                   if monster.get("element")))
+            return self.bot.content.monsters().search()
         except Exception as e:
             self.bot.logger.error(f"Error loading monster data: {e}")
-            self.monster_data = {}
-            self.elements = []
+            return MonsterSearch({})
+
+    @property
+    def monster_data(self) -> Dict[str, Dict]:
+        """Public monsters from the shared monsters.json index, keyed by name."""
+        return self.monster_search.monsters
+
+    @property
+    def elements(self) -> List[str]:
+        # All possible elements for dropdown filtering
+        return self.monster_search.elements
     
     @commands.command(name="monsters", aliases=["bestiary", "encyclopedia"])
-    async def show_monster_encyclopedia(self, ctx):
-        """Display the interactive monster encyclopedia with filtering options."""
-        # Get all monsters sorted alphabetically as the default view
-        all_monsters = sorted(self.monster_data.items(), key=lambda x: x[0])
+    async def show_monster_encyclopedia(self, ctx, *, query: Optional[str] = None):
+        """Display the interactive monster encyclopedia with filtering options.
+
+        With a query, only the monsters matching it are listed."""
+        if query:
+            monsters = self.fuzzy_search_monsters(query)
+            if not monsters:
+                return await ctx.send(f"No monsters found matching '{query}'.")
+        else:
+            # Get all monsters sorted alphabetically as the default view
+            monsters = sorted(self.monster_data.items(), key=lambda x: x[0])
         
         # Create the initial view
-        view = MonsterPaginationView(self.monster_data, all_monsters)
+        view = MonsterPaginationView(self.monster_data, monsters)
         
         # Create the initial embed
         embed = view.create_monster_list_embed()
@@ -617,39 +617,7 @@ class FableAssistant(commands.Cog):
         Returns:
             List of matching (monster_name, monster_data) tuples
         """
-        query = query.lower().strip()
-        results = []
-        
-        # Check for exact matches first
-        exact_matches = self.search_monsters_exact(query)
-        if exact_matches:
-            return exact_matches
-        
-        # If no exact matches, try fuzzy matching for names
-        monster_names = list(self.monster_data.keys())
-        matches = difflib.get_close_matches(query, monster_names, n=10, cutoff=threshold)
-        
-        for match in matches:
-            results.append((match, self.monster_data[match]))
-        
-        # If we found fuzzy name matches, return them
-        if results:
-            return results
-            
-        # If still nothing, try to parse if it's a level or element query that might be misspelled
-        level_match = re.search(r'l[ve][ve][le]\s*(\d+)', query)  # Handle misspellings like "lvl", "leve"
-        if level_match:
-            level = int(level_match.group(1))
-            return [(name, monster) for name, monster in self.monster_data.items() 
-                    if monster.get('level') == level]
-        
-        # Try fuzzy matching for elements
-        for element in self.elements:
-            if difflib.SequenceMatcher(None, query, element).ratio() > threshold:
-                return [(name, monster) for name, monster in self.monster_data.items() 
-                        if monster.get('element', '').lower() == element]
-        
-        return []
+        return self.monster_search.fuzzy(query, threshold)
     
     def search_monsters_exact(self, query: str) -> List[Tuple[str, Dict]]:
         """
@@ -661,38 +629,7 @@ class FableAssistant(commands.Cog):
         Returns:
             List of matching (monster_name, monster_data) tuples
         """
-        query = query.lower().strip()
-        results = []
-        
-        # Check for level-based search (with or without space)
-        level_search = re.search(r'level\s*(\d+)', query)
-        
-        # Check for element-based search
-        element_search = None
-        for element in self.elements:
-            if re.search(r'\b' + element + r'\b', query):
-                element_search = element
-                break
-        
-        # Search logic
-        for name, monster in self.monster_data.items():
-            name_lower = name.lower()
-            
-            # Search by name (full or partial)
-            if query in name_lower:
-                results.append((name, monster))
-                continue
-                
-            # Search by level
-            if level_search and monster.get("level") == int(level_search.group(1)):
-                results.append((name, monster))
-                continue
-                
-            # Search by element
-            if element_search and monster.get("element", "").lower() == element_search:
-                results.append((name, monster))
-                
-        return results
+        return self.monster_search.exact(query)
     
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -40,6 +40,7 @@ from discord.http import handle_message_parameters
 import json
 
 from classes.converters import CrateRarity, IntFromTo, IntGreaterThan, UserWithCharacter
+from classes.cooldowns import GUILD
 from classes.items import ItemType
 from cogs.battles.extensions.elements import ElementExtension
 from cogs.newwerewolf.core import all_talisman_roles
@@ -66,6 +67,7 @@ from discord.ext import commands
 from utils.checks import has_char, is_gm, is_god
 from classes.badges import Badge, BadgeConverter
 from classes.bot import Bot
+from classes.content import MonsterIndex
 from classes.context import Context
 from classes.converters import UserWithCharacter
 from utils import shell
@@ -803,6 +805,9 @@ class GameMaster(commands.Cog):
                 """DELETE FROM market WHERE "published" + '14 days'::interval < NOW() RETURNING *;""",
                 timeout=600,
             )
+            trading_cog = self.bot.get_cog("Trading")
+            if trading_cog is not None:
+                await trading_cog.market.invalidate()
             await conn.executemany(
             )
         await ctx.send(
@@ -825,6 +830,22 @@ class GameMaster(commands.Cog):
         await self.bot.clear_donator_cache(other)
         await ctx.send(_("Done"))
 
+    @is_gm()
+    @commands.command(
+        hidden=True, aliases=["gmreloadcontent"], brief=_("Reload game content files")
+    )
+    @locale_doc
+    async def reloadcontent(self, ctx):
+        _(
+            """Reloads monsters.json, the battle tower data and the splice PvE pool on every cluster.
+
+            Files are also picked up on their own a few seconds after they change.
+
+            Only Game Masters can use this command."""
+        )
+        await self.bot.content.reload()
+        await ctx.send(_("Content reloaded."))
+
 
     @is_gm()
     @commands.command(hidden=True, brief=_("Grant Favor"))
@@ -872,8 +893,7 @@ class GameMaster(commands.Cog):
 
             # Load monsters.json
             try:
-                with open('monsters.json', 'r') as f:
-                    monsters_data = json.load(f)
+                monsters = self.bot.content.monsters(missing_ok=False)
             except FileNotFoundError:
                 return await ctx.send("Error: monsters.json not found.")
             except json.JSONDecodeError:
@@ -882,7 +902,7 @@ class GameMaster(commands.Cog):
             # Process each name
             results = []
             for name in names:
-                result = await self.process_single_pet(ctx, user_id, name, monsters_data)
+                result = await self.process_single_pet(ctx, user_id, name, monsters)
                 results.append(result)
 
             # Combine and send results
@@ -891,19 +911,15 @@ class GameMaster(commands.Cog):
         except Exception as e:
             await ctx.send(e)
 
-    async def process_single_pet(self, ctx, user_id: int, name: str, monsters_data: dict) -> str:
+    @staticmethod
+    def _monster_suggestions(monsters: MonsterIndex, name: str) -> str:
+        close = monsters.search(public_only=False).close_names(name, n=3)
+        return f" Did you mean: {', '.join(close)}?" if close else ""
+
+    async def process_single_pet(self, ctx, user_id: int, name: str, monsters: MonsterIndex) -> str:
         """Process a single pet and return the result message."""
         # First, search in monsters.json
-        found_monster = None
-
-        # Search through all levels in monsters.json
-        for level, monsters in monsters_data.items():
-            for monster in monsters:
-                if monster.get('name', '').lower() == name.lower():
-                    found_monster = monster
-                    break
-            if found_monster:
-                break
+        found_monster = monsters.get(name)
 
         # If not found in JSON, search in postgres database
         if not found_monster:
@@ -925,7 +941,10 @@ class GameMaster(commands.Cog):
 
         # If monster not found in either source
         if not found_monster:
-            return f"❌ Monster '{name}' not found in monsters.json or database."
+            return (
+                f"❌ Monster '{name}' not found in monsters.json or database."
+                + self._monster_suggestions(monsters, name)
+            )
 
         # Generate IVs
         iv_percentage, hp_iv, attack_iv, defense_iv = self.generate_ivs()
@@ -2963,21 +2982,13 @@ class GameMaster(commands.Cog):
         """Generate an egg for a user with a specified monster."""
         # Load monsters data from JSON file
         try:
-            with open("monsters.json", "r") as f:
-                monsters_data = json.load(f)
+            monsters = self.bot.content.monsters(missing_ok=False)
         except Exception as e:
             await ctx.send("Error loading monsters data. Please contact the admin.")
             return
 
         # Search for the monster by name (ignoring case)
-        monster = None
-        for level_str, monster_list in monsters_data.items():
-            for m in monster_list:
-                if m["name"].lower() == monster_name.lower():
-                    monster = m
-                    break
-            if monster:
-                break
+        monster = monsters.get(monster_name)
 
         if not monster:
             async with self.bot.pool.acquire() as conn:
@@ -2993,7 +3004,10 @@ class GameMaster(commands.Cog):
                     monster = dict(db_monster)
 
         if not monster:
-            await ctx.send(f"Monster '{monster_name}' not found.")
+            await ctx.send(
+                f"Monster '{monster_name}' not found."
+                + self._monster_suggestions(monsters, monster_name)
+            )
             return
 
         # Check the user's current pet and egg count
@@ -3233,12 +3247,8 @@ class GameMaster(commands.Cog):
                 await ctx.send(f"No profile found for user ID {profile_id}.")
                 return
             
-            # Get all cooldown keys for this guild
-            keys_to_delete = await self.bot.redis.keys(f"guildcd:{guild_id}:*")
-            
-            # Delete each matching key
-            if keys_to_delete:
-                await self.bot.redis.delete(*keys_to_delete)
+            # Delete all cooldowns of this guild
+            if await self.bot.cooldowns.clear(GUILD, guild_id):
                 await ctx.send(f"All cooldown entries for guild ID {guild_id} have been deleted.")
             else:
                 await ctx.send(f"No cooldown entries found for guild ID {guild_id}.")
@@ -3266,21 +3276,13 @@ class GameMaster(commands.Cog):
 
         # Load monsters data from JSON file
         try:
-            with open("monsters.json", "r") as f:
-                monsters_data = json.load(f)
+            monsters = self.bot.content.monsters(missing_ok=False)
         except Exception as e:
             await ctx.send("Error loading monsters data. Please contact the admin.")
             return
 
         # Search for the monster by name (ignoring case)
-        monster = None
-        for level_str, monster_list in monsters_data.items():
-            for m in monster_list:
-                if m["name"].lower() == monster_name.lower():
-                    monster = m
-                    break
-            if monster:
-                break
+        monster = monsters.get(monster_name)
 
         if not monster:
             async with self.bot.pool.acquire() as conn:
@@ -3296,7 +3298,10 @@ class GameMaster(commands.Cog):
                     monster = dict(db_monster)
 
         if not monster:
-            await ctx.send(f"Monster '{monster_name}' not found.")
+            await ctx.send(
+                f"Monster '{monster_name}' not found."
+                + self._monster_suggestions(monsters, monster_name)
+            )
             return
 
         import random
@@ -31,6 +31,7 @@ from discord.http import handle_message_parameters
 
 from classes.classes import Ritualist, from_string
 from classes.converters import IntGreaterThan
+from classes.cooldowns import USER
 from cogs.shard_communication import next_day_cooldown
 from cogs.shard_communication import user_on_cooldown as user_cooldown
 from utils import random
@@ -977,15 +978,16 @@ class Gods(commands.Cog):
         *,
         seconds: int = 60,
     ):
-        key = f"cd:{ctx.author.id}:spin_approval:{gate}"
         try:
-            can_send = await self.bot.redis.execute_command(
-                "SET",
-                key,
-                "1",
-                "EX",
-                max(1, int(seconds)),
-                "NX",
+            can_send = (
+                await self.bot.cooldowns.acquire(
+                    USER,
+                    ctx.author.id,
+                    f"spin_approval:{gate}",
+                    max(1, int(seconds)),
+                    value="1",
+                )
+                is None
             )
         except Exception:
             can_send = True
@@ -1369,22 +1371,15 @@ class Gods(commands.Cog):
         cooldown_key = f"cd:{ctx.author.id}:spin"
 
         if cooldown_seconds > 0:
-            cooldown_set = await self.bot.redis.execute_command(
-                "SET",
-                cooldown_key,
-                "spin",
-                "EX",
-                cooldown_seconds,
-                "NX",
+            ttl = await self.bot.cooldowns.acquire(
+                USER, ctx.author.id, "spin", cooldown_seconds
             )
-            if not cooldown_set:
-                ttl = await self.bot.redis.execute_command("TTL", cooldown_key)
-                if ttl != -2:
-                    return await ctx.send(
-                        _("You are on cooldown. Try again in {time}.").format(
-                            time=timedelta(seconds=max(0, int(ttl)))
-                        )
+            if ttl is not None:
+                return await ctx.send(
+                    _("You are on cooldown. Try again in {time}.").format(
+                        time=timedelta(seconds=max(0, int(ttl)))
                     )
+                )
 
         reward = random.choice(config["pool"])
         try:
@@ -39,6 +39,7 @@ from classes.converters import (
     MemberWithCharacter,
     UserWithCharacter,
 )
+from classes.cooldowns import GUILD
 from cogs.shard_communication import guild_on_cooldown as guild_cooldown
 from cogs.shard_communication import user_on_cooldown as user_cooldown
 from utils import misc as rpgtools
@@ -2541,12 +2542,8 @@ class Guild(commands.Cog):
                 await ctx.send(f"No profile found for user ID {profile_id}.")
                 return
             
-            # Get all cooldown keys for this guild
-            keys_to_delete = await self.bot.redis.keys(f"guildcd:{guild_id}:*")
-            
-            # Delete each matching key
-            if keys_to_delete:
-                await self.bot.redis.delete(*keys_to_delete)
+            # Delete all cooldowns of this guild
+            if await self.bot.cooldowns.clear(GUILD, guild_id):
                 await ctx.send(f"All cooldown entries for guild ID {guild_id} have been deleted.")
             else:
                 await ctx.send(f"No cooldown entries found for guild ID {guild_id}.")
@@ -2969,8 +2966,8 @@ class Guild(commands.Cog):
         _(
             """Lists guild-specific cooldowns, meaning all guild members have these cooldowns and cannot use the commands."""
         )
-        cooldowns = await self.bot.redis.execute_command(
-            "KEYS", f"guildcd:{ctx.character_data['guild']}:*"
+        cooldowns = await self.bot.cooldowns.timers(
+            GUILD, ctx.character_data["guild"]
         )
         adv = await self.bot.get_guild_adventure(ctx.character_data["guild"])
         if not cooldowns and (not adv or adv[2]):
@@ -2978,10 +2975,7 @@ class Guild(commands.Cog):
                 _("You don't have any active cooldown at the moment.")
             )
         timers = _("Commands on cooldown:")
-        for key in cooldowns:
-            key = key.decode()
-            cooldown = await self.bot.redis.execute_command("TTL", key)
-            cmd = key.replace(f"guildcd:{ctx.character_data['guild']}:", "")
+        for cmd, cooldown in cooldowns.items():
             text = _("{cmd} is on cooldown and will be available after {time}").format(
                 cmd=cmd, time=timedelta(seconds=int(cooldown))
             )
@@ -22,12 +22,32 @@ import io
 from discord.ext import commands
 from discord.ext.commands import BucketType
 
+from classes.image_ops import ImageOps, ImageOpsBusy
 from utils.i18n import _, locale_doc
 
 
 class Images(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.ops = ImageOps()
+
+    def cog_unload(self):
+        self.ops.close()
+
+    async def send_filtered(self, ctx, user, operation, params=()):
+        # animated avatars are requested as png, which is their first frame
+        avatar = user.display_avatar.replace(format="png", size=512)
+        try:
+            bytebuffer = await self.ops.process(avatar.key, operation, params, avatar.read)
+        except ImageOpsBusy:
+            return await ctx.send(
+                _("Too many images are being edited right now, please try again in a few seconds.")
+            )
+        except discord.HTTPException:
+            return await ctx.send("Error failed to fetch image")
+        await ctx.send(
+            file=discord.File(fp=io.BytesIO(bytebuffer), filename="image.png"),
+        )
 
     @commands.command(brief=_("Pixelfy an avatar"))
     @locale_doc
@@ -40,24 +60,11 @@ class Images(commands.Cog):
         )
         user = user or ctx.author
         try:
-            size = [256, 128, 64, 32, 16][size - 1]
+            # blocks per side, fewer blocks for more pixels
+            blocks = [256, 128, 64, 32, 16][size - 1]
         except IndexError:
             return await ctx.send(_("Use 1, 2, 3, 4 or 5 as intensity value."))
-        url = user.display_avatar.replace(format="png", size=size).url
-        # change size to lower for less pixels
-        async with self.bot.trusted_session.post(
-            f"{self.bot.config.external.okapi_url}/api/imageops/pixel",
-            json={"image": url},
-            headers={"Authorization": self.bot.config.external.okapi_token},
-        ) as r:
-            image = await r.text()
-            async with self.bot.trusted_session.get(image) as resp:
-                bytebuffer = await resp.read()
-                if resp.status != 200:
-                    return await ctx.send("Error failed to fetch image")
-        await ctx.send(
-            file=discord.File(fp=io.BytesIO(bytebuffer), filename="image.png"),
-        )
+        await self.send_filtered(ctx, user, "pixel", (blocks,))
 
     @commands.command(brief=_("Defines an avatar's edges"))
     @locale_doc
@@ -67,20 +74,7 @@ class Images(commands.Cog):
 
             Finds and exaggerates edges in a user's avatar, creating a cool image effect."""
         )
-        user = user or ctx.author
-        async with self.bot.trusted_session.post(
-            f"{self.bot.config.external.okapi_url}/api/imageops/edges",
-            json={"image": user.display_avatar.replace(format="png").url},
-            headers={"Authorization": self.bot.config.external.okapi_token},
-        ) as r:
-            image = await r.text()
-            async with self.bot.trusted_session.get(image) as resp:
-                bytebuffer = await resp.read()
-                if resp.status != 200:
-                    return await ctx.send("Error failed to fetch image")
-        await ctx.send(
-            file=discord.File(fp=io.BytesIO(bytebuffer), filename="image.png"),
-        )
+        await self.send_filtered(ctx, user or ctx.author, "edges")
 
     @commands.cooldown(1, 15, BucketType.channel)
     @commands.command(brief=_("Inverts a user's avatar"))
@@ -93,20 +87,7 @@ class Images(commands.Cog):
 
             (This command has a channel cooldown of 15 seconds.)"""
         )
-        user = user or ctx.author
-        async with self.bot.trusted_session.post(
-            f"{self.bot.config.external.okapi_url}/api/imageops/invert",
-            json={"image": user.display_avatar.replace(format="png").url},
-            headers={"Authorization": self.bot.config.external.okapi_token},
-        ) as r:
-            image = await r.text()
-            async with self.bot.trusted_session.get(image) as resp:
-                bytebuffer = await resp.read()
-                if resp.status != 200:
-                    return await ctx.send("Error failed to fetch image")
-        await ctx.send(
-            file=discord.File(fp=io.BytesIO(bytebuffer), filename="image.png"),
-        )
+        await self.send_filtered(ctx, user or ctx.author, "invert")
 
     @commands.cooldown(1, 15, BucketType.channel)
     @commands.command(brief=_("Oil-paint someone's avatar"))
@@ -119,20 +100,7 @@ class Images(commands.Cog):
 
             (This command has a channel cooldown of 15 seconds.)"""
         )
-        user = user or ctx.author
-        async with self.bot.trusted_session.post(
-            f"{self.bot.config.external.okapi_url}/api/imageops/oil",
-            json={"image": user.display_avatar.replace(format="png").url},
-            headers={"Authorization": self.bot.config.external.okapi_token},
-        ) as r:
-            image = await r.text()
-            async with self.bot.trusted_session.get(image) as resp:
-                bytebuffer = await resp.read()
-                if resp.status != 200:
-                    return await ctx.send("Error failed to fetch image")
-        await ctx.send(
-            file=discord.File(fp=io.BytesIO(bytebuffer), filename="image.png"),
-        )
+        await self.send_filtered(ctx, user or ctx.author, "oil")
 
 
 async def setup(bot):
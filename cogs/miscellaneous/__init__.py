@@ -52,6 +52,7 @@ import requests
 from discord.ext import commands
 
 from classes.converters import ImageFormat, ImageUrl
+from classes.cooldowns import USER
 from cogs.help import chunks
 from cogs.shard_communication import next_day_cooldown
 from cogs.shard_communication import user_on_cooldown as user_cooldown
@@ -370,10 +371,8 @@ class Miscellaneous(commands.Cog):
 
             # Add command to task list and set cooldown
             tasks.append(self._invoke_all_command(ctx, command))
-            await ctx.bot.redis.set(
-                f"cd:{ctx.author.id}:{command.qualified_name}",
-                command.qualified_name,
-                ex=config['cooldown']
+            await ctx.bot.cooldowns.set(
+                USER, ctx.author.id, command.qualified_name, config['cooldown']
             )
 
         # Execute all commands concurrently
@@ -676,11 +675,10 @@ class Miscellaneous(commands.Cog):
                 "EX",
                 48 * 60 * 60,
             )
-            await self.bot.redis.execute_command(
-                "SET",
-                f"cd:{ctx.author.id}:{ctx.command.qualified_name}",
+            await self.bot.cooldowns.set(
+                USER,
+                ctx.author.id,
                 ctx.command.qualified_name,
-                "EX",
                 self.time_until_midnight(),
             )
         except Exception as error:
@@ -32,12 +32,16 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import datetime
+import functools
 import logging
 import re
 import traceback
 
 from enum import Enum
+from types import MappingProxyType
+from typing import Any, Awaitable, Mapping
 
 import discord
 
@@ -1021,6 +1025,10 @@ WW_NIGHT_LOCK_CHANNEL_ID = 1458644607893246024
 WW_ALIVE_ROLE_ID = 1474617968708161618
 WW_DEAD_ROLE_ID = 1474617848071720960
 AFK_STRIKE_LIMIT = 2
+# a wave of concurrent night prompts gets this many timers, plus a few seconds
+# for the replies to resolve before unfinished actions are cancelled
+NIGHT_ACTION_DEADLINE_FACTOR = 2
+NIGHT_ACTION_GRACE = 5
 WW_DAY_ANNOUNCEMENT_IMAGE_URL = (
     "https://pub-0e7afc36364b4d5dbd1fd2bea161e4d1.r2.dev/"
     "295173706496475136_ChatGPT_Image_Feb_24_2026_08_16_32_PM.png"
@@ -1087,8 +1095,51 @@ def schedule_traceback(ctx: Context, exc: BaseException) -> None:
         print(_format_traceback(exc) or repr(exc))
 
 
-def is_wolf_team_role(role: Role) -> bool:
-    return role in {
+# (deadline, events of the earlier actions) of the night action wave the
+# current task belongs to, see Game.run_night_actions
+_night_action_slot: contextvars.ContextVar[
+    tuple[float, list[asyncio.Event]] | None
+] = contextvars.ContextVar("newwerewolf_night_action_slot", default=None)
+
+
+def night_prompt_timeout(timeout: float) -> float:
+    slot = _night_action_slot.get()
+    if slot is None:
+        return timeout
+    remaining = slot[0] - asyncio.get_running_loop().time()
+    return max(1.0, min(timeout, remaining))
+
+
+async def wait_for_night_action_turn() -> None:
+    slot = _night_action_slot.get()
+    if slot is None:
+        return
+    for event in slot[1]:
+        await event.wait()
+
+
+def night_action_prompt(func):
+    """Holds a prompt's answer until the earlier actions of its wave resolved.
+
+    The prompts of a wave are all open at once, but what an action does with
+    the answer still happens in the order the actions were listed.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            await wait_for_night_action_turn()
+            raise
+        await wait_for_night_action_turn()
+        return result
+
+    return wrapper
+
+
+WOLF_TEAM_ROLES = frozenset(
+    {
         Role.WEREWOLF,
         Role.BIG_BAD_WOLF,
         Role.RAVAGER_WOLF,
@@ -1109,6 +1160,11 @@ def is_wolf_team_role(role: Role) -> bool:
         Role.SORCERER,
         Role.WOLF_PACIFIST,
     }
+)
+
+
+def is_wolf_team_role(role: Role) -> bool:
+    return role in WOLF_TEAM_ROLES
 
 
 def is_wolf_aligned_role(role: Role) -> bool:
@@ -1138,19 +1194,23 @@ def is_villager_team_role(role: Role) -> bool:
     )
 
 
-def _normalized_disabled_role_tokens() -> set[str]:
-    return {_normalize_role_token(token) for token in DISABLED_ROLES}
+@functools.cache
+def _normalized_disabled_role_tokens() -> frozenset[str]:
+    return frozenset(_normalize_role_token(token) for token in DISABLED_ROLES)
 
 
-def _normalized_role_mode_allowlist() -> dict[str, set[str]]:
-    normalized: dict[str, set[str]] = {}
+# role_config is static, so the normalized tables are built once
+@functools.cache
+def _normalized_role_mode_allowlist() -> Mapping[str, frozenset[str]]:
+    normalized: dict[str, frozenset[str]] = {}
     for role_token, modes in ROLE_MODE_ALLOWLIST.items():
         norm_role = _normalize_role_token(str(role_token))
-        norm_modes = {_normalize_mode_token(mode) for mode in modes}
+        norm_modes = frozenset(_normalize_mode_token(mode) for mode in modes)
         if not norm_role:
             continue
         normalized[norm_role] = norm_modes
-    return normalized
+    # shared by every caller, so it must not be changed
+    return MappingProxyType(normalized)
 
 
 def _normalized_unlock_only_advanced_roles() -> set[Role]:
@@ -1766,8 +1826,9 @@ SPECIAL_WOLF_ROLES = {
 }
 
 # "Special" wolves for pack composition excludes Alpha so one slot can remain
-# base Werewolf/Alpha according to requested behavior.
-PACK_SPECIAL_WOLF_ROLES = {
+# base Werewolf/Alpha according to requested behavior. Kept as a tuple so the
+# pack draw follows this order rather than the hash seed.
+PACK_SPECIAL_WOLF_ROLES = (
     Role.BIG_BAD_WOLF,
     Role.RAVAGER_WOLF,
     Role.CURSED_WOLF_FATHER,
@@ -1784,7 +1845,7 @@ PACK_SPECIAL_WOLF_ROLES = {
     Role.WOLF_SEER,
     Role.SORCERER,
     Role.WOLF_PACIFIST,
-}
+)
 
 # Mapped from Wolvesville unknown aura categories and nearest equivalents used here.
 UNKNOWN_AURA_ROLES = {
@@ -3324,7 +3385,10 @@ class Game:
         if not sorcerers:
             return
 
-        present_roles = {player.role for player in self.players if not player.dead}
+        # in seating order, a set would order the pool by the hash seed
+        present_roles = dict.fromkeys(
+            player.role for player in self.players if not player.dead
+        )
         disguise_pool = [
             role
             for role in present_roles
@@ -6611,7 +6675,8 @@ class Game:
         protected_players = [
             player for player in self.alive_players if player.is_protected
         ]
-        bodyguards_to_kill: set[Player] = set()
+        # insertion ordered, the bodyguards fall in the order they intercepted
+        bodyguards_to_kill: dict[Player, None] = {}
 
         guardians = [
             player
@@ -6652,7 +6717,7 @@ class Game:
                     NIGHT_KILLER_GROUP_SOLO,
                 ):
                     guardian.non_villager_killer_group = guardian_attack_source
-                bodyguards_to_kill.add(guardian)
+                bodyguards_to_kill[guardian] = None
                 await guardian.send(
                     _(
                         "🛡️ You intercepted another attack tonight. Your strength is"
@@ -6754,7 +6819,7 @@ class Game:
                             NIGHT_KILLER_GROUP_SOLO,
                         ):
                             guardian.non_villager_killer_group = attack_source
-                        bodyguards_to_kill.add(guardian)
+                        bodyguards_to_kill[guardian] = None
                         await guardian.send(
                             _(
                                 "🛡️ You intercepted another attack on **{saved}**. This"
@@ -8409,10 +8474,11 @@ class Game:
             for player in self.alive_players
             if player.role in (Role.BODYGUARD, Role.TOUGH_GUY)
         ]
+        protector_actions = []
         for guardian in guardians:
-            await guardian.set_bodyguard_target()
+            protector_actions.append(guardian.set_bodyguard_target())
         if healer := self.get_player_with_role(Role.HEALER):
-            await healer.set_healer_target()
+            protector_actions.append(healer.set_healer_target())
         protectors = [
             player
             for player in self.alive_players
@@ -8420,36 +8486,33 @@ class Game:
         ]
         for protector in protectors:
             if protector.role == Role.BUTCHER:
-                await protector.set_butcher_targets()
+                protector_actions.append(protector.set_butcher_targets())
             else:
-                await protector.set_doctor_target()
+                protector_actions.append(protector.set_doctor_target())
         night_hags = [
             player
             for player in self.alive_players
             if player.role in (Role.GRUMPY_GRANDMA, Role.PREACHER)
         ]
-        if night_hags:
-            for night_hag in night_hags:
-                if night_hag.role == Role.PREACHER:
-                    await night_hag.set_preacher_prediction()
-                else:
-                    await night_hag.set_grumpy_grandma_target()
+        for night_hag in night_hags:
+            if night_hag.role == Role.PREACHER:
+                protector_actions.append(night_hag.set_preacher_prediction())
+            else:
+                protector_actions.append(night_hag.set_grumpy_grandma_target())
         voodoo_wolves = self.get_players_with_role(Role.VOODOO_WEREWOLF)
-        if voodoo_wolves:
-            for voodoo_wolf in voodoo_wolves:
-                await voodoo_wolf.set_voodoo_mute_target()
+        for voodoo_wolf in voodoo_wolves:
+            protector_actions.append(voodoo_wolf.set_voodoo_mute_target())
         red_ladies = [
             player
             for player in self.alive_players
             if player.role in (Role.RED_LADY, Role.GHOST_LADY)
         ]
-        if red_ladies:
-            for red_lady in red_ladies:
-                await red_lady.set_red_lady_target()
+        for red_lady in red_ladies:
+            protector_actions.append(red_lady.set_red_lady_target())
         marksmen = self.get_players_with_role(Role.MARKSMAN)
-        if marksmen:
-            for marksman in marksmen:
-                await marksman.set_marksman_target()
+        for marksman in marksmen:
+            protector_actions.append(marksman.set_marksman_target())
+        await self.run_night_actions(protector_actions)
         wolf_team_alive = [
             p
             for p in self.alive_players
@@ -9152,6 +9215,53 @@ class Game:
         self._capture_successful_night_killer_ids(targets)
         return targets
 
+    async def run_night_actions(
+            self, actions: list[Awaitable[Any]], *, default: Any = None
+    ) -> list[Any]:
+        """Runs independent night actions at once, results in the given order.
+
+        Every prompt of the wave shares one deadline instead of each getting a
+        full timer after the previous one. Choices are resolved in list order,
+        see ``night_action_prompt``, so only pass actions whose prompts do not
+        depend on what an earlier action does. Actions still running after the
+        deadline are cancelled and return ``default``.
+        """
+        if not actions:
+            return []
+        window = self.timer * NIGHT_ACTION_DEADLINE_FACTOR
+        deadline = asyncio.get_running_loop().time() + window
+        resolved = [asyncio.Event() for _ in actions]
+
+        async def run(index: int, action: Awaitable[Any]) -> Any:
+            _night_action_slot.set((deadline, resolved[:index]))
+            try:
+                return await action
+            finally:
+                resolved[index].set()
+
+        tasks = [
+            asyncio.create_task(run(index, action))
+            for index, action in enumerate(actions)
+        ]
+        try:
+            await asyncio.wait(tasks, timeout=window + NIGHT_ACTION_GRACE)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        results = []
+        for task in tasks:
+            if task.cancelled():
+                results.append(default)
+                continue
+            if (error := task.exception()) is not None:
+                raise error
+            results.append(task.result())
+        return results
+
     async def night(self, white_wolf_ability: bool) -> list[Player]:
         await self.stop_alpha_day_wolf_relay()
         moon = "🌕" if white_wolf_ability else "🌘"
@@ -9207,12 +9317,15 @@ class Game:
                 await self.ex_maid.give_fortune_card()
                 fortune_teller_acted = True
             self.ex_maid = None
+        resurrection_actions = []
         if ritualist := self.get_player_with_role(Role.RITUALIST):
-            await ritualist.set_ritualist_mark()
+            resurrection_actions.append(ritualist.set_ritualist_mark())
         if medium := self.get_player_with_role(Role.MEDIUM):
-            await medium.medium_resurrect()
+            resurrection_actions.append(medium.medium_resurrect())
         if wolf_necro := self.get_player_with_role(Role.WOLF_NECROMANCER):
-            await wolf_necro.resurrect_werewolf()
+            resurrection_actions.append(wolf_necro.resurrect_werewolf())
+        await self.run_night_actions(resurrection_actions)
+        # summoners revive right away, which changes who the next one can pick
         wolf_summoners = self.get_players_with_role(Role.WOLF_SUMMONER)
         for wolf_summoner in wolf_summoners:
             await wolf_summoner.summon_werewolf()
@@ -9226,11 +9339,12 @@ class Game:
             await fortune_teller.give_fortune_card()
         await self.ensure_head_hunter_targets()
         await self.activate_jail_for_night()
+        informer_actions = []
         if seer := self.get_player_with_role(Role.SEER):
-            await seer.check_player_card()
+            informer_actions.append(seer.check_player_card())
         detectives = self.get_players_with_role(Role.DETECTIVE)
         for detective in detectives:
-            await detective.check_same_team()
+            informer_actions.append(detective.check_same_team())
         aura_readers = [
             player
             for player in self.alive_players
@@ -9238,26 +9352,29 @@ class Game:
         ]
         for aura_reader in aura_readers:
             if aura_reader.role == Role.AURA_SEER:
-                await aura_reader.check_player_aura()
+                informer_actions.append(aura_reader.check_player_aura())
             elif aura_reader.role == Role.ANALYST:
-                await aura_reader.check_analyst_auras()
+                informer_actions.append(aura_reader.check_analyst_auras())
             else:
-                await aura_reader.guess_player_team_as_gambler()
+                informer_actions.append(aura_reader.guess_player_team_as_gambler())
         spirit_seers = self.get_players_with_role(Role.SPIRIT_SEER)
         for spirit_seer in spirit_seers:
-            await spirit_seer.check_spirit_seer_targets()
+            informer_actions.append(spirit_seer.check_spirit_seer_targets())
+        await self.run_night_actions(informer_actions)
+        # the confusion mask only hides roles from the checks after it
         await self.handle_confusion_wolf_night_masking()
+        masked_actions = []
         corruptors = self.get_players_with_role(Role.CORRUPTOR)
         for corruptor in corruptors:
-            await corruptor.set_corruptor_target()
+            masked_actions.append(corruptor.set_corruptor_target())
         flaggers = self.get_players_with_role(Role.FLAGGER)
         for flagger in flaggers:
-            await flagger.set_flagger_redirect()
+            masked_actions.append(flagger.set_flagger_redirect())
         morticians = self.get_players_with_role(Role.MORTICIAN)
         for mortician in morticians:
-            await mortician.mortician_autopsy()
+            masked_actions.append(mortician.mortician_autopsy())
         if fox := self.get_player_with_role(Role.FOX):
-            await fox.check_3_werewolves()
+            masked_actions.append(fox.check_3_werewolves())
         wolf_informers = [
             player
             for player in self.alive_players
@@ -9265,9 +9382,10 @@ class Game:
         ]
         for wolf_informer in wolf_informers:
             if wolf_informer.role == Role.WOLF_SEER:
-                await wolf_informer.check_wolf_seer_target()
+                masked_actions.append(wolf_informer.check_wolf_seer_target())
             else:
-                await wolf_informer.check_sorcerer_target()
+                masked_actions.append(wolf_informer.check_sorcerer_target())
+        await self.run_night_actions(masked_actions)
         kitten_conversion_mode = self.consume_kitten_wolf_conversion_for_current_night()
         target = await self.wolves(kitten_conversion_mode=kitten_conversion_mode)
         kitten_conversion_target = target if kitten_conversion_mode else None
@@ -9302,8 +9420,13 @@ class Game:
                         target, NIGHT_KILLER_GROUP_WOLVES
                     )
         serial_killers = self.get_players_with_role(Role.SERIAL_KILLER)
-        for serial_killer in serial_killers:
-            if target := await serial_killer.serial_killer_kill():
+        cannibals = self.get_players_with_role(Role.CANNIBAL)
+        solo_choices = await self.run_night_actions(
+            [serial_killer.serial_killer_kill() for serial_killer in serial_killers]
+            + [cannibal.cannibal_eat() for cannibal in cannibals]
+        )
+        for serial_killer, target in zip(serial_killers, solo_choices):
+            if target:
                 targets.append(target)
                 self.current_night_solo_kills.append(
                     (serial_killer.user.id, target.user.id)
@@ -9311,10 +9434,12 @@ class Game:
                 self._set_pending_night_killer_group(
                     target, NIGHT_KILLER_GROUP_SOLO, overwrite=True
                 )
-        cannibals = self.get_players_with_role(Role.CANNIBAL)
-        for cannibal in cannibals:
-            cannibal_targets = await cannibal.cannibal_eat()
-            cannibal_targets = self._apply_cannibal_protector_priority(cannibal_targets)
+        for cannibal, cannibal_targets in zip(
+            cannibals, solo_choices[len(serial_killers):]
+        ):
+            cannibal_targets = self._apply_cannibal_protector_priority(
+                cannibal_targets or []
+            )
             for target in cannibal_targets:
                 targets.append(target)
                 self.current_night_solo_kills.append((cannibal.user.id, target.user.id))
@@ -9343,10 +9468,12 @@ class Game:
         if witches:
             for witch in witches:
                 targets = await witch.witch_actions(targets)
+        spreader_actions = []
         if flutist := self.get_player_with_role(Role.FLUTIST):
-            await flutist.enchant()
+            spreader_actions.append(flutist.enchant())
         if superspreader := self.get_player_with_role(Role.SUPERSPREADER):
-            await superspreader.infect_virus()
+            spreader_actions.append(superspreader.infect_virus())
+        await self.run_night_actions(spreader_actions)
         self._capture_successful_night_killer_ids(targets)
         return targets
 
@@ -10772,6 +10899,7 @@ class Player:
         if self.fortune_cards_remaining is None:
             self.fortune_cards_remaining = 1 if len(self.game.players) <= 7 else 2
 
+    @night_action_prompt
     async def choose_users(
             self,
             title: str,
@@ -10782,6 +10910,10 @@ class Player:
             traceback_on_http_error: bool = False,
             prefer_multi_select: bool = False,
     ) -> list[Player]:
+        timeout = night_prompt_timeout(
+            timeout if timeout is not None else self.game.timer
+        )
+
         async def ensure_selection_available() -> bool:
             if self.is_jailed:
                 await self.send(
@@ -10843,7 +10975,7 @@ class Player:
                     placeholder=_("Choose up to {amount} player(s)").format(
                         amount=min(amount, len(list_of_users))
                     ),
-                    timeout=timeout if timeout is not None else self.game.timer,
+                    timeout=timeout,
                     max_values=min(amount, len(list_of_users)),
                     allow_empty=not required,
                     empty_label=_("Skip"),
@@ -10921,7 +11053,7 @@ class Player:
                     return_index=True,
                     title=menu_title,
                     placeholder=group_placeholder,
-                    timeout=timeout if timeout is not None else self.game.timer,
+                    timeout=timeout,
                 ).paginate(self.game.ctx, location=self.user)
 
                 if can_dismiss and chunk_index == 0:
@@ -10943,7 +11075,7 @@ class Player:
                 return_index=True,
                 title=menu_title,
                 placeholder=player_placeholder,
-                timeout=timeout if timeout is not None else self.game.timer,
+                timeout=timeout,
             ).paginate(self.game.ctx, location=self.user)
 
             if can_dismiss and selection_index == 0:
@@ -12108,7 +12240,7 @@ class Player:
                 entries=consume_entries,
                 return_index=True,
                 title=_("Choose how much hunger to consume tonight."),
-                timeout=self.game.timer,
+                timeout=night_prompt_timeout(self.game.timer),
             ).paginate(self.game.ctx, location=self.user)
         except (
             self.game.ctx.bot.paginator.NoChoice,
@@ -12625,7 +12757,7 @@ class Player:
                     title=_("Pick your team guess for {target}.").format(
                         target=target.user
                     ),
-                    timeout=self.game.timer,
+                    timeout=night_prompt_timeout(self.game.timer),
                 ).paginate(self.game.ctx, location=self.user)
             except (
                 self.game.ctx.bot.paginator.NoChoice,
@@ -12721,7 +12853,7 @@ class Player:
                     entries=[_("Use bonus gamble"), _("Stop gambling")],
                     return_index=True,
                     title=_("Your guess was correct. Use your bonus second gamble?"),
-                    timeout=self.game.timer,
+                    timeout=night_prompt_timeout(self.game.timer),
                 ).paginate(self.game.ctx, location=self.user)
             except (
                 self.game.ctx.bot.paginator.NoChoice,
@@ -12904,7 +13036,7 @@ class Player:
                 return_index=True,
                 title=_("Do you want to resign your Sorcerer powers tonight?")[:250],
                 placeholder=_("Choose one option"),
-                timeout=self.game.timer,
+                timeout=night_prompt_timeout(self.game.timer),
             ).paginate(self.game.ctx, location=self.user)
         except (
             self.game.ctx.bot.paginator.NoChoice,
@@ -0,0 +1,476 @@
+"""Headless NewWerewolf games for role pool balance work.
+
+``HeadlessGame`` plays the real ``Game`` and ``Player`` rules with the Discord
+side swapped out: channel and DM messages go nowhere, chat locks, relays and
+role syncing do nothing, and every prompt is answered at once by a
+``BotPolicy``. Sleeps return immediately and ``utils.random`` is replaced by a
+generator seeded per game, so results do not depend on how the games are split
+across worker processes.
+
+    report = simulate(GameSpec(players=12, mode="Classic", games=100_000), workers=8)
+    print(report.format())
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import enum
+import itertools
+import random
+import statistics
+import time
+
+from collections import Counter
+from collections.abc import Set as AbstractSet
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from . import core, role_pool
+from .core import Game, Player, Role, Side
+
+DEFAULT_MAX_DAYS = 40
+CHUNK_SIZE = 100
+DRAW = "Draw"
+
+
+@dataclass(frozen=True)
+class GameSpec:
+    """One role set to play.
+
+    ``roles`` are ``Role`` names for a custom role set, otherwise the roles are
+    drawn by ``get_roles`` for ``players`` and ``mode`` like a live game.
+    """
+
+    players: int
+    mode: str = "Classic"
+    roles: Tuple[str, ...] = ()
+    speed: str = "Normal"
+    games: int = 1000
+    seed: int = 0
+    max_days: int = DEFAULT_MAX_DAYS
+    skip_chance: float = 0.1
+
+
+@dataclass(frozen=True)
+class GameResult:
+    seed: int
+    winner: str
+    days: int
+    roles: Tuple[str, ...]
+    error: Optional[str] = None
+
+
+@dataclass
+class SimulationReport:
+    spec: GameSpec
+    results: List[GameResult]
+    elapsed: float
+
+    @property
+    def finished(self) -> List[GameResult]:
+        return [result for result in self.results if result.error is None]
+
+    @property
+    def games_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    def win_rates(self) -> Dict[str, float]:
+        finished = self.finished
+        total = len(finished) or 1
+        winners = Counter(result.winner for result in finished)
+        return {winner: count / total for winner, count in winners.most_common()}
+
+    def length_distribution(self) -> Dict[str, float]:
+        return _distribution([result.days for result in self.finished])
+
+    def errors(self) -> Counter:
+        return Counter(result.error for result in self.results if result.error)
+
+    def format(self) -> str:
+        label = ", ".join(self.spec.roles) if self.spec.roles else self.spec.mode
+        lines = [
+            f"{label} ({self.spec.players} players): {len(self.results)} games in"
+            f" {self.elapsed:.2f}s ({self.games_per_second:,.1f} games/s)",
+            "win rate: "
+            + ", ".join(f"{name} {rate:.1%}" for name, rate in self.win_rates().items()),
+            "days: "
+            + ", ".join(
+                f"{name} {value:,.1f}"
+                for name, value in self.length_distribution().items()
+            ),
+        ]
+        for error, count in self.errors().most_common(5):
+            lines.append(f"error x{count}: {error}")
+        return "\n".join(lines)
+
+
+def _distribution(values) -> Dict[str, float]:
+    if not values:
+        return {"mean": 0.0, "p10": 0.0, "p50": 0.0, "p90": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def percentile(fraction):
+        return float(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))])
+
+    return {
+        "mean": float(statistics.fmean(ordered)),
+        "p10": percentile(0.1),
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "max": float(ordered[-1]),
+    }
+
+
+def _stable_key(item) -> tuple:
+    user = getattr(item, "user", None)
+    if user is not None:
+        return (0, str(user.id))
+    if isinstance(item, enum.Enum):
+        return (1, item.name)
+    return (2, repr(item))
+
+
+def _in_stable_order(population) -> list:
+    # set order depends on PYTHONHASHSEED (and on addresses for players)
+    if isinstance(population, AbstractSet):
+        return sorted(population, key=_stable_key)
+    return list(population)
+
+
+class SeededRandom:
+    """The ``utils.random`` functions on a seeded generator.
+
+    Sets are sorted before drawing from them, so a seed gives the same game
+    in every interpreter.
+    """
+
+    def __init__(self, seed: int) -> None:
+        self._random = random.Random(seed)
+
+    def __getattr__(self, name):
+        return getattr(self._random, name)
+
+    def sample(self, population, k):
+        return self._random.sample(_in_stable_order(population), k)
+
+    def shuffle(self, population):
+        return self._random.sample(_in_stable_order(population), len(population))
+
+
+class BotPolicy:
+    """Answers every prompt with a uniform random pick.
+
+    Skippable prompts are skipped with ``skip_chance``. In day elections each
+    player votes for a random other player, wolves never vote for a wolf.
+    """
+
+    def __init__(self, rng: random.Random, skip_chance: float = 0.1) -> None:
+        self.rng = rng
+        self.skip_chance = skip_chance
+
+    def choose(self, options: int) -> int:
+        return self.rng.randrange(options)
+
+    def choose_many(self, options: int, max_values: int, allow_empty: bool) -> List[int]:
+        if allow_empty and self.rng.random() < self.skip_chance:
+            return []
+        amount = self.rng.randint(1, max(1, min(options, max_values)))
+        return sorted(self.rng.sample(range(options), amount))
+
+    def lynch_vote(self, voter: Player, candidates: List[Player]) -> Optional[Player]:
+        options = [candidate for candidate in candidates if candidate is not voter]
+        if core.is_wolf_team_role(voter.role):
+            options = [
+                candidate
+                for candidate in options
+                if candidate.side not in (Side.WOLVES, Side.WHITE_WOLF)
+            ] or options
+        if not options or self.rng.random() < self.skip_chance:
+            return None
+        return self.rng.choice(options)
+
+
+class HeadlessMessage:
+    _ids = itertools.count(1)
+
+    def __init__(self, channel=None) -> None:
+        self.id = next(self._ids)
+        self.channel = channel
+        self.reactions = []
+        self.content = ""
+
+    async def edit(self, **kwargs):
+        return self
+
+    async def delete(self, **kwargs):
+        return None
+
+    async def add_reaction(self, emoji):
+        return None
+
+    async def remove_reaction(self, emoji, member):
+        return None
+
+
+class HeadlessUser:
+    """A game member whose DMs go nowhere."""
+
+    bot = False
+
+    def __init__(self, user_id: int) -> None:
+        self.id = user_id
+        self.name = f"Bot{user_id}"
+        self.display_name = self.name
+        self.mention = f"<@{user_id}>"
+        self.dm_channel = SimpleNamespace(id=user_id)
+
+    def __str__(self) -> str:
+        return self.name
+
+    async def send(self, *args, **kwargs):
+        return HeadlessMessage(self.dm_channel)
+
+    async def create_dm(self):
+        return self.dm_channel
+
+
+class HeadlessChannel:
+    id = 0
+    mention = "#werewolf"
+    guild = None
+
+    async def send(self, *args, **kwargs):
+        return HeadlessMessage(self)
+
+    async def fetch_message(self, message_id):
+        return HeadlessMessage(self)
+
+    async def set_permissions(self, *args, **kwargs):
+        return None
+
+
+class _NoChoice(Exception):
+    pass
+
+
+class HeadlessPaginator:
+    """``utils.paginator`` stand-in that asks the policy instead of a user."""
+
+    NoChoice = _NoChoice
+
+    def __init__(self, policy: BotPolicy) -> None:
+        self.policy = policy
+
+    def Choose(self, entries, **kwargs):
+        policy = self.policy
+
+        class Menu:
+            async def paginate(self, ctx, location=None, user=None):
+                return policy.choose(len(entries))
+
+        return Menu()
+
+    def MultiChoose(self, entries, max_values=None, allow_empty=False, **kwargs):
+        policy = self.policy
+
+        class Menu:
+            async def paginate(self, ctx, location=None, user=None):
+                return policy.choose_many(
+                    len(entries),
+                    max_values if max_values is not None else len(entries),
+                    allow_empty,
+                )
+
+        return Menu()
+
+
+def headless_context(policy: BotPolicy):
+    async def wait_for(*args, **kwargs):
+        raise asyncio.TimeoutError()
+
+    channel = HeadlessChannel()
+    bot = SimpleNamespace(
+        paginator=HeadlessPaginator(policy),
+        wait_for=wait_for,
+        wait_for_dms=wait_for,
+        config=SimpleNamespace(game=SimpleNamespace(primary_colour=0)),
+        pool=None,
+    )
+    author = HeadlessUser(0)
+    return SimpleNamespace(
+        bot=bot,
+        channel=channel,
+        guild=None,
+        author=author,
+        me=author,
+        send=channel.send,
+        clean_prefix="$",
+    )
+
+
+class HeadlessGame(Game):
+    """``Game`` with its Discord I/O replaced and a policy answering prompts."""
+
+    def __init__(self, ctx, players, mode, speed, custom_roles=None, *, policy, max_days):
+        super().__init__(ctx, players, mode, speed, custom_roles)
+        self.policy = policy
+        self.max_days = max_days
+
+    async def send_to_channel(self, *args, **kwargs):
+        return HeadlessMessage(self.ctx.channel)
+
+    async def edit_message(self, message, **kwargs):
+        return message
+
+    async def add_reaction_to_message(self, message, emoji) -> bool:
+        return True
+
+    async def remove_reaction_from_message(self, message, emoji, user) -> bool:
+        return True
+
+    async def fetch_channel_message(self, channel, message_id):
+        return None
+
+    async def _set_night_chat_lock(self, lock: bool) -> None:
+        self._night_chat_locked = lock
+
+    async def _set_everyone_chat_lock(self, lock: bool) -> None:
+        self._everyone_chat_locked = lock
+
+    async def _open_postgame_everyone_chat(self, duration_seconds: int = 120) -> None:
+        return None
+
+    async def sync_player_ww_role(self, player: Player) -> None:
+        return None
+
+    async def cleanup_ww_player_roles(self) -> None:
+        return None
+
+    async def send_endgame_team_embed(self, winner) -> None:
+        return None
+
+    async def relay_team_messages(self) -> None:
+        return None
+
+    async def relay_medium_messages(self) -> None:
+        return None
+
+    async def relay_alpha_day_wolf_messages(self) -> None:
+        return None
+
+    async def relay_jail_messages(self, *args, **kwargs) -> None:
+        return None
+
+    async def handle_afk(self) -> None:
+        return None
+
+    async def election(self):
+        voters = self._get_live_day_election_players()
+        votes = Counter()
+        for voter in voters:
+            target = self.policy.lynch_vote(voter, voters)
+            if target is not None:
+                votes[target.user.id] += 2 if voter.is_sheriff else 1
+        ranked = votes.most_common(2)
+        if not ranked or (len(ranked) == 2 and ranked[0][1] == ranked[1][1]):
+            return None, False
+        return self.get_alive_player_by_user_id(ranked[0][0]).user, False
+
+    async def day(self, deaths: list[Player]) -> None:
+        if self.night_no > self.max_days:
+            self.forced_winner = DRAW
+            return
+        await super().day(deaths)
+
+
+def _winner_label(game: HeadlessGame) -> str:
+    winner = game.winner
+    if winner is None or winner == DRAW:
+        return DRAW
+    if isinstance(winner, Player):
+        return str(game.winning_side or winner.role_name)
+    return str(game.winning_side or winner)
+
+
+@contextlib.contextmanager
+def _headless_runtime(seed: int):
+    # the game paces itself with asyncio.sleep and rolls with utils.random
+    sleep = asyncio.sleep
+
+    async def no_sleep(delay=0, result=None):
+        return await sleep(0, result)
+
+    seeded = SeededRandom(seed)
+    modules = (core, role_pool)
+    previous = [module.random for module in modules]
+    asyncio.sleep = no_sleep
+    for module in modules:
+        module.random = seeded
+    try:
+        yield
+    finally:
+        asyncio.sleep = sleep
+        for module, module_random in zip(modules, previous):
+            module.random = module_random
+
+
+async def run_game(spec: GameSpec, seed: int) -> GameResult:
+    """Plays one game of ``spec`` to the end."""
+    policy = BotPolicy(random.Random(seed), spec.skip_chance)
+    custom_roles = [Role[name] for name in spec.roles] if spec.roles else None
+    game = HeadlessGame(
+        headless_context(policy),
+        [HeadlessUser(user_id) for user_id in range(1, spec.players + 1)],
+        spec.mode,
+        spec.speed,
+        custom_roles,
+        policy=policy,
+        max_days=spec.max_days,
+    )
+    roles = tuple(player.role.name for player in game.players)
+    try:
+        await game.run()
+    except Exception as error:
+        return GameResult(
+            seed=seed,
+            winner=DRAW,
+            days=game.night_no,
+            roles=roles,
+            error=f"{type(error).__name__}: {error}",
+        )
+    return GameResult(
+        seed=seed, winner=_winner_label(game), days=game.night_no, roles=roles
+    )
+
+
+def game_seed(spec: GameSpec, index: int) -> int:
+    return spec.seed * 1_000_003 + index
+
+
+def run_chunk(spec: GameSpec, indices) -> List[GameResult]:
+    """Plays the games at ``indices`` of ``spec`` in this process."""
+    results = []
+    for index in indices:
+        seed = game_seed(spec, index)
+        with _headless_runtime(seed):
+            results.append(asyncio.run(run_game(spec, seed)))
+    return results
+
+
+def simulate(spec: GameSpec, *, workers: int = 1) -> SimulationReport:
+    """Plays ``spec.games`` games, across ``workers`` processes if above one."""
+    chunks = [
+        range(start, min(start + CHUNK_SIZE, spec.games))
+        for start in range(0, spec.games, CHUNK_SIZE)
+    ]
+    started = time.perf_counter()
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(run_chunk, [spec] * len(chunks), chunks))
+    else:
+        parts = [run_chunk(spec, chunk) for chunk in chunks]
+    elapsed = time.perf_counter() - started
+    results = [result for part in parts for result in part]
+    return SimulationReport(spec=spec, results=results, elapsed=elapsed)
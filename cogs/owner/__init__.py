@@ -34,6 +34,7 @@ from classes.bot import Bot
 from classes.context import Context
 from classes.converters import UserWithCharacter
 from utils import shell
+from utils.i18n import _
 from utils.misc import random_token
 
 
@@ -45,6 +46,29 @@ class Owner(commands.Cog):
     #async def cog_check(self, ctx: Context) -> bool:
        # return await self.bot.is_owner(ctx.author)
 
+    @commands.is_owner()
+    @commands.command(hidden=True, brief=_("Show profile queries per command"))
+    async def profilequeries(self, ctx: Context, limit: int = 15):
+        """Lists the commands reading the author's profile most often.
+
+        "before" counts every profile read the command made, "after" only the
+        ones that still reached the database."""
+        stats = sorted(
+            self.bot.profile_cache.command_stats.items(),
+            key=lambda item: item[1][1] + item[1][2],
+            reverse=True,
+        )[:limit]
+        if not stats:
+            return await ctx.send(_("No commands recorded yet."))
+        lines = [f"{'command':<24} {'uses':>6} {'before':>7} {'after':>7}"]
+        for name, (invocations, queries, hits) in stats:
+            lines.append(
+                f"{name[:24]:<24} {invocations:>6}"
+                f" {(queries + hits) / invocations:>7.2f}"
+                f" {queries / invocations:>7.2f}"
+            )
+        await ctx.send("```\n{0}\n```".format("\n".join(lines)))
+
 
 
 async def setup(bot):
@@ -25,7 +25,7 @@ import re
 
 import asyncpg
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord.http import handle_message_parameters
 from discord.ui import Modal, TextInput
 from discord.ui.button import Button
@@ -35,6 +35,8 @@ from classes import logger
 from classes.classes import Ranger
 from classes.classes import from_string as class_from_string
 from classes.converters import IntGreaterThan
+from classes.cooldowns import USER
+from cogs.pets.due_events import PetDueEvents
 from cogs.shard_communication import user_on_cooldown as user_cooldown
 from utils import random
 from utils.april_fools import (
@@ -2349,12 +2351,8 @@ class Pets(commands.Cog):
         if not isinstance(pets_ids, dict):
             pets_ids = {}
         self.booster_guild_id = pets_ids.get("booster_guild_id") or self.bot.config.game.support_server_id
-        if not self.check_egg_hatches.is_running():
-            self.check_egg_hatches.start()
-        if not self.check_pet_growth.is_running():
-            self.check_pet_growth.start()
-        if not self.auto_return_daycare_boardings.is_running():
-            self.auto_return_daycare_boardings.start()
+        self.due_events = PetDueEvents(self)
+        self.due_events.start()
             
         self.emoji_to_element = {
             "<:f_corruption:1170192253256466492>": "Corrupted",
@@ -2614,12 +2612,7 @@ class Pets(commands.Cog):
         self.bot.loop.create_task(self.initialize_enhanced_tables())
 
     def cog_unload(self):
-        if self.check_egg_hatches.is_running():
-            self.check_egg_hatches.cancel()
-        if self.check_pet_growth.is_running():
-            self.check_pet_growth.cancel()
-        if self.auto_return_daycare_boardings.is_running():
-            self.auto_return_daycare_boardings.cancel()
+        self.due_events.stop()
 
     async def initialize_enhanced_tables(self):
         """Initialize the enhanced pet system database tables"""
@@ -2797,6 +2790,15 @@ class Pets(commands.Cog):
                 await conn.execute(
                     "CREATE INDEX IF NOT EXISTS pet_daycare_boardings_owner_idx ON pet_daycare_boardings(owner_user_id, status);"
                 )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS pet_daycare_boardings_due_idx ON pet_daycare_boardings(ends_at) WHERE status = 'active';"
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS monster_pets_growth_due_idx ON monster_pets(growth_time) WHERE growth_stage <> 'adult';"
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS monster_eggs_hatch_due_idx ON monster_eggs(hatch_time) WHERE hatched = FALSE;"
+                )
                 await conn.execute("ALTER TABLE pet_daycare_boardings ADD COLUMN IF NOT EXISTS food_type TEXT NOT NULL DEFAULT 'basic_food';")
                 await conn.execute("ALTER TABLE pet_daycare_boardings ADD COLUMN IF NOT EXISTS feeds_per_day INTEGER NOT NULL DEFAULT 0;")
                 await conn.execute("ALTER TABLE pet_daycare_boardings ADD COLUMN IF NOT EXISTS plays_per_day INTEGER NOT NULL DEFAULT 0;")
@@ -3114,12 +3116,7 @@ class Pets(commands.Cog):
         )
 
     async def is_ranger_owner(self, ctx) -> bool:
-        if not hasattr(ctx, "character_data"):
-            ctx.character_data = await ctx.bot.pool.fetchrow(
-                'SELECT * FROM profile WHERE "user"=$1;',
-                ctx.author.id,
-            )
-        if not ctx.character_data:
+        if not await ctx.get_profile():
             return False
         classes = [class_from_string(name) for name in ctx.character_data["class"]]
         return any(class_ and class_.in_class_line(Ranger) for class_ in classes)
@@ -8365,12 +8362,8 @@ class Pets(commands.Cog):
             # subcommand cooldown key explicitly and invoke with the command
             # context switched so reset_cooldown() inside subcommands targets
             # the correct key.
-            await ctx.bot.redis.execute_command(
-                "SET",
-                f"cd:{ctx.author.id}:{primary_command_id}",
-                primary_command_id,
-                "EX",
-                action["cooldown"],
+            await ctx.bot.cooldowns.set(
+                USER, ctx.author.id, primary_command_id, action["cooldown"]
             )
             previous_command = ctx.command
             ctx.command = command
@@ -9408,56 +9401,6 @@ class Pets(commands.Cog):
         embed.set_footer(text="Your pet will no longer participate in battles until re-equipped.")
         await ctx.send(embed=embed)
 
-    @tasks.loop(minutes=1)
-    async def auto_return_daycare_boardings(self):
-        try:
-            async with self.bot.pool.acquire() as conn:
-                pending = await conn.fetch(
-                    """
-                    SELECT id
-                    FROM pet_daycare_boardings
-                    WHERE status = 'active' AND ends_at <= NOW()
-                    ORDER BY ends_at ASC
-                    LIMIT 50;
-                    """
-                )
-
-            for entry in pending:
-                settlement = None
-                async with self.bot.pool.acquire() as conn:
-                    async with conn.transaction():
-                        boarding = await conn.fetchrow(
-                            """
-                            SELECT b.*, p.name AS package_name, p.min_growth_stage, d.name AS daycare_name
-                            FROM pet_daycare_boardings b
-                            JOIN pet_daycare_packages p ON p.id = b.package_id
-                            JOIN pet_daycares d ON d.id = b.daycare_id
-                            WHERE b.id = $1 AND b.status = 'active';
-                            """,
-                            entry["id"],
-                        )
-                        if not boarding:
-                            continue
-
-                        pet = await conn.fetchrow(
-                            "SELECT * FROM monster_pets WHERE id = $1 AND user_id = $2;",
-                            boarding["pet_id"],
-                            boarding["customer_user_id"],
-                        )
-                        if not pet:
-                            settlement = await self.settle_missing_daycare_boarding(
-                                conn,
-                                boarding,
-                                reason="pet missing from collection",
-                            )
-                        else:
-                            settlement = await self.settle_daycare_boarding(conn, boarding, pet=pet)
-
-                if settlement:
-                    await self.send_daycare_auto_return_dm(settlement)
-        except Exception as e:
-            print(f"Error in auto_return_daycare_boardings: {e}")
-
     def _resolve_pet_growth_index(self, pet) -> int:
         growth_index = pet.get("growth_index")
         if growth_index in self.EGG_GROWTH_STAGES:
@@ -9470,6 +9413,46 @@ class Pets(commands.Cog):
 
         return 1
 
+    def plan_pet_growth(self, pet, daycare_room_type: str | None) -> dict | None:
+        """The next growth stage of ``pet`` and its new stats, None for adults."""
+        current_stage_index = self._resolve_pet_growth_index(pet)
+        current_stage = self.EGG_GROWTH_STAGES.get(
+            current_stage_index, self.EGG_GROWTH_STAGES[1]
+        )
+        next_stage_index = current_stage_index + 1
+        next_stage = self.EGG_GROWTH_STAGES.get(next_stage_index)
+
+        if next_stage is None or str(pet.get("growth_stage") or "").lower() == "adult":
+            return None
+
+        growth_time_interval = (
+            self.get_pet_growth_interval_for_stage(
+                pet,
+                next_stage["growth_time"],
+                stage_override=next_stage["stage"],
+                daycare_room_type=daycare_room_type,
+            )
+            if next_stage["growth_time"] is not None
+            else None
+        )
+
+        multiplier_ratio = (
+            next_stage["stat_multiplier"] / current_stage["stat_multiplier"]
+        )
+        return {
+            "old_stage": current_stage["stage"],
+            "new_stage": next_stage["stage"],
+            "growth_index": next_stage_index,
+            "growth_time_interval": growth_time_interval,
+            "hp": pet["hp"] * multiplier_ratio,
+            "attack": pet["attack"] * multiplier_ratio,
+            "defense": pet["defense"] * multiplier_ratio,
+            "speed_growth_active": bool(pet.get("speed_growth_active", False)),
+            "speed_growth_expired": bool(
+                next_stage["stage"] == "adult" and pet.get("speed_growth_active", False)
+            ),
+        }
+
     async def advance_pet_growth_stage(self, conn, pet_id: int):
         async with conn.transaction():
             pet = await conn.fetchrow(
@@ -9480,15 +9463,13 @@ class Pets(commands.Cog):
             if pet is None:
                 return {"status": "missing", "pet_id": pet_id}
 
-            current_stage_index = self._resolve_pet_growth_index(pet)
-            current_stage = self.EGG_GROWTH_STAGES.get(
-                current_stage_index, self.EGG_GROWTH_STAGES[1]
-            )
-            next_stage_index = current_stage_index + 1
-            next_stage = self.EGG_GROWTH_STAGES.get(next_stage_index)
             daycare_room_type = await self.get_active_daycare_room_type_for_pet(conn, pet)
+            growth = self.plan_pet_growth(pet, daycare_room_type)
 
-            if next_stage is None or str(pet.get("growth_stage") or "").lower() == "adult":
+            if growth is None:
+                current_stage = self.EGG_GROWTH_STAGES.get(
+                    self._resolve_pet_growth_index(pet), self.EGG_GROWTH_STAGES[1]
+                )
                 return {
                     "status": "adult",
                     "pet_id": pet["id"],
@@ -9497,25 +9478,7 @@ class Pets(commands.Cog):
                     "current_stage": current_stage["stage"],
                 }
 
-            growth_time_interval = (
-                self.get_pet_growth_interval_for_stage(
-                    pet,
-                    next_stage["growth_time"],
-                    stage_override=next_stage["stage"],
-                    daycare_room_type=daycare_room_type,
-                )
-                if next_stage["growth_time"] is not None
-                else None
-            )
-
-            multiplier_ratio = (
-                next_stage["stat_multiplier"] / current_stage["stat_multiplier"]
-            )
-            newhp = pet["hp"] * multiplier_ratio
-            newattack = pet["attack"] * multiplier_ratio
-            newdefense = pet["defense"] * multiplier_ratio
-
-            if growth_time_interval is not None:
+            if growth["growth_time_interval"] is not None:
                 await conn.execute(
                     """
                     UPDATE monster_pets
@@ -9529,12 +9492,12 @@ class Pets(commands.Cog):
                     WHERE
                         id = $7;
                     """,
-                    next_stage["stage"],
-                    growth_time_interval,
-                    newhp,
-                    newattack,
-                    newdefense,
-                    next_stage_index,
+                    growth["new_stage"],
+                    growth["growth_time_interval"],
+                    growth["hp"],
+                    growth["attack"],
+                    growth["defense"],
+                    growth["growth_index"],
                     pet["id"],
                 )
             else:
@@ -9551,18 +9514,15 @@ class Pets(commands.Cog):
                     WHERE
                         id = $6;
                     """,
-                    next_stage["stage"],
-                    newhp,
-                    newattack,
-                    newdefense,
-                    next_stage_index,
+                    growth["new_stage"],
+                    growth["hp"],
+                    growth["attack"],
+                    growth["defense"],
+                    growth["growth_index"],
                     pet["id"],
                 )
 
-            speed_growth_expired = bool(
-                next_stage["stage"] == "adult" and pet.get("speed_growth_active", False)
-            )
-            if speed_growth_expired:
+            if growth["speed_growth_expired"]:
                 await conn.execute(
                     "UPDATE monster_pets SET speed_growth_active = FALSE WHERE id = $1;",
                     pet["id"],
@@ -9573,42 +9533,22 @@ class Pets(commands.Cog):
             "pet_id": pet["id"],
             "user_id": pet["user_id"],
             "pet_name": pet["name"],
-            "old_stage": current_stage["stage"],
-            "new_stage": next_stage["stage"],
-            "speed_growth_active": bool(pet.get("speed_growth_active", False)),
-            "speed_growth_expired": speed_growth_expired,
+            "old_stage": growth["old_stage"],
+            "new_stage": growth["new_stage"],
+            "speed_growth_active": growth["speed_growth_active"],
+            "speed_growth_expired": growth["speed_growth_expired"],
         }
 
-    @tasks.loop(minutes=1)
-    async def check_pet_growth(self):
-        try:
-            async with self.bot.pool.acquire() as conn:
-                pets = await conn.fetch(
-                    "SELECT id FROM monster_pets WHERE growth_time <= NOW() AND growth_stage != 'adult';"
-                )
-                for pet in pets:
-                    growth_result = await self.advance_pet_growth_stage(conn, pet["id"])
-                    if growth_result.get("status") != "advanced":
-                        continue
-
-                    user = self.bot.get_user(growth_result["user_id"])
-                    if user:
-                        growth_message = (
-                            f"Your pet **{growth_result['pet_name']}** has grown into a "
-                            f"{growth_result['new_stage']}!"
-                        )
-
-                        if (
-                            growth_result["speed_growth_active"]
-                            and growth_result["new_stage"] != "adult"
-                        ):
-                            growth_message += " (Speed Growth Potion active - growing 2x faster!)"
-                        elif growth_result["speed_growth_expired"]:
-                            growth_message += " (Speed Growth Potion effect has expired)"
-
-                        await user.send(growth_message)
-        except Exception as e:
-            print(f"Error in check_pet_growth: {e}")
+    def format_pet_growth_message(self, growth_result: dict) -> str:
+        growth_message = (
+            f"Your pet **{growth_result['pet_name']}** has grown into a "
+            f"{growth_result['new_stage']}!"
+        )
+        if growth_result["speed_growth_active"] and growth_result["new_stage"] != "adult":
+            growth_message += " (Speed Growth Potion active - growing 2x faster!)"
+        elif growth_result["speed_growth_expired"]:
+            growth_message += " (Speed Growth Potion effect has expired)"
+        return growth_message
 
     async def hatch_monster_egg(self, conn, egg_id: int):
         async with conn.transaction():
@@ -9676,30 +9616,6 @@ class Pets(commands.Cog):
             "pet_name": egg["egg_type"],
         }
 
-    @tasks.loop(minutes=1)
-    async def check_egg_hatches(self):
-        async with self.bot.pool.acquire() as conn:
-            # Fetch eggs that are ready to hatch
-            eggs = await conn.fetch(
-                "SELECT id FROM monster_eggs WHERE hatched = FALSE AND hatch_time <= NOW();"
-            )
-            for egg in eggs:
-                hatch_result = await self.hatch_monster_egg(conn, egg["id"])
-                if hatch_result is None:
-                    continue
-
-                # Notify the user 
-                try:
-                    user = self.bot.get_user(hatch_result["user_id"])
-                    if user:
-                        await user.send(
-                            f"Your **Egg** has hatched into a pet named **{hatch_result['pet_name']}**! Check your pet menu to see it."
-                        )
-                except:
-                    pass
-
-
-
     @is_gm()
     @commands.command(name="gmcreatemonster")
     async def gmcreatemonster(self, ctx):
@@ -0,0 +1,312 @@
+"""Pet growth, egg hatching and daycare returns for every cluster at once.
+
+These used to be three one minute loops that ran on every cluster, each
+scanning its whole table and updating row by row, so with N clusters every
+due pet was claimed N times and most of the work was wasted on lock waits.
+Now only the cluster holding the ``pets:due-events`` lease looks for due rows,
+through partial indexes on the due time columns, and claims them with
+``FOR UPDATE SKIP LOCKED`` so a command touching the same pet never blocks it.
+Eggs are hatched and pets are grown with one statement per batch.
+
+Notifications are queued in Redis and sent by the cluster running shard 0,
+which owns the DM channels.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import logging
+
+from utils.scheduling import ClusterLease, DueEventDispatcher
+
+log = logging.getLogger(__name__)
+
+PET_DUE_LEASE_NAME = "pets:due-events"
+NOTIFICATION_QUEUE = "pets:notifications"
+DUE_WINDOW = datetime.timedelta(minutes=1)
+DUE_BATCH_SIZE = 100
+
+
+def _naive_utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class PetDueEvents:
+    def __init__(self, cog) -> None:
+        self.cog = cog
+        self.bot = cog.bot
+        self.dispatcher = DueEventDispatcher(
+            lease=ClusterLease(self.bot.redis, PET_DUE_LEASE_NAME),
+            load=self.load,
+            fire=self.fire,
+            window=DUE_WINDOW,
+            batch_size=DUE_BATCH_SIZE,
+        )
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks.append(asyncio.create_task(self.run_dispatcher()))
+        if 0 in self.bot.shard_ids:
+            self._tasks.append(asyncio.create_task(self.drain_notifications()))
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        asyncio.create_task(self.dispatcher.lease.release())
+
+    async def run_dispatcher(self) -> None:
+        await self.bot.wait_until_ready()
+        await self.dispatcher.run()
+
+    async def load(self, horizon: datetime.datetime) -> list[tuple]:
+        ahead = max(horizon - self.dispatcher.clock(), datetime.timedelta(0))
+        async with self.bot.pool.acquire() as conn:
+            pets = await conn.fetch(
+                """
+                SELECT id, growth_time AS due FROM monster_pets
+                WHERE growth_stage <> 'adult' AND growth_time <= NOW() + $1;
+                """,
+                ahead,
+            )
+            eggs = await conn.fetch(
+                """
+                SELECT id, hatch_time AS due FROM monster_eggs
+                WHERE hatched = FALSE AND hatch_time <= NOW() + $1;
+                """,
+                ahead,
+            )
+            boardings = await conn.fetch(
+                """
+                SELECT id, ends_at AS due FROM pet_daycare_boardings
+                WHERE status = 'active' AND ends_at <= NOW() + $1;
+                """,
+                ahead,
+            )
+        return [
+            ((kind, record["id"]), _naive_utc(record["due"]), None)
+            for kind, records in (("pet", pets), ("egg", eggs), ("boarding", boardings))
+            for record in records
+        ]
+
+    async def fire(self, due: list[tuple]) -> None:
+        ids = {"pet": [], "egg": [], "boarding": []}
+        for (kind, id_), _value in due:
+            ids[kind].append(id_)
+
+        for kind, handler in (
+            ("egg", self.hatch_eggs),
+            ("pet", self.grow_pets),
+            ("boarding", self.return_boardings),
+        ):
+            if not ids[kind]:
+                continue
+            try:
+                await handler(ids[kind])
+            except Exception:
+                log.exception("Failed to process due %s rows %s", kind, ids[kind])
+
+    async def hatch_eggs(self, egg_ids: list[int]) -> None:
+        baby_stage = self.cog.EGG_GROWTH_STAGES[1]
+        async with self.bot.pool.acquire() as conn:
+            hatched = await conn.fetch(
+                """
+                WITH hatched AS (
+                    UPDATE monster_eggs
+                    SET hatched = TRUE
+                    WHERE id IN (
+                        SELECT id FROM monster_eggs
+                        WHERE id = ANY($1) AND hatched = FALSE AND hatch_time <= NOW()
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING *
+                )
+                INSERT INTO monster_pets (
+                    user_id, name, default_name, hp, attack, defense, element, url,
+                    growth_stage, growth_index, growth_time, "IV",
+                    frontier_species_id
+                )
+                SELECT
+                    user_id, egg_type, egg_type,
+                    round(hp * $2::float8), round(attack * $2::float8),
+                    round(defense * $2::float8), element, url,
+                    $3, 1, NOW() + $4, coalesce("IV", 0), frontier_species_id
+                FROM hatched
+                RETURNING id, user_id, name, frontier_species_id;
+                """,
+                egg_ids,
+                baby_stage["stat_multiplier"],
+                baby_stage["stage"],
+                datetime.timedelta(days=baby_stage["growth_time"]),
+            )
+
+        for pet in hatched:
+            self.bot.dispatch(
+                "frontier_pet_hatched",
+                int(pet["user_id"]),
+                int(pet["id"]),
+                (
+                    int(pet["frontier_species_id"])
+                    if pet["frontier_species_id"] is not None
+                    else None
+                ),
+            )
+            await self.notify(
+                pet["user_id"],
+                f"Your **Egg** has hatched into a pet named **{pet['name']}**! Check"
+                " your pet menu to see it.",
+            )
+
+    async def grow_pets(self, pet_ids: list[int]) -> None:
+        messages = []
+        async with self.bot.pool.acquire() as conn:
+            async with conn.transaction():
+                pets = await conn.fetch(
+                    """
+                    SELECT p.*, b.room_type AS daycare_room_type
+                    FROM monster_pets p
+                    LEFT JOIN pet_daycare_boardings b
+                        ON b.id = p.daycare_boarding_id AND b.status = 'active'
+                    WHERE
+                        p.id = ANY($1)
+                        AND p.growth_stage <> 'adult'
+                        AND p.growth_time <= NOW()
+                    FOR UPDATE OF p SKIP LOCKED;
+                    """,
+                    pet_ids,
+                )
+                rows = []
+                for pet in pets:
+                    growth = self.cog.plan_pet_growth(pet, pet["daycare_room_type"])
+                    if growth is None:
+                        continue
+                    rows.append((pet["id"], growth))
+                    messages.append(
+                        (
+                            pet["user_id"],
+                            self.cog.format_pet_growth_message(
+                                {"pet_name": pet["name"], **growth}
+                            ),
+                        )
+                    )
+                if rows:
+                    await conn.execute(
+                        """
+                        UPDATE monster_pets AS p
+                        SET
+                            growth_stage = u.growth_stage,
+                            growth_time = NOW() + u.growth_interval,
+                            hp = u.hp,
+                            attack = u.attack,
+                            defense = u.defense,
+                            growth_index = u.growth_index,
+                            speed_growth_active =
+                                p.speed_growth_active AND NOT u.speed_expired
+                        FROM unnest(
+                            $1::bigint[], $2::text[], $3::interval[], $4::float8[],
+                            $5::float8[], $6::float8[], $7::int[], $8::bool[]
+                        ) AS u(
+                            id, growth_stage, growth_interval, hp, attack, defense,
+                            growth_index, speed_expired
+                        )
+                        WHERE p.id = u.id;
+                        """,
+                        [id_ for id_, _growth in rows],
+                        [growth["new_stage"] for _id, growth in rows],
+                        [growth["growth_time_interval"] for _id, growth in rows],
+                        [growth["hp"] for _id, growth in rows],
+                        [growth["attack"] for _id, growth in rows],
+                        [growth["defense"] for _id, growth in rows],
+                        [growth["growth_index"] for _id, growth in rows],
+                        [growth["speed_growth_expired"] for _id, growth in rows],
+                    )
+
+        for user_id, content in messages:
+            await self.notify(user_id, content)
+
+    async def return_boardings(self, boarding_ids: list[int]) -> None:
+        # Settling a boarding pays out the daycare and writes its ledger, so
+        # each one keeps its own transaction.
+        for boarding_id in boarding_ids:
+            settlement = None
+            async with self.bot.pool.acquire() as conn:
+                async with conn.transaction():
+                    boarding = await conn.fetchrow(
+                        """
+                        SELECT b.*, p.name AS package_name, p.min_growth_stage,
+                            d.name AS daycare_name
+                        FROM pet_daycare_boardings b
+                        JOIN pet_daycare_packages p ON p.id = b.package_id
+                        JOIN pet_daycares d ON d.id = b.daycare_id
+                        WHERE b.id = $1 AND b.status = 'active' AND b.ends_at <= NOW()
+                        FOR UPDATE OF b SKIP LOCKED;
+                        """,
+                        boarding_id,
+                    )
+                    if not boarding:
+                        continue
+
+                    pet = await conn.fetchrow(
+                        "SELECT * FROM monster_pets WHERE id = $1 AND user_id = $2;",
+                        boarding["pet_id"],
+                        boarding["customer_user_id"],
+                    )
+                    if not pet:
+                        settlement = await self.cog.settle_missing_daycare_boarding(
+                            conn,
+                            boarding,
+                            reason="pet missing from collection",
+                        )
+                    else:
+                        settlement = await self.cog.settle_daycare_boarding(
+                            conn, boarding, pet=pet
+                        )
+
+            if settlement:
+                await self.queue_notification(
+                    {"kind": "daycare", "settlement": settlement}
+                )
+
+    async def notify(self, user_id: int, content: str) -> None:
+        await self.queue_notification(
+            {"kind": "text", "user_id": user_id, "content": content}
+        )
+
+    async def queue_notification(self, payload: dict) -> None:
+        try:
+            await self.bot.redis.rpush(
+                NOTIFICATION_QUEUE, json.dumps(payload, default=str)
+            )
+        except Exception:
+            log.exception("Could not queue a pet notification, sending it here")
+            await self.deliver(payload)
+
+    async def drain_notifications(self) -> None:
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                item = await self.bot.redis.blpop(NOTIFICATION_QUEUE, timeout=5)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Failed to read pet notifications")
+                await asyncio.sleep(5)
+                continue
+            if item is None:
+                continue
+            await self.deliver(json.loads(item[1]))
+
+    async def deliver(self, payload: dict) -> None:
+        if payload["kind"] == "daycare":
+            await self.cog.send_daycare_auto_return_dm(payload["settlement"])
+            return
+        try:
+            user = self.bot.get_user(payload["user_id"])
+            if user is None:
+                user = await self.bot.fetch_user(payload["user_id"])
+            await user.send(payload["content"])
+        except Exception:
+            pass
@@ -1992,40 +1992,15 @@ class ProcessSplice(commands.Cog):
 
     def _load_default_pve_monster_names(self):
         """Load base monster names from monsters.json used by PvE."""
-        with open("monsters.json", "r", encoding="utf-8") as f:
-            monsters_data = json.load(f)
-
-        base_names = set()
-        if isinstance(monsters_data, dict):
-            for monster_list in monsters_data.values():
-                if not isinstance(monster_list, list):
-                    continue
-                for monster in monster_list:
-                    if not isinstance(monster, dict):
-                        continue
-                    name = monster.get("name")
-                    if isinstance(name, str):
-                        cleaned = name.strip()
-                        if cleaned:
-                            base_names.add(cleaned)
-        return base_names
+        return self.bot.content.monsters(missing_ok=False).names
 
     def _load_default_pve_monsters(self):
         """Load full base monster records from monsters.json, keyed by name."""
-        with open("monsters.json", "r", encoding="utf-8") as f:
-            monsters_data = json.load(f)
-
         by_name = {}
-        if isinstance(monsters_data, dict):
-            for monster_list in monsters_data.values():
-                if not isinstance(monster_list, list):
-                    continue
-                for monster in monster_list:
-                    if not isinstance(monster, dict):
-                        continue
-                    name = monster.get("name")
-                    if isinstance(name, str) and name.strip():
-                        by_name.setdefault(name.strip(), monster)
+        for monster in self.bot.content.monsters(missing_ok=False).iter_monsters():
+            name = monster.get("name")
+            if isinstance(name, str) and name.strip():
+                by_name.setdefault(name.strip(), monster)
         return by_name
 
     def _build_splice_generation_map(self, base_monster_names, completed_rows):
@@ -2078,8 +2053,7 @@ class ProcessSplice(commands.Cog):
         return generation_by_name
 
     def _load_monsters_json_data(self):
-        with open("monsters.json", "r", encoding="utf-8") as f:
-            return json.load(f)
+        return self.bot.content.monsters(missing_ok=False).data
 
     def _build_splice_thumb(self, image_bytes: bytes, thumb_size: int):
         with Image.open(BytesIO(image_bytes)) as source_img:
@@ -32,6 +32,7 @@ from aiohttp import ContentTypeError
 from discord import Embed
 from discord.ext import commands
 
+from classes import profile_card
 from classes.ascension import ASCENSION_TABLE_NAME, get_ascension_mantle
 from classes.badges import Badge
 from classes.bot import Bot
@@ -40,11 +41,11 @@ from classes.context import Context
 from classes.converters import IntFromTo, MemberWithCharacter, UserWithCharacter
 from classes.endgame import apply_item_progression_bonus, soulbound_level_from_xp
 from classes.items import ALL_ITEM_TYPES, ItemType
+from classes.profile_card import ProfileCardRenderer
 from cogs.adventure import ADVENTURE_NAMES
 from cogs.help import chunks
 from cogs.shard_communication import user_on_cooldown as user_cooldown
 from cogs.profilecustomization import ProfileCustomization
-from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageOps
 from utils import checks, colors, random
 from utils.april_fools import get_pet_display_name, mask_pet_record_for_display
 from utils import misc as rpgtools
@@ -1546,12 +1547,15 @@ class Profile(commands.Cog):
 
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
-        self._profile_font_cache = {}
+        self.card_renderer = ProfileCardRenderer(bot.redis)
         self._veteran_badge_ids = self._load_veteran_badge_ids()
 
     async def cog_load(self):
         await self._ensure_profile_xp_bigint()
 
+    async def cog_unload(self):
+        self.card_renderer.close()
+
     async def _ensure_profile_xp_bigint(self) -> None:
         async with self.bot.pool.acquire() as conn:
             await conn.execute(
@@ -1562,34 +1566,14 @@ class Profile(commands.Cog):
                 """
             )
 
-    @staticmethod
-    def _safe_int(value, default: int = 0) -> int:
-        try:
-            return int(value)
-        except (TypeError, ValueError):
-            return default
-
-    @staticmethod
-    def _safe_float(value, default: float = 0.0) -> float:
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return default
-
-    @staticmethod
-    def _decimal_or_zero(value) -> Decimal:
-        try:
-            return Decimal(str(value or 0))
-        except Exception:
-            return Decimal("0")
-
-    @classmethod
-    def _format_stat_value(cls, value) -> str:
-        number = cls._decimal_or_zero(value)
-        if number == number.to_integral_value():
-            return f"{int(number):,}"
-        rounded = number.quantize(Decimal("0.1"), rounding=ROUND_HALF_UP)
-        return f"{float(rounded):,.1f}"
+    _safe_int = staticmethod(profile_card.safe_int)
+    _safe_float = staticmethod(profile_card.safe_float)
+    _decimal_or_zero = staticmethod(profile_card.decimal_or_zero)
+    _format_stat_value = staticmethod(profile_card.format_stat_value)
+    _effective_item_damage = staticmethod(profile_card.effective_item_damage)
+    _effective_item_armor = staticmethod(profile_card.effective_item_armor)
+    _effective_item_primary_stat = staticmethod(profile_card.effective_item_primary_stat)
+    _compact_number = staticmethod(profile_card.compact_number)
 
     @classmethod
     def _rounded_stat_int(cls, value) -> int:
@@ -1600,24 +1584,6 @@ class Profile(commands.Cog):
             )
         )
 
-    @classmethod
-    def _effective_item_damage(cls, item) -> Decimal:
-        if not item:
-            return Decimal("0")
-        return cls._decimal_or_zero(item.get("effective_damage", item.get("damage", 0)))
-
-    @classmethod
-    def _effective_item_armor(cls, item) -> Decimal:
-        if not item:
-            return Decimal("0")
-        return cls._decimal_or_zero(item.get("effective_armor", item.get("armor", 0)))
-
-    @classmethod
-    def _effective_item_primary_stat(cls, item) -> Decimal:
-        damage = cls._effective_item_damage(item)
-        armor = cls._effective_item_armor(item)
-        return damage if damage > 0 else armor
-
     def _profile_item_tuple(self, item):
         if not item:
             return None
@@ -1710,25 +1676,6 @@ class Profile(commands.Cog):
             if local:
                 await self.bot.pool.release(conn)
 
-    @staticmethod
-    def _compact_number(value: int) -> str:
-        number = int(value)
-        units = (
-            (1_000_000_000_000, "T"),
-            (1_000_000_000, "B"),
-            (1_000_000, "M"),
-            (1_000, "K"),
-        )
-        for amount, suffix in units:
-            if abs(number) >= amount:
-                compact = number / amount
-                if compact >= 100:
-                    return f"{compact:.0f}{suffix}"
-                if compact >= 10:
-                    return f"{compact:.1f}{suffix}"
-                return f"{compact:.2f}{suffix}"
-        return f"{number:,}"
-
     @staticmethod
     def _badge_from_db_value(raw_badges) -> Badge:
         if raw_badges is None:
@@ -1813,27 +1760,6 @@ class Profile(commands.Cog):
             )
         return synced_badges
 
-    def _profile_font(self, size: int) -> ImageFont.FreeTypeFont:
-        if size in self._profile_font_cache:
-            return self._profile_font_cache[size]
-
-        font_path_candidates = (
-            Path("EightBitDragon-anqx.ttf"),
-            Path("assets") / "EightBitDragon-anqx.ttf",
-        )
-        for font_path in font_path_candidates:
-            if font_path.exists():
-                try:
-                    font = ImageFont.truetype(str(font_path), size=size)
-                    self._profile_font_cache[size] = font
-                    return font
-                except OSError:
-                    continue
-
-        font = ImageFont.load_default()
-        self._profile_font_cache[size] = font
-        return font
-
     def _find_class_icon(self, icon_name: str) -> Optional[Path]:
         base = Path("assets") / "classes"
         if not icon_name:
@@ -1844,53 +1770,6 @@ class Profile(commands.Cog):
                 return candidate
         return None
 
-    def _find_element_icon(self, element_name: str) -> Optional[Path]:
-        base = Path("assets") / "elements"
-        if not element_name:
-            return None
-
-        raw = str(element_name).strip()
-        if not raw:
-            return None
-
-        normalized = raw.lower()
-        aliases = {
-            "lightning": "electric",
-            "electricity": "electric",
-            "nature": "earth",
-        }
-        normalized = aliases.get(normalized, normalized)
-
-        preferred_stem = {
-            "wind": "Wind",
-            "electric": "Electric",
-            "light": "Light",
-            "dark": "Dark",
-            "corrupted": "Corrupted",
-            "earth": "Earth",
-            "water": "Water",
-            "fire": "Fire",
-        }.get(normalized, raw.capitalize())
-
-        direct_candidate = base / f"{preferred_stem}.png"
-        if direct_candidate.exists():
-            return direct_candidate
-
-        if not base.exists():
-            return None
-
-        # Fallback to case-insensitive stem matching.
-        for candidate in base.iterdir():
-            if candidate.is_file() and candidate.suffix.lower() in {
-                ".png",
-                ".webp",
-                ".jpg",
-                ".jpeg",
-            }:
-                if candidate.stem.lower() == normalized:
-                    return candidate
-        return None
-
     async def _resolve_profile_target_user(self, ctx: Context, raw_target: Optional[str]):
         target = str(ctx.author.id) if not raw_target else raw_target.split()[0]
         id_pattern = re.compile(r"^\d{17,19}$")
@@ -1916,7 +1795,18 @@ class Profile(commands.Cog):
 
         return None
 
-    async def _fetch_avatar_image(self, user: discord.User, size: int = 512) -> Image.Image:
+    async def _fetch_image_bytes(self, url: str) -> Optional[bytes]:
+        if not url:
+            return None
+        try:
+            async with self.bot.trusted_session.get(url) as resp:
+                if resp.status != 200:
+                    return None
+                return await resp.read()
+        except Exception:
+            return None
+
+    async def _fetch_avatar_bytes(self, user: discord.User, size: int = 512) -> Optional[bytes]:
         asset = user.display_avatar
         avatar_url = asset.url
         try:
@@ -1926,17 +1816,7 @@ class Profile(commands.Cog):
                 avatar_url = asset.with_size(size).with_format("png").url
             except Exception:
                 avatar_url = asset.url
-
-        try:
-            async with self.bot.trusted_session.get(avatar_url) as resp:
-                data = await resp.read()
-                if resp.status == 200:
-                    image = Image.open(BytesIO(data)).convert("RGBA")
-                    return image
-        except Exception:
-            pass
-
-        return Image.new("RGBA", (size, size), (44, 52, 68, 255))
+        return await self._fetch_image_bytes(avatar_url)
 
     async def _build_profile_rpg_card(
         self,
@@ -1955,137 +1835,6 @@ class Profile(commands.Cog):
         total_health: Optional[float] = None,
         amulet_data=None,
     ) -> BytesIO:
-        width, height = 1660, 940
-        canvas = Image.new("RGBA", (width, height), (58, 38, 22, 255))
-        draw = ImageDraw.Draw(canvas)
-        resample = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
-        colors = {
-            "panel": (74, 49, 30, 220),
-            "panel_inner": (103, 72, 45, 180),
-            "border": (198, 156, 90, 255),
-            "border_dim": (132, 98, 54, 235),
-            "text": (247, 231, 196, 255),
-            "muted": (214, 186, 140, 255),
-            "bar_bg": (65, 48, 34, 255),
-        }
-
-        for y in range(height):
-            t = y / max(1, height - 1)
-            r = int(44 + (150 - 44) * t)
-            g = int(30 + (111 - 30) * t)
-            b = int(18 + (72 - 18) * t)
-            draw.line([(0, y), (width, y)], fill=(r, g, b, 255))
-
-        if hasattr(Image, "effect_noise"):
-            try:
-                noise = Image.effect_noise((width, height), 14).convert("L")
-                tex = ImageOps.colorize(noise, (46, 31, 20), (170, 132, 86)).convert("RGBA")
-                tex.putalpha(42)
-                canvas.alpha_composite(tex)
-            except Exception:
-                pass
-
-        for path in (
-            Path("assets") / "other" / "dragon.webp",
-            Path("assets") / "other" / "dragon.jpg",
-            Path("assets") / "other" / "dragon.jpeg",
-        ):
-            if path.exists():
-                try:
-                    dragon = Image.open(path).convert("RGBA")
-                    dragon = ImageOps.fit(dragon, (1060, 680), method=resample)
-                    dragon = ImageOps.grayscale(dragon).convert("RGBA")
-                    tint = Image.new("RGBA", dragon.size, (210, 166, 100, 255))
-                    dragon = Image.blend(dragon, tint, 0.58)
-                    dragon.putalpha(dragon.split()[3].point(lambda p: int(p * 0.18)))
-                    canvas.alpha_composite(dragon, (480, 150))
-                    break
-                except Exception:
-                    continue
-
-        draw.rounded_rectangle((24, 24, width - 24, height - 24), radius=34, fill=(39, 24, 14, 242), outline=colors["border"], width=4)
-        draw.rounded_rectangle((40, 40, width - 40, height - 40), radius=30, outline=colors["border_dim"], width=2)
-
-        title_font = self._profile_font(44)
-        subtitle_font = self._profile_font(24)
-        heading_font = self._profile_font(31)
-        label_font = self._profile_font(24)
-        value_font = self._profile_font(25)
-        tiny_font = self._profile_font(20)
-        micro_font = self._profile_font(19)
-
-        def tw(text, font):
-            box = draw.textbbox((0, 0), str(text), font=font)
-            return max(0, box[2] - box[0])
-
-        def clip(text, font, max_w):
-            txt = str(text or "")
-            if max_w <= 0 or tw(txt, font) <= max_w:
-                return txt
-            while txt and tw(f"{txt}...", font) > max_w:
-                txt = txt[:-1]
-            return f"{txt}..." if txt else "..."
-
-        def panel(rect, title):
-            x1, y1, x2, y2 = rect
-            draw.rounded_rectangle(rect, radius=24, fill=colors["panel"], outline=colors["border_dim"], width=3)
-            draw.rounded_rectangle((x1 + 4, y1 + 4, x2 - 4, y2 - 4), radius=20, outline=colors["panel_inner"], width=1)
-            title_text = clip(title, heading_font, max(64, (x2 - x1) - 36))
-            draw.text((x1 + 18, y1 + 14), title_text, font=heading_font, fill=colors["border"])
-            draw.line((x1 + 18, y1 + 56, x2 - 18, y1 + 56), fill=colors["border_dim"], width=2)
-
-        left_rect = (56, 66, 390, 884)
-        header_rect = (412, 66, 1268, 450)
-        ledger_rect = (412, 470, 850, 884)
-        gear_rect = (868, 470, 1268, 884)
-        pet_rect = (1286, 66, width - 56, 884)
-        panel(left_rect, "Hero Sigil")
-        panel(header_rect, "Dragonforged Chronicle")
-        panel(ledger_rect, "Adventurer Ledger")
-        panel(gear_rect, "Armory and Quests")
-        panel(pet_rect, "Pet Status")
-
-        xp_value = self._safe_int(profile.get("xp"), 0)
-        level = int(rpgtools.xptolevel(xp_value))
-        floor = rpgtools.levels.get(level, 0)
-        ceil = rpgtools.levels.get(min(level + 1, rpgtools.MAX_LEVEL), floor)
-        xp_progress = (
-            1.0
-            if level >= rpgtools.MAX_LEVEL or ceil <= floor
-            else max(0.0, min(1.0, (xp_value - floor) / (ceil - floor)))
-        )
-        luck_raw = float(profile.get("luck") or 0.3)
-        luck_percent = 20.0 if luck_raw <= 0.3 else ((luck_raw - 0.3) / 1.2) * 80 + 20
-        luck_percent = round(max(0.0, min(100.0, luck_percent)), 2)
-        damage_total = sum(self._effective_item_damage(i) for i in items)
-        armor_total = sum(self._effective_item_armor(i) for i in items)
-        raid_attack_value = max(0, int(round(self._safe_float(raid_attack, float(damage_total)))))
-        raid_defense_value = max(0, int(round(self._safe_float(raid_defense, float(armor_total)))))
-        total_health_value = max(
-            0,
-            int(
-                round(
-                    self._safe_float(
-                        total_health,
-                        self._safe_float(profile.get("health"), 0.0),
-                    )
-                )
-            ),
-        )
-        pvp_wins = self._safe_int(profile.get("pvpwins"), 0)
-        money = self._safe_int(profile.get("money"), 0)
-        # Power uses full raid-facing combat values. Attack/defense already include
-        # equipped amulet bonuses from get_raidstats(), and total health includes HP
-        # stat + level scaling + equipped amulet HP.
-        attack_power = raid_attack_value
-        defense_power = raid_defense_value
-        health_power = total_health_value
-        progression_power = int(luck_percent * 2) + level * 12 + pvp_wins * 2
-        power = max(1, attack_power + defense_power + health_power + progression_power)
-        rarity = "Mythic" if level >= 90 else "Legendary" if level >= 70 else "Epic" if level >= 50 else "Rare" if level >= 30 else "Adventurer"
-
-        card_name = str(profile.get("name") or user.display_name)
-        race_name = str(profile.get("race") or "Unknown")
         class_list = profile.get("class") or []
         if not isinstance(class_list, list):
             class_list = [str(class_list)]
@@ -2093,502 +1842,58 @@ class Profile(commands.Cog):
         spec_cog = self.bot.get_cog("Specializations")
         if spec_cog:
             class_list = await spec_cog.get_spec_display_classes(user.id, class_list)
-        classes = " / ".join([str(c) for c in class_list if c]) or "No Class"
-        god_name = str(profile.get("god") or "No God")
+
         ascension = get_ascension_mantle(profile.get("ascension_mantle"))
         ascension_enabled = bool(profile.get("ascension_enabled", True))
         if ascension:
             ascension_title = f"{ascension.title} ({'Active' if ascension_enabled else 'Dormant'})"
         else:
             ascension_title = "Unclaimed"
-        jury_title = str(profile.get("jury_title") or "").strip()
-
-        avatar = await self._fetch_avatar_image(user, size=512)
-        avatar = ImageOps.fit(avatar, (212, 212), method=resample)
-        mask = Image.new("L", (212, 212), 0)
-        ImageDraw.Draw(mask).ellipse((0, 0, 211, 211), fill=255)
-        ring = Image.new("RGBA", (238, 238), (0, 0, 0, 0))
-        rd = ImageDraw.Draw(ring)
-        rd.ellipse((0, 0, 237, 237), fill=(255, 241, 209, 12), outline=colors["border"], width=6)
-        rd.ellipse((13, 13, 224, 224), outline=colors["border_dim"], width=2)
-        canvas.alpha_composite(ring, (102, 146))
-        canvas.paste(avatar, (115, 159), mask)
-
-        draw.text((80, 404), clip(f"Level {level}  {rarity}", value_font, 286), font=value_font, fill=colors["border"])
-        draw.text((80, 436), clip(race_name, tiny_font, 286), font=tiny_font, fill=colors["muted"])
-        badge_value = self._badge_from_db_value(profile.get("badges"))
-        if badge_value:
-            badge_lines = badge_value.to_profile_display_items(limit=6)
-        else:
-            badge_lines = ["No badges yet"]
-        draw.text((80, 506), "Relics and Badges", font=label_font, fill=colors["border"])
-        draw.multiline_text(
-            (80, 542),
-            "\n".join(badge_lines),
-            font=tiny_font,
-            fill=colors["muted"],
-            spacing=6,
-        )
-        draw.text((80, 748), "Ascension", font=label_font, fill=colors["border"])
-        draw.text((80, 784), clip(ascension_title, tiny_font, 286), font=tiny_font, fill=colors["muted"])
-
-        draw.text((80, 852), f"ID {user.id}", font=tiny_font, fill=colors["muted"])
-
-        right_hand, left_hand = None, None
-        any_count = sum(1 for i in items if i.get("hand") == "any")
-        if len(items) == 2 and any_count == 1 and items[0].get("hand") == "any":
-            items = [items[1], items[0]]
-        for i in items:
-            h = i.get("hand")
-            if h == "both":
-                right_hand = left_hand = i
-            elif h == "left":
-                left_hand = i
-            elif h == "right":
-                right_hand = i
-            elif h == "any":
-                if not right_hand:
-                    right_hand = i
-                else:
-                    left_hand = i
-
-        icon_size, icon_gap = 74, 10
-        display_right = right_hand or left_hand
-        display_left = left_hand if right_hand else None
-        element_slots = [display_right, display_left]
-        equipped_elements = []
-        for weapon_item in element_slots:
-            if not weapon_item:
-                continue
-            raw = str(weapon_item.get("element") or "").strip().lower()
-            if raw:
-                equipped_elements.append(raw)
-        one_unique_element = len(set(equipped_elements)) == 1 and bool(equipped_elements)
-        icon_count = len(element_slots)
-        icon_start = header_rect[2] - 22 - (icon_size * icon_count + icon_gap * (icon_count - 1))
-        name_x = header_rect[0] + 22
-        name_max = max(80, icon_start - name_x - 20)
-        draw.text((name_x, 150), clip(card_name, title_font, name_max), font=title_font, fill=colors["text"])
-        draw.text((name_x, 208), clip(f"{race_name} | {classes}", subtitle_font, name_max), font=subtitle_font, fill=colors["muted"])
-        stars = max(1, min(5, math.ceil(level / 20)))
-        ribbon = clip(f"{rarity} Tier {'*' * stars}", label_font, 420)
-        rw = tw(ribbon, label_font) + 34
-        draw.rounded_rectangle((name_x, 250, name_x + rw, 294), radius=16, fill=(164, 120, 64, 245), outline=colors["border"], width=2)
-        draw.text((name_x + 16, 260), ribbon, font=label_font, fill=colors["text"])
-        draw.text((name_x, 310), clip(f"Power {power:,}", value_font, 390), font=value_font, fill=colors["border"])
-        draw.text((844, 310), clip(f"Luck Blessing {luck_percent:.2f}%", value_font, 390), font=value_font, fill=colors["muted"])
-
-        for idx, weapon_item in enumerate(element_slots):
-            raw_element = str(weapon_item.get("element") if weapon_item else "").strip()
-            if raw_element:
-                element_key = raw_element.lower()
-                element_name = "Nature" if element_key == "earth" else element_key.capitalize()
-            else:
-                element_name = "Unknown"
-            x = icon_start + idx * (icon_size + icon_gap)
-            slot = (x, 146, x + icon_size, 146 + icon_size)
-            draw.rounded_rectangle(slot, radius=14, fill=(70, 48, 28, 220), outline=colors["border_dim"], width=2)
-            if one_unique_element and idx == 1:
-                pad = 18
-                x1, y1 = x + pad, 146 + pad
-                x2, y2 = x + icon_size - pad, 146 + icon_size - pad
-                # Draw a crisp outlined X so the placeholder is consistent across fonts.
-                draw.line((x1, y1, x2, y2), fill=(72, 16, 16, 255), width=10)
-                draw.line((x2, y1, x1, y2), fill=(72, 16, 16, 255), width=10)
-                draw.line((x1, y1, x2, y2), fill=(214, 42, 42, 255), width=6)
-                draw.line((x2, y1, x1, y2), fill=(214, 42, 42, 255), width=6)
-                continue
-            icon_path = self._find_element_icon(element_name)
-            if icon_path:
-                try:
-                    icon = Image.open(icon_path).convert("RGBA")
-                    icon = ImageOps.fit(icon, (icon_size - 12, icon_size - 12), method=resample)
-                    canvas.paste(icon, (x + 6, 152), icon)
-                except Exception:
-                    draw.text((x + 25, 170), (element_name[:1] or "?").upper(), font=heading_font, fill=colors["text"])
-            else:
-                draw.text((x + 25, 170), (element_name[:1] or "?").upper(), font=heading_font, fill=colors["text"])
-
-        def stat_bar(x, y, w, label, value, ratio, color):
-            v = clip(value, tiny_font, 120)
-            draw.text((x, y), clip(label, label_font, w - 120), font=label_font, fill=colors["muted"])
-            draw.text((x + w - tw(v, tiny_font), y + 3), v, font=tiny_font, fill=colors["text"])
-            by = y + 28
-            draw.rounded_rectangle((x, by, x + w, by + 16), radius=8, fill=colors["bar_bg"], outline=colors["border_dim"], width=1)
-            fw = int(max(0.0, min(1.0, ratio)) * (w - 2))
-            if fw > 0:
-                draw.rounded_rectangle((x + 1, by + 1, x + 1 + fw, by + 15), radius=7, fill=color)
-
-        stat_bar(434, 340, 390, "Level", f"{level}", level / 100.0, (178, 133, 70, 255))
-        stat_bar(844, 340, 390, "Attack", f"{raid_attack_value:,}", min(1.0, raid_attack_value / 5000.0), (171, 84, 64, 255))
-        stat_bar(434, 394, 390, "Health", f"{total_health_value:,}", min(1.0, total_health_value / 20000.0), (112, 151, 93, 255))
-        stat_bar(844, 394, 390, "Defense", f"{raid_defense_value:,}", min(1.0, raid_defense_value / 5000.0), (88, 118, 164, 255))
-
-        amulet_text = "None"
-        if amulet_data:
-            amulet_tier = self._safe_int(amulet_data.get("tier"), 0)
-            raw_amulet_type = str(amulet_data.get("type") or "").strip().lower()
-            amulet_type_map = {
-                "health": "HP",
-                "defense": "Def",
-                "attack": "Attack",
-                "balanced": "Balanced",
-            }
-            amulet_type_label = amulet_type_map.get(raw_amulet_type, raw_amulet_type.capitalize() or "Unknown")
-            amulet_text = f"Tier {amulet_tier} {amulet_type_label}"
-
-        ledger = [
-            ("Money", f"${self._compact_number(money)}"),
-            ("Guild", guild_name or "None"),
-            ("God", god_name),
-            ("Raid ATK", f"{raid_attack_value:,}"),
-            ("Raid DEF", f"{raid_defense_value:,}"),
-            ("Amulet", amulet_text),
-            ("Health", f"{total_health_value:,}"),
-            ("PvP Wins", f"{pvp_wins:,}"),
-            ("Pet", pet_name or "None"),
-            ("Marriage", marriage_name or "None"),
-        ]
-        max_value = ledger_rect[2] - ledger_rect[0] - 224
-        y = 546
-        for k, v in ledger:
-            draw.text((ledger_rect[0] + 18, y), f"{k}:", font=label_font, fill=colors["muted"])
-            draw.text((ledger_rect[0] + 210, y), clip(v, value_font, max_value), font=value_font, fill=colors["text"])
-            y += 33
-
-        px1, py1, px2, py2 = pet_rect
-        pet_w = px2 - px1 - 28
-
-        async def fetch_remote_image(url: str) -> Optional[Image.Image]:
-            if not url:
-                return None
-            try:
-                async with self.bot.trusted_session.get(url) as resp:
-                    if resp.status != 200:
-                        return None
-                    data = await resp.read()
-                return Image.open(BytesIO(data)).convert("RGBA")
-            except Exception:
-                return None
-
-        def trust_tier(value: int) -> tuple[str, int]:
-            if value >= 81:
-                return "Devoted", 10
-            if value >= 61:
-                return "Loyal", 8
-            if value >= 41:
-                return "Trusting", 5
-            if value >= 21:
-                return "Cautious", 0
-            return "Distrustful", -10
-
-        def pet_bar(y_pos: int, label: str, value: int, color: tuple[int, int, int, int]) -> int:
-            clamped = max(0, min(100, int(value)))
-            draw.text(
-                (px1 + 14, y_pos),
-                clip(f"{label} {clamped}%", micro_font, pet_w),
-                font=micro_font,
-                fill=colors["muted"],
-            )
-            bar_y = y_pos + 22
-            draw.rounded_rectangle(
-                (px1 + 14, bar_y, px2 - 14, bar_y + 14),
-                radius=6,
-                fill=colors["bar_bg"],
-                outline=colors["border_dim"],
-                width=1,
-            )
-            fill_w = int(((px2 - px1 - 30) * clamped) / 100)
-            if fill_w > 0:
-                draw.rounded_rectangle(
-                    (px1 + 15, bar_y + 1, px1 + 15 + fill_w, bar_y + 13),
-                    radius=5,
-                    fill=color,
-                )
-            return bar_y + 18
-
-        def pet_combat_bar(
-            y_pos: int,
-            label: str,
-            value: int,
-            cap: int,
-            color: tuple[int, int, int, int],
-        ) -> int:
-            safe_cap = max(1, cap)
-            clamped = max(0, int(value))
-            draw.text(
-                (px1 + 20, y_pos),
-                clip(f"{label} {clamped:,}", micro_font, pet_w - 12),
-                font=micro_font,
-                fill=colors["muted"],
-            )
-            bar_y = y_pos + 22
-            draw.rounded_rectangle(
-                (px1 + 20, bar_y, px2 - 20, bar_y + 16),
-                radius=6,
-                fill=colors["bar_bg"],
-                outline=colors["border_dim"],
-                width=1,
-            )
-            fill_w = int(((px2 - px1 - 42) * min(1.0, clamped / safe_cap)))
-            if fill_w > 0:
-                draw.rounded_rectangle(
-                    (px1 + 21, bar_y + 1, px1 + 21 + fill_w, bar_y + 15),
-                    radius=5,
-                    fill=color,
-                )
-            return bar_y + 16
-
-        portrait_size = min(max(210, pet_w - 24), 320)
-        portrait_x = px1 + ((px2 - px1) - portrait_size) // 2
-        portrait_y = py1 + 78
-        draw.rounded_rectangle(
-            (portrait_x - 10, portrait_y - 10, portrait_x + portrait_size + 10, portrait_y + portrait_size + 10),
-            radius=18,
-            fill=(63, 41, 25, 235),
-            outline=colors["border_dim"],
-            width=2,
-        )
-
-        if pet_data:
-            pet_display_name = str(
-                pet_data.get("name") or pet_data.get("default_name") or pet_name or "Unknown"
-            )
-            pet_level = max(1, min(100, self._safe_int(pet_data.get("level"), 1)))
-            pet_stage = str(pet_data.get("growth_stage") or "Unknown").capitalize()
-            pet_element_key = str(pet_data.get("element") or "").strip().lower()
-            pet_element = "Nature" if pet_element_key == "earth" else (pet_element_key.capitalize() if pet_element_key else "Unknown")
-            pet_happiness = max(0, min(100, self._safe_int(pet_data.get("happiness"), 0)))
-            pet_hunger = max(0, min(100, self._safe_int(pet_data.get("hunger"), 0)))
-            pet_trust = max(0, min(100, self._safe_int(pet_data.get("trust_level"), 0)))
-            pet_hp_base = self._safe_float(pet_data.get("hp"), 0.0)
-            pet_attack_base = self._safe_float(pet_data.get("attack"), 0.0)
-            pet_defense_base = self._safe_float(pet_data.get("defense"), 0.0)
-            pet_iv = self._safe_int(pet_data.get("IV"), 0)
-            trust_name, trust_bonus = trust_tier(pet_trust)
-            level_multiplier = 1 + (pet_level * 0.01)
-            trust_multiplier = 1 + (trust_bonus / 100.0)
-            pet_hp = max(0, int(round(pet_hp_base * level_multiplier * trust_multiplier)))
-            pet_attack = max(0, int(round(pet_attack_base * level_multiplier * trust_multiplier)))
-            pet_defense = max(0, int(round(pet_defense_base * level_multiplier * trust_multiplier)))
-
-            pet_img = await fetch_remote_image(str(pet_data.get("url") or ""))
-            if pet_img:
-                pet_img = ImageOps.fit(pet_img, (portrait_size, portrait_size), method=resample)
-                rounded_mask = Image.new("L", (portrait_size, portrait_size), 0)
-                ImageDraw.Draw(rounded_mask).rounded_rectangle(
-                    (0, 0, portrait_size - 1, portrait_size - 1), radius=14, fill=255
-                )
-                src_alpha = pet_img.split()[3]
-                combined_alpha = ImageChops.multiply(src_alpha, rounded_mask)
-                pet_img.putalpha(combined_alpha)
-                canvas.paste(pet_img, (portrait_x, portrait_y), pet_img)
-            else:
-                draw.rounded_rectangle(
-                    (portrait_x, portrait_y, portrait_x + portrait_size, portrait_y + portrait_size),
-                    radius=14,
-                    fill=(82, 59, 38, 240),
-                    outline=colors["border_dim"],
-                    width=1,
-                )
-                draw.text(
-                    (portrait_x + 24, portrait_y + portrait_size // 2 - 16),
-                    "No Pet Image",
-                    font=tiny_font,
-                    fill=colors["muted"],
-                )
-
-            y_cursor = portrait_y + portrait_size + 20
-            draw.text(
-                (px1 + 14, y_cursor),
-                clip(pet_display_name, tiny_font, pet_w),
-                font=tiny_font,
-                fill=colors["text"],
-            )
-            y_cursor += 34
-            draw.text(
-                (px1 + 14, y_cursor),
-                clip(f"Lv {pet_level} | {pet_element}", micro_font, pet_w),
-                font=micro_font,
-                fill=colors["muted"],
-            )
-            y_cursor += 26
-            draw.text(
-                (px1 + 14, y_cursor),
-                clip(f"Stage: {pet_stage}", micro_font, pet_w),
-                font=micro_font,
-                fill=colors["muted"],
-            )
-            y_cursor += 26
-            draw.text(
-                (px1 + 14, y_cursor),
-                clip(f"Bond: {trust_name} ({trust_bonus:+d}%)", micro_font, pet_w),
-                font=micro_font,
-                fill=colors["muted"],
-            )
-            y_cursor += 32
-
-            y_cursor = pet_bar(y_cursor, "Happy", pet_happiness, (112, 151, 93, 255))
-            y_cursor = pet_bar(y_cursor, "Hunger", pet_hunger, (171, 84, 64, 255))
-            y_cursor = pet_bar(y_cursor, "Trust", pet_trust, (88, 118, 164, 255))
-
-            combat_top = max(y_cursor + 12, py2 - 248)
-            draw.rounded_rectangle(
-                (px1 + 12, combat_top, px2 - 12, py2 - 18),
-                radius=14,
-                fill=(76, 53, 32, 220),
-                outline=colors["border_dim"],
-                width=2,
-            )
-            draw.text(
-                (px1 + 20, combat_top + 10),
-                clip(f"Combat Readout | IV {pet_iv}%", micro_font, pet_w - 10),
-                font=micro_font,
-                fill=colors["border"],
-            )
-            combat_y = combat_top + 40
-            combat_y = pet_combat_bar(combat_y, "HP", pet_hp, 30000, (112, 151, 93, 255))
-            combat_y = pet_combat_bar(combat_y + 4, "ATK", pet_attack, 6000, (171, 84, 64, 255))
-            pet_combat_bar(combat_y + 4, "DEF", pet_defense, 6000, (88, 118, 164, 255))
-        else:
-            draw.rounded_rectangle(
-                (portrait_x, portrait_y, portrait_x + portrait_size, portrait_y + portrait_size),
-                radius=14,
-                fill=(82, 59, 38, 240),
-                outline=colors["border_dim"],
-                width=1,
-            )
-            draw.text(
-                (portrait_x + 24, portrait_y + portrait_size // 2 - 16),
-                "No Pet Equipped",
-                font=tiny_font,
-                fill=colors["muted"],
-            )
-            draw.text(
-                (px1 + 14, portrait_y + portrait_size + 24),
-                "Use $pets equip",
-                font=micro_font,
-                fill=colors["muted"],
-            )
-
-        def item_type_name(item) -> str:
-            if not item:
-                return ""
-            return str(item.get("type") or item.get("type_") or "").strip().title()
-
-        def combo_stance(right_item, left_item) -> str:
-            r_type = item_type_name(right_item)
-            l_type = item_type_name(left_item)
-            types = [t for t in (r_type, l_type) if t]
-
-            if not types:
-                return "Traveler's Poise"
-
-            if len(types) == 2 and r_type == l_type:
-                twin_map = {
-                    "Bow": "Eagle Volley",
-                    "Scythe": "Reaper's Arc",
-                    "Mace": "Titan Maul",
-                    "Shield": "Twin Aegis",
-                    "Sword": "Twinblade Dance",
-                    "Dagger": "Twin Fang",
-                    "Knife": "Twin Fang",
-                    "Wand": "Twin Sigils",
-                    "Axe": "Blood Reavers",
-                    "Hammer": "Stonebreak Pair",
-                    "Spear": "Dual Pike Drill",
-                }
-                return twin_map.get(r_type, f"Twin {r_type} Form")
-
-            # One shield + one weapon
-            if "Shield" in types and any(t != "Shield" for t in types):
-                weapon = next((t for t in types if t != "Shield"), "")
-                shield_map = {
-                    "Sword": "Guardian Knight",
-                    "Axe": "Bulwark Reaver",
-                    "Hammer": "Citadel Breaker",
-                    "Wand": "Arcane Bastion",
-                    "Spear": "Phalanx Pike",
-                    "Dagger": "Viper Bulwark",
-                    "Knife": "Viper Bulwark",
-                    "Bow": "Aegis Archer",
-                    "Scythe": "Gravewarden",
-                    "Mace": "Sanctified Bastion",
-                }
-                return shield_map.get(weapon, "Aegis Stance")
-
-            # Dual wield non-shields
-            if len(types) == 2 and all(t != "Shield" for t in types):
-                pair = tuple(sorted(types))
-                dual_map = {
-                    ("Dagger", "Knife"): "Shadow Fang",
-                    ("Axe", "Hammer"): "Ravager Pair",
-                    ("Dagger", "Sword"): "Duelist's Dance",
-                    ("Knife", "Sword"): "Duelist's Dance",
-                    ("Dagger", "Wand"): "Spellblade Tempo",
-                    ("Knife", "Wand"): "Spellblade Tempo",
-                    ("Spear", "Sword"): "Dragoon Cross",
-                }
-                return dual_map.get(pair, "Twinblade Tempo")
-
-            # Single weapon
-            single = types[0]
-            single_map = {
-                "Bow": "Ranger's Focus",
-                "Wand": "Arcanist Focus",
-                "Spear": "Lancer Reach",
-                "Dagger": "Assassin Veil",
-                "Knife": "Assassin Veil",
-                "Sword": "Duelist Guard",
-                "Axe": "Berserker Rush",
-                "Hammer": "Warden Crush",
-                "Scythe": "Reaper's Poise",
-                "Mace": "Crusader Weight",
-                "Shield": "Fortress Stance",
-            }
-            return single_map.get(single, "Balanced Form")
-
-        stance = combo_stance(right_hand, left_hand)
-        draw.text(
-            (gear_rect[0] + 20, 548),
-            clip(f"Battle Stance: {stance}", tiny_font, gear_rect[2] - gear_rect[0] - 40),
-            font=tiny_font,
-            fill=colors["muted"],
-        )
 
-        gear_x = gear_rect[0] + 16
-        gear_w = gear_rect[2] - gear_rect[0] - 32
-
-        def item_block(x, y, width_px, title, item):
-            draw.rounded_rectangle((x, y, x + width_px, y + 108), radius=14, fill=(76, 53, 32, 220), outline=colors["border_dim"], width=2)
-            draw.text((x + 14, y + 10), title, font=label_font, fill=colors["border"])
-            if item:
-                name = clip(str(item.get("name", "Unknown")), value_font, max(120, width_px - 28))
-                kind = clip(str(item.get("type", "Unknown")), tiny_font, max(80, width_px - 170))
-                power_val = self._format_stat_value(self._effective_item_primary_stat(item))
-                draw.text((x + 14, y + 44), name, font=value_font, fill=colors["text"])
-                draw.text((x + 14, y + 76), f"{kind} | Power {power_val}", font=tiny_font, fill=colors["muted"])
-            else:
-                draw.text((x + 14, y + 52), "None Equipped", font=value_font, fill=colors["muted"])
-
-        item_block(gear_x, 580, gear_w, "Right Hand", right_hand)
-        item_block(gear_x, 708, gear_w, "Left Hand", left_hand)
-
-        mission_text = "No active mission"
+        badge_value = self._badge_from_db_value(profile.get("badges"))
+        mission_text = None
         if mission:
-            mission_name = ADVENTURE_NAMES.get(mission[0], str(mission[0]))
-            mission_text = mission_name
-        draw.rounded_rectangle((gear_x, 830, gear_x + gear_w, 876), radius=12, fill=(76, 53, 32, 230), outline=colors["border_dim"], width=2)
-        draw.text((gear_x + 16, 842), "Quest:", font=label_font, fill=colors["border"])
-        draw.text((gear_x + 118, 844), clip(mission_text, tiny_font, max(80, gear_w - 132)), font=tiny_font, fill=colors["text"])
+            mission_text = ADVENTURE_NAMES.get(mission[0], str(mission[0]))
+
+        def pick(record, fields):
+            return {key: record[key] for key in fields if key in record}
+
+        # everything the card shows, the cache key is a hash of it
+        card = {
+            "user_id": user.id,
+            "display_name": user.display_name,
+            "avatar": user.display_avatar.key,
+            "profile": pick(profile, profile_card.PROFILE_FIELDS),
+            "classes": " / ".join([str(c) for c in class_list if c]) or "No Class",
+            "ascension_title": ascension_title,
+            "badge_lines": badge_value.to_profile_display_items(limit=6) if badge_value else [],
+            "items": [pick(item, profile_card.ITEM_FIELDS) for item in items],
+            "guild_name": guild_name,
+            "mission_text": mission_text,
+            "pet_name": pet_name,
+            "marriage_name": marriage_name,
+            "pet": pick(pet_data, profile_card.PET_FIELDS) if pet_data else None,
+            "raid_attack": raid_attack,
+            "raid_defense": raid_defense,
+            "total_health": total_health,
+            "amulet": (
+                {"tier": amulet_data.get("tier"), "type": amulet_data.get("type")}
+                if amulet_data
+                else None
+            ),
+        }
 
-        footer = "Fable Reborn - Dragon Chronicle"
-        draw.text((width - 12 - tw(footer, tiny_font), height - 22), footer, font=tiny_font, fill=colors["muted"])
+        async def produce():
+            avatar, pet_image = await asyncio.gather(
+                self._fetch_avatar_bytes(user, size=512),
+                self._fetch_image_bytes(str((card["pet"] or {}).get("url") or "")),
+            )
+            return await self.card_renderer.run(
+                profile_card.render_rpg_card, card, avatar, pet_image
+            )
 
-        output = BytesIO()
-        canvas.convert("RGB").save(output, format="PNG", optimize=True)
-        output.seek(0)
-        return output
+        key = self.card_renderer.cache_key("rpg", card)
+        return BytesIO(await self.card_renderer.render(key, produce))
 
     @classmethod
     def _preset_amulet_none_marker(cls) -> int:
@@ -3206,8 +2511,15 @@ class Profile(commands.Cog):
                     "positions": positions,
                     "scales": scales,
                 }
-                
 
+                # identical payloads render identical cards, skip Okapi for those
+                card_key = self.card_renderer.cache_key("genprofile", payload_for_okapi)
+                cached_card = await self.card_renderer.get(card_key)
+                if cached_card is not None:
+                    return await ctx.send(
+                        _("Your Profile:"),
+                        file=discord.File(fp=io.BytesIO(cached_card), filename="image.png"),
+                    )
 
                 async with self.bot.trusted_session.post(
                         f"{self.bot.config.external.okapi_url}/api/genprofile",
@@ -3247,6 +2559,7 @@ class Profile(commands.Cog):
                         bytebuffer = await resp.read()
                         if resp.status != 200:
                             return await ctx.send("Error failed to fetch image")
+                    await self.card_renderer.put(card_key, bytebuffer)
 
                 await ctx.send(
                     _("Your Profile:"),
@@ -235,7 +235,6 @@ KEY_ITEM_DEFINITIONS = {
     for step in GREG_QUEST.steps
 }
 
-MONSTERS_PATH = Path("monsters.json")
 BUILTIN_CAMPAIGN_DIR = Path(__file__).resolve().parent / "data" / "builtin_campaigns"
 CUSTOM_QUEST_SOURCES = {
     "none",
@@ -2702,8 +2701,7 @@ class Quests(commands.Cog):
             return self._monster_cache
         catalog = []
         try:
-            with MONSTERS_PATH.open("r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self.bot.content.monsters().data
         except OSError:
             data = {}
 
@@ -2962,8 +2960,7 @@ class Quests(commands.Cog):
         monsters = []
         seen_names = set()
         try:
-            with MONSTERS_PATH.open("r", encoding="utf-8") as monster_file:
-                file_monsters = json.load(monster_file)
+            file_monsters = self.bot.content.monsters().data
         except OSError:
             file_monsters = {}
         for tier, entries in file_monsters.items():
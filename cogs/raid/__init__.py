@@ -566,19 +566,31 @@ class Raid(commands.Cog):
             max(0.0, float(damage or 0) - float(defense or 0))
         )
 
-    async def _apply_raid_spec_stats(self, user_id, dmg, deff):
+    async def _raid_spec_effects_many(self, user_ids, conn=None):
+        """Specialization effects of all raiders, {} for everyone on failure."""
+        spec_cog = self.bot.get_cog("Specializations")
+        if not spec_cog:
+            return {}
+        try:
+            return await spec_cog.get_user_spec_effects_many(user_ids, conn=conn)
+        except Exception:
+            return {}
+
+    async def _apply_raid_spec_stats(self, user_id, dmg, deff, fx=None):
         """Stat-time class specialization effects for raid joins.
 
         Raid combat is pooled, so runtime specs are approximated as stat-time
         pressure. Boss-only effects always qualify because raid targets are bosses.
+        Pass ``fx`` when the effects were loaded in bulk.
         """
-        spec_cog = self.bot.get_cog("Specializations")
-        if not spec_cog:
-            return dmg, deff, {}
-        try:
-            fx = await spec_cog.get_user_spec_effects(user_id)
-        except Exception:
-            return dmg, deff, {}
+        if fx is None:
+            spec_cog = self.bot.get_cog("Specializations")
+            if not spec_cog:
+                return dmg, deff, {}
+            try:
+                fx = await spec_cog.get_user_spec_effects(user_id)
+            except Exception:
+                return dmg, deff, {}
         if "boss_damage_pct" in fx:
             dmg = Decimal(str(dmg)) * Decimal(str(1 + fx["boss_damage_pct"]["value"] / 100))
         if "perfect_form_pct" in fx:
@@ -1365,32 +1377,29 @@ class Raid(commands.Cog):
                     self.joined.extend(booster_members)
 
             async with self.bot.pool.acquire() as conn:
-                for u in self.joined:
-                    profile = await conn.fetchrow('SELECT * FROM profile WHERE "user"=$1;', u.id)
-                    if not profile:
-                        # You might want to send a message or log that the profile wasn't found.
-                        continue
-                    dmg, deff = await self.bot.get_raidstats(
-                        u,
-                        atkmultiply=profile["atkmultiply"],
-                        defmultiply=profile["defmultiply"],
-                        classes=profile["class"],
-                        race=profile["race"],
-                        guild=profile["guild"],
-                        conn=conn,
-                    )
-                    if raid_hp == 17776:
-                        stathp = profile["stathp"] * 50
-                        level = rpgtools.xptolevel(profile["xp"])
-                        raidhp = profile["health"] + 200 + (level * 15) + stathp
-                    else:
-                        raidhp = raid_hp
-                    dmg, deff, spec_effects = await self._apply_raid_spec_stats(u.id, dmg, deff)
-                    participant = {"hp": raidhp, "armor": deff, "damage": dmg}
-                    participant.update(
-                        self._pooled_seasonal_state(profile["class"], spec_effects, raidhp)
+                joined_ids = [u.id for u in self.joined]
+                stats = await self.bot.get_raidstats_many(joined_ids, conn=conn)
+                spec_effects_by_user = await self._raid_spec_effects_many(
+                    list(stats), conn=conn
+                )
+            for u in self.joined:
+                if not (user_stats := stats.get(u.id)):
+                    # You might want to send a message or log that the profile wasn't found.
+                    continue
+                raidhp = user_stats.hp if raid_hp == 17776 else raid_hp
+                dmg, deff, spec_effects = await self._apply_raid_spec_stats(
+                    u.id,
+                    user_stats.damage,
+                    user_stats.armor,
+                    fx=spec_effects_by_user.get(u.id, {}),
+                )
+                participant = {"hp": raidhp, "armor": deff, "damage": dmg}
+                participant.update(
+                    self._pooled_seasonal_state(
+                        user_stats.profile["class"], spec_effects, raidhp
                     )
-                    self.raid[(u, "user")] = self._normalize_raid_combatant(participant)
+                )
+                self.raid[(u, "user")] = self._normalize_raid_combatant(participant)
 
             all_participant_ids = [
                 user.id for (user, participant_type) in self.raid.keys()
@@ -2106,32 +2115,29 @@ class Raid(commands.Cog):
                     self.joined.extend(booster_members)
 
             async with self.bot.pool.acquire() as conn:
-                for u in self.joined:
-                    profile = await conn.fetchrow('SELECT * FROM profile WHERE "user"=$1;', u.id)
-                    if not profile:
-                        # You might want to send a message or log that the profile wasn't found.
-                        continue
-                    dmg, deff = await self.bot.get_raidstats(
-                        u,
-                        atkmultiply=profile["atkmultiply"],
-                        defmultiply=profile["defmultiply"],
-                        classes=profile["class"],
-                        race=profile["race"],
-                        guild=profile["guild"],
-                        conn=conn,
-                    )
-                    if raid_hp == 17776:
-                        stathp = profile["stathp"] * 50
-                        level = rpgtools.xptolevel(profile["xp"])
-                        raidhp = profile["health"] + 200 + (level * 15) + stathp
-                    else:
-                        raidhp = raid_hp
-                    dmg, deff, spec_effects = await self._apply_raid_spec_stats(u.id, dmg, deff)
-                    participant = {"hp": raidhp, "armor": deff, "damage": dmg}
-                    participant.update(
-                        self._pooled_seasonal_state(profile["class"], spec_effects, raidhp)
+                joined_ids = [u.id for u in self.joined]
+                stats = await self.bot.get_raidstats_many(joined_ids, conn=conn)
+                spec_effects_by_user = await self._raid_spec_effects_many(
+                    list(stats), conn=conn
+                )
+            for u in self.joined:
+                if not (user_stats := stats.get(u.id)):
+                    # You might want to send a message or log that the profile wasn't found.
+                    continue
+                raidhp = user_stats.hp if raid_hp == 17776 else raid_hp
+                dmg, deff, spec_effects = await self._apply_raid_spec_stats(
+                    u.id,
+                    user_stats.damage,
+                    user_stats.armor,
+                    fx=spec_effects_by_user.get(u.id, {}),
+                )
+                participant = {"hp": raidhp, "armor": deff, "damage": dmg}
+                participant.update(
+                    self._pooled_seasonal_state(
+                        user_stats.profile["class"], spec_effects, raidhp
                     )
-                    self.raid[(u, "user")] = self._normalize_raid_combatant(participant)
+                )
+                self.raid[(u, "user")] = self._normalize_raid_combatant(participant)
 
             all_participant_ids = [
                 user.id for (user, participant_type) in self.raid.keys()
@@ -2907,32 +2913,16 @@ class Raid(commands.Cog):
 
             HowMany = 0
 
-            async with self.bot.pool.acquire() as conn:
-                for u in dual_view.follower_joined + dual_view.leader_joined:
-                    if (
-                            not (
-                                    profile := await conn.fetchrow(
-                                        'SELECT * FROM profile WHERE "user"=$1;', u.id
-                                    )
-                            )
-                            or profile["god"] != "Sepulchure"
-                    ):
-                        continue
-                    HowMany = HowMany + 1
-                    try:
-                        dmg, deff = await self.bot.get_raidstats(
-                            u,
-                            atkmultiply=profile["atkmultiply"],
-                            defmultiply=profile["defmultiply"],
-                            classes=profile["class"],
-                            race=profile["race"],
-                            guild=profile["guild"],
-                            god=profile["god"],
-                            conn=conn,
-                        )
-                    except ValueError:
-                        continue
-                    raid[u] = {"hp": 250, "armor": deff, "damage": dmg}
+            ritual_joined = dual_view.follower_joined + dual_view.leader_joined
+            stats = await self.bot.get_raidstats_many([u.id for u in ritual_joined])
+            for u in ritual_joined:
+                if (
+                        not (user_stats := stats.get(u.id))
+                        or user_stats.profile["god"] != "Sepulchure"
+                ):
+                    continue
+                HowMany = HowMany + 1
+                raid[u] = {"hp": 250, "armor": user_stats.armor, "damage": user_stats.damage}
 
             async def is_valid_participant(user, conn):
                 # Check if the user is a follower of "Sepulchure"
@@ -4966,44 +4956,35 @@ class Raid(commands.Cog):
                         self.joined.append(user)
             
             # Process participants and assign random elements
-            async with self.bot.pool.acquire() as conn:
-                for u in self.joined:
-                    profile = await conn.fetchrow('SELECT * FROM profile WHERE "user"=$1;', u.id)
-                    if not profile:
-                        # User doesn't have a profile, skip
-                        continue
-                    
-                    # Get raid stats with potential donator bonus
-                    is_donator = profile["tier"] >= 1
-                    donator_bonus = 1.2 if is_donator else 1.0  # 20% bonus for donators
-                    
-                    dmg, deff = await self.bot.get_raidstats(
-                        u,
-                        atkmultiply=float(profile["atkmultiply"]) * donator_bonus,
-                        defmultiply=float(profile["defmultiply"]) * donator_bonus,
-                        classes=profile["class"],
-                        race=profile["race"],
-                        guild=profile["guild"],
-                        conn=conn,
-                    )
-                    
-                    # Calculate raid HP - higher than normal
-                    stathp = float(profile["stathp"]) * 50 * donator_bonus
-                    level = rpgtools.xptolevel(profile["xp"])
-                    raidhp = (float(profile["health"]) + 200 + (level * 15) + stathp) * donator_bonus
-                    
-                    # Assign random element to the player
-                    player_element = randomm.choice(elements)
-                    self.celestial_elements[u.id] = player_element
-                    
-                    # Store raid stats - ensure all numeric values are floats
-                    self.raid[(u, "user")] = {
-                        "hp": float(raidhp), 
-                        "armor": float(deff), 
-                        "damage": float(dmg),
-                        "element": player_element,
-                        "is_donator": is_donator
-                    }
+            stats = await self.bot.get_raidstats_many([u.id for u in self.joined])
+            for u in self.joined:
+                if not (user_stats := stats.get(u.id)):
+                    # User doesn't have a profile, skip
+                    continue
+                profile = user_stats.profile
+                dmg, deff = user_stats.damage, user_stats.armor
+
+                # Get raid stats with potential donator bonus
+                is_donator = profile["tier"] >= 1
+                donator_bonus = 1.2 if is_donator else 1.0  # 20% bonus for donators
+                
+                # Calculate raid HP - higher than normal
+                stathp = float(profile["stathp"]) * 50 * donator_bonus
+                level = rpgtools.xptolevel(profile["xp"])
+                raidhp = (float(profile["health"]) + 200 + (level * 15) + stathp) * donator_bonus
+                
+                # Assign random element to the player
+                player_element = randomm.choice(elements)
+                self.celestial_elements[u.id] = player_element
+                
+                # Store raid stats - ensure all numeric values are floats
+                self.raid[(u, "user")] = {
+                    "hp": float(raidhp), 
+                    "armor": float(deff), 
+                    "damage": float(dmg),
+                    "element": player_element,
+                    "is_donator": is_donator
+                }
             
             raiders_joined = len(self.raid)
             
@@ -22,6 +22,7 @@ from discord.ext import commands
 
 from classes.bot import Bot
 from classes.context import Context
+from classes.leaderboard import split_battletower_score
 from utils import misc as rpgtools
 from utils.i18n import _, locale_doc
 from utils.markdown import escape_markdown
@@ -32,48 +33,55 @@ class Ranks(commands.Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
 
+    async def _board_entries(
+        self, ctx: Context, board: str, limit: int = 10
+    ) -> tuple[list[tuple[int, int, str]], tuple[int, int, str] | None]:
+        """Returns the top ``limit`` of a leaderboard as ``(user, score, name)``
+        and the author's ``(rank, score, name)`` if they are not part of it."""
+        top = await self.bot.leaderboards.top(board, limit)
+        user_ids = [user_id for user_id, _score in top]
+        own_rank = None
+        if ctx.author.id not in user_ids:
+            own_rank = await self.bot.leaderboards.rank(board, ctx.author.id)
+        names = {
+            row["user"]: row["name"]
+            for row in await self.bot.pool.fetch(
+                'SELECT "user", "name" FROM profile WHERE "user"=ANY($1);',
+                [*user_ids, ctx.author.id],
+            )
+        }
+        players = [
+            (user_id, score, names[user_id])
+            for user_id, score in top
+            if user_id in names
+        ]
+        own = None
+        if own_rank is not None and ctx.author.id in names:
+            own = (*own_rank, names[ctx.author.id])
+        return players, own
+
     @commands.command(brief=_("Show the top 10 richest"))
     @locale_doc
     async def richest(self, ctx: Context) -> None:
         _("""The 10 richest players in Fable.""")
         await ctx.typing()
-        # Fetch the top 10 richest players
-        players = await self.bot.pool.fetch(
-            'SELECT "user", "name", "money" FROM profile ORDER BY "money" DESC LIMIT 10;'
-        )
+        players, own = await self._board_entries(ctx, "money")
         result = ""
-        top_10_ids = [player["user"] for player in players]
-        user_in_top_10 = ctx.author.id in top_10_ids
 
         # Build the leaderboard string
-        for idx, profile in enumerate(players):
-            username = await rpgtools.lookup(self.bot, profile["user"])
+        for idx, (user_id, money, name) in enumerate(players):
+            username = await rpgtools.lookup(self.bot, user_id)
             text = _("{name}, a character by {username} with **${money}**").format(
-                name=escape_markdown(profile["name"]),
+                name=escape_markdown(name),
                 username=escape_markdown(username),
-                money=profile["money"],
+                money=money,
             )
-            # Highlight user's own entry if they are in top 10
-            if user_in_top_10 and profile["user"] == ctx.author.id:
-                result += f"{idx + 1}. {text}\n"
-            else:
-                result += f"{idx + 1}. {text}\n"
-
-        # If the user isn't in the top 10, fetch their rank
-        if not user_in_top_10:
-            # Fetch user's own money
-            user_profile = await self.bot.pool.fetchrow(
-                'SELECT "money", "name" FROM profile WHERE "user" = $1;', ctx.author.id
-            )
-            if user_profile:
-                user_money = user_profile["money"]
-                user_name = user_profile["name"]
-                # Calculate the user's rank
-                user_rank = await self.bot.pool.fetchval(
-                    'SELECT COUNT(*) FROM profile WHERE "money" > $1;', user_money
-                )
-                user_rank += 1  # Adjust rank to be 1-based
+            result += f"{idx + 1}. {text}\n"
 
+        # If the user isn't in the top 10, show their rank
+        if ctx.author.id not in (player[0] for player in players):
+            if own:
+                user_rank, user_money, user_name = own
                 username = await rpgtools.lookup(self.bot, ctx.author.id)
 
                 text = _("{name}, a character by {username} with **${money}**").format(
@@ -99,43 +107,23 @@ class Ranks(commands.Cog):
     async def hordelb(self, ctx: Context) -> None:
         _("""The 10 top horde players in Fable.""")
         await ctx.typing()
-        # Fetch the top 10 horde players
-        players = await self.bot.pool.fetch(
-            'SELECT "user", "name", "whored" FROM profile ORDER BY "whored" DESC LIMIT 10;'
-        )
+        players, own = await self._board_entries(ctx, "whored")
         result = ""
-        top_10_ids = [player["user"] for player in players]
-        user_in_top_10 = ctx.author.id in top_10_ids
 
         # Build the leaderboard string
-        for idx, profile in enumerate(players):
-            username = await rpgtools.lookup(self.bot, profile["user"])
+        for idx, (user_id, whored, name) in enumerate(players):
+            username = await rpgtools.lookup(self.bot, user_id)
             text = _("{name}, a character by {username} with a score of **{whored}**").format(
-                name=escape_markdown(profile["name"]),
+                name=escape_markdown(name),
                 username=escape_markdown(username),
-                whored=profile["whored"],
+                whored=whored,
             )
-            # Highlight user's own entry if they are in top 10
-            if user_in_top_10 and profile["user"] == ctx.author.id:
-                result += f"{idx + 1}. {text}\n"
-            else:
-                result += f"{idx + 1}. {text}\n"
-
-        # If the user isn't in the top 10, fetch their rank
-        if not user_in_top_10:
-            # Fetch user's own horde score
-            user_profile = await self.bot.pool.fetchrow(
-                'SELECT "whored", "name" FROM profile WHERE "user" = $1;', ctx.author.id
-            )
-            if user_profile:
-                user_whored = user_profile["whored"]
-                user_name = user_profile["name"]
-                # Calculate the user's rank
-                user_rank = await self.bot.pool.fetchval(
-                    'SELECT COUNT(*) FROM profile WHERE "whored" > $1;', user_whored
-                )
-                user_rank += 1  # Adjust rank to be 1-based
+            result += f"{idx + 1}. {text}\n"
 
+        # If the user isn't in the top 10, show their rank
+        if ctx.author.id not in (player[0] for player in players):
+            if own:
+                user_rank, user_whored, user_name = own
                 username = await rpgtools.lookup(self.bot, ctx.author.id)
 
                 text = _("{name}, a character by {username} with a score of **{whored}**").format(
@@ -322,63 +310,27 @@ class Ranks(commands.Cog):
     async def battletowerlb(self, ctx: Context) -> None:
         try:
             _("""Display the leaderboard of players in the Battle Tower.""")
-            # Fetch the top 10 players
-            players = await self.bot.pool.fetch(
-                'SELECT bt."id", bt."prestige", bt."level", p."name" '
-                'FROM battletower AS bt '
-                'INNER JOIN profile AS p ON bt."id" = p."user" '
-                'ORDER BY bt."prestige" DESC, bt."level" DESC LIMIT 10'
-            )
-
+            players, own = await self._board_entries(ctx, "battletower")
             result = ""
-            top_10_ids = [player["id"] for player in players]
-            user_in_top_10 = ctx.author.id in top_10_ids
 
             # Build the leaderboard string
-            for idx, player in enumerate(players):
-                username = await self.bot.fetch_user(player["id"])
-                character_name = player["name"]
+            for idx, (user_id, score, character_name) in enumerate(players):
+                prestige, level = split_battletower_score(score)
+                username = await rpgtools.lookup(self.bot, user_id)
 
                 text = _("{name}, a character by {username} at Prestige **{prestige}** and Level **{level}**").format(
                     name=escape_markdown(character_name),
-                    username=escape_markdown(username.name) if username else "Unknown User",
-                    prestige=player["prestige"],
-                    level=player["level"]
-                )
-                # Highlight user's own entry if they are in top 10
-                if user_in_top_10 and player["id"] == ctx.author.id:
-                    result += f"{idx + 1}. {text}\n"
-                else:
-                    result += f"{idx + 1}. {text}\n"
-
-            # If the user isn't in the top 10, fetch their rank
-            if not user_in_top_10:
-                # Fetch user's prestige and level
-                user_bt = await self.bot.pool.fetchrow(
-                    'SELECT bt."prestige", bt."level" '
-                    'FROM battletower AS bt '
-                    'WHERE bt."id" = $1', ctx.author.id
+                    username=escape_markdown(username),
+                    prestige=prestige,
+                    level=level
                 )
-                if user_bt:
-                    user_prestige = user_bt["prestige"]
-                    user_level = user_bt["level"]
-
-                    # Calculate the user's rank
-                    user_rank = await self.bot.pool.fetchval(
-                        'SELECT COUNT(*) FROM battletower AS bt '
-                        'WHERE (bt."prestige" > $1) '
-                        'OR (bt."prestige" = $1 AND bt."level" > $2)',
-                        user_prestige, user_level
-                    )
-                    user_rank += 1  # Adjust rank to be 1-based
+                result += f"{idx + 1}. {text}\n"
 
-                    # Fetch user's character name
-                    user_profile = await self.bot.pool.fetchrow(
-                        'SELECT p."name" '
-                        'FROM profile AS p '
-                        'WHERE p."user" = $1', ctx.author.id
-                    )
-                    character_name = user_profile["name"] if user_profile else "Unknown"
+            # If the user isn't in the top 10, show their rank
+            if ctx.author.id not in (player[0] for player in players):
+                if own:
+                    user_rank, score, character_name = own
+                    user_prestige, user_level = split_battletower_score(score)
                     username = ctx.author.name
 
                     text = _(
@@ -408,46 +360,26 @@ class Ranks(commands.Cog):
     async def highscore(self, ctx: Context) -> None:
         _("""Shows you the top 10 players by XP and displays the corresponding level.""")
         await ctx.typing()
-        # Fetch the top 10 players by XP
-        players = await self.bot.pool.fetch(
-            'SELECT "user", "name", "xp" FROM profile ORDER BY "xp" DESC LIMIT 10;'
-        )
+        players, own = await self._board_entries(ctx, "xp")
         result = ""
-        top_10_ids = [player["user"] for player in players]
-        user_in_top_10 = ctx.author.id in top_10_ids
 
         # Build the leaderboard string
-        for idx, profile in enumerate(players):
-            username = await rpgtools.lookup(self.bot, profile["user"])
+        for idx, (user_id, xp, name) in enumerate(players):
+            username = await rpgtools.lookup(self.bot, user_id)
             text = _(
                 "{name}, a character by {username} with Level **{level}** (**{xp}** XP)"
             ).format(
-                name=escape_markdown(profile["name"]),
+                name=escape_markdown(name),
                 username=escape_markdown(username),
-                level=rpgtools.xptolevel(profile["xp"]),
-                xp=profile["xp"],
+                level=rpgtools.xptolevel(xp),
+                xp=xp,
             )
-            # Highlight user's own entry if they are in top 10
-            if user_in_top_10 and profile["user"] == ctx.author.id:
-                result += f"{idx + 1}. {text}\n"
-            else:
-                result += f"{idx + 1}. {text}\n"
-
-        # If the user isn't in the top 10, fetch their rank
-        if not user_in_top_10:
-            # Fetch user's own XP
-            user_profile = await self.bot.pool.fetchrow(
-                'SELECT "xp", "name" FROM profile WHERE "user" = $1;', ctx.author.id
-            )
-            if user_profile:
-                user_xp = user_profile["xp"]
-                user_name = user_profile["name"]
-                # Calculate the user's rank
-                user_rank = await self.bot.pool.fetchval(
-                    'SELECT COUNT(*) FROM profile WHERE "xp" > $1;', user_xp
-                )
-                user_rank += 1  # Adjust rank to be 1-based
+            result += f"{idx + 1}. {text}\n"
 
+        # If the user isn't in the top 10, show their rank
+        if ctx.author.id not in (player[0] for player in players):
+            if own:
+                user_rank, user_xp, user_name = own
                 username = await rpgtools.lookup(self.bot, ctx.author.id)
 
                 text = _(
@@ -476,43 +408,23 @@ class Ranks(commands.Cog):
     async def pvpstats(self, ctx: Context) -> None:
         _("""Shows you the top 10 players by the amount of wins in PvP matches.""")
         await ctx.typing()
-        # Fetch the top 10 PvP players
-        players = await self.bot.pool.fetch(
-            'SELECT "user", "name", "pvpwins" FROM profile ORDER BY "pvpwins" DESC LIMIT 10;'
-        )
+        players, own = await self._board_entries(ctx, "pvpwins")
         result = ""
-        top_10_ids = [player["user"] for player in players]
-        user_in_top_10 = ctx.author.id in top_10_ids
 
         # Build the leaderboard string
-        for idx, profile in enumerate(players):
-            username = await rpgtools.lookup(self.bot, profile["user"])
+        for idx, (user_id, wins, name) in enumerate(players):
+            username = await rpgtools.lookup(self.bot, user_id)
             text = _("{name}, a character by {username} with **{wins}** wins").format(
-                name=escape_markdown(profile["name"]),
+                name=escape_markdown(name),
                 username=escape_markdown(username),
-                wins=profile["pvpwins"],
-            )
-            # Highlight user's own entry if they are in top 10
-            if user_in_top_10 and profile["user"] == ctx.author.id:
-                result += f"{idx + 1}. {text}\n"
-            else:
-                result += f"{idx + 1}. {text}\n"
-
-        # If the user isn't in the top 10, fetch their rank
-        if not user_in_top_10:
-            # Fetch user's own PvP wins
-            user_profile = await self.bot.pool.fetchrow(
-                'SELECT "pvpwins", "name" FROM profile WHERE "user" = $1;', ctx.author.id
+                wins=wins,
             )
-            if user_profile:
-                user_pvpwins = user_profile["pvpwins"]
-                user_name = user_profile["name"]
-                # Calculate the user's rank
-                user_rank = await self.bot.pool.fetchval(
-                    'SELECT COUNT(*) FROM profile WHERE "pvpwins" > $1;', user_pvpwins
-                )
-                user_rank += 1  # Adjust rank to be 1-based
+            result += f"{idx + 1}. {text}\n"
 
+        # If the user isn't in the top 10, show their rank
+        if ctx.author.id not in (player[0] for player in players):
+            if own:
+                user_rank, user_pvpwins, user_name = own
                 username = await rpgtools.lookup(self.bot, ctx.author.id)
 
                 text = _("{name}, a character by {username} with **{wins}** wins").format(
@@ -23,19 +23,17 @@ import re
 
 from datetime import datetime, timedelta
 
-import asyncpg
 import discord
 
-from discord.ext import commands, tasks
-from discord.http import handle_message_parameters
+from discord.ext import commands
 
 from classes.bot import Bot
 from classes.context import Context
 from classes.converters import DateTimeScheduler, IntGreaterThan
 from cogs.help import chunks
 from utils.checks import has_char
-from utils.i18n import _, current_locale, locale_doc
-
+from utils.i18n import _, locale_doc
+from utils.scheduling import ClusterLease, DueEventDispatcher
 
 
 class Timer:
@@ -89,180 +87,106 @@ class Timer:
         return f"{self.end - self.start}".split(".")[0]
 
 
+REMINDER_LEASE_NAME = "scheduler:reminders"
+REMINDER_BATCH_SIZE = 50
+
+
 class Scheduling(commands.Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
-        self._handles = 0 in self.bot.shard_ids  # Determines if this shard should handle reminders
-        ids_section = getattr(self.bot.config, "ids", None)
-        scheduler_ids = getattr(ids_section, "scheduler", {}) if ids_section else {}
-        if not isinstance(scheduler_ids, dict):
-            scheduler_ids = {}
-        self.error_report_user_id = scheduler_ids.get("error_report_user_id")
-
-        self._have_data = asyncio.Event()
-        self._current_timer = None
-
-        if self._handles:
-            self.reminder_check.start()  # Start only on the designated shard
 
+        # Only the cluster holding the lease dispatches reminders. It keeps the
+        # reminders of the next hour in memory and sleeps until the next one is
+        # due instead of reading the whole table every second.
+        self._index_ready = False
+        self.dispatcher = DueEventDispatcher(
+            lease=ClusterLease(self.bot.redis, REMINDER_LEASE_NAME),
+            load=self.load_due_reminders,
+            fire=self.fire_reminders,
+            batch_size=REMINDER_BATCH_SIZE,
+        )
+        self._task = asyncio.create_task(self.run_dispatcher())
 
-    async def get_active_timer(self, *, connection=None, days=7) -> Timer | None:
-            query = 'SELECT * FROM reminders WHERE "end" < (CURRENT_DATE + $1::interval) ORDER BY "end" LIMIT 1;'
-            con = connection or self.bot.pool
+    async def run_dispatcher(self) -> None:
+        await self.bot.wait_until_ready()
+        await self.dispatcher.run()
 
-            record = await con.fetchrow(query, timedelta(days=days))
-            return Timer(record=record) if record else None
+    async def _ensure_reminder_index(self, conn) -> None:
+        if self._index_ready:
+            return
+        await conn.execute(
+            'CREATE INDEX IF NOT EXISTS reminders_end_idx ON reminders ("end");'
+        )
+        self._index_ready = True
 
-    async def wait_for_active_timers(self, *, conn=None, days=7) -> Timer:
+    async def load_due_reminders(
+        self, horizon: datetime
+    ) -> list[tuple[int, datetime, Timer]]:
         async with self.bot.pool.acquire() as conn:
-            timer = await self.get_active_timer(connection=conn, days=days)
-            if timer is not None:
-                self._have_data.set()
-                return timer
-
-            self._have_data.clear()
-            self._current_timer = None
-            await self._have_data.wait()
-            return await self.get_active_timer(connection=conn, days=days)
-
-    async def dispatch_timers(self):
-        try:
-            while not self.bot.is_closed():
-                timer = self._current_timer = await self.wait_for_active_timers(days=40)
-                now = datetime.utcnow()
-
-                if timer.end >= now:
-                    to_sleep = (timer.end - now).total_seconds()
-                    await asyncio.sleep(to_sleep)
-
-                try:
-                    await self._remind(timer)
-                except Exception:
-                    pass
-        except asyncio.CancelledError:
-            raise
-        except (OSError, discord.ConnectionClosed, asyncpg.PostgresConnectionError):
-            self.restart()
+            await self._ensure_reminder_index(conn)
+            records = await conn.fetch(
+                'SELECT * FROM reminders WHERE "end" < $1 ORDER BY "end";', horizon
+            )
+        return [
+            (timer.id, timer.end, timer)
+            for timer in (Timer(record=record) for record in records)
+        ]
+
+    async def fire_reminders(self, due: list[tuple[int, Timer]]) -> None:
+        await asyncio.gather(*(self._send_reminder(timer) for _id, timer in due))
+        await self.bot.pool.execute(
+            'DELETE FROM reminders WHERE "id"=ANY($1);', [id_ for id_, _timer in due]
+        )
 
     @commands.Cog.listener()
     async def on_timer_add(self, timer: Timer) -> None:
-        if not self._handles:
-            return
-
-        if (timer.end - timer.start).total_seconds() <= (86400 * 40):  # 40 days
-            self._have_data.set()
-        if self._current_timer and timer.end < self._current_timer.end:
-            self.restart()
+        self.dispatcher.schedule(timer.id, timer.end, timer)
 
     @commands.Cog.listener()
     async def on_timer_remove(self, timer_id: int) -> None:
-        if not self._handles:
-            return
-
-        if self._current_timer and self._current_timer.id == timer_id:
-            self.restart()
+        self.dispatcher.cancel(timer_id)
 
     async def add_timer(self, timer: Timer) -> None:
-        await self.bot.cogs["Sharding"].handler("add_timer", 0, args=timer.to_dict())
+        args = timer.to_dict()
+        args["start"] = timer.start.isoformat()
+        args["end"] = timer.end.isoformat()
+        await self.bot.cogs["Sharding"].handler("add_timer", 0, args=args)
 
     async def remove_timer(self, timer_id: int) -> None:
         await self.bot.cogs["Sharding"].handler(
             "remove_timer", 0, args={"timer_id": timer_id}
         )
 
-    async def fetch_reminders(self):
-        try:
-            async with self.bot.pool.acquire() as connection:
-                async with connection.transaction():
-                    reminders = await connection.fetch(
-                        "SELECT * FROM reminders"
-                    )
-            return reminders
-        except Exception as e:
-            # If an exception occurs, send a direct message to a specific user
-            user = self.bot.get_user(self.error_report_user_id) if self.error_report_user_id else None
-            if user:
-                await user.send(f"An exception occurred while fetching reminders: {e}")
-            else:
-                print("Failed to send DM: Error report user not found")
-            return []
-
-    @tasks.loop(seconds=1)  # Adjust the interval as needed
-    async def reminder_check(self):
-        try:
-            reminders = await self.fetch_reminders()
-            current_time = datetime.now()
+    async def _resolve_user(self, user_id: int) -> discord.User:
+        return self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
 
-            for reminder in reminders:
-                end_time = reminder["end"]
-                if current_time >= end_time:
-                    await self._send_reminder(reminder)
-        except Exception as e:
-            # If an exception occurs, send a direct message to a specific user
-            print(f"Failed to send DM: User not found")
-    @reminder_check.before_loop
-    async def before_reminder_check(self):
-        await self.bot.wait_until_ready()  # Wait until the bot is fully ready
-
-    async def _send_reminder(self, reminder: dict) -> None:
-        user_id = reminder["user"]
-        content = reminder["content"]
-        channel_id = reminder["channel"]
-        reminder_id = reminder["id"]
-        reminder_start = reminder["start"]
-        type = reminder["type"] # Assuming reminder["start"] is already a datetime object
+    async def _resolve_channel(self, channel_id: int) -> discord.abc.Messageable:
+        return self.bot.get_channel(channel_id) or await self.bot.fetch_channel(
+            channel_id
+        )
 
+    async def _send_reminder(self, timer: Timer) -> None:
         try:
-            user = await self.bot.fetch_user(user_id)
-            channel = await self.bot.fetch_channel(channel_id)
+            user = await self._resolve_user(timer.user)
+            channel = await self._resolve_channel(timer.channel)
 
-            # Calculate timedelta
-            timedelta = datetime.now() - reminder_start
-
-            # Format timedelta
-            hours, remainder = divmod(timedelta.total_seconds(), 3600)
+            # Format the time since the reminder was created
+            hours, remainder = divmod(
+                (datetime.utcnow() - timer.start).total_seconds(), 3600
+            )
             minutes, seconds = divmod(remainder, 60)
             formatted_timedelta = f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
-            if type != "adventure":
-            # Send the reminder message
-                await channel.send(f"{user.mention} you wanted to be reminded about {content} {formatted_timedelta} ago.")
-                async with self.bot.pool.acquire() as connection:
-                    async with connection.transaction():
-                        await connection.execute(
-                            "DELETE FROM reminders WHERE id = $1",
-                            reminder_id
-                        )
+            if timer.type != "adventure":
+                await channel.send(
+                    f"{user.mention} you wanted to be reminded about {timer.content}"
+                    f" {formatted_timedelta} ago."
+                )
             else:
                 await channel.send(
-                    f"{user.mention} adventure level: **{content}** is finished!")
-
-                # Delete the reminder from the database
-                async with self.bot.pool.acquire() as connection:
-                    async with connection.transaction():
-                        await connection.execute(
-                            "DELETE FROM reminders WHERE id = $1",
-                            reminder_id
-                        )
-        except Exception as e:
-                    # Send a message to a specific user if any other error occurs
-                async with self.bot.pool.acquire() as connection:
-                    async with connection.transaction():
-                        await connection.execute(
-                            "DELETE FROM reminders WHERE id = $1",
-                            reminder_id
-                        )
-                print(f"Failed to send DM: User {user_id} not found.")
-
-    def restart(self):
-        if self._task:
-            self._task.cancel()
-            self._task = asyncio.create_task(self.dispatch_timers())
-
-    async def short_timer_optimisation(self, seconds: int, timer: Timer) -> None:
-        await asyncio.sleep(seconds)
-        await self._remind(timer)
-
-
+                    f"{user.mention} adventure level: **{timer.content}** is finished!"
+                )
+        except Exception:
+            print(f"Failed to send reminder {timer.id} to user {timer.user}.")
 
     async def create_reminder(
             self,
@@ -287,31 +211,25 @@ class Scheduling(commands.Cog):
             )
             delta = (end - now).total_seconds()
 
-            if delta <= 7884000:
-                # a shortcut for small timers
-                #asyncio.create_task(self.short_timer_optimisation(delta, timer))
-
-                id = await conn.fetchval(
-                    'INSERT INTO reminders ("user", "content", "channel", "start", "end", "type") VALUES'
-                    ' ($1, $2, $3, $4, $5, $6) RETURNING "id";',
-                    ctx.author.id,
-                    content,
-                    ctx.channel.id,
-                    now,
-                    end,
-                    type,
-                )
-                timer.id = id
-
+            if delta > 7884000:
                 return timer
 
-
+            timer.id = await conn.fetchval(
+                'INSERT INTO reminders ("user", "content", "channel", "start", "end", "type") VALUES'
+                ' ($1, $2, $3, $4, $5, $6) RETURNING "id";',
+                ctx.author.id,
+                content,
+                ctx.channel.id,
+                now,
+                end,
+                type,
+            )
         except Exception as e:
             # Handle the exception here
             await ctx.send(f"An error occurred: {e}")
             # You can add more error handling or logging as needed
         else:
-            timer.id = id
+            # Let the dispatching cluster know, it only reads the table hourly
             await self.add_timer(timer)
         return timer
 
@@ -482,7 +400,8 @@ class Scheduling(commands.Cog):
             await ctx.send(_("Opted out of automatic adventure reminders."))
 
     def cog_unload(self):
-        self.reminder_check.cancel()
+        self._task.cancel()
+        asyncio.create_task(self.dispatcher.lease.release())
 
 
 async def setup(bot):
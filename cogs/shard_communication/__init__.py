@@ -28,6 +28,7 @@ import asyncpg
 import discord
 from discord.ext import commands
 
+from classes.cooldowns import ALLIANCE, GUILD, USER
 from cogs.scheduler import Timer
 from utils.eval import evaluate as _evaluate
 from utils.i18n import _, locale_doc
@@ -41,17 +42,10 @@ def user_on_cooldown(cooldown: int, identifier: str = None):
             cmd_id = ctx.command.qualified_name
         else:
             cmd_id = identifier
-        command_ttl = await ctx.bot.redis.execute_command(
-            "TTL", f"cd:{ctx.author.id}:{cmd_id}"
+        command_ttl = await ctx.bot.cooldowns.acquire(
+            USER, ctx.author.id, cmd_id, cooldown
         )
-        if command_ttl == -2:
-            await ctx.bot.redis.execute_command(
-                "SET",
-                f"cd:{ctx.author.id}:{cmd_id}",
-                cmd_id,
-                "EX",
-                cooldown,
-            )
+        if command_ttl is None:
             return True
         else:
             raise commands.CommandOnCooldown(ctx, command_ttl, commands.BucketType.user)
@@ -69,17 +63,10 @@ def guild_on_cooldown(cooldown: int):
             )
         else:
             guild = guild["guild"]
-        command_ttl = await ctx.bot.redis.execute_command(
-            "TTL", f"guildcd:{guild}:{ctx.command.qualified_name}"
+        command_ttl = await ctx.bot.cooldowns.acquire(
+            GUILD, guild, ctx.command.qualified_name, cooldown
         )
-        if command_ttl == -2:
-            await ctx.bot.redis.execute_command(
-                "SET",
-                f"guildcd:{guild}:{ctx.command.qualified_name}",
-                ctx.command.qualified_name,
-                "EX",
-                cooldown,
-            )
+        if command_ttl is None:
             return True
         else:
             raise commands.CommandOnCooldown(
@@ -105,17 +92,10 @@ def alliance_on_cooldown(cooldown: int):
                 'SELECT alliance FROM guild WHERE "id"=$1;', guild
             )
 
-        command_ttl = await ctx.bot.redis.execute_command(
-            "TTL", f"alliancecd:{alliance}:{ctx.command.qualified_name}"
+        command_ttl = await ctx.bot.cooldowns.acquire(
+            ALLIANCE, alliance, ctx.command.qualified_name, cooldown
         )
-        if command_ttl == -2:
-            await ctx.bot.redis.execute_command(
-                "SET",
-                f"alliancecd:{alliance}:{ctx.command.qualified_name}",
-                ctx.command.qualified_name,
-                "EX",
-                cooldown,
-            )
+        if command_ttl is None:
             return True
         else:
             raise commands.CommandOnCooldown(
@@ -127,20 +107,13 @@ def alliance_on_cooldown(cooldown: int):
 
 def next_day_cooldown():
     async def predicate(ctx):
-        command_ttl = await ctx.bot.redis.execute_command(
-            "TTL", f"cd:{ctx.author.id}:{ctx.command.qualified_name}"
+        ctt = int(
+            86400 - (time() % 86400)
+        )  # Calculate the number of seconds until next UTC midnight
+        command_ttl = await ctx.bot.cooldowns.acquire(
+            USER, ctx.author.id, ctx.command.qualified_name, ctt
         )
-        if command_ttl == -2:
-            ctt = int(
-                86400 - (time() % 86400)
-            )  # Calculate the number of seconds until next UTC midnight
-            await ctx.bot.redis.execute_command(
-                "SET",
-                f"cd:{ctx.author.id}:{ctx.command.qualified_name}",
-                ctx.command.qualified_name,
-                "EX",
-                ctt,
-            )
+        if command_ttl is None:
             return True
         else:
             raise commands.CommandOnCooldown(ctx, command_ttl, commands.BucketType.user)
@@ -224,6 +197,12 @@ class Sharding(commands.Cog):
 
     async def clear_donator_cache(self, user_id: int, command_id: int):
         self.bot.get_donator_rank.invalidate(self.bot, user_id)
+        self.bot.patron_tiers.invalidate(user_id)
+
+    async def reload_content(self, command_id: int):
+        self.bot.content.invalidate()
+        if battles := self.bot.get_cog("Battles"):
+            battles.load_data_files()
 
     async def remove_timer(self, timer_id: int, command_id: int) -> None:
         self.bot.dispatch("timer_remove", timer_id)
@@ -747,7 +726,7 @@ class Sharding(commands.Cog):
                 chunks.append("\n".join(current_chunk))
             return chunks
 
-        cooldowns = await self.bot.redis.execute_command("KEYS", f"cd:{ctx.author.id}:*")
+        cooldowns = await self.bot.cooldowns.timers(USER, ctx.author.id)
         adv = await self.bot.get_adventure(ctx.author)
         use_new_view = await self._get_timers_view_preference(ctx.author.id)
 
@@ -794,10 +773,8 @@ class Sharding(commands.Cog):
 
             max_length = 0
             message_lengths = []
-            for key in cooldowns:
-                key = key.decode()
-                cooldown = await self.bot.redis.execute_command("TTL", key)
-                cmd = key.replace(f"cd:{ctx.author.id}:", "").lower()
+            for cmd, cooldown in cooldowns.items():
+                cmd = cmd.lower()
                 formatted_time = timedelta(seconds=int(cooldown))
 
                 if cmd in ["battle", "raidbattle", "tournament", "raidtournament"]:
@@ -885,17 +862,10 @@ class Sharding(commands.Cog):
             return await ctx.send(embed=embed)
 
         normalized_cooldowns: dict[str, int] = {}
-        for key in cooldowns:
-            key = key.decode()
-            cooldown = await self.bot.redis.execute_command("TTL", key)
-            try:
-                cooldown_seconds = int(cooldown)
-            except (TypeError, ValueError):
-                continue
+        for raw_cmd, cooldown_seconds in cooldowns.items():
             if cooldown_seconds <= 0:
                 continue
 
-            raw_cmd = key.replace(f"cd:{ctx.author.id}:", "")
             cmd = normalize_cmd_id(raw_cmd)
             previous = normalized_cooldowns.get(cmd)
             if previous is None or cooldown_seconds > previous:
@@ -9,14 +9,13 @@ from __future__ import annotations
 
 import datetime as dt
 import inspect
-import json
 import logging
-from pathlib import Path
 from typing import Any, Mapping, Optional
 
 import discord
 from discord.ext import commands
 
+from classes.cooldowns import USER
 from cogs.frontier_catalog import get_frontier_catalog
 from utils import misc as rpgtools
 from utils.checks import has_char
@@ -43,8 +42,6 @@ from .progression import (
 
 
 log = logging.getLogger(__name__)
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
-MONSTERS_PATH = PROJECT_ROOT / "monsters.json"
 PAGE_SIZE = 12
 COLLECTION_PAGE_SIZE = 8
 MATERIALS_CRATE_EMOJI = "<:c_mats:1403797590335819897>"
@@ -1914,7 +1911,7 @@ class SoulforgeFrontiers(commands.Cog):
         if battles is not None and getattr(battles, "monsters_data", None):
             public_pool = battles.monsters_data
         else:
-            public_pool = json.loads(MONSTERS_PATH.read_text(encoding="utf-8"))
+            public_pool = self.bot.content.monsters(missing_ok=False).data
         async with self.bot.pool.acquire() as conn:
             rows = await conn.fetch(
                 """
@@ -1987,12 +1984,15 @@ class SoulforgeFrontiers(commands.Cog):
                 "This week's boss could not be loaded safely. Please contact a GM."
             )
         cooldown_key = f"cd:{ctx.author.id}:{pve_command.qualified_name}"
-        acquired = await self.bot.redis.execute_command(
-            "SET", cooldown_key, "frontier-boss", "NX", "EX", 60 * 30
+        ttl = await self.bot.cooldowns.acquire(
+            USER,
+            ctx.author.id,
+            pve_command.qualified_name,
+            60 * 30,
+            value="frontier-boss",
         )
-        if not acquired:
-            ttl = await self.bot.redis.execute_command("TTL", cooldown_key)
-            ttl = max(0, int(ttl or 0))
+        if ttl is not None:
+            ttl = max(0, int(ttl))
             hours, remainder = divmod(ttl, 3600)
             minutes, seconds = divmod(remainder, 60)
             return await ctx.send(
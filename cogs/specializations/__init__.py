@@ -435,6 +435,10 @@ class Specializations(commands.Cog):
                 row = await conn2.fetchrow(query, user_id)
         if not row:
             return {}, 0
+        return self._lines_from_profile(row)
+
+    @staticmethod
+    def _lines_from_profile(row):
         level = rpgtools.xptolevel(row["xp"])
         lines = {}
         raw = row["class"] if isinstance(row["class"], list) else [row["class"]]
@@ -465,7 +469,40 @@ class Specializations(commands.Cog):
         else:
             async with self.bot.pool.acquire() as conn2:
                 rows = await conn2.fetch(query, user_id)
+        return self._effects_from_specs(lines, rows)
 
+    async def get_user_spec_effects_many(self, user_ids, conn=None):
+        """``get_user_spec_effects`` for many players with two queries.
+
+        Returns {user_id: effects}; players without a character are missing.
+        """
+        await self.ensure_tables()
+        user_ids = list(user_ids)
+        if conn is None:
+            async with self.bot.pool.acquire() as conn2:
+                return await self.get_user_spec_effects_many(user_ids, conn=conn2)
+        profiles = await conn.fetch(
+            'SELECT "user", class, xp FROM profile WHERE "user" = ANY($1);', user_ids
+        )
+        picks = {}
+        for row in await conn.fetch(
+            "SELECT user_id, class_line, spec_key FROM class_specs"
+            " WHERE user_id = ANY($1)",
+            [row["user"] for row in profiles],
+        ):
+            picks.setdefault(row["user_id"], []).append(row)
+        effects = {}
+        for row in profiles:
+            lines, _level = self._lines_from_profile(row)
+            effects[row["user"]] = (
+                self._effects_from_specs(lines, picks.get(row["user"], []))
+                if lines
+                else {}
+            )
+        return effects
+
+    @staticmethod
+    def _effects_from_specs(lines, rows):
         effects = {}
         for row in rows:
             spec = SPECS.get(row["spec_key"])
@@ -36,6 +36,13 @@ from classes.converters import (
 )
 from classes.errors import NoChoice
 from classes.items import ALL_ITEM_TYPES, ItemType
+from classes.market import (
+    COUNT_CAP,
+    PAGE_SIZE,
+    MarketBrowser,
+    MarketQuery,
+    create_indexes,
+)
 from cogs.shard_communication import user_on_cooldown as user_cooldown
 from utils.checks import has_char, has_money, is_gm
 from utils.i18n import _, locale_doc
@@ -100,7 +107,7 @@ class MarketSortSelect(discord.ui.Select):
         self.market_view = market_view
 
     async def callback(self, interaction):
-        self.market_view.apply_sort(self.values[0])
+        await self.market_view.apply_sort(self.values[0])
         self.market_view.rebuild_components()
         await interaction.response.edit_message(embed=self.market_view.build_embed(), view=self.market_view)
 
@@ -149,20 +156,25 @@ class MarketBuyConfirmView(discord.ui.View):
 
 
 class MarketBrowserView(discord.ui.View):
-    PAGE_SIZE = 25
+    PAGE_SIZE = PAGE_SIZE
 
-    def __init__(self, cog, ctx, items):
+    def __init__(self, cog, ctx, query, page):
         super().__init__(timeout=300)
         self.cog = cog
         self.ctx = ctx
-        self.items = [dict(item) for item in items]
-        self.index = 0
-        self.sort_mode = "price"
-        self.page_start = 0
         self.message = None
-        self.apply_sort("price")
+        self.show(query, page)
         self.rebuild_components()
 
+    def show(self, query, page):
+        self.query = query
+        self.sort_mode = query.sort
+        self.items = list(page.items)
+        self.cursor = page.cursor
+        self.total = page.total
+        self.index = 0
+        self.page_start = 0
+
     def current_item(self):
         return self.items[self.index] if self.items else None
 
@@ -170,17 +182,23 @@ class MarketBrowserView(discord.ui.View):
         self.page_start = (self.index // self.PAGE_SIZE) * self.PAGE_SIZE
         return self.items[self.page_start:self.page_start + self.PAGE_SIZE]
 
-    def apply_sort(self, mode):
-        self.sort_mode = mode
-        if mode == "stat":
-            self.items.sort(key=lambda item: (-(float(item["damage"]) + float(item["armor"])), int(item["price"])))
-        elif mode == "efficiency":
-            self.items.sort(key=lambda item: -(float(item["damage"] + item["armor"]) / max(1, int(item["price"]))))
-        elif mode == "newest":
-            self.items.sort(key=lambda item: -int(item.get("id", item["item"])))
-        else:
-            self.items.sort(key=lambda item: (int(item["price"]), -(float(item["damage"]) + float(item["armor"]))))
-        self.index = 0
+    async def apply_sort(self, mode):
+        query = self.query.sorted_by(mode)
+        self.show(query, await self.cog.market.page(query))
+
+    async def load_next_page(self):
+        if self.cursor is None:
+            return
+        page = await self.cog.market.page(self.query, self.cursor)
+        self.items.extend(page.items)
+        self.cursor = page.cursor
+
+    def listing_count(self):
+        if self.cursor is None:
+            return f"{len(self.items)}"
+        if self.total is not None and self.total <= COUNT_CAP:
+            return f"{max(self.total, len(self.items)):,}"
+        return f"{max(COUNT_CAP, len(self.items)):,}+"
 
     def build_embed(self):
         item = self.current_item()
@@ -191,7 +209,7 @@ class MarketBrowserView(discord.ui.View):
         money = int(self.ctx.character_data.get("money", 0) or 0)
         embed = discord.Embed(
             title=f"🏪 {item['name']}",
-            description=f"Listing **{self.index + 1}/{len(self.items)}** • Item ID `{item['item']}`",
+            description=f"Listing **{self.index + 1}/{self.listing_count()}** • Item ID `{item['item']}`",
             color=discord.Color.blurple(),
         )
         embed.add_field(name="Type", value=str(item["type"]), inline=True)
@@ -215,7 +233,7 @@ class MarketBrowserView(discord.ui.View):
             self.add_item(MarketSortSelect(self))
         for label, style, callback, disabled in [
             ("Previous", discord.ButtonStyle.secondary, self.previous, self.index <= 0),
-            ("Next", discord.ButtonStyle.secondary, self.next, self.index >= len(self.items) - 1),
+            ("Next", discord.ButtonStyle.secondary, self.next, self.index >= len(self.items) - 1 and self.cursor is None),
             ("Filters", discord.ButtonStyle.primary, self.filters, False),
             ("Compare", discord.ButtonStyle.primary, self.compare, not self.items),
             ("Buy", discord.ButtonStyle.success, self.buy_selected, not self.items),
@@ -256,6 +274,8 @@ class MarketBrowserView(discord.ui.View):
         await interaction.response.edit_message(embed=self.build_embed(), view=self)
 
     async def next(self, interaction):
+        if self.index + 1 >= len(self.items):
+            await self.load_next_page()
         self.index = min(len(self.items) - 1, self.index + 1)
         self.rebuild_components()
         await interaction.response.edit_message(embed=self.build_embed(), view=self)
@@ -315,6 +335,8 @@ class Trading(commands.Cog):
         self.decrease_happy_task.start()
 
         self.player_item_cache = {}
+        self.market = MarketBrowser(self.bot)
+        self.create_market_indexes.start()
 
 
 
@@ -763,6 +785,16 @@ class Trading(commands.Cog):
 
         return offers
 
+    @tasks.loop(count=1)
+    async def create_market_indexes(self):
+        # one cluster builds them, concurrent builds of one index collide
+        if 0 in self.bot.shard_ids:
+            await create_indexes(self.bot.pool)
+
+    @create_market_indexes.before_loop
+    async def before_create_market_indexes(self):
+        await self.bot.wait_until_ready()
+
     @tasks.loop(minutes=999999)  # Adjust the interval as needed (e.g., minutes=10 means it runs every 10 minutes)
     async def decrease_hunger_task(self):
         try:
@@ -904,6 +936,7 @@ class Trading(commands.Cog):
                 itemid,
                 price,
             )
+        await self.market.invalidate()
         await ctx.send(
             _(
                 "Successfully added your item to the shop! Use `{prefix}shop` to view"
@@ -1019,6 +1052,7 @@ class Trading(commands.Cog):
                     await profile_cog.sanitize_presets_for_user(
                         item["owner"], conn=conn
                     )
+        await self.market.invalidate()
         await ctx.send(
             _(
                 "Successfully bought item `{id}`. Use `{prefix}inventory` to view your"
@@ -1098,6 +1132,7 @@ class Trading(commands.Cog):
                         self.restock_source_user_id,
                     )
 
+        await self.market.invalidate()
         await ctx.send(
             _(
                 "Successfully restocked configured source items to the shop! Use `{prefix}shop` to view them in the market!"
@@ -1151,6 +1186,7 @@ class Trading(commands.Cog):
                     itemid,
                     False,
                 )
+        await self.market.invalidate()
         await ctx.send(
             _(
                 "Successfully removed item `{itemid}` from the shop and put it in your"
@@ -1295,28 +1331,12 @@ class Trading(commands.Cog):
                 )
             )
 
-        if item_types:
-            items = await self.bot.pool.fetch(
-                "SELECT * FROM allitems ai JOIN market m ON (ai.id=m.item) WHERE"
-                ' ai."type"=ANY($1) AND (ai."damage">=$2 OR ai."armor">=$3) AND m."price"<=$4;',
-                item_types,
-                minstat,
-                minstat,
-                highestprice,
-            )
-        else:
-            items = await self.bot.pool.fetch(
-                "SELECT * FROM allitems ai JOIN market m ON (ai.id=m.item) WHERE"
-                ' m."price"<=$1 AND (ai."damage">=$2 OR ai."armor">=$3);',
-                highestprice,
-                minstat,
-                minstat,
-            )
-
-        if not items:
+        query = MarketQuery(tuple(item_types), minstat, highestprice)
+        page = await self.market.page(query)
+        if not page.items:
             return await ctx.send(_("No results."))
 
-        view = MarketBrowserView(self, ctx, items)
+        view = MarketBrowserView(self, ctx, query, page)
         view.message = await ctx.send(embed=view.build_embed(), view=view)
 
     @has_char()
@@ -144,3 +144,14 @@ def load_city_war_runtime_type() -> Type[object]:
         ROOT / "cogs" / "battles" / "types" / "city_war.py",
     )
     return city_war_mod.CityWarBattle
+
+
+def load_pet_due_events_module():
+    """Return the pets due event module without importing `cogs.pets.__init__`."""
+    _ensure_namespace("cogs", ROOT / "cogs")
+    _ensure_namespace("cogs.pets", ROOT / "cogs" / "pets")
+
+    return _load_module(
+        "cogs.pets.due_events",
+        ROOT / "cogs" / "pets" / "due_events.py",
+    )
@@ -0,0 +1,136 @@
+import asyncio
+import time
+import unittest
+
+from types import SimpleNamespace
+
+from tests.pet_test_loader import load_battle_runtime_type
+
+
+class FakeBattle:
+    def __init__(self, battle_id, channel_id, log, delay=0.0):
+        self.battle_id = battle_id
+        self.ctx = SimpleNamespace(channel=SimpleNamespace(id=channel_id))
+        self.log = log
+        self.delay = delay
+        self.edits = []
+
+    async def publish_battle_message_now(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        self.edits.append(kwargs)
+        self.log.append((time.monotonic(), self.battle_id, kwargs["frame"]))
+
+
+class TestDisplayScheduler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        load_battle_runtime_type()
+        from cogs.battles.core.display import DisplayScheduler
+
+        cls.DisplayScheduler = DisplayScheduler
+
+    def test_intermediate_frames_are_dropped(self):
+        log = []
+
+        async def run():
+            scheduler = self.DisplayScheduler(edits_per_window=1, window=0.05)
+            battle = FakeBattle("a", 1, log)
+            for frame in range(10):
+                scheduler.submit(battle, {"frame": frame})
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.2)
+            return scheduler.metrics()
+
+        metrics = asyncio.run(run())
+
+        self.assertEqual([entry[2] for entry in log], [0, 9])
+        self.assertEqual(metrics["frames_submitted"], 10)
+        self.assertEqual(metrics["frames_dropped"], 8)
+        self.assertEqual(metrics["edits"], 2)
+        self.assertGreater(metrics["edit_latency_max"], 0.03)
+
+    def test_dropped_frames_keep_the_fields_they_set(self):
+        battle = FakeBattle("a", 1, [])
+
+        async def run():
+            scheduler = self.DisplayScheduler(edits_per_window=1, window=0.05)
+            scheduler.submit(battle, {"frame": 0})
+            await asyncio.sleep(0)
+            scheduler.submit(battle, {"frame": 1, "view": "controls"})
+            scheduler.submit(battle, {"frame": 2})
+            await asyncio.sleep(0.2)
+
+        asyncio.run(run())
+
+        self.assertEqual(battle.edits, [{"frame": 0}, {"frame": 2, "view": "controls"}])
+
+    def test_edits_are_paced_per_channel(self):
+        log = []
+
+        async def run():
+            scheduler = self.DisplayScheduler(edits_per_window=2, window=0.1)
+            battles = [FakeBattle(name, 1, log) for name in "abc"]
+            other = FakeBattle("z", 2, log)
+            for frame in range(6):
+                for battle in battles + [other]:
+                    scheduler.submit(battle, {"frame": frame})
+                await asyncio.sleep(0.03)
+            await asyncio.sleep(0.6)
+
+        asyncio.run(run())
+
+        channel = [entry for entry in log if entry[1] != "z"]
+        for index, (stamp, _battle, _frame) in enumerate(channel):
+            in_window = [e for e in channel[index:] if e[0] - stamp < 0.095]
+            self.assertLessEqual(len(in_window), 2)
+        self.assertEqual({battle: frame for _t, battle, frame in log}, dict.fromkeys("abcz", 5))
+        # the idle channel does not wait behind the busy one
+        self.assertGreater(len([entry for entry in log if entry[1] == "z"]), 2)
+
+    def test_finished_battle_edits_after_frame_in_flight(self):
+        Battle = load_battle_runtime_type()
+        log = []
+
+        class DummyBattle(Battle):
+            async def start_battle(self):
+                return True
+
+            async def process_turn(self):
+                return True
+
+            async def end_battle(self):
+                return None
+
+            async def update_display(self):
+                return None
+
+            async def publish_battle_message_now(self, **kwargs):
+                await asyncio.sleep(0.02)
+                log.append(kwargs["frame"])
+                self.battle_message = "message"
+                return self.battle_message
+
+        async def run():
+            scheduler = self.DisplayScheduler()
+            cog = SimpleNamespace(display_scheduler=scheduler)
+            ctx = SimpleNamespace(
+                bot=SimpleNamespace(cogs={"Battles": cog}), channel=SimpleNamespace(id=1)
+            )
+            battle = DummyBattle(ctx, teams=[])
+            await battle.publish_battle_message(frame=0)
+            await battle.publish_battle_message(frame=1)
+            await asyncio.sleep(0.005)
+            await battle.publish_battle_message(frame=2)
+            battle.finished = True
+            await battle.publish_battle_message(frame=3)
+            await asyncio.sleep(0.05)
+            return scheduler.metrics()
+
+        metrics = asyncio.run(run())
+
+        self.assertEqual(log, [0, 1, 3])
+        self.assertEqual(metrics["frames_dropped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import random
+import unittest
+
+from types import SimpleNamespace
+
+from tests.pet_test_loader import load_battle_runtime_type, load_tower_runtime_types
+
+
+class TestBattleReplay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        _tower, cls.Team, cls.Combatant = load_tower_runtime_types()
+        cls.Battle = load_battle_runtime_type()
+        from cogs.battles.core import battle, replay
+
+        cls.battle_module = battle
+        cls.replay_module = replay
+
+    def _new_battle(self):
+        class DummyBattle(self.Battle):
+            async def start_battle(self):
+                return True
+
+            async def process_turn(self):
+                return True
+
+            async def end_battle(self):
+                return None
+
+            async def update_display(self):
+                return None
+
+        teams = [
+            self.Team(
+                "A",
+                [
+                    self.Combatant("Hero", 500, 500, 80, 40, element="Fire"),
+                    self.Combatant("Pet", 300, 300, 50, 20, element="Water", is_pet=True),
+                ],
+            ),
+            self.Team("B", [self.Combatant("Ogre", 900, 900, 60, 30, element="Earth")]),
+        ]
+        bot = SimpleNamespace(
+            cogs={"Battles": SimpleNamespace(emoji_to_element={"f": "Fire", "w": "Water"})}
+        )
+        return DummyBattle(SimpleNamespace(bot=bot, send=None), teams=teams)
+
+    def _play(self, battle, actions=100):
+        rng = random.Random(7)
+        snapshots = []
+
+        async def run():
+            for action in range(actions):
+                combatant = rng.choice([c for team in battle.teams for c in team.combatants])
+                combatant.hp = max(0, combatant.hp - rng.randint(0, 40))
+                if action == 40:
+                    battle.teams[1].combatants.append(
+                        self.Combatant("Imp", 100, 100, 10, 5, element="Dark")
+                    )
+                if action == 70:
+                    battle.finished = True
+                await battle.add_to_log(f"Action {action}")
+                snapshots.append(
+                    json.loads(json.dumps(battle.turn_states[-1], cls=self.battle_module.DecimalEncoder))
+                )
+
+        asyncio.run(run())
+        return snapshots
+
+    def test_encoded_replay_rebuilds_every_frame(self):
+        battle = self._new_battle()
+        snapshots = self._play(battle)
+
+        battle_data, battle_log, frames = self.replay_module.decode_replay(
+            battle.replay.encode(battle.serialize_battle_data(), battle.serialize_battle_log())
+        )
+
+        self.assertEqual(len(frames), len(snapshots))
+        order = list(range(len(snapshots)))
+        random.Random(1).shuffle(order)
+        for index in order:
+            self.assertEqual(frames[index], snapshots[index])
+        self.assertEqual(frames[-1], snapshots[-1])
+        self.assertEqual(battle_data["battle_id"], battle.battle_id)
+        self.assertEqual(battle_log[-1], [99, "Action 99"])
+
+    def test_recorder_keeps_only_changed_fields(self):
+        battle = self._new_battle()
+        self._play(battle, actions=3)
+
+        delta = json.loads(battle.replay.deltas[0])
+        self.assertEqual(delta["d"]["action_message"], {"v": "Action 1"})
+        self.assertNotIn("battle_info", delta["d"])
+        self.assertEqual(battle.initial_state["action_message"], "Action 0")
+
+    def test_patch_round_trip(self):
+        diff, apply_patch = self.replay_module.diff, self.replay_module.apply_patch
+        old = {"a": 1, "b": [1, 2], "c": {"x": 1.0}, "gone": True}
+        new = {"a": 1, "b": [1, 2, 3], "c": {"x": 1}, "new": None}
+
+        self.assertEqual(apply_patch(old, diff(old, new)), new)
+        self.assertIs(diff(new, dict(new)), self.replay_module._SAME)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import importlib
+import unittest
+
+from tests.pet_test_loader import (
+    load_city_war_runtime_type,
+    load_pet_runtime_types,
+    load_tower_runtime_types,
+)
+
+
+class TestBattleSimulator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        load_tower_runtime_types()
+        load_pet_runtime_types()
+        load_city_war_runtime_type()
+        cls.simulator = importlib.import_module("cogs.battles.simulator")
+
+    def _spec(self, mode, battles=20, seed=3, **kwargs):
+        spec = self.simulator.CombatantSpec
+        teams = (
+            (
+                spec("Hero", 2400, 310, 120, "Fire"),
+                spec(
+                    "Pup",
+                    900,
+                    120,
+                    60,
+                    "Water",
+                    is_pet=True,
+                    owner="Hero",
+                    pet_skills=("Water Jet", "Purify"),
+                ),
+            ),
+            (spec("Ogre", 3200, 220, 150, "Earth"),),
+        )
+        return self.simulator.SimulationSpec(
+            mode, teams, battles=battles, seed=seed, **kwargs
+        )
+
+    def test_every_mode_runs_headless(self):
+        for mode in self.simulator.MODES:
+            with self.subTest(mode=mode):
+                report = self.simulator.simulate(self._spec(mode, battles=5))
+                self.assertEqual(len(report.results), 5)
+                self.assertGreater(report.turns, 0)
+                self.assertAlmostEqual(sum(report.win_rates().values()), 1.0)
+                for result in report.results:
+                    self.assertEqual(len(result.damage), 2)
+                    if result.winner is not None:
+                        self.assertGreater(result.damage[result.winner], 0)
+
+    def test_results_are_reproducible(self):
+        first = self.simulator.simulate(self._spec("pvp"))
+        second = self.simulator.simulate(self._spec("pvp"))
+        other_seed = self.simulator.simulate(self._spec("pvp", seed=4))
+
+        self.assertEqual(first.results, second.results)
+        self.assertNotEqual(first.results, other_seed.results)
+
+    def test_process_pool_matches_single_process(self):
+        spec = self._spec("tower", battles=self.simulator.CHUNK_SIZE + 10)
+        single = self.simulator.simulate(spec)
+        pooled = self.simulator.simulate(spec, workers=2)
+
+        self.assertEqual(single.results, pooled.results)
+
+    def test_turn_cap_ends_in_a_draw(self):
+        report = self.simulator.simulate(self._spec("pvp", battles=3, max_turns=2))
+
+        self.assertEqual([result.turns for result in report.results], [2, 2, 2])
+        self.assertEqual(report.win_rates()["draw"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
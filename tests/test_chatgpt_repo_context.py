@@ -1,4 +1,6 @@
+import dataclasses
 import json
+import os
 import tempfile
 import unittest
 
@@ -7,8 +9,10 @@ from types import SimpleNamespace
 
 from cogs.chatgpt import (
     ChatGPTCog,
+    RepoIndexStore,
     RepoToolSession,
     _build_query_variants,
+    _build_repo_context_from_index,
     _build_repo_search_index,
     _expand_terms_with_repo_vocabulary,
     _extract_compound_phrases_from_terms,
@@ -854,6 +858,74 @@ class TestChatGPTRepoContext(unittest.TestCase):
             )
 
 
+class TestRepoIndexStore(unittest.TestCase):
+    def write_repo(self, root: Path) -> None:
+        (root / "cogs" / "raid").mkdir(parents=True)
+        (root / "cogs" / "pets").mkdir(parents=True)
+        (root / "cogs" / "raid" / "__init__.py").write_text(
+            "\n".join(
+                [
+                    "RAID_DAMAGE_FACTOR = 3",
+                    "",
+                    "class Raid:",
+                    "    def raid_damage(self, attack):",
+                    "        return attack * RAID_DAMAGE_FACTOR",
+                ]
+            ),
+            encoding="utf-8",
+        )
+        (root / "cogs" / "pets" / "__init__.py").write_text(
+            "\n".join(
+                [
+                    "class Pets:",
+                    "    def feed_pet(self, pet):",
+                    "        pet.hunger = 0",
+                ]
+            ),
+            encoding="utf-8",
+        )
+
+    def test_refresh_reparses_only_changed_files_and_persists(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self.write_repo(root)
+            store = RepoIndexStore(root)
+
+            index = store.refresh()
+            self.assertIs(store.refresh(), index)
+            self.assertTrue(store.cache_path.is_file())
+
+            pets_path = root / "cogs" / "pets" / "__init__.py"
+            pets_path.write_text("class Pets:\n    def pet_treat(self):\n        pass\n", encoding="utf-8")
+            stat = pets_path.stat()
+            os.utime(pets_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+            reloaded = RepoIndexStore(root)
+            reloaded._entries = reloaded._load()
+            raid_entry = reloaded._entries["cogs/raid/__init__.py"]
+            index = reloaded.refresh()
+
+            self.assertIs(reloaded._entries["cogs/raid/__init__.py"], raid_entry)
+            self.assertIn("pet_treat", index.python_symbol_defs)
+            self.assertNotIn("feed_pet", index.python_symbol_defs)
+
+    def test_indexed_search_matches_full_scan(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self.write_repo(root)
+            index = RepoIndexStore(root).refresh()
+            full_scan = dataclasses.replace(index, term_index=None)
+
+            for question in ("How is raid damage calculated?", "How do I feed my pet?"):
+                self.assertEqual(
+                    [snippet.reference for snippet in _build_repo_context_from_index(question, index)],
+                    [snippet.reference for snippet in _build_repo_context_from_index(question, full_scan)],
+                )
+
+            ranked = [path_text for _, path_text in index.term_index.rank(["raid", "damage"])]
+            self.assertEqual(ranked, ["cogs/raid/__init__.py"])
+
+
 class TestChatGPTRepoAgentLoop(unittest.IsolatedAsyncioTestCase):
     async def test_ask_openai_uses_repo_tools_before_answering(self):
         with tempfile.TemporaryDirectory() as tmpdir:
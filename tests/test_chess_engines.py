@@ -0,0 +1,126 @@
+import asyncio
+import unittest
+
+from types import SimpleNamespace
+
+from utils import chess_engines
+from utils.chess_engines import EnginePool
+
+
+class FakeBoard:
+    def __init__(self, fen):
+        self._fen = fen
+
+    def fen(self):
+        return self._fen
+
+
+class FakeEngine:
+    def __init__(self, name, delay=0.01):
+        self.name = name
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.positions = []
+        self.stopped = False
+
+    async def play(self, board, limit):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        self.positions.append(board.fen())
+        return SimpleNamespace(move=f"{self.name}:{board.fen()}")
+
+    async def quit(self):
+        self.stopped = True
+
+
+def make_pool(*names, down=(), **kwargs):
+    engines = {name: FakeEngine(name) for name in names}
+
+    async def connect(backend):
+        if backend in down:
+            raise ConnectionRefusedError(backend)
+        return engines[backend]
+
+    return EnginePool(connect, list(names), **kwargs), engines
+
+
+def depth(value):
+    return SimpleNamespace(depth=value)
+
+
+class TestEnginePool(unittest.TestCase):
+    def test_searches_spread_over_engines(self):
+        async def run():
+            pool, engines = make_pool("a", "b", "c")
+            await pool.start()
+            await asyncio.gather(
+                *(pool.play(FakeBoard(f"fen{i}"), depth(3)) for i in range(9))
+            )
+            return pool, engines
+
+        pool, engines = asyncio.run(run())
+
+        for engine in engines.values():
+            self.assertEqual(len(engine.positions), 3)
+            self.assertEqual(engine.max_running, 1)
+        self.assertGreater(pool.stats()["max_wait"], 0)
+
+    def test_positions_are_cached_per_depth(self):
+        async def run():
+            pool, engines = make_pool("a", cache_size=2)
+            await pool.start()
+            first = await pool.play(FakeBoard("start"), depth(3))
+            again = await pool.play(FakeBoard("start"), depth(3))
+            await pool.play(FakeBoard("start"), depth(8))
+            await pool.play(FakeBoard("other"), depth(3))
+            await pool.play(FakeBoard("start"), depth(3))
+            return pool, engines["a"], first, again
+
+        pool, engine, first, again = asyncio.run(run())
+
+        self.assertIs(again, first)
+        # the third distinct key evicted the least recently used one
+        self.assertEqual(engine.positions, ["start", "start", "other", "start"])
+        self.assertEqual((pool.hits, pool.misses), (1, 4))
+
+    def test_deep_searches_are_limited(self):
+        async def run():
+            pool, engines = make_pool("a", "b", "c", "d")
+            await pool.start()
+            await asyncio.gather(
+                *(
+                    pool.play(FakeBoard(f"fen{i}"), depth(chess_engines.DEEP_DEPTH))
+                    for i in range(8)
+                )
+            )
+            return engines
+
+        engines = asyncio.run(run())
+
+        # at most half of the engines search deep positions at once
+        self.assertEqual(
+            sorted(len(engine.positions) for engine in engines.values()),
+            [0, 0, 4, 4],
+        )
+
+    def test_start_skips_unreachable_backends(self):
+        async def run():
+            pool, engines = make_pool("a", "b", down={"a"})
+            await pool.start()
+            await pool.quit()
+            return pool, engines
+
+        pool, engines = asyncio.run(run())
+        self.assertTrue(engines["b"].stopped)
+        self.assertFalse(engines["a"].stopped)
+
+        pool, _engines = make_pool("a", down={"a"})
+        with self.assertRaises(ConnectionError):
+            asyncio.run(pool.start())
+
+
+if __name__ == "__main__":
+    unittest.main()
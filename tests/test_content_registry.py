@@ -0,0 +1,185 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from classes import content
+from classes.content import ContentRegistry, MonsterIndex, MonsterSearch
+
+ROSTER = {
+    "1": [
+        {"name": "Slime", "element": "Water"},
+        {"name": "Wisp", "element": "Light", "frontier_only": True},
+        {"name": "Hidden", "element": "Dark", "ispublic": False},
+    ],
+    "2": [
+        {"name": "slime", "element": "Earth"},
+        {"name": "Golem", "element": "Earth"},
+    ],
+}
+
+
+class FakeConnection:
+    def __init__(self):
+        self.stamp = (3, 7, 0, 0)
+        self.fetches = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def fetchval(self, query):
+        return False
+
+    async def fetchrow(self, query):
+        return self.stamp
+
+    async def fetch(self, query):
+        self.fetches += 1
+        return [{"id": self.fetches}]
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    def acquire(self):
+        return self.conn
+
+
+class TestMonsterIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = MonsterIndex(ROSTER)
+
+    def test_lookup_by_name_keeps_first_entry(self):
+        self.assertEqual(self.index.get(" SLIME ")["element"], "Water")
+        self.assertEqual(self.index.level_of["golem"], 2)
+        self.assertIsNone(self.index.get("Missing"))
+
+    def test_public_pools(self):
+        public = [monster["name"] for monster in self.index.public()[1]]
+        frontier = [
+            monster["name"]
+            for monster in self.index.public(include_frontier_only=True)[1]
+        ]
+
+        self.assertEqual(public, ["Slime"])
+        self.assertEqual(frontier, ["Slime", "Wisp"])
+
+    def test_by_element_and_names(self):
+        earth = [monster["name"] for monster in self.index.by_element["earth"]]
+
+        self.assertEqual(earth, ["slime", "Golem"])
+        self.assertEqual(
+            self.index.names, {"Slime", "Wisp", "Hidden", "slime", "Golem"}
+        )
+
+    def test_derived_values_are_built_once(self):
+        build = mock.Mock(return_value=["built"])
+
+        self.assertEqual(self.index.derived("key", build), ["built"])
+        self.assertEqual(self.index.derived("key", build), ["built"])
+        build.assert_called_once_with(self.index)
+
+
+class TestMonsterSearch(unittest.TestCase):
+    def setUp(self):
+        self.search = MonsterIndex(ROSTER).search()
+
+    def names(self, results):
+        return [name for name, _monster in results]
+
+    def test_public_roster_keeps_first_position_and_last_entry(self):
+        self.assertEqual(self.search.names, ["Slime", "Wisp", "slime", "Golem"])
+        self.assertEqual(self.search.monsters["Golem"]["level"], 2)
+        self.assertIn("Hidden", MonsterIndex(ROSTER).search(public_only=False).names)
+
+    def test_exact_matches_in_roster_order(self):
+        self.assertEqual(self.names(self.search.exact("LIM")), ["Slime", "slime"])
+        self.assertEqual(self.names(self.search.exact("s")), ["Slime", "Wisp", "slime"])
+        self.assertEqual(self.names(self.search.exact("level 2")), ["slime", "Golem"])
+        self.assertEqual(self.names(self.search.exact("earth")), ["slime", "Golem"])
+
+    def test_fuzzy_falls_back_to_close_names_then_levels(self):
+        self.assertEqual(self.names(self.search.fuzzy("golm")), ["Golem"])
+        self.assertEqual(self.names(self.search.fuzzy("lvel 1")), ["Slime", "Wisp"])
+        self.assertEqual(self.names(self.search.fuzzy("watr")), ["Slime"])
+        self.assertEqual(self.search.fuzzy("zzzz"), [])
+
+    def test_aliases(self):
+        search = MonsterSearch(
+            {"Ancient Wyrm": {"level": 9, "aliases": ["Old Dragon"]}}
+        )
+
+        self.assertEqual(self.names(search.exact("dragon")), ["Ancient Wyrm"])
+        self.assertEqual(search.close_names("old dragn"), ["Ancient Wyrm"])
+
+
+class TestContentRegistry(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        self.write({"1": []})
+        self.registry = ContentRegistry()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write(self, data, mtime=None):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        if mtime is not None:
+            os.utime(self.path, ns=(mtime, mtime))
+
+    def test_file_is_parsed_once(self):
+        first = self.registry.file(self.path, MonsterIndex)
+
+        self.assertIs(self.registry.file(self.path, MonsterIndex), first)
+
+    def test_changed_file_is_reloaded(self):
+        self.write(ROSTER, mtime=1_000_000_000)
+        with mock.patch.object(content, "CHECK_INTERVAL", 0):
+            first = self.registry.file(self.path, MonsterIndex)
+            self.assertIs(self.registry.file(self.path, MonsterIndex), first)
+            self.write({"3": [{"name": "Drake"}]}, mtime=2_000_000_000)
+            second = self.registry.file(self.path, MonsterIndex)
+
+        self.assertIsNot(second, first)
+        self.assertIsNotNone(second.get("drake"))
+
+    def test_changes_wait_for_the_check_interval(self):
+        first = self.registry.file(self.path)
+        self.write({"2": []}, mtime=2_000_000_000)
+
+        self.assertIs(self.registry.file(self.path), first)
+        self.registry.invalidate()
+        self.assertEqual(self.registry.file(self.path), {"2": []})
+
+    def test_missing_monsters_file(self):
+        with mock.patch.object(content, "MONSTERS_PATH", self.path + ".missing"):
+            self.assertEqual(self.registry.monsters().data, {})
+            with self.assertRaises(FileNotFoundError):
+                self.registry.monsters(missing_ok=False)
+
+    def test_splice_rows_follow_the_version_stamp(self):
+        self.registry.bot = mock.Mock(pool=FakePool())
+        conn = self.registry.bot.pool.conn
+
+        first = asyncio.run(self.registry.splice_rows())
+        self.assertIs(asyncio.run(self.registry.splice_rows()), first)
+        self.assertEqual(conn.fetches, 1)
+
+        conn.stamp = (4, 8, 0, 0)
+        second = asyncio.run(self.registry.splice_rows())
+        self.assertEqual(second.version, (4, 8, 0, 0))
+        self.assertEqual(second.pending_parent_names, [])
+        self.assertEqual(conn.fetches, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
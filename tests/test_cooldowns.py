@@ -0,0 +1,144 @@
+import asyncio
+import unittest
+
+from classes import cooldowns
+from classes.cooldowns import (
+    GUILD,
+    USER,
+    CooldownRegistry,
+    cooldown_key,
+    parse_cooldown_key,
+    registry_key,
+)
+
+
+class FakeRedis:
+    """Runs the registry scripts as Python against dicts of TTLs and ZSETs."""
+
+    def __init__(self):
+        self.ttls = {}
+        self.zsets = {}
+        self.calls = []
+
+    def register_script(self, script):
+        handler = {
+            cooldowns._START_SCRIPT: self._start,
+            cooldowns._LIST_SCRIPT: self._list,
+            cooldowns._CLEAR_SCRIPT: self._clear,
+        }[script]
+
+        async def call(keys=None, args=None, client=None):
+            self.calls.append((handler.__name__, keys))
+            return handler(keys, args)
+
+        return call
+
+    def _start(self, keys, args):
+        mode, command, _value, seconds, now, persistent = args
+        ttl = self.ttls.get(keys[0], -2)
+        if mode == "index":
+            if ttl == -2:
+                return -2
+        elif mode == "nx" and ttl != -2:
+            return ttl
+        else:
+            ttl = self.ttls[keys[0]] = seconds
+        if ttl < 0:
+            ttl = persistent
+        registry = self.zsets.setdefault(keys[1], {})
+        registry[command] = now + ttl
+        for member, expiry in list(registry.items()):
+            if expiry <= now:
+                del registry[member]
+        if not registry:
+            del self.zsets[keys[1]]
+        return -2 if mode == "nx" else ttl
+
+    def _list(self, keys, args):
+        timers = []
+        for member in list(self.zsets.get(keys[0], {})):
+            ttl = self.ttls.get(args[0] + member, -2)
+            if ttl == -2:
+                del self.zsets[keys[0]][member]
+            else:
+                timers += [member.encode(), ttl]
+        return timers
+
+    def _clear(self, keys, args):
+        deleted = 0
+        for member in self.zsets.pop(keys[0], {}):
+            deleted += self.ttls.pop(args[0] + member, None) is not None
+        return deleted
+
+
+class TestCooldownRegistry(unittest.TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.registry = CooldownRegistry(self.redis)
+
+    def test_acquire_is_check_and_set(self):
+        self.assertIsNone(asyncio.run(self.registry.acquire(USER, 1, "daily", 60)))
+        self.assertEqual(asyncio.run(self.registry.acquire(USER, 1, "daily", 60)), 60)
+        self.assertEqual(self.redis.ttls, {"cd:1:daily": 60})
+        self.assertEqual([name for name, _keys in self.redis.calls], ["_start"] * 2)
+
+    def test_timers_lists_registry_in_one_call(self):
+        asyncio.run(self.registry.acquire(USER, 1, "daily", 60))
+        asyncio.run(self.registry.set(USER, 1, "pets feed", 30))
+        asyncio.run(self.registry.set(USER, 2, "daily", 10))
+        self.redis.calls.clear()
+
+        timers = asyncio.run(self.registry.timers(USER, 1))
+
+        self.assertEqual(timers, {"daily": 60, "pets feed": 30})
+        self.assertEqual(self.redis.calls, [("_list", [registry_key(USER, 1)])])
+
+    def test_direct_deletes_are_dropped_from_the_registry(self):
+        asyncio.run(self.registry.set(USER, 1, "daily", 60))
+        del self.redis.ttls[cooldown_key(USER, 1, "daily")]
+
+        self.assertEqual(asyncio.run(self.registry.timers(USER, 1)), {})
+        self.assertEqual(self.redis.zsets[registry_key(USER, 1)], {})
+
+    def test_indexing_a_key_about_to_expire(self):
+        self.redis.ttls[cooldown_key(USER, 1, "vote")] = 0
+
+        ttl = asyncio.run(
+            self.registry._start(
+                **self.registry._start_args(USER, 1, "vote", "index", 0, None)
+            )
+        )
+
+        self.assertEqual(ttl, 0)
+        self.assertNotIn(registry_key(USER, 1), self.redis.zsets)
+
+        asyncio.run(self.registry.set(USER, 1, "daily", 60))
+        asyncio.run(
+            self.registry._start(
+                **self.registry._start_args(USER, 1, "vote", "index", 0, None)
+            )
+        )
+        self.assertEqual(list(self.redis.zsets[registry_key(USER, 1)]), ["daily"])
+
+    def test_clear_removes_all_guild_cooldowns(self):
+        asyncio.run(self.registry.set(GUILD, 5, "guild adventure", 60))
+        asyncio.run(self.registry.set(GUILD, 5, "guild invest", 60))
+
+        self.assertEqual(asyncio.run(self.registry.clear(GUILD, 5)), 2)
+        self.assertEqual(self.redis.ttls, {})
+
+    def test_parse_cooldown_key(self):
+        self.assertEqual(
+            parse_cooldown_key(b"cd:7:spin_approval:gate"),
+            ("cd", "7", "spin_approval:gate"),
+        )
+        self.assertEqual(
+            parse_cooldown_key("alliancecd:3:alliance build"),
+            ("alliancecd", "3", "alliance build"),
+        )
+        self.assertIsNone(parse_cooldown_key("cdreg:cd:7"))
+        self.assertIsNone(parse_cooldown_key("lb:money"))
+
+
+if __name__ == "__main__":
+    unittest.main()
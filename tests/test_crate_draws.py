@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+
+from classes import crates
+from classes.items import Hand, ItemType
+
+
+class TestCrateDraws(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(1234)
+
+    def test_mystery_matches_range_widths(self):
+        amount = 200_000
+        counts = crates.draw_mystery(self.rng, amount)
+
+        self.assertEqual(sum(counts.values()), amount)
+        for rarity, width in crates.MYSTERY_ODDS:
+            expected = amount * width / 10001
+            tolerance = 5 * (expected * (1 - width / 10001)) ** 0.5 + 1
+            self.assertAlmostEqual(counts[rarity], expected, delta=tolerance)
+
+    def test_stats_follow_the_bands(self):
+        amount = 100_000
+        for rarity, bands in crates.STAT_BANDS.items():
+            with self.subTest(rarity=rarity):
+                stats = crates.draw_stats(self.rng, rarity, amount)
+                expected_mean = sum(
+                    chance / 10 * (low + high) / 2 for chance, (low, high) in bands
+                )
+                lows, highs = zip(*(band for _chance, band in bands))
+                self.assertGreaterEqual(stats.min(), min(lows))
+                self.assertLessEqual(stats.max(), max(highs))
+                self.assertAlmostEqual(stats.mean(), expected_mean, delta=0.2)
+
+    def test_items_mirror_single_rolls(self):
+        items = crates.draw_items(self.rng, "rare", 20_000)
+
+        two_handed = [item for item in items if item["hand"] == Hand.Both.value]
+        uneven = sum(item["damage"] % 2 for item in two_handed) / len(two_handed)
+        self.assertAlmostEqual(uneven, 0.5, delta=0.03)
+        for item in items:
+            if item["type_"] == ItemType.Shield.value:
+                self.assertEqual(item["damage"], 0)
+                self.assertTrue(20 <= item["armor"] <= 40)
+            else:
+                self.assertEqual(item["armor"], 0)
+            self.assertTrue(1 <= item["value"] <= 250)
+
+    def test_dragon_coins_only_for_high_tiers(self):
+        self.assertEqual(crates.draw_dragon_coins(self.rng, "rare", 1000), 0)
+        coins = crates.draw_dragon_coins(self.rng, "divine", 100_000)
+        self.assertAlmostEqual(coins / 100_000, 0.4 * 25.5, delta=0.3)
+
+    def test_fortune_rewards(self):
+        draw = crates.draw_fortune(self.rng, 100_000, level=60)
+
+        self.assertEqual(draw.xp_crates + draw.money_crates, 100_000)
+        self.assertAlmostEqual(draw.xp_crates / 100_000, 0.5, delta=0.01)
+        self.assertEqual(draw.money % 100, 0)
+        expected = 0.75 * 360_000 + 0.25 * 660_000.5
+        self.assertAlmostEqual(draw.money / draw.money_crates, expected, delta=2000)
+        expected_xp = (50_000 + 121_500) / 2
+        self.assertAlmostEqual(draw.xp / draw.xp_crates, expected_xp, delta=500)
+
+    def test_materials_follow_the_odds(self):
+        odds = {"dust": 0.6, "ore": 0.3, "gem": 0.1}
+        materials = crates.draw_materials(self.rng, 50_000, odds)
+
+        total = sum(materials.values())
+        self.assertTrue(3 * 50_000 <= total <= 10 * 50_000)
+        self.assertAlmostEqual(total / 50_000, 6.5, delta=0.05)
+        for resource, chance in odds.items():
+            self.assertAlmostEqual(materials[resource] / total, chance, delta=0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
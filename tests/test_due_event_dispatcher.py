@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+
+from datetime import datetime, timedelta
+
+from utils.scheduling import DeadlineQueue, DueEventDispatcher
+
+START = datetime(2026, 1, 1)
+
+
+class FakeLease:
+    def __init__(self, held=True):
+        self.held = held
+        self.renew_interval = 10.0
+
+    async def acquire(self):
+        return self.held
+
+
+class TestDeadlineQueue(unittest.TestCase):
+    def test_pop_due_is_ordered_and_limited(self):
+        queue = DeadlineQueue()
+        for key, minutes in (("c", 3), ("a", 1), ("b", 2), ("d", 10)):
+            queue.push(key, START + timedelta(minutes=minutes), key.upper())
+
+        due = queue.pop_due(START + timedelta(minutes=5), limit=2)
+
+        self.assertEqual(due, [("a", "A"), ("b", "B")])
+        self.assertEqual(queue.next_deadline(), START + timedelta(minutes=3))
+        self.assertEqual(len(queue), 2)
+
+    def test_discard_and_reschedule_skip_stale_entries(self):
+        queue = DeadlineQueue()
+        queue.push(1, START + timedelta(minutes=1))
+        queue.push(2, START + timedelta(minutes=2))
+        queue.push(2, START + timedelta(minutes=30))
+        queue.discard(1)
+
+        self.assertEqual(queue.pop_due(START + timedelta(minutes=10)), [])
+        self.assertEqual(queue.next_deadline(), START + timedelta(minutes=30))
+
+
+class TestDueEventDispatcher(unittest.TestCase):
+    def make_dispatcher(self, rows, *, held=True):
+        self.now = START
+        self.loads = []
+        self.fired = []
+
+        async def load(horizon):
+            self.loads.append(horizon)
+            return [(key, end, key) for key, end in rows if end < horizon]
+
+        async def fire(due):
+            self.fired.append([key for key, _value in due])
+
+        return DueEventDispatcher(
+            lease=FakeLease(held),
+            load=load,
+            fire=fire,
+            batch_size=2,
+            clock=lambda: self.now,
+        )
+
+    def test_loads_window_once_and_fires_in_batches(self):
+        rows = [(key, START - timedelta(seconds=key)) for key in range(1, 4)]
+        rows.append((10, START + timedelta(minutes=5)))
+        rows.append((11, START + timedelta(hours=3)))
+        dispatcher = self.make_dispatcher(rows)
+
+        async def scenario():
+            self.assertEqual(await dispatcher.run_once(), 0)
+            self.assertEqual(await dispatcher.run_once(), 0)
+            delay = await dispatcher.run_once()
+            self.assertEqual(delay, 10.0)
+            self.now = START + timedelta(minutes=5)
+            await dispatcher.run_once()
+
+        asyncio.run(scenario())
+
+        self.assertEqual(self.fired, [[3, 2], [1], [10]])
+        self.assertEqual(len(self.loads), 1)
+
+    def test_schedule_and_cancel_between_loads(self):
+        dispatcher = self.make_dispatcher([])
+
+        async def scenario():
+            await dispatcher.run_once()
+            dispatcher.schedule(20, START + timedelta(seconds=30), 20)
+            dispatcher.schedule(21, START + timedelta(seconds=40), 21)
+            dispatcher.schedule(22, START + timedelta(hours=2), 22)
+            dispatcher.cancel(21)
+            self.now = START + timedelta(minutes=1)
+            await dispatcher.run_once()
+
+        asyncio.run(scenario())
+
+        self.assertEqual(self.fired, [[20]])
+        self.assertNotIn(22, dispatcher.queue)
+
+    def test_non_owner_does_nothing(self):
+        dispatcher = self.make_dispatcher([(1, START)], held=False)
+
+        asyncio.run(dispatcher.run_once())
+        dispatcher.schedule(2, START, 2)
+
+        self.assertEqual(self.loads, [])
+        self.assertEqual(len(dispatcher.queue), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import asyncio
+import unittest
+
+import numpy as np
+
+from classes.image_ops import (
+    ImageOps,
+    ImageOpsBusy,
+    apply,
+    decode,
+    edges,
+    encode,
+    invert,
+    oil,
+    pixel,
+)
+
+
+def avatar(size=64, seed=0):
+    rgba = np.random.default_rng(seed).integers(0, 256, (size, size, 4), dtype=np.uint8)
+    rgba[..., 3] = 255
+    return rgba
+
+
+class TestFilters(unittest.TestCase):
+    def test_invert_keeps_alpha(self):
+        rgba = avatar()
+        rgba[0, 0] = (10, 20, 30, 40)
+
+        out = invert(rgba)
+
+        self.assertEqual(tuple(out[0, 0]), (245, 235, 225, 40))
+        np.testing.assert_array_equal(invert(out), rgba)
+
+    def test_pixel_averages_blocks(self):
+        rgba = avatar()
+
+        out = pixel(rgba, 8)
+
+        block = rgba[:8, :8].astype(float).mean(axis=(0, 1))
+        np.testing.assert_array_equal(out[:8, :8], np.broadcast_to(np.rint(block), (8, 8, 4)))
+        self.assertEqual(len(np.unique(out[..., 0])), len(np.unique(out[::8, ::8, 0])))
+
+    def test_flat_images_have_no_edges_and_keep_their_color(self):
+        flat = np.full((32, 32, 4), (90, 120, 200, 255), dtype=np.uint8)
+
+        self.assertEqual(int(edges(flat)[..., :3].max()), 0)
+        np.testing.assert_array_equal(oil(flat), flat)
+
+    def test_oil_keeps_a_hard_edge(self):
+        halves = np.zeros((32, 32, 4), dtype=np.uint8)
+        halves[..., 3] = 255
+        halves[:, 16:, :3] = 200
+
+        np.testing.assert_array_equal(oil(halves), halves)
+
+    def test_apply_returns_a_png_of_the_output_size(self):
+        out = decode(apply(encode(avatar()), "invert"))
+
+        self.assertEqual(out.shape, (512, 512, 4))
+
+
+class TestImageOps(unittest.TestCase):
+    def setUp(self):
+        self.data = encode(avatar())
+        self.reads = 0
+
+    async def read(self):
+        self.reads += 1
+        return self.data
+
+    def test_results_are_cached_and_coalesced(self):
+        ops = ImageOps(workers=1)
+
+        async def scenario():
+            first, second = await asyncio.gather(
+                ops.process("hash", "invert", (), self.read),
+                ops.process("hash", "invert", (), self.read),
+            )
+            third = await ops.process("hash", "invert", (), self.read)
+            return first, second, third
+
+        try:
+            first, second, third = asyncio.run(scenario())
+        finally:
+            ops.close()
+
+        self.assertEqual(first, apply(self.data, "invert"))
+        self.assertTrue(first == second == third)
+        self.assertEqual(self.reads, 1)
+        self.assertEqual((ops.runs, ops.coalesced, ops.cache_hits), (1, 1, 1))
+
+    def test_overload_is_rejected_before_downloading(self):
+        ops = ImageOps(workers=1, max_pending=1)
+
+        async def scenario():
+            running = asyncio.create_task(ops.process("a", "edges", (), self.read))
+            while not ops.pending:
+                await asyncio.sleep(0)
+            with self.assertRaises(ImageOpsBusy):
+                await ops.process("b", "edges", (), self.read)
+            await running
+
+        try:
+            asyncio.run(asyncio.wait_for(scenario(), 60))
+        finally:
+            ops.close()
+
+        self.assertEqual((self.reads, ops.rejected), (1, 1))
+
+    def test_a_burst_only_downloads_what_the_pool_takes(self):
+        ops = ImageOps(workers=1, max_pending=2)
+        release = None
+
+        async def slow_read():
+            self.reads += 1
+            await release.wait()
+            return self.data
+
+        async def scenario():
+            nonlocal release
+            release = asyncio.Event()
+            tasks = [
+                asyncio.create_task(ops.process(str(index), "invert", (), slow_read))
+                for index in range(5)
+            ]
+            await asyncio.sleep(0.01)
+            release.set()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            results = asyncio.run(asyncio.wait_for(scenario(), 60))
+        finally:
+            ops.close()
+
+        busy = [result for result in results if isinstance(result, ImageOpsBusy)]
+        self.assertEqual((self.reads, len(busy), ops.rejected), (2, 3, 3))
+        self.assertEqual(ops.pending, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
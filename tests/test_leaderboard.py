@@ -0,0 +1,100 @@
+import asyncio
+import unittest
+
+from types import SimpleNamespace
+
+from classes.leaderboard import (
+    BATTLETOWER_BOARD,
+    READY_KEY,
+    Leaderboards,
+    battletower_score,
+    board_key,
+    scores_from_payload,
+    split_battletower_score,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.zsets = {}
+        self.keys = {READY_KEY}
+
+    async def exists(self, key):
+        return int(key in self.keys or key in self.zsets)
+
+    async def zscore(self, key, member):
+        value = self.zsets.get(key, {}).get(member)
+        return None if value is None else float(value)
+
+    async def zcount(self, key, low, high):
+        exclusive = isinstance(low, str) and low.startswith("(")
+        low = float(low[1:]) if exclusive else float(low)
+        return sum(
+            1
+            for score in self.zsets.get(key, {}).values()
+            if (score > low if exclusive else score >= low)
+        )
+
+    async def zrevrange(self, key, start, stop, withscores=False):
+        entries = sorted(
+            self.zsets.get(key, {}).items(), key=lambda item: item[1], reverse=True
+        )
+        return [(str(member).encode(), float(score)) for member, score in entries][
+            start : stop + 1
+        ]
+
+
+class TestLeaderboard(unittest.TestCase):
+    def make_boards(self, scores):
+        redis = FakeRedis()
+        redis.zsets[board_key("money")] = dict(scores)
+        return Leaderboards(SimpleNamespace(redis=redis))
+
+    def test_rank_matches_count_queries_with_ties(self):
+        scores = {1: 500, 2: 300, 3: 300, 4: 100}
+        boards = self.make_boards(scores)
+
+        for user_id, score in scores.items():
+            expected = sum(1 for other in scores.values() if other > score) + 1
+            expected_inclusive = sum(1 for other in scores.values() if other >= score)
+            self.assertEqual(
+                asyncio.run(boards.rank("money", user_id)), (expected, score)
+            )
+            self.assertEqual(
+                asyncio.run(boards.rank("money", user_id, inclusive=True)),
+                (expected_inclusive, score),
+            )
+
+        self.assertIsNone(asyncio.run(boards.rank("money", 99)))
+
+    def test_top_returns_highest_scores_first(self):
+        boards = self.make_boards({1: 5, 2: 50, 3: 20})
+
+        self.assertEqual(asyncio.run(boards.top("money", 2)), [(2, 50), (3, 20)])
+
+    def test_profile_payload_updates_and_deletes(self):
+        user_id, scores = scores_from_payload(
+            {"user": 7, "money": 10, "xp": 20, "pvpwins": 3, "whored": None}
+        )
+        self.assertEqual(user_id, 7)
+        self.assertEqual(scores, {"money": 10, "xp": 20, "pvpwins": 3, "whored": None})
+
+        self.assertEqual(scores_from_payload({"user": 7}), (7, {}))
+
+        _user_id, scores = scores_from_payload({"user": 7, "deleted": True})
+        self.assertEqual(set(scores.values()), {None})
+        self.assertIn(BATTLETOWER_BOARD, scores)
+
+    def test_battletower_orders_by_prestige_then_level(self):
+        self.assertGreater(battletower_score(2, 1), battletower_score(1, 30))
+        self.assertGreater(battletower_score(1, 30), battletower_score(1, 29))
+        self.assertEqual(split_battletower_score(battletower_score(3, 17)), (3, 17))
+
+        user_id, scores = scores_from_payload(
+            {"battletower": 5, "prestige": 3, "level": 17}
+        )
+        self.assertEqual((user_id, scores), (5, {BATTLETOWER_BOARD: 3_000_017}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import asyncio
+import unittest
+
+from types import SimpleNamespace
+
+from classes.market import (
+    COUNT_CAP,
+    INDEXES,
+    PAGE_SIZE,
+    MarketBrowser,
+    MarketQuery,
+    count_sql,
+    create_indexes,
+    page_sql,
+)
+
+
+class FakeContext:
+    def __init__(self, value):
+        self.value = value
+
+    async def __aenter__(self):
+        return self.value
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakePool:
+    def __init__(self, rows, total=None):
+        self.rows = rows
+        self.total = len(rows) if total is None else total
+        self.fetches = []
+
+    def acquire(self):
+        return FakeContext(self)
+
+    async def fetch(self, statement, *args):
+        self.fetches.append(args)
+        return self.rows[: args[-1]]
+
+    async def fetchval(self, statement, *args):
+        return self.total
+
+
+class IndexConnection:
+    def __init__(self, invalid):
+        self.invalid = invalid
+        self.executed = []
+
+    def acquire(self):
+        return FakeContext(self)
+
+    async def fetch(self, statement, names):
+        return [{"relname": name} for name in self.invalid if name in names]
+
+    async def execute(self, statement, timeout=None):
+        self.executed.append(statement)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.generation = 0
+
+    async def get(self, key):
+        return str(self.generation).encode()
+
+    async def incr(self, key):
+        self.generation += 1
+
+
+def listing(n):
+    return {"item": n, "offer": n, "price": n * 10, "k0": n * 10, "k1": n}
+
+
+class TestMarketQueries(unittest.TestCase):
+    def test_first_page_is_filtered_and_limited(self):
+        statement, args = page_sql(MarketQuery(("Sword", "Axe"), 20, 5000))
+
+        self.assertIn('ai."type" = ANY($3)', statement)
+        self.assertIn("ORDER BY m.price ASC, m.id ASC LIMIT $4", statement)
+        self.assertEqual(args, [5000, 20, ["Sword", "Axe"], PAGE_SIZE + 1])
+
+    def test_next_page_continues_after_the_cursor(self):
+        statement, args = page_sql(MarketQuery(sort="stat"), cursor=(90, 500, 7))
+
+        self.assertIn(
+            "(ai.damage + ai.armor) <= $3 AND (((ai.damage + ai.armor) < $3)"
+            " OR ((ai.damage + ai.armor) = $3 AND m.price > $4)"
+            " OR ((ai.damage + ai.armor) = $3 AND m.price = $4 AND m.id > $5))",
+            statement,
+        )
+        self.assertEqual(args, [1_000_000_000, 0.0, 90, 500, 7, PAGE_SIZE + 1])
+
+    def test_newest_uses_descending_offer_ids(self):
+        statement, _args = page_sql(MarketQuery(sort="newest"), cursor=(40,))
+
+        self.assertIn("m.id <= $3 AND ((m.id < $3))", statement)
+        self.assertIn("ORDER BY m.id DESC", statement)
+
+    def test_count_is_capped(self):
+        statement, args = count_sql(MarketQuery())
+
+        self.assertIn("LIMIT $3) AS capped", statement)
+        self.assertEqual(args[-1], COUNT_CAP + 1)
+
+
+class TestMarketIndexes(unittest.TestCase):
+    def test_invalid_indexes_are_dropped_before_building(self):
+        conn = IndexConnection(["allitems_type_armor_idx"])
+
+        with self.assertLogs("classes.market", "WARNING"):
+            asyncio.run(create_indexes(conn))
+
+        self.assertEqual(
+            conn.executed[0],
+            "DROP INDEX CONCURRENTLY IF EXISTS allitems_type_armor_idx;",
+        )
+        self.assertEqual(len(conn.executed), 1 + len(INDEXES))
+        self.assertTrue(
+            all("CREATE INDEX CONCURRENTLY IF NOT EXISTS" in s for s in conn.executed[1:])
+        )
+
+
+class TestMarketBrowser(unittest.TestCase):
+    def setUp(self):
+        self.pool = FakePool([listing(n) for n in range(1, 31)])
+        self.redis = FakeRedis()
+        self.browser = MarketBrowser(SimpleNamespace(pool=self.pool, redis=self.redis))
+
+    def test_pages_carry_the_cursor_of_their_last_row(self):
+        first = asyncio.run(self.browser.page(MarketQuery()))
+
+        self.assertEqual(len(first.items), PAGE_SIZE)
+        self.assertEqual(first.cursor, (PAGE_SIZE * 10, PAGE_SIZE))
+        self.assertEqual(first.total, 30)
+
+        self.pool.rows = [listing(n) for n in range(26, 31)]
+        second = asyncio.run(self.browser.page(MarketQuery(), first.cursor))
+
+        self.assertEqual([item["item"] for item in second.items], [26, 27, 28, 29, 30])
+        self.assertIsNone(second.cursor)
+        self.assertIsNone(second.total)
+
+    def test_first_pages_are_cached_until_the_market_changes(self):
+        query = MarketQuery(("Shield",), 10, 1000)
+
+        first = asyncio.run(self.browser.page(query))
+        self.assertIs(asyncio.run(self.browser.page(query)), first)
+        self.assertEqual(len(self.pool.fetches), 1)
+
+        self.redis.generation += 1  # another cluster sold an item
+        self.assertIsNot(asyncio.run(self.browser.page(query)), first)
+        self.assertEqual(len(self.pool.fetches), 2)
+
+        asyncio.run(self.browser.invalidate())
+        asyncio.run(self.browser.page(query))
+        self.assertEqual(len(self.pool.fetches), 3)
+        self.assertEqual((self.browser.hits, self.browser.misses), (1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 
 from types import SimpleNamespace
@@ -10,6 +11,8 @@ from cogs.newwerewolf.core import (
     Side,
     enforce_role_min_player_requirements,
     get_custom_roles,
+    night_action_prompt,
+    night_prompt_timeout,
     side_from_role,
 )
 
@@ -656,6 +659,41 @@ class TestNewWerewolfRoleBehaviors(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(2, sent_text.count("Correct"))
         self.assertIn("Their team is **Werewolf**", sent_text)
 
+    async def test_gambler_follow_up_prompts_keep_to_the_wave_deadline(self):
+        first_target = DummyPlayer(2, "Villager", Role.VILLAGER)
+        second_target = DummyPlayer(3, "Wolf", Role.WEREWOLF)
+        choose = SequenceChoose([0, 0, 1])
+        paginator = SimpleNamespace(
+            Choose=choose,
+            NoChoice=RuntimeError,
+        )
+        game = SimpleNamespace(
+            ctx=SimpleNamespace(bot=SimpleNamespace(paginator=paginator)),
+            alive_players=[],
+            timer=60,
+            game_link="https://example.invalid/game",
+        )
+        game.get_observed_side = lambda player, observer=None: player.side
+        gambler = SimpleNamespace(
+            user=DummyUser(id=1, name="Gambler", mention="<@1>"),
+            game=game,
+            gambler_village_guesses_left=2,
+            announce_awake=AsyncMock(),
+            choose_users=AsyncMock(side_effect=[[first_target], [second_target]]),
+            send=AsyncMock(),
+        )
+        game.alive_players = [gambler, first_target, second_target]
+
+        # a wave shorter than one prompt timer
+        with patch("cogs.newwerewolf.core.NIGHT_ACTION_DEADLINE_FACTOR", 0.5):
+            await Game.run_night_actions(
+                game, [Player.guess_player_team_as_gambler(gambler)]
+            )
+
+        self.assertEqual(3, len(choose.calls))
+        for call in choose.calls:
+            self.assertLessEqual(call["timeout"], 30)
+
     async def test_sorcerer_disguise_uses_present_non_seer_informers(self):
         sorcerer = DummyPlayer(1, "Sorcerer", Role.SORCERER)
         seer = DummyPlayer(2, "Seer", Role.SEER)
@@ -728,3 +766,62 @@ class TestNewWerewolfRoleBehaviors(unittest.IsolatedAsyncioTestCase):
             Role.SORCERER,
             game.get_observed_role(sorcerer, observer=villager),
         )
+
+    async def test_night_actions_prompt_together_and_resolve_in_order(self):
+        game = SimpleNamespace(timer=60)
+        log = []
+
+        @night_action_prompt
+        async def prompt(name, delay):
+            log.append(f"ask {name}")
+            await asyncio.sleep(delay)
+            return name
+
+        async def action(name, delay):
+            choice = await prompt(name, delay)
+            log.append(f"resolve {choice}")
+            return choice
+
+        results = await Game.run_night_actions(
+            game, [action("seer", 0.05), action("detective", 0)]
+        )
+
+        self.assertEqual(["seer", "detective"], results)
+        self.assertEqual(
+            ["ask seer", "ask detective", "resolve seer", "resolve detective"], log
+        )
+
+    async def test_night_actions_share_one_deadline(self):
+        game = SimpleNamespace(timer=0.01)
+        timeouts = []
+
+        async def stuck():
+            timeouts.append(night_prompt_timeout(60))
+            await asyncio.Event().wait()
+
+        async def answer():
+            return "answer"
+
+        with patch("cogs.newwerewolf.core.NIGHT_ACTION_GRACE", 0):
+            results = await Game.run_night_actions(
+                game, [stuck(), answer()], default="skipped"
+            )
+
+        self.assertEqual(["skipped", "answer"], results)
+        self.assertLessEqual(timeouts[0], 1.0)
+        self.assertEqual(60, night_prompt_timeout(60))
+
+    async def test_night_action_errors_are_raised_after_the_wave(self):
+        game = SimpleNamespace(timer=60)
+        finished = []
+
+        async def broken():
+            raise ValueError("broken prompt")
+
+        async def fine():
+            await asyncio.sleep(0)
+            finished.append(True)
+
+        with self.assertRaises(ValueError):
+            await Game.run_night_actions(game, [broken(), fine()])
+        self.assertEqual([True], finished)
@@ -0,0 +1,92 @@
+import os
+import random
+import subprocess
+import sys
+import unittest
+
+from pathlib import Path
+
+from cogs.newwerewolf import simulator
+from cogs.newwerewolf.simulator import GameSpec, SeededRandom, simulate
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CUSTOM_ROLES = (
+    "WEREWOLF",
+    "WEREWOLF",
+    "SEER",
+    "WITCH",
+    "VILLAGER",
+    "VILLAGER",
+    "VILLAGER",
+)
+
+
+class TestWerewolfSimulator(unittest.TestCase):
+    def test_seeded_random_is_reproducible(self):
+        first, second = SeededRandom(5), SeededRandom(5)
+
+        self.assertEqual(first.shuffle(range(10)), second.shuffle(range(10)))
+        self.assertEqual(first.sample({1, 2, 3}, 2), second.sample({1, 2, 3}, 2))
+        self.assertEqual(first.randint(1, 100), second.randint(1, 100))
+
+    def test_policy_respects_multi_choice_bounds(self):
+        policy = simulator.BotPolicy(random.Random(1), skip_chance=0.0)
+
+        for _ in range(50):
+            picks = policy.choose_many(6, 2, allow_empty=True)
+            self.assertTrue(1 <= len(picks) <= 2)
+            self.assertTrue(all(0 <= pick < 6 for pick in picks))
+        self.assertEqual(
+            simulator.BotPolicy(random.Random(1), 1.0).choose_many(6, 2, True), []
+        )
+
+    def test_custom_role_set_plays_to_the_end(self):
+        report = simulate(GameSpec(len(CUSTOM_ROLES), roles=CUSTOM_ROLES, games=20))
+
+        self.assertEqual(len(report.results), 20)
+        self.assertEqual(report.errors(), {})
+        self.assertAlmostEqual(sum(report.win_rates().values()), 1.0)
+        self.assertTrue(
+            set(report.win_rates()) <= {"Werewolves", "Villagers", simulator.DRAW}
+        )
+        for result in report.results:
+            self.assertEqual(len(result.roles), len(CUSTOM_ROLES))
+            self.assertGreater(result.days, 0)
+
+    def test_results_are_reproducible(self):
+        spec = GameSpec(8, mode="Classic", games=10, seed=2)
+
+        self.assertEqual(simulate(spec).results, simulate(spec).results)
+
+    def test_results_do_not_depend_on_the_hash_seed(self):
+        script = (
+            "from cogs.newwerewolf.simulator import GameSpec, simulate\n"
+            "print(simulate(GameSpec(10, mode='Classic', games=10, seed=4)).results)\n"
+            "print(simulate(GameSpec(16, mode='Extended', games=10, seed=7)).results)"
+        )
+        outputs = [
+            subprocess.run(
+                [sys.executable, "-c", script],
+                cwd=ROOT,
+                env={**os.environ, "PYTHONHASHSEED": hash_seed},
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=600,
+            ).stdout
+            for hash_seed in ("1", "2")
+        ]
+
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_day_cap_ends_in_a_draw(self):
+        report = simulate(
+            GameSpec(len(CUSTOM_ROLES), roles=CUSTOM_ROLES, games=5, max_days=0)
+        )
+
+        self.assertEqual(report.win_rates(), {simulator.DRAW: 1.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
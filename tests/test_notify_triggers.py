@@ -0,0 +1,60 @@
+import asyncio
+import contextlib
+import unittest
+
+from utils.notify_triggers import ensure_triggers
+
+DDL = "CREATE TRIGGER ..."
+
+
+class FakeConnection:
+    """Reports the given trigger counts, one per ``pg_trigger`` lookup."""
+
+    def __init__(self, *counts):
+        self.counts = list(counts)
+        self.statements = []
+        self.in_transaction = False
+
+    async def fetchval(self, query, names):
+        return self.counts.pop(0)
+
+    async def execute(self, query, *args):
+        self.statements.append((query, self.in_transaction))
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+
+class TestEnsureTriggers(unittest.TestCase):
+    def test_installed_triggers_are_left_alone(self):
+        conn = FakeConnection(2)
+
+        self.assertFalse(asyncio.run(ensure_triggers(conn, ("a", "b"), DDL)))
+        self.assertEqual(conn.statements, [])
+
+    def test_missing_triggers_are_created_under_the_lock(self):
+        conn = FakeConnection(1, 1)
+
+        self.assertTrue(asyncio.run(ensure_triggers(conn, ("a", "b"), DDL)))
+        self.assertEqual(
+            conn.statements,
+            [
+                ("SELECT pg_advisory_xact_lock(hashtext($1));", True),
+                (DDL, True),
+            ],
+        )
+
+    def test_triggers_created_while_waiting_for_the_lock_are_kept(self):
+        conn = FakeConnection(0, 2)
+
+        self.assertFalse(asyncio.run(ensure_triggers(conn, ("a", "b"), DDL)))
+        self.assertNotIn((DDL, True), conn.statements)
+
+
+if __name__ == "__main__":
+    unittest.main()
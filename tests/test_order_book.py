@@ -0,0 +1,105 @@
+import datetime
+import json
+import unittest
+
+from classes.order_book import CRATE, WEAPON, BuyOrder, BuyOrderBook, OrderBook
+
+START = datetime.datetime(2025, 1, 1)
+
+
+def weapon(order_id, price, low, high, *, user=1, weapon_type="sword", quantity=1, age=0):
+    return BuyOrder(
+        WEAPON,
+        order_id,
+        user,
+        weapon_type,
+        price,
+        quantity,
+        0,
+        START + datetime.timedelta(minutes=age),
+        low,
+        high,
+    )
+
+
+def crate(order_id, price, *, crate_type="rare", quantity=5, age=0):
+    return BuyOrder(
+        CRATE, order_id, 1, crate_type, price, quantity, 0,
+        START + datetime.timedelta(minutes=age),
+    )
+
+
+class TestOrderBook(unittest.TestCase):
+    def setUp(self):
+        self.book = OrderBook()
+        for order in (
+            weapon(1, 500, 10, 30, age=1),
+            weapon(2, 800, 25, 50, age=2),
+            weapon(3, 800, 20, 40, age=0),
+            weapon(4, 900, 45, 50, user=2),
+            weapon(5, 2000, 10, 50, weapon_type="axe"),
+            crate(6, 100),
+            crate(7, 300, crate_type="legendary"),
+        ):
+            self.book.upsert(order)
+
+    def test_orders_for_an_item_are_in_price_time_priority(self):
+        self.assertEqual([o.id for o in self.book.weapon_orders("sword", 28)], [3, 2, 1])
+        self.assertEqual([o.id for o in self.book.weapon_orders("sword", 46)], [4, 2])
+        self.assertEqual(list(self.book.weapon_orders("sword", 5)), [])
+        self.assertEqual(self.book.best_weapon_order("sword", 48, exclude_user=2).id, 2)
+
+    def test_filled_and_cancelled_orders_leave_the_book(self):
+        filled = weapon(3, 800, 20, 40)
+        filled.quantity_filled = 1
+        self.book.upsert(filled)
+        self.book.upsert(weapon(1, 500, 10, 30), active=False)
+
+        self.assertEqual([o.id for o in self.book.weapon_orders("sword", 28)], [2])
+        self.assertIsNone(self.book.get(WEAPON, 3))
+        self.assertNotIn(20, self.book.stat_bands["sword"])
+
+    def test_match_respects_remaining_quantity(self):
+        matches = self.book.match_weapons(
+            [(10, "sword", 30), (11, "sword", 35), (12, "sword", 48), (13, "axe", 12)],
+            exclude_user=2,
+        )
+
+        self.assertEqual(
+            [(item_id, order.id) for item_id, order in matches],
+            [(12, 2), (11, 3), (10, 1), (13, 5)],
+        )
+
+    def test_search_filters_and_sorts(self):
+        weapons, crates = self.book.search(weapon_type="sw", min_stat=20, sort="price")
+
+        self.assertEqual([o.id for o in weapons], [2, 3, 4])
+        self.assertEqual([o.id for o in crates], [6, 7])
+
+        weapons, crates = self.book.search(kind=CRATE, max_price=200)
+        self.assertEqual((weapons, [o.id for o in crates]), ([], [6]))
+
+
+class TestNotifications(unittest.TestCase):
+    def test_changes_are_applied_from_payloads(self):
+        book = BuyOrderBook(bot=None)
+        row = {
+            "id": 1, "user_id": 3, "weapon_type": "Bow", "min_stat": 5,
+            "max_stat": 9, "price": 70, "quantity": 2, "quantity_filled": 0,
+            "created_at": "2025-01-01T12:00:00", "active": True,
+        }
+        book.apply(json.dumps({"table": "weapon_buy_orders", "row": row}))
+        self.assertEqual(book.best_weapon_order("bow", 7).price, 70)
+
+        row["quantity_filled"] = 2
+        book.apply(json.dumps({"table": "weapon_buy_orders", "row": row}))
+        self.assertEqual(len(book), 0)
+
+        book.ready = True
+        with self.assertLogs("classes.order_book", "ERROR"):
+            book.apply("{}")
+        self.assertFalse(book.ready)
+
+
+if __name__ == "__main__":
+    unittest.main()
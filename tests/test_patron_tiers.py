@@ -0,0 +1,198 @@
+import asyncio
+import unittest
+
+from types import SimpleNamespace
+
+import discord
+
+from classes.patron_tiers import PatronTiers, ready_key, roles_key
+
+SUPPORT_GUILD_ID = 10
+BOOSTER_GUILD_ID = 20
+ROLE_TIERS = {111: 1, 222: 2, 444: 4}
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        return [
+            getattr(self.redis, "_" + name)(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def _exists(self, key):
+        return int(key in self.data)
+
+    def _hget(self, key, field):
+        value = self.data.get(key, {}).get(str(field))
+        return None if value is None else str(value).encode()
+
+    def _hset(self, key, field=None, value=None, mapping=None):
+        values = self.data.setdefault(key, {})
+        if mapping:
+            values.update({str(k): v for k, v in mapping.items()})
+        if field is not None:
+            values[str(field)] = value
+
+    def _hdel(self, key, field):
+        self.data.get(key, {}).pop(str(field), None)
+
+    def _delete(self, key):
+        self.data.pop(key, None)
+
+    def _rename(self, key, new_key):
+        self.data[new_key] = self.data.pop(key)
+
+    def _set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def hget(self, key, field):
+        self.round_trips += 1
+        return self._hget(key, field)
+
+    async def hset(self, key, field, value):
+        self.round_trips += 1
+        self._hset(key, field, value)
+
+    async def hdel(self, key, field):
+        self.round_trips += 1
+        self._hdel(key, field)
+
+
+class FakeHTTP:
+    def __init__(self, members):
+        self.members = members
+        self.calls = []
+
+    async def get_member(self, guild_id, user_id):
+        self.calls.append((guild_id, user_id))
+        try:
+            return {"roles": [str(role) for role in self.members[guild_id][user_id]]}
+        except KeyError:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "")
+
+
+def member(guild_id, user_id, *role_ids):
+    return SimpleNamespace(
+        id=user_id,
+        guild=SimpleNamespace(id=guild_id),
+        roles=[SimpleNamespace(id=role_id) for role_id in role_ids],
+    )
+
+
+class FakeBot:
+    def __init__(self, members):
+        self.redis = FakeRedis()
+        self.http = FakeHTTP(members)
+        self.cleared = []
+
+    def _get_patreon_tier_lookup_guild_ids(self):
+        return [SUPPORT_GUILD_ID, BOOSTER_GUILD_ID]
+
+    def _resolve_numeric_patreon_tier_from_role_ids(self, role_ids):
+        return max((ROLE_TIERS.get(role_id, 0) for role_id in role_ids), default=0)
+
+    async def clear_donator_cache(self, user_id):
+        self.cleared.append(user_id)
+        self.patron_tiers.invalidate(user_id)
+
+
+class TestPatronTiers(unittest.TestCase):
+    def setUp(self):
+        self.members = {
+            SUPPORT_GUILD_ID: {1: [111], 2: [], 3: [222, 444]},
+            BOOSTER_GUILD_ID: {1: [222]},
+        }
+        self.bot = FakeBot(self.members)
+        self.tiers = self.bot.patron_tiers = PatronTiers(self.bot)
+
+    def scan(self, guild_id):
+        guild = SimpleNamespace(
+            id=guild_id,
+            chunked=True,
+            members=[
+                member(guild_id, user_id, *roles)
+                for user_id, roles in self.members[guild_id].items()
+            ],
+        )
+        self.tiers._owned.add(guild_id)
+        return asyncio.run(self.tiers.scan(guild))
+
+    def test_unscanned_guilds_fall_back_to_rest(self):
+        self.assertEqual(asyncio.run(self.tiers.get(1)), (2, True))
+        self.assertEqual(asyncio.run(self.tiers.get(9)), (0, False))
+        self.assertEqual(len(self.bot.http.calls), 4)
+
+    def test_scanned_guilds_need_no_rest_calls(self):
+        self.assertEqual(self.scan(SUPPORT_GUILD_ID), 2)
+        self.assertEqual(self.scan(BOOSTER_GUILD_ID), 1)
+        self.assertTrue(self.bot.redis._exists(ready_key(SUPPORT_GUILD_ID)))
+
+        self.assertEqual(asyncio.run(self.tiers.get(1)), (2, True))
+        self.assertEqual(asyncio.run(self.tiers.get(2)), (0, True))
+        self.assertEqual(asyncio.run(self.tiers.get(3)), (4, True))
+        self.assertEqual(asyncio.run(self.tiers.get(9)), (0, True))
+        self.assertEqual(self.bot.http.calls, [])
+
+    def test_repeated_reads_are_served_locally(self):
+        self.scan(SUPPORT_GUILD_ID)
+        self.scan(BOOSTER_GUILD_ID)
+        trips = self.bot.redis.round_trips
+
+        for _ in range(5):
+            asyncio.run(self.tiers.get(3))
+
+        self.assertEqual(self.bot.redis.round_trips, trips + 1)
+
+    def test_role_changes_update_hash_and_invalidate(self):
+        self.scan(SUPPORT_GUILD_ID)
+        self.scan(BOOSTER_GUILD_ID)
+        self.assertEqual(asyncio.run(self.tiers.get(2))[0], 0)
+
+        before = member(SUPPORT_GUILD_ID, 2)
+        after = member(SUPPORT_GUILD_ID, 2, 444)
+        asyncio.run(self.tiers.on_member_update(before, after))
+        self.assertEqual(asyncio.run(self.tiers.get(2))[0], 4)
+
+        asyncio.run(self.tiers.on_member_remove(after))
+        self.assertEqual(asyncio.run(self.tiers.get(2))[0], 0)
+        self.assertEqual(self.bot.cleared, [2, 2])
+        self.assertNotIn("2", self.bot.redis.data[roles_key(SUPPORT_GUILD_ID)])
+
+    def test_unchanged_tier_is_not_broadcast(self):
+        self.scan(SUPPORT_GUILD_ID)
+        before = member(SUPPORT_GUILD_ID, 3, 222, 444)
+        after = member(SUPPORT_GUILD_ID, 3, 444)
+
+        asyncio.run(self.tiers.on_member_update(before, after))
+
+        self.assertEqual(self.bot.cleared, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+import asyncio
+import datetime
+import json
+import unittest
+
+from tests.pet_test_loader import load_pet_due_events_module
+
+due_events = load_pet_due_events_module()
+
+NOW = datetime.datetime(2026, 1, 1, 12, 0)
+
+
+class FakeContext:
+    def __init__(self, value=None):
+        self.value = value
+
+    async def __aenter__(self):
+        return self.value
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    def __init__(self, results):
+        self.results = results
+        self.fetched = []
+        self.executed = []
+
+    def transaction(self):
+        return FakeContext()
+
+    async def fetch(self, query, *args):
+        self.fetched.append((query, args))
+        for marker, rows in self.results.items():
+            if marker in query:
+                return rows
+        return []
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        return FakeContext(self.conn)
+
+
+class FakeRedis:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.pushed = []
+
+    async def rpush(self, key, value):
+        if self.fail:
+            raise ConnectionError("redis is down")
+        self.pushed.append((key, json.loads(value)))
+
+
+class FakeBot:
+    def __init__(self, conn, redis):
+        self.pool = FakePool(conn)
+        self.redis = redis
+        self.shard_ids = [0]
+        self.dispatched = []
+
+    def dispatch(self, event, *args):
+        self.dispatched.append((event, args))
+
+
+class FakeCog:
+    EGG_GROWTH_STAGES = {1: {"stage": "baby", "stat_multiplier": 0.25, "growth_time": 2}}
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    def plan_pet_growth(self, pet, daycare_room_type):
+        if pet["growth_stage"] == "adult":
+            return None
+        return {
+            "old_stage": "baby",
+            "new_stage": "juvenile",
+            "growth_index": 2,
+            "growth_time_interval": datetime.timedelta(days=3),
+            "hp": pet["hp"] * 2,
+            "attack": pet["attack"] * 2,
+            "defense": pet["defense"] * 2,
+            "speed_growth_active": False,
+            "speed_growth_expired": False,
+        }
+
+    def format_pet_growth_message(self, growth):
+        return f"{growth['pet_name']} is now a {growth['new_stage']}"
+
+
+def make_events(results=None, *, redis=None):
+    conn = FakeConnection(results or {})
+    bot = FakeBot(conn, redis or FakeRedis())
+    return due_events.PetDueEvents(FakeCog(bot)), conn, bot
+
+
+def pet(id_, stage="baby"):
+    return {
+        "id": id_,
+        "user_id": 100 + id_,
+        "name": f"Pet {id_}",
+        "growth_stage": stage,
+        "hp": 10.0,
+        "attack": 5.0,
+        "defense": 4.0,
+        "daycare_room_type": None,
+    }
+
+
+class TestPetDueEvents(unittest.TestCase):
+    def test_load_keys_rows_by_kind_in_naive_utc(self):
+        aware = datetime.datetime(2026, 1, 1, 13, 0, tzinfo=datetime.timezone.utc)
+        events, conn, _bot = make_events(
+            {
+                "FROM monster_pets": [{"id": 1, "due": NOW}],
+                "FROM monster_eggs": [{"id": 2, "due": aware}],
+                "FROM pet_daycare_boardings": [{"id": 3, "due": NOW}],
+            }
+        )
+
+        loaded = asyncio.run(events.load(NOW + datetime.timedelta(minutes=1)))
+
+        self.assertEqual(
+            loaded,
+            [
+                (("pet", 1), NOW, None),
+                (("egg", 2), datetime.datetime(2026, 1, 1, 13, 0), None),
+                (("boarding", 3), NOW, None),
+            ],
+        )
+        self.assertEqual(len(conn.fetched), 3)
+
+    def test_fire_groups_ids_and_isolates_failures(self):
+        events, _conn, _bot = make_events()
+        handled = []
+
+        async def hatch(ids):
+            raise RuntimeError("boom")
+
+        async def grow(ids):
+            handled.append(("pet", ids))
+
+        async def settle(ids):
+            handled.append(("boarding", ids))
+
+        events.hatch_eggs, events.grow_pets, events.return_boardings = (
+            hatch,
+            grow,
+            settle,
+        )
+        due = [(("pet", 1), None), (("egg", 2), None), (("pet", 3), None)]
+
+        with self.assertLogs(due_events.log, "ERROR"):
+            asyncio.run(events.fire(due))
+
+        self.assertEqual(handled, [("pet", [1, 3])])
+
+    def test_grow_pets_updates_the_batch_in_one_statement(self):
+        events, conn, bot = make_events(
+            {"FROM monster_pets p": [pet(1), pet(2, stage="adult"), pet(3)]}
+        )
+
+        asyncio.run(events.grow_pets([1, 2, 3]))
+
+        self.assertEqual(len(conn.executed), 1)
+        _query, args = conn.executed[0]
+        self.assertEqual(args[0], [1, 3])
+        self.assertEqual(args[1], ["juvenile", "juvenile"])
+        self.assertEqual(args[3], [20.0, 20.0])
+        self.assertEqual(
+            bot.redis.pushed,
+            [
+                (
+                    due_events.NOTIFICATION_QUEUE,
+                    {"kind": "text", "user_id": 101, "content": "Pet 1 is now a juvenile"},
+                ),
+                (
+                    due_events.NOTIFICATION_QUEUE,
+                    {"kind": "text", "user_id": 103, "content": "Pet 3 is now a juvenile"},
+                ),
+            ],
+        )
+
+    def test_hatched_eggs_dispatch_and_notify(self):
+        events, _conn, bot = make_events(
+            {
+                "WITH hatched": [
+                    {"id": 7, "user_id": 5, "name": "Slime", "frontier_species_id": None}
+                ]
+            }
+        )
+
+        asyncio.run(events.hatch_eggs([4]))
+
+        self.assertEqual(bot.dispatched, [("frontier_pet_hatched", (5, 7, None))])
+        self.assertEqual(bot.redis.pushed[0][1]["user_id"], 5)
+
+    def test_notification_is_delivered_directly_without_redis(self):
+        events, _conn, _bot = make_events(redis=FakeRedis(fail=True))
+        delivered = []
+
+        async def deliver(payload):
+            delivered.append(payload)
+
+        events.deliver = deliver
+        with self.assertLogs(due_events.log, "ERROR"):
+            asyncio.run(events.notify(1, "hello"))
+
+        self.assertEqual(delivered, [{"kind": "text", "user_id": 1, "content": "hello"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
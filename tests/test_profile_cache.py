@@ -0,0 +1,196 @@
+import asyncio
+import unittest
+
+from types import SimpleNamespace
+
+from classes.profile_cache import PROFILE_QUERY, ProfileCache, ProfileWriteTracking
+
+
+class FakeConnection:
+    def __init__(self, rows, *, in_transaction=False):
+        self.rows = rows
+        self.in_transaction = in_transaction
+        self.queries = []
+
+    def is_in_transaction(self):
+        return self.in_transaction
+
+    async def fetchrow(self, query, user_id):
+        self.queries.append((query, user_id))
+        return self.rows.get(user_id)
+
+
+class LoggingConnection:
+    """Applies statements to ``rows`` and runs query loggers like asyncpg,
+    scheduled with ``call_soon`` once the statement returns."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.loggers = []
+        self.transaction_writes = None
+        self.queries = []
+
+    def add_query_logger(self, callback):
+        self.loggers.append(callback)
+
+    def is_in_transaction(self):
+        return self.transaction_writes is not None
+
+    async def _run(self, query):
+        await asyncio.sleep(0)  # the round trip
+        loop = asyncio.get_running_loop()
+        for callback in self.loggers:
+            loop.call_soon(callback, SimpleNamespace(query=query))
+
+    async def execute(self, query, user_id, money):
+        await self._run(query)
+        if self.transaction_writes is not None:
+            self.transaction_writes[user_id] = {"user": user_id, "money": money}
+        else:
+            self.rows[user_id] = {"user": user_id, "money": money}
+        return "UPDATE 1"
+
+    async def fetchrow(self, query, user_id):
+        self.queries.append((query, user_id))
+        await self._run(query)
+        return self.rows.get(user_id)
+
+    def commit(self):
+        self.rows.update(self.transaction_writes)
+        self.transaction_writes = None
+
+
+class TestProfileCache(unittest.TestCase):
+    def setUp(self):
+        self.rows = {1: {"user": 1, "money": 10}}
+        self.pool = FakeConnection(self.rows)
+        self.cache = ProfileCache(SimpleNamespace(pool=self.pool))
+
+    def run_command(self, coro_factory, user_id=1, command="profile"):
+        async def invoke():
+            snapshot = self.cache.open_snapshot(user_id, command)
+            try:
+                return await coro_factory()
+            finally:
+                self.cache.close_snapshot(snapshot)
+
+        return asyncio.run(invoke())
+
+    def test_snapshot_serves_repeated_reads(self):
+        async def command():
+            first = await self.cache.get(1)
+            second = await self.cache.get(1)
+            return first, second
+
+        first, second = self.run_command(command)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.pool.queries), 1)
+        self.assertEqual(self.cache.command_stats["profile"], [1, 0, 1])
+
+    def test_other_tables_do_not_invalidate(self):
+        self.assertFalse(self.cache.track('UPDATE profile_badges SET "x"=1;'))
+        self.assertFalse(self.cache.track('SELECT * FROM profile WHERE "user"=$1;'))
+        self.assertTrue(self.cache.track('UPDATE "profile" SET "money"=0;'))
+
+    def test_transactions_read_through(self):
+        conn = FakeConnection(self.rows, in_transaction=True)
+
+        async def command():
+            await self.cache.get(1)
+            return await self.cache.get(1, conn=conn)
+
+        self.run_command(command)
+
+        self.assertEqual(conn.queries, [(PROFILE_QUERY, 1)])
+
+    def test_lru_requires_notification_connection(self):
+        asyncio.run(self.cache.get(1))
+        asyncio.run(self.cache.get(1))
+        self.assertEqual(len(self.pool.queries), 2)
+
+        self.cache._listen_conn = object()
+        asyncio.run(self.cache.get(1))
+        asyncio.run(self.cache.get(1))
+        self.assertEqual(len(self.pool.queries), 3)
+
+        self.cache._on_notification(None, 0, "profile_changed", '{"user": 1}')
+        asyncio.run(self.cache.get(1))
+        self.assertEqual(len(self.pool.queries), 4)
+
+
+class TestProfileWrites(unittest.TestCase):
+    """Commands on a connection that behaves like asyncpg's, loggers included."""
+
+    UPDATE = 'UPDATE profile SET "money"=$2 WHERE "user"=$1;'
+
+    def setUp(self):
+        self.rows = {1: {"user": 1, "money": 10}}
+        self.cache = ProfileCache(SimpleNamespace(pool=None))
+        connection_class = type(
+            "Connection",
+            (ProfileWriteTracking, LoggingConnection),
+            {"profile_cache": self.cache},
+        )
+        self.conn = connection_class(self.rows)
+        self.cache.bot.pool = self.conn
+        self.logged = []
+        self.conn.add_query_logger(self.logged.append)
+
+    async def invoke(self, body):
+        snapshot = self.cache.open_snapshot(1, "command")
+        try:
+            return await body()
+        finally:
+            self.cache.close_snapshot(snapshot)
+
+    def test_write_then_read_in_the_same_step(self):
+        async def body():
+            await self.cache.get(1)
+            await self.conn.execute(self.UPDATE, 1, 20)
+            # the query logger for the UPDATE has not run yet
+            self.assertEqual(len(self.logged), 1)
+            return await self.cache.get(1)
+
+        row = asyncio.run(self.invoke(body))
+
+        self.assertEqual(row["money"], 20)
+
+    def test_reads_before_commit_are_not_kept(self):
+        async def body():
+            self.conn.transaction_writes = {}
+            await self.conn.execute(self.UPDATE, 1, 30)
+            before_commit = await self.cache.get(1)
+            self.conn.commit()
+            return before_commit, await self.cache.get(1)
+
+        before_commit, after_commit = asyncio.run(self.invoke(body))
+
+        self.assertEqual(before_commit["money"], 10)
+        self.assertEqual(after_commit["money"], 30)
+
+    def test_spawned_tasks_do_not_read_the_snapshot(self):
+        async def body():
+            await self.cache.get(1)
+            return asyncio.create_task(later()), asyncio.create_task(now())
+
+        async def later():
+            await asyncio.sleep(0.01)
+            return await self.cache.get(1)
+
+        async def now():
+            return await self.cache.get(1)
+
+        async def scenario():
+            later_task, now_task = await self.invoke(body)
+            self.rows[1] = {"user": 1, "money": 40}  # written elsewhere
+            return await now_task, await later_task
+
+        now_row, later_row = asyncio.run(scenario())
+
+        self.assertEqual(now_row["money"], 40)
+        self.assertEqual(later_row["money"], 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import asyncio
+import unittest
+
+from unittest import mock
+
+from classes import profile_card
+from classes.profile_card import CACHE_INDEX, CACHE_PREFIX, ProfileCardRenderer
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.index = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    async def zadd(self, key, mapping):
+        self.index.update(mapping)
+
+    async def zcard(self, key):
+        return len(self.index)
+
+    async def zpopmin(self, key, count):
+        popped = sorted(self.index.items(), key=lambda item: item[1])[:count]
+        for member, _score in popped:
+            del self.index[member]
+        return [(member.encode(), score) for member, score in popped]
+
+
+def card():
+    return {
+        "user_id": 1,
+        "display_name": "Tester",
+        "avatar": "avatar",
+        "profile": {"name": "Tester", "xp": 1500, "luck": 1.0, "money": 10},
+        "classes": "No Class",
+        "ascension_title": "Unclaimed",
+        "badge_lines": [],
+        "items": [],
+        "guild_name": None,
+        "mission_text": None,
+        "pet_name": "None",
+        "marriage_name": None,
+        "pet": None,
+        "raid_attack": None,
+        "raid_defense": None,
+        "total_health": None,
+        "amulet": None,
+    }
+
+
+class TestProfileCardRenderer(unittest.TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.renderer = ProfileCardRenderer(self.redis)
+        self.produced = 0
+
+    async def produce(self):
+        self.produced += 1
+        await asyncio.sleep(0)
+        return b"image-%d" % self.produced
+
+    def test_key_depends_on_inputs_only(self):
+        first = ProfileCardRenderer.cache_key("rpg", {"a": 1, "b": 2})
+        self.assertEqual(first, ProfileCardRenderer.cache_key("rpg", {"b": 2, "a": 1}))
+        self.assertNotEqual(first, ProfileCardRenderer.cache_key("rpg", {"a": 2}))
+        self.assertNotEqual(
+            first, ProfileCardRenderer.cache_key("genprofile", {"a": 1, "b": 2})
+        )
+
+    def test_second_render_is_served_from_cache(self):
+        first = asyncio.run(self.renderer.render("k", self.produce))
+        second = asyncio.run(self.renderer.render("k", self.produce))
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.produced, 1)
+        self.assertEqual((self.renderer.renders, self.renderer.cache_hits), (1, 1))
+
+    def test_concurrent_renders_are_coalesced(self):
+        async def burst():
+            return await asyncio.gather(
+                *(self.renderer.render("k", self.produce) for _ in range(5))
+            )
+
+        results = asyncio.run(burst())
+
+        self.assertEqual(set(results), {b"image-1"})
+        self.assertEqual(self.produced, 1)
+        self.assertEqual(self.renderer.coalesced, 4)
+
+    def test_failures_reach_every_waiter_and_are_not_cached(self):
+        async def fail():
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        async def burst():
+            return await asyncio.gather(
+                self.renderer.render("k", fail),
+                self.renderer.render("k", fail),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(burst())
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(self.redis.values, {})
+
+    def test_least_recently_used_entries_are_evicted(self):
+        clock = iter(range(100))
+        with mock.patch.object(profile_card, "CACHE_MAX_ENTRIES", 2), mock.patch(
+            "classes.profile_card.time.time", lambda: next(clock)
+        ):
+            asyncio.run(self.renderer.render("a", self.produce))
+            asyncio.run(self.renderer.render("b", self.produce))
+            asyncio.run(self.renderer.render("a", self.produce))
+            asyncio.run(self.renderer.render("c", self.produce))
+
+        self.assertEqual(set(self.redis.index), {"a", "c"})
+        self.assertNotIn(CACHE_PREFIX + "b", self.redis.values)
+        self.assertIn(CACHE_PREFIX + "a", self.redis.values)
+        self.assertNotIn(CACHE_INDEX, self.redis.values)
+
+    def test_card_renders_to_png(self):
+        data = profile_card.render_rpg_card(card(), None, None)
+
+        self.assertTrue(data.startswith(b"\x89PNG"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import asyncio
+import unittest
+
+from decimal import Decimal
+
+from classes import raidstats
+from classes.raidstats import fetch_raidstats, fetch_raidstats_many
+from utils import misc as rpgtools
+
+
+class FakeDatabase:
+    """Answers the raid stat queries from in-memory tables."""
+
+    def __init__(self):
+        self.profiles = {}
+        self.items = []
+        self.stars = {}
+        self.soulbound = []
+        self.alliances = {}
+        self.cities = {}
+        self.amulets = []
+        self.progression_tables = True
+        self.queries = []
+
+    def _equipped(self, user_ids):
+        return [
+            item
+            for item in self.items
+            if item["owner"] in user_ids and item["owner"] in self.profiles
+        ]
+
+    def _city(self, guild_id):
+        return self.cities.get(self.alliances.get(guild_id))
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        if query == raidstats.PROFILES_QUERY:
+            return [self.profiles[u] for u in args[0] if u in self.profiles]
+        if query == raidstats.EQUIPPED_ITEMS_QUERY:
+            return self._equipped({args[0]})
+        if query == raidstats.EQUIPPED_ITEMS_MANY_QUERY:
+            return self._equipped(set(args[0]))
+        if query == raidstats.STARFORGED_QUERY:
+            return [
+                {"item_id": item_id, "stars": stars}
+                for item_id, stars in self.stars.items()
+                if item_id in args[0]
+            ]
+        if query == raidstats.SOULBOUND_QUERY:
+            return [
+                row
+                for row in self.soulbound
+                if row["user_id"] in args[0] and row["item_id"] in args[1]
+            ]
+        if query == raidstats.CITY_MANY_QUERY:
+            return [
+                {"member_guild": guild_id, **self._city(guild_id)}
+                for guild_id in args[0]
+                if self._city(guild_id)
+            ]
+        if query == raidstats.AMULETS_QUERY:
+            return [row for row in self.amulets if row["user_id"] in args[0]]
+        raise AssertionError(query)
+
+    async def fetchrow(self, query, *args):
+        if query == raidstats.PROGRESSION_TABLES_QUERY:
+            self.queries.append(query)
+            if not self.progression_tables:
+                raise RuntimeError("relation does not exist")
+            return {"starforged": True, "soulbound": True}
+        if query == raidstats.CITY_QUERY:
+            self.queries.append(query)
+            return self._city(args[0])
+        rows = await self.fetch(query, *args)
+        return rows[0] if rows else None
+
+
+def profile(user_id, classes, race, guild=0, **overrides):
+    row = {
+        "user": user_id,
+        "class": classes,
+        "race": race,
+        "guild": guild,
+        "god": None,
+        "atkmultiply": Decimal("1.3"),
+        "defmultiply": Decimal("1.1"),
+        "statatk": 2,
+        "statdef": 1,
+        "stathp": 3,
+        "statpoints": 0,
+        "health": 40,
+        "xp": 250000,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestRaidStatsMany(unittest.TestCase):
+    def setUp(self):
+        db = self.db = FakeDatabase()
+        db.profiles = {
+            1: profile(1, ["Bowman", "Enchanter"], "Elf", guild=10),
+            2: profile(2, ["Artisan"], "Human", guild=11, atkmultiply=Decimal("2.0")),
+            3: profile(3, ["Guardian", "Mercenary"], "Orc", statatk=0, statdef=4),
+            4: profile(4, ["No Class"], "Shadeborn", guild=12),
+        }
+        db.items = [
+            {"id": 100, "owner": 1, "type": "Bow", "damage": 40, "armor": 0},
+            {"id": 101, "owner": 1, "type": "Wand", "damage": Decimal("21"), "armor": 0},
+            {"id": 200, "owner": 2, "type": "Spear", "damage": 35, "armor": 0},
+            {"id": 201, "owner": 2, "type": "Shield", "damage": 0, "armor": 30},
+            {"id": 300, "owner": 3, "type": "Shield", "damage": 0, "armor": 48},
+            {"id": 301, "owner": 3, "type": "Sword", "damage": 33, "armor": 0},
+            {"id": 900, "owner": 9, "type": "Axe", "damage": 50, "armor": 0},
+        ]
+        db.stars = {100: 3, 201: 1, 300: 5}
+        db.soulbound = [
+            {"user_id": 1, "item_id": 100, "xp": 4000},
+            {"user_id": 3, "item_id": 301, "xp": 900},
+        ]
+        db.alliances = {10: 10, 11: 10, 12: 13}
+        db.cities = {10: {"owner": 10, "raid_building": 4}}
+        db.amulets = [
+            {"user_id": 2, "attack": 12, "defense": None, "hp": 150},
+            {"user_id": 4, "attack": 5, "defense": 9, "hp": 80},
+        ]
+
+    async def scalar(self, user_id):
+        row = self.db.profiles[user_id]
+        dmg, deff, _breakdown = await fetch_raidstats(
+            self.db,
+            user_id,
+            atkmultiply=row["atkmultiply"],
+            defmultiply=row["defmultiply"],
+            classes=row["class"],
+            race=row["race"],
+            guild=row["guild"],
+            statatk=row["statatk"],
+            statdef=row["statdef"],
+        )
+        return dmg, deff
+
+    def assert_matches_scalar(self, bulk):
+        for user_id, stats in bulk.items():
+            with self.subTest(user_id=user_id):
+                dmg, deff = asyncio.run(self.scalar(user_id))
+                self.assertEqual((stats.damage, stats.armor), (dmg, deff))
+
+    def test_matches_scalar_path(self):
+        bulk = asyncio.run(fetch_raidstats_many(self.db, [1, 2, 3, 4, 9, 2]))
+
+        self.assertEqual(sorted(bulk), [1, 2, 3, 4])
+        self.assert_matches_scalar(bulk)
+        self.assertEqual(bulk[2].amulet_hp, 150)
+        self.assertEqual(bulk[3].amulet_hp, 0)
+        level = rpgtools.xptolevel(250000)
+        self.assertEqual(bulk[1].hp, 40 + 200 + level * 15 + 3 * 50)
+
+    def test_query_count_does_not_grow(self):
+        asyncio.run(fetch_raidstats_many(self.db, [1]))
+        single = len(self.db.queries)
+        self.db.queries.clear()
+
+        asyncio.run(fetch_raidstats_many(self.db, [1, 2, 3, 4]))
+
+        self.assertEqual(len(self.db.queries), single)
+
+    def test_missing_progression_tables(self):
+        with_progression = asyncio.run(fetch_raidstats_many(self.db, [1, 2, 3, 4]))
+        self.db.progression_tables = False
+
+        bulk = asyncio.run(fetch_raidstats_many(self.db, [1, 2, 3, 4]))
+
+        self.assertLess(bulk[1].damage, with_progression[1].damage)
+        self.assert_matches_scalar(bulk)
+
+
+if __name__ == "__main__":
+    unittest.main()
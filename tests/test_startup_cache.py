@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+from utils import i18n
+from utils.startup_cache import StartupCache, extract_docstrings
+
+SOURCE = '''\
+def decorate(func):
+    return func
+
+
+class Cog:
+    @decorate
+    @decorate
+    async def documented(self):
+        _("""Translated help.""")
+
+    async def plain(self):
+        """Not translated."""
+
+    async def formatted(self):
+        _("Help {0}").format(1)
+'''
+
+
+class TestStartupCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.source = os.path.join(self.directory.name, "cog.py")
+        self.cache_path = os.path.join(self.directory.name, "cache", "startup.json")
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write(SOURCE)
+
+    def test_docstrings_are_keyed_by_first_decorator_line(self):
+        self.assertEqual(extract_docstrings(SOURCE), {"6": "Translated help."})
+
+    def test_locale_doc_uses_cached_docstrings(self):
+        namespace = {"_": lambda text: text, "locale_doc": i18n.locale_doc}
+        exec(compile(SOURCE, self.source, "exec"), namespace)
+        cache = StartupCache(self.cache_path)
+        original, i18n.startup_cache = i18n.startup_cache, cache
+        self.addCleanup(setattr, i18n, "startup_cache", original)
+
+        documented = i18n.locale_doc(namespace["Cog"].documented)
+        plain = i18n.locale_doc(namespace["Cog"].plain)
+        formatted = i18n.locale_doc(namespace["Cog"].formatted)
+
+        self.assertEqual(documented.__doc__, "Translated help.")
+        self.assertEqual(plain.__doc__, "Not translated.")
+        self.assertIsNone(formatted.__doc__)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_entries_survive_restarts(self):
+        cache = StartupCache(self.cache_path)
+        with open(self.source, encoding="utf-8") as f:
+            self.assertEqual(cache.line_count(self.source), len(f.readlines()))
+        cache.docstrings(self.source)
+        cache.save()
+
+        restarted = StartupCache(self.cache_path)
+        self.assertEqual(restarted.docstrings(self.source), {"6": "Translated help."})
+        self.assertEqual((restarted.hits, restarted.misses), (1, 0))
+
+    def test_changed_source_is_parsed_again(self):
+        cache = StartupCache(self.cache_path)
+        cache.docstrings(self.source)
+        cache.save()
+        with open(self.source, "a", encoding="utf-8") as f:
+            f.write("\n\nasync def extra():\n    _('More help.')\n")
+
+        restarted = StartupCache(self.cache_path)
+        self.assertEqual(
+            restarted.docstrings(self.source),
+            {"6": "Translated help.", "18": "More help."},
+        )
+        self.assertEqual(restarted.misses, 1)
+
+    def test_catalogs_load_on_first_use(self):
+        translations = i18n.LazyTranslations()
+        locale = next(iter(sorted(i18n.locales - {"en_US"})), None)
+        if locale is None:
+            self.skipTest("no compiled locales")
+
+        self.assertNotIn(locale, translations)
+        translations[locale]
+        self.assertIn(locale, translations)
+        with self.assertRaises(KeyError):
+            translations["xx_XX"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import unittest
+
+from classes.transaction_log import INSERT_MARKET_HISTORY, TransactionLog
+
+
+class FakeContext:
+    def __init__(self, value=None):
+        self.value = value
+
+    async def __aenter__(self):
+        return self.value
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    def __init__(self, fail_copy=False, bad_rows=()):
+        self.fail_copy = fail_copy
+        self.bad_rows = set(bad_rows)
+        self.copied = []
+        self.executed = []
+
+    def transaction(self):
+        return FakeContext()
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        if self.fail_copy:
+            raise ValueError("invalid input syntax")
+        self.copied.append((table, list(records)))
+
+    async def executemany(self, query, rows):
+        self.executed.extend((query, tuple(row)) for row in rows)
+
+    async def execute(self, query, *args):
+        if args in self.bad_rows:
+            raise ValueError("invalid input syntax")
+        self.executed.append((query, args))
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+        return FakeContext(self.conn)
+
+
+def row(n):
+    return (n, 1, "money", f"info {n}", "data", None)
+
+
+class TestTransactionLog(unittest.TestCase):
+    def test_rows_are_copied_in_one_batch_after_the_interval(self):
+        conn = FakeConnection()
+        pool = FakePool(conn)
+
+        async def scenario():
+            log = TransactionLog(pool, flush_interval=0.01)
+            log.start()
+            for n in range(5):
+                await log.enqueue(row(n))
+            self.assertEqual(conn.copied, [])
+            await asyncio.sleep(0.05)
+            await log.close()
+            return log
+
+        log = asyncio.run(scenario())
+
+        self.assertEqual(conn.copied, [("transactions", [row(n) for n in range(5)])])
+        self.assertEqual(log.stats()["written"], 5)
+        self.assertEqual(log.stats()["batches"], 1)
+
+    def test_full_batches_flush_without_waiting_and_close_drains(self):
+        conn = FakeConnection()
+
+        async def scenario():
+            log = TransactionLog(
+                FakePool(conn), flush_interval=60, batch_size=4, max_pending=4
+            )
+            log.start()
+            for n in range(10):
+                await log.enqueue(row(n), ("item", n) if n == 3 else None)
+            await log.close()
+
+        asyncio.run(asyncio.wait_for(scenario(), 5))
+
+        copied = [record for _table, records in conn.copied for record in records]
+        self.assertEqual(copied, [row(n) for n in range(10)])
+        self.assertTrue(all(len(records) <= 4 for _table, records in conn.copied))
+        self.assertEqual(conn.executed, [(INSERT_MARKET_HISTORY, ("item", 3))])
+
+    def test_failed_copy_falls_back_to_single_rows(self):
+        conn = FakeConnection(fail_copy=True, bad_rows={row(1)})
+
+        async def scenario():
+            log = TransactionLog(FakePool(conn), flush_interval=0.01)
+            log.start()
+            for n in range(3):
+                await log.enqueue(row(n))
+            await log.close()
+            return log
+
+        with self.assertLogs("classes.transaction_log", "ERROR"):
+            log = asyncio.run(scenario())
+
+        self.assertEqual([args for _query, args in conn.executed], [row(0), row(2)])
+        self.assertEqual(log.stats()["dropped"], 1)
+
+    def test_rows_after_close_are_written_directly(self):
+        conn = FakeConnection()
+        pool = FakePool(conn)
+
+        async def scenario():
+            log = TransactionLog(pool)
+            log.start()
+            await log.close()
+            await log.enqueue(row(7))
+
+        asyncio.run(scenario())
+
+        self.assertEqual([args for _query, args in conn.executed], [row(7)])
+
+
+if __name__ == "__main__":
+    unittest.main()
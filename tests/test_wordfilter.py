@@ -0,0 +1,63 @@
+import random
+import re
+import unittest
+
+from utils.wordfilter import WordMatcher, normalize
+
+WORDS = ["ass", "shit", "f*ck", "s.o.b", "he", "hers", "*x*", "a-b"]
+
+
+class TestWordMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = WordMatcher(WORDS)
+
+    def test_whole_words_only(self):
+        self.assertEqual(self.matcher.search("what an ASS!"), "ass")
+        self.assertIsNone(self.matcher.search("first class pass"))
+        self.assertIsNone(self.matcher.search("the f*cker"))
+        self.assertEqual(self.matcher.search("f*ck this"), "f*ck")
+        self.assertEqual(self.matcher.search("you s.o.b."), "s.o.b")
+
+    def test_case_folding_and_leetspeak(self):
+        self.assertEqual(normalize("5H1T"), "shit")
+        self.assertEqual(self.matcher.search("a$$ hat"), "ass")
+        self.assertEqual(self.matcher.search("ＳＨＩＴ"), "shit")
+        self.assertEqual(WordMatcher(["straße"]).search("STRASSE"), "strasse")
+
+    def test_numbers_are_not_leetspeak(self):
+        matcher = WordMatcher(["ass", "sex", "shit", "tit"])
+
+        self.assertIsNone(matcher.search("I have 455 coins"))
+        self.assertIsNone(matcher.search("bid 53x"))
+        self.assertIsNone(matcher.search("sold for $455 and 5h1p 2nd"))
+        self.assertIsNone(matcher.search("717 gold, 7175 xp"))
+        self.assertEqual(normalize("455 53x 1st"), "455 53x 1st")
+        self.assertEqual(matcher.search("s3x"), "sex")
+        self.assertEqual(matcher.search("7i7"), "tit")
+        self.assertEqual(matcher.search("4$$"), "ass")
+
+    def test_empty_list(self):
+        matcher = WordMatcher(["", "  "])
+
+        self.assertEqual(len(matcher), 0)
+        self.assertIsNone(matcher.search("anything"))
+
+    def test_agrees_with_the_alternation_regex(self):
+        pattern = re.compile(
+            r"\b(" + "|".join(re.escape(word) for word in WORDS) + r")\b",
+            re.IGNORECASE,
+        )
+        rng = random.Random(7)
+        for _ in range(5000):
+            text = "".join(
+                rng.choice("ashitf*ckob.er-x !") for _ in range(rng.randint(1, 20))
+            )
+            with self.subTest(text=text):
+                self.assertEqual(
+                    pattern.search(text) is not None,
+                    self.matcher.search(text) is not None,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
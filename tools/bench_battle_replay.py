@@ -0,0 +1,155 @@
+"""Measure battle replay memory and storage size, full snapshots vs deltas.
+
+Plays a synthetic battle through ``Battle.add_to_log`` twice: once keeping a
+full snapshot per action as the replay system used to, once with the
+keyframe-plus-delta ``ReplayRecorder``. Reports the memory the replay holds
+per battle and the bytes written per replay (JSON text before, compressed
+bytea after), and checks that the delta replay rebuilds the same frames.
+
+    python tools/bench_battle_replay.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+
+from pathlib import Path
+from types import SimpleNamespace
+
+# Allow direct execution: `python tools/bench_battle_replay.py`.
+if __package__ in {None, ""}:  # pragma: no cover - execution mode guard
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from cogs.battles.core.battle import Battle, DecimalEncoder
+from cogs.battles.core.combatant import Combatant
+from cogs.battles.core.replay import decode_replay
+from cogs.battles.core.team import Team
+
+SCENARIOS = (
+    # (combatants per team, actions)
+    (2, 60),
+    (2, 300),
+    (6, 300),
+)
+ELEMENTS = ("Fire", "Water", "Earth", "Wind", "Light", "Dark")
+
+
+class FullSnapshots(list):
+    """The previous replay storage: every captured state, in full."""
+
+    record = list.append
+
+    @property
+    def keyframe(self):
+        return self[0] if self else None
+
+
+class BenchBattle(Battle):
+    async def start_battle(self):
+        return True
+
+    async def process_turn(self):
+        return True
+
+    async def end_battle(self):
+        return None
+
+    async def update_display(self):
+        return None
+
+
+def new_battle(per_team: int) -> BenchBattle:
+    teams = [
+        Team(
+            name,
+            [
+                Combatant(
+                    f"{name}{index}",
+                    2000,
+                    2000,
+                    150,
+                    90,
+                    element=ELEMENTS[index % len(ELEMENTS)],
+                    is_pet=index % 2 == 1,
+                )
+                for index in range(per_team)
+            ],
+        )
+        for name in ("Alpha", "Beta")
+    ]
+    cog = SimpleNamespace(emoji_to_element={f"<:{e}:1>": e for e in ELEMENTS})
+    ctx = SimpleNamespace(bot=SimpleNamespace(cogs={"Battles": cog}), send=None)
+    return BenchBattle(ctx, teams=teams)
+
+
+async def play(battle: BenchBattle, actions: int) -> None:
+    rng = random.Random(42)
+    combatants = [c for team in battle.teams for c in team.combatants]
+    for action in range(actions):
+        attacker, target = rng.sample(combatants, 2)
+        damage = rng.randint(5, 60)
+        target.hp = max(0, target.hp - damage)
+        await battle.add_to_log(
+            f"{attacker.name} attacks! {target.name} takes **{damage} HP** damage."
+        )
+
+
+def measure(per_team: int, actions: int, full: bool):
+    battle = new_battle(per_team)
+    if full:
+        battle.replay = FullSnapshots()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    asyncio.run(play(battle, actions))
+    elapsed = time.perf_counter() - start
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    battle_data = battle.serialize_battle_data()
+    battle_log = battle.serialize_battle_log()
+    if full:
+        battle_data["turn_states"] = list(battle.replay)
+        battle_data["initial_state"] = battle.replay.keyframe
+        battle_data["has_enhanced_replay"] = True
+        stored = json.dumps(battle_data, cls=DecimalEncoder) + json.dumps(
+            battle_log, cls=DecimalEncoder
+        )
+        return battle, held, len(stored.encode()), elapsed
+    blob = battle.replay.encode(battle_data, battle_log)
+    return battle, held, len(blob), elapsed
+
+
+def main() -> None:
+    print(
+        f"{'combatants':>10} | {'actions':>7} | {'memory before':>13} | {'memory after':>12}"
+        f" | {'bytes before':>12} | {'bytes after':>11} | same frames"
+    )
+    for per_team, actions in SCENARIOS:
+        full_battle, full_mem, full_bytes, _ = measure(per_team, actions, True)
+        delta_battle, delta_mem, delta_bytes, _ = measure(per_team, actions, False)
+        _data, _log, frames = decode_replay(
+            delta_battle.replay.encode(
+                delta_battle.serialize_battle_data(), delta_battle.serialize_battle_log()
+            )
+        )
+        expected = [
+            json.loads(json.dumps(state, cls=DecimalEncoder)) for state in full_battle.replay
+        ]
+        same = [
+            {k: v for k, v in frame.items() if k != "timestamp"} for frame in frames
+        ] == [{k: v for k, v in frame.items() if k != "timestamp"} for frame in expected]
+        print(
+            f"{per_team * 2:>10} | {actions:>7} | {full_mem / 1024:10.1f} KB |"
+            f" {delta_mem / 1024:9.1f} KB | {full_bytes / 1024:9.1f} KB |"
+            f" {delta_bytes / 1024:8.1f} KB | {'yes' if same else 'NO'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Track battle engine throughput with the headless simulator.
+
+Runs a fixed, seeded set of battles for every simulator mode and reports
+simulated turns per second. With ``--baseline`` the numbers are compared to a
+JSON file written earlier with ``--save`` and the script exits non-zero when a
+mode got slower than the tolerance allows, so it can gate a CI job.
+
+    python tools/bench_battle_simulator.py [--save bench.json] [--baseline bench.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+
+from pathlib import Path
+
+# Allow direct execution: `python tools/bench_battle_simulator.py`.
+if __package__ in {None, ""}:  # pragma: no cover - execution mode guard
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from cogs.battles.simulator import MODES, CombatantSpec, SimulationSpec, simulate
+
+BATTLES = 200
+REPEATS = 3
+TOLERANCE = 0.2
+
+TEAMS = (
+    (
+        CombatantSpec("Hero", 2400, 310, 120, "Fire"),
+        CombatantSpec(
+            "Pup",
+            900,
+            120,
+            60,
+            "Water",
+            is_pet=True,
+            owner="Hero",
+            pet_skills=("Water Jet", "Purify", "Tidal Force"),
+        ),
+    ),
+    (
+        CombatantSpec("Ogre", 3200, 220, 150, "Earth"),
+        CombatantSpec("Imp", 800, 90, 40, "Dark"),
+    ),
+)
+
+
+def measure(mode: str, workers: int) -> float:
+    """Best turns per second of a few runs of ``mode``."""
+    spec = SimulationSpec(mode, TEAMS, battles=BATTLES, seed=1)
+    return max(simulate(spec, workers=workers).turns_per_second for _ in range(REPEATS))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--save", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else {}
+    results = {}
+    regressed = []
+    print(f"{'mode':>8} | {'turns/s':>9} | {'baseline':>9} | {'change':>7}")
+    for mode in MODES:
+        results[mode] = measure(mode, args.workers)
+        previous = baseline.get(mode)
+        if previous:
+            change = results[mode] / previous - 1
+            if change < -args.tolerance:
+                regressed.append(mode)
+            row = f"{previous:9.0f} | {change:+7.1%}"
+        else:
+            row = f"{'-':>9} | {'-':>7}"
+        print(f"{mode:>8} | {results[mode]:9.0f} | {row}")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2) + "\n")
+    if regressed:
+        print(f"over {args.tolerance:.0%} slower than baseline: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
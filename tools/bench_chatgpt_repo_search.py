@@ -0,0 +1,79 @@
+"""Measure the latency of the ChatGPT repo-context search.
+
+Reports the cost of building the search index from scratch, reloading it
+from the on-disk cache and refreshing it when nothing changed, and the query
+latency of the indexed search against the old full scan over every file and
+line window. Both searches must return the same snippets.
+
+    python tools/bench_chatgpt_repo_search.py
+"""
+from __future__ import annotations
+
+import dataclasses
+import statistics
+import tempfile
+import time
+
+from pathlib import Path
+
+# Allow direct execution: `python tools/bench_chatgpt_repo_search.py`.
+if __package__ in {None, ""}:  # pragma: no cover - execution mode guard
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from cogs.chatgpt import RepoIndexStore, _build_repo_context_from_index
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+QUESTIONS = (
+    "How does battletower prestige work?",
+    "What are the pet skills for the fire element?",
+    "How is raid damage calculated?",
+    "What tables are in the schema?",
+    "How much xp does a level 30 character need?",
+)
+ROUNDS = 3
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def query_latency(index, question: str) -> tuple[float, list[str]]:
+    samples = []
+    for _ in range(ROUNDS):
+        elapsed, snippets = timed(_build_repo_context_from_index, question, index)
+        samples.append(elapsed)
+    return statistics.median(samples), [snippet.reference for snippet in snippets]
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = Path(tmpdir) / "index.pickle"
+        cold, index = timed(RepoIndexStore(REPO_ROOT, cache_path).refresh)
+        warm, _ = timed(RepoIndexStore(REPO_ROOT, cache_path).refresh)
+        store = RepoIndexStore(REPO_ROOT, cache_path)
+        store.refresh()
+        unchanged, _ = timed(store.refresh)
+
+    print(f"files indexed:            {len(index.source_records)}")
+    print(f"cold build:               {cold * 1000:8.1f} ms")
+    print(f"reload from disk cache:   {warm * 1000:8.1f} ms")
+    print(f"refresh, nothing changed: {unchanged * 1000:8.1f} ms")
+    print()
+
+    full_scan = dataclasses.replace(index, term_index=None)
+    print(f"{'question':<48} | {'full scan':>9} | {'indexed':>9} | same")
+    for question in QUESTIONS:
+        full_time, full_refs = query_latency(full_scan, question)
+        indexed_time, indexed_refs = query_latency(index, question)
+        print(
+            f"{question:<48} | {full_time * 1000:7.0f}ms | {indexed_time * 1000:7.0f}ms |"
+            f" {'yes' if full_refs == indexed_refs else 'NO'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
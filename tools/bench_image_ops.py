@@ -0,0 +1,117 @@
+"""Throughput and latency of the local image operations pool.
+
+Keeps ``--concurrency`` requests in flight against ``ImageOps`` for
+``--duration`` seconds, for every worker count up to ``--workers``. Every
+request uses a new synthetic 512x512 avatar, so nothing is served from the
+cache, and cycles through ``pixel``, ``edges``, ``invert`` and ``oil``.
+Requests rejected as busy are counted and retried after ``--backoff``.
+
+    python tools/bench_image_ops.py [--workers 4] [--concurrency 16]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import time
+
+from pathlib import Path
+
+# Allow direct execution: `python tools/bench_image_ops.py`.
+if __package__ in {None, ""}:  # pragma: no cover - execution mode guard
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from classes.image_ops import SIZE, ImageOps, ImageOpsBusy, encode
+
+JOBS = (("pixel", (64,)), ("edges", ()), ("invert", ()), ("oil", ()))
+
+
+def synthetic_avatar(rng: np.random.Generator) -> bytes:
+    # smooth gradients with a noisy patch, closer to a real avatar than noise
+    y, x = np.mgrid[0:SIZE, 0:SIZE]
+    phase = rng.integers(0, 256, 3)
+    rgba = np.empty((SIZE, SIZE, 4), dtype=np.uint8)
+    rgba[..., 0] = (x // 2 + phase[0]) % 256
+    rgba[..., 1] = (y // 2 + phase[1]) % 256
+    rgba[..., 2] = ((x + y) // 4 + phase[2]) % 256
+    rgba[..., 3] = 255
+    top, left = rng.integers(0, SIZE // 2, 2)
+    rgba[top : top + 128, left : left + 128, :3] = rng.integers(0, 256, (128, 128, 3))
+    return encode(rgba)
+
+
+async def run(args, workers: int, avatars: list[bytes]) -> tuple[float, list[float], int]:
+    ops = ImageOps(workers=workers, max_pending=args.max_pending)
+    # start the workers before timing
+    await asyncio.gather(
+        *(ops.run(avatars[0], "invert") for _ in range(min(workers, args.max_pending)))
+    )
+    counter = itertools.count()
+    latencies = []
+    deadline = time.perf_counter() + args.duration
+
+    async def client():
+        while time.perf_counter() < deadline:
+            n = next(counter)
+            operation, params = JOBS[n % len(JOBS)]
+            data = avatars[n % len(avatars)]
+
+            async def read():
+                return data
+
+            started = time.perf_counter()
+            try:
+                await ops.process(f"avatar-{n}", operation, params, read)
+            except ImageOpsBusy:
+                await asyncio.sleep(args.backoff / 1000)
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    ops.close()
+    return elapsed, latencies, ops.rejected
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-pending", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    parser.add_argument("--backoff", type=float, default=50.0, help="Milliseconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    avatars = [synthetic_avatar(rng) for _ in range(32)]
+
+    print(
+        f"{args.concurrency} clients, at most {args.max_pending} pending,"
+        f" {os.cpu_count()} cores available"
+    )
+    print(
+        f"{'workers':>7} | {'images/s':>8} | {'per core':>8} | {'p50':>8}"
+        f" | {'p99':>8} | {'rejected':>8}"
+    )
+    for workers in range(1, args.workers + 1):
+        elapsed, latencies, rejected = asyncio.run(run(args, workers, avatars))
+        throughput = len(latencies) / elapsed
+        p99 = statistics.quantiles(latencies, n=100)[-1]
+        print(
+            f"{workers:>7} | {throughput:8.1f} | {throughput / workers:8.1f}"
+            f" | {statistics.median(latencies) * 1000:6.0f}ms | {p99 * 1000:6.0f}ms"
+            f" | {rejected:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+"""Buy order matching with the in-memory order book against a linear scan.
+
+Builds a synthetic book of ``--orders`` open weapon and crate orders and times
+finding the best order for ``--items`` seller weapons, once by scanning every
+order like a query without an index would, and once through ``OrderBook``.
+A ``buyorder search`` style lookup is timed as well.
+
+    python tools/bench_order_book.py [--orders 100000] [--items 200]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import random
+import time
+
+from pathlib import Path
+
+# Allow direct execution: `python tools/bench_order_book.py`.
+if __package__ in {None, ""}:  # pragma: no cover - execution mode guard
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from classes.order_book import CRATE, WEAPON, BuyOrder, OrderBook
+
+WEAPON_TYPES = ("sword", "axe", "spear", "bow", "wand", "dagger", "shield", "hammer")
+CRATE_TYPES = ("common", "uncommon", "rare", "magic", "legendary", "mystery")
+START = datetime.datetime(2025, 1, 1)
+
+
+def synthetic_orders(count: int, rng: random.Random) -> list[BuyOrder]:
+    orders = []
+    for order_id in range(1, count + 1):
+        created_at = START + datetime.timedelta(seconds=rng.randrange(10_000_000))
+        quantity = rng.randint(1, 10)
+        if rng.random() < 0.8:
+            low = rng.randint(1, 90)
+            high = min(101, low + rng.randint(0, 30))
+            orders.append(
+                BuyOrder(
+                    WEAPON, order_id, rng.randrange(5000), rng.choice(WEAPON_TYPES),
+                    rng.randint(100, 100_000), quantity, 0, created_at, low, high,
+                )
+            )
+        else:
+            orders.append(
+                BuyOrder(
+                    CRATE, order_id, rng.randrange(5000), rng.choice(CRATE_TYPES),
+                    rng.randint(100, 50_000), quantity, 0, created_at,
+                )
+            )
+    return orders
+
+
+def linear_best(orders, weapon_type, stat, seller):
+    best = None
+    for order in orders:
+        if (
+            order.kind == WEAPON
+            and order.item_type == weapon_type
+            and order.min_stat <= stat <= order.max_stat
+            and order.user_id != seller
+            and (best is None or order.priority < best.priority)
+        ):
+            best = order
+    return best
+
+
+def timed(function, repeat: int = 1) -> tuple[float, object]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    orders = synthetic_orders(args.orders, rng)
+    items = [
+        (item_id, rng.choice(WEAPON_TYPES), rng.randint(1, 101))
+        for item_id in range(args.items)
+    ]
+    seller = 5000
+
+    book = OrderBook()
+    build, _result = timed(lambda: [book.upsert(order) for order in orders])
+    print(f"{args.orders:,} orders, {args.items} seller items, book built in {build:.2f}s")
+
+    scan, expected = timed(
+        lambda: [linear_best(orders, t, stat, seller) for _id, t, stat in items]
+    )
+    lookup, found = timed(
+        lambda: [book.best_weapon_order(t, stat, exclude_user=seller) for _id, t, stat in items],
+        repeat=10,
+    )
+    assert [o and o.id for o in found] == [o and o.id for o in expected]
+    match, _result = timed(lambda: book.match_weapons(items, exclude_user=seller), repeat=10)
+    search, _result = timed(
+        lambda: book.search(weapon_type="sword", min_stat=30, max_price=50_000, sort="price"),
+        repeat=10,
+    )
+
+    print(f"{'operation':>22} | {'time':>10}")
+    print(f"{'linear best orders':>22} | {scan * 1000:8.1f}ms")
+    print(f"{'book best orders':>22} | {lookup * 1000:8.2f}ms")
+    print(f"{'book match_weapons':>22} | {match * 1000:8.2f}ms")
+    print(f"{'book search':>22} | {search * 1000:8.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+"""Measure pet skill resolution throughput.
+
+Builds pairs of pets with a few learned skills each and runs their per-turn,
+on-attack and on-damage-taken skill chains for a fixed number of turns.
+Reports turns per second and the mean time of each chain call.
+
+    python tools/bench_pet_skills.py
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+# Allow direct execution: `python tools/bench_pet_skills.py`.
+if __package__ in {None, ""}:  # pragma: no cover - execution mode guard
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from cogs.battles.core.combatant import Combatant
+from cogs.battles.core.team import Team
+from cogs.battles.extensions.pets import PetExtension
+from tools.pet_skill_audit_lib import iter_skill_records, load_skill_trees
+
+BATTLES = 40
+TURNS = 30
+REPEATS = 5
+SKILLS_PER_PET = (3, 6, 10)
+
+
+def new_side(rng, skills, index, per_pet):
+    element = rng.choice(sorted(skills))
+    owner_user = SimpleNamespace(id=index, display_name=f"Owner{index}")
+    owner = Combatant(owner_user, 50000, 50000, 400, 150, element=element)
+    pet = Combatant(
+        SimpleNamespace(id=index + 100, display_name=f"Pet{index}"),
+        50000,
+        50000,
+        300,
+        120,
+        element=element,
+        is_pet=True,
+        owner=owner_user,
+    )
+    learned = rng.sample(skills[element], min(per_pet, len(skills[element])))
+    return Team(f"Team{index}", [owner, pet]), pet, learned
+
+
+def run(skills, per_pet):
+    """Returns turns per second and the mean microseconds per chain call."""
+    rng = random.Random(per_pet)
+    random.seed(per_pet)
+    extension = PetExtension()
+    per_turn = getattr(extension, "process_skill_effects_per_turn")
+    on_attack = getattr(extension, "process_skill_effects_on_attack")
+    on_damage_taken = getattr(extension, "process_skill_effects_on_damage_taken")
+    spent = {"per_turn": 0.0, "on_attack": 0.0, "on_damage_taken": 0.0}
+    clock = time.perf_counter
+    for _battle in range(BATTLES):
+        first, pet_a, skills_a = new_side(rng, skills, 1, per_pet)
+        second, pet_b, skills_b = new_side(rng, skills, 2, per_pet)
+        pet_a.team, pet_a.enemy_team = first, second
+        pet_b.team, pet_b.enemy_team = second, first
+        extension.apply_skill_effects(pet_a, skills_a)
+        extension.apply_skill_effects(pet_b, skills_b)
+
+        for _turn in range(TURNS):
+            for pet, enemy in ((pet_a, pet_b), (pet_b, pet_a)):
+                start = clock()
+                per_turn(pet)
+                attacked = clock()
+                damage, _messages = on_attack(pet, enemy, Decimal(200))
+                hit = clock()
+                on_damage_taken(enemy, pet, damage)
+                done = clock()
+                spent["per_turn"] += attacked - start
+                spent["on_attack"] += hit - attacked
+                spent["on_damage_taken"] += done - hit
+    calls = BATTLES * TURNS * 2
+    turns_per_second = BATTLES * TURNS / sum(spent.values())
+    return turns_per_second, {name: total / calls * 1e6 for name, total in spent.items()}
+
+
+def main() -> None:
+    skills = {}
+    for record in iter_skill_records(load_skill_trees()):
+        skills.setdefault(record.element, []).append(record.skill_name)
+
+    print(
+        f"{'skills/pet':>10} | {'turns/s':>7} | {'per_turn':>8}"
+        f" | {'on_attack':>9} | {'on_damage_taken':>15}"
+    )
+    for per_pet in SKILLS_PER_PET:
+        # best of a few runs, the chains are short enough for noise to matter
+        turns_per_second, micros = max(
+            (run(skills, per_pet) for _ in range(REPEATS)),
+            key=lambda result: result[0],
+        )
+        print(
+            f"{per_pet:>10} | {turns_per_second:7.0f} |"
+            f" {micros['per_turn']:6.1f}us | {micros['on_attack']:7.1f}us |"
+            f" {micros['on_damage_taken']:13.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
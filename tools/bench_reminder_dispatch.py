@@ -0,0 +1,107 @@
+"""Compare database load of the reminder poll loop against the due-time dispatcher.
+
+The old scheduler read every pending reminder once per second. The dispatcher
+reads the reminders of the next hour once per hour and deletes fired reminders
+in batches. This simulates one day of wall time on a virtual clock for a
+growing number of pending reminders and reports queries and rows read.
+
+    python tools/bench_reminder_dispatch.py
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import random
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Allow direct execution: `python tools/bench_reminder_dispatch.py`.
+if __package__ in {None, ""}:  # pragma: no cover - execution mode guard
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.scheduling import DueEventDispatcher
+
+SIMULATED = timedelta(days=1)
+SPREAD = timedelta(days=30)
+COUNTS = (1_000, 10_000, 50_000, 200_000)
+
+
+class AlwaysHeldLease:
+    held = True
+    renew_interval = 10.0
+
+    async def acquire(self) -> bool:
+        return True
+
+
+class FakeReminderTable:
+    """Sorted ``end`` index with query and row counters."""
+
+    def __init__(self, ends: list[datetime]) -> None:
+        self.rows = sorted((end, id_) for id_, end in enumerate(ends))
+        self.deleted: set[int] = set()
+        self.queries = 0
+        self.rows_read = 0
+
+    async def load(self, horizon: datetime):
+        self.queries += 1
+        stop = bisect.bisect_left(self.rows, (horizon, -1))
+        due = [row for row in self.rows[:stop] if row[1] not in self.deleted]
+        self.rows_read += len(due)
+        return [(id_, end, None) for end, id_ in due]
+
+    async def delete(self, ids: list[int]) -> None:
+        self.queries += 1
+        self.deleted.update(ids)
+
+
+async def run_dispatcher(count: int, start: datetime) -> tuple[int, int, int]:
+    rng = random.Random(count)
+    table = FakeReminderTable(
+        [start + SPREAD * rng.random() for _ in range(count)]
+    )
+    now = start
+    fired = 0
+
+    async def fire(due):
+        nonlocal fired
+        fired += len(due)
+        await table.delete([key for key, _value in due])
+
+    dispatcher = DueEventDispatcher(
+        lease=AlwaysHeldLease(), load=table.load, fire=fire, clock=lambda: now
+    )
+    while now < start + SIMULATED:
+        delay = await dispatcher.run_once()
+        now += timedelta(seconds=delay)
+    return table.queries, table.rows_read, fired
+
+
+def legacy_poll(count: int, fired: int) -> tuple[int, int]:
+    # one SELECT * per second plus one DELETE per fired reminder; the table
+    # shrinks by the fired reminders, which is negligible over a day
+    seconds = int(SIMULATED.total_seconds())
+    return seconds + fired, seconds * count
+
+
+def main() -> None:
+    start = datetime(2026, 1, 1)
+    print(f"simulated wall time: {SIMULATED}, reminders spread over {SPREAD.days} days")
+    print(
+        f"{'pending':>9} | {'fired':>6} | {'poll queries':>12} | {'poll rows':>14} |"
+        f" {'heap queries':>12} | {'heap rows':>9}"
+    )
+    for count in COUNTS:
+        queries, rows_read, fired = asyncio.run(run_dispatcher(count, start))
+        poll_queries, poll_rows = legacy_poll(count, fired)
+        print(
+            f"{count:>9} | {fired:>6} | {poll_queries:>12} | {poll_rows:>14} |"
+            f" {queries:>12} | {rows_read:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Economy command throughput with inline and write-behind transaction logging.
+
+Simulates ``--concurrency`` users running economy commands against a pool of
+``--pool-size`` connections where every statement costs one ``--rtt`` round
+trip and a COPY additionally ``--row-cost`` per row. A command runs two
+statements of its own (take money, give money) and then logs the transaction,
+either with its own INSERT on the command's connection as before, or through
+``TransactionLog``.
+
+    python tools/bench_transaction_log.py [--concurrency 200] [--pool-size 20]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from pathlib import Path
+
+# Allow direct execution: `python tools/bench_transaction_log.py`.
+if __package__ in {None, ""}:  # pragma: no cover - execution mode guard
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from classes.transaction_log import TransactionLog, write_entry
+
+ROW = (1, 2, "money", "From: 1\nTo: 2\nSubject: money", "amount: 100", None)
+
+
+class SimulatedConnection:
+    def __init__(self, rtt: float, row_cost: float) -> None:
+        self.rtt = rtt
+        self.row_cost = row_cost
+
+    def transaction(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query, *args):
+        await asyncio.sleep(self.rtt)
+
+    async def executemany(self, query, rows):
+        await asyncio.sleep(self.rtt + self.row_cost * len(rows))
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        await asyncio.sleep(self.rtt + self.row_cost * len(records))
+
+
+class SimulatedPool:
+    def __init__(self, size: int, rtt: float, row_cost: float) -> None:
+        self.connections = asyncio.Queue()
+        for _ in range(size):
+            self.connections.put_nowait(SimulatedConnection(rtt, row_cost))
+
+    def acquire(self):
+        return _Acquire(self.connections)
+
+
+class _Acquire:
+    def __init__(self, connections: asyncio.Queue) -> None:
+        self.connections = connections
+
+    async def __aenter__(self):
+        self.conn = await self.connections.get()
+        return self.conn
+
+    async def __aexit__(self, *exc):
+        self.connections.put_nowait(self.conn)
+        return False
+
+
+async def run(args, buffered: bool) -> tuple[float, list[float]]:
+    pool = SimulatedPool(args.pool_size, args.rtt / 1000, args.row_cost / 1000)
+    txlog = TransactionLog(pool)
+    txlog.start()
+    latencies = []
+    deadline = time.perf_counter() + args.duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            async with pool.acquire() as conn:
+                await conn.execute("UPDATE profile SET money = money - $1")
+                await conn.execute("UPDATE profile SET money = money + $1")
+                if not buffered:
+                    await write_entry(conn, ROW, None)
+            if buffered:
+                await txlog.enqueue(ROW)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    await txlog.close()
+    return elapsed, latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--rtt", type=float, default=1.0, help="Milliseconds")
+    parser.add_argument("--row-cost", type=float, default=0.01, help="Milliseconds")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds")
+    args = parser.parse_args()
+
+    print(
+        f"{args.concurrency} users, {args.pool_size} connections,"
+        f" {args.rtt}ms per statement"
+    )
+    print(f"{'logging':>8} | {'cmds/s':>8} | {'p50':>8} | {'p95':>8}")
+    for name, buffered in (("inline", False), ("buffered", True)):
+        elapsed, latencies = asyncio.run(run(args, buffered))
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(
+            f"{name:>8} | {len(latencies) / elapsed:8,.0f}"
+            f" | {statistics.median(latencies) * 1000:6.1f}ms | {p95 * 1000:6.1f}ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
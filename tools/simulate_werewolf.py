@@ -0,0 +1,65 @@
+"""Monte Carlo win rates and game lengths for NewWerewolf role sets.
+
+Plays headless games for every requested player count and mode, or for one
+custom role set, and prints the win rate of each side and the distribution of
+game lengths in days. Runs are seeded, so the same arguments give the same
+numbers regardless of ``--workers``.
+
+    python tools/simulate_werewolf.py --players 8 12 16 --mode Classic Chaos --workers 8
+    python tools/simulate_werewolf.py --roles WEREWOLF WEREWOLF SEER WITCH VILLAGER VILLAGER
+"""
+from __future__ import annotations
+
+import argparse
+
+from pathlib import Path
+
+# Allow direct execution: `python tools/simulate_werewolf.py`.
+if __package__ in {None, ""}:  # pragma: no cover - execution mode guard
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from cogs.newwerewolf.simulator import DEFAULT_MAX_DAYS, GameSpec, simulate
+
+GAMES = 100_000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, nargs="+", default=[12])
+    parser.add_argument("--mode", nargs="+", default=["Classic"])
+    parser.add_argument(
+        "--roles", nargs="+", default=(), help="Role names of a custom role set"
+    )
+    parser.add_argument("--games", type=int, default=GAMES)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-days", type=int, default=DEFAULT_MAX_DAYS)
+    parser.add_argument("--skip-chance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    settings = dict(
+        games=args.games,
+        seed=args.seed,
+        max_days=args.max_days,
+        skip_chance=args.skip_chance,
+    )
+    if args.roles:
+        roles = tuple(role.upper() for role in args.roles)
+        specs = [GameSpec(len(roles), mode=args.mode[0], roles=roles, **settings)]
+    else:
+        specs = [
+            GameSpec(players, mode=mode, **settings)
+            for mode in args.mode
+            for players in args.players
+        ]
+
+    for spec in specs:
+        print(simulate(spec, workers=args.workers).format())
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
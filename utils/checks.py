@@ -166,10 +166,7 @@ def has_char() -> "_CheckDecorator":
     """Checks for a user to have a character."""
 
     async def predicate(ctx: Context) -> bool:
-        ctx.character_data = await ctx.bot.pool.fetchrow(
-            'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-        )
-        if ctx.character_data:
+        if await ctx.get_profile():
             return True
         raise NoCharacter()
 
@@ -180,9 +177,7 @@ def has_no_char() -> "_CheckDecorator":
     """Checks for a user to have no character."""
 
     async def predicate(ctx: Context) -> bool:
-        if await ctx.bot.pool.fetchrow(
-                'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-        ):
+        if await ctx.get_profile():
             raise NeedsNoCharacter()
         return True
 
@@ -216,10 +211,7 @@ def has_no_guild() -> "_CheckDecorator":
     """Checks for a user to be in no guild."""
 
     async def predicate(ctx: Context) -> bool:
-        if not hasattr(ctx, "character_data"):
-            ctx.character_data = await ctx.bot.pool.fetchrow(
-                'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-            )
+        await ctx.get_profile()
         if not ctx.character_data["guild"]:
             return True
         raise NeedsNoGuild()
@@ -231,10 +223,7 @@ def has_guild() -> "_CheckDecorator":
     """Checks for a user to be in a guild."""
 
     async def predicate(ctx: Context) -> bool:
-        if not hasattr(ctx, "character_data"):
-            ctx.character_data = await ctx.bot.pool.fetchrow(
-                'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-            )
+        await ctx.get_profile()
         if ctx.character_data and ctx.character_data["guild"]:
             return True
         raise NoGuild()
@@ -246,10 +235,7 @@ def is_guild_officer() -> "_CheckDecorator":
     """Checks for a user to be guild officer or leader."""
 
     async def predicate(ctx: Context) -> bool:
-        if not hasattr(ctx, "character_data"):
-            ctx.character_data = await ctx.bot.pool.fetchrow(
-                'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-            )
+        await ctx.get_profile()
         if (
                 ctx.character_data["guildrank"] == "Leader"
                 or ctx.character_data["guildrank"] == "Officer"
@@ -264,10 +250,7 @@ def is_guild_leader() -> "_CheckDecorator":
     """Checks for a user to be guild leader."""
 
     async def predicate(ctx: Context) -> bool:
-        if not hasattr(ctx, "character_data"):
-            ctx.character_data = await ctx.bot.pool.fetchrow(
-                'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-            )
+        await ctx.get_profile()
         if ctx.character_data["guildrank"] == "Leader":
             return True
         raise NoGuildPermissions()
@@ -279,10 +262,7 @@ def is_no_guild_leader() -> "_CheckDecorator":
     """Checks for a user not to be guild leader."""
 
     async def predicate(ctx: Context) -> bool:
-        if not hasattr(ctx, "character_data"):
-            ctx.character_data = await ctx.bot.pool.fetchrow(
-                'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-            )
+        await ctx.get_profile()
         if ctx.character_data["guildrank"] != "Leader":
             return True
         raise NeedsNoGuildLeader()
@@ -296,10 +276,7 @@ def is_alliance_leader() -> "_CheckDecorator":
     async def predicate(ctx: Context) -> bool:
 
         async with ctx.bot.pool.acquire() as conn:
-            if not hasattr(ctx, "character_data"):
-                ctx.character_data = await conn.fetchrow(
-                    'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-                )
+            await ctx.get_profile()
             leading_guild = await conn.fetchval(
                 'SELECT alliance FROM guild WHERE "id"=$1;', ctx.character_data["guild"]
             )
@@ -318,10 +295,7 @@ def owns_city() -> "_CheckDecorator":
 
     async def predicate(ctx: Context) -> bool:
         async with ctx.bot.pool.acquire() as conn:
-            if not hasattr(ctx, "character_data"):
-                ctx.character_data = await conn.fetchrow(
-                    'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-                )
+            await ctx.get_profile()
             alliance = await conn.fetchval(
                 'SELECT alliance FROM guild WHERE "id"=$1', ctx.character_data["guild"]
             )
@@ -341,10 +315,7 @@ def owns_no_city() -> "_CheckDecorator":
 
     async def predicate(ctx: Context) -> bool:
         async with ctx.bot.pool.acquire() as conn:
-            if not hasattr(ctx, "character_data"):
-                ctx.character_data = await conn.fetchrow(
-                    'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-                )
+            await ctx.get_profile()
             alliance = await conn.fetchval(
                 'SELECT alliance FROM guild WHERE "id"=$1', ctx.character_data["guild"]
             )
@@ -362,10 +333,7 @@ def is_class(class_: type[GameClass]) -> "_CheckDecorator":
     """Checks for a user to be in a class line."""
 
     async def predicate(ctx: Context) -> bool:
-        if not hasattr(ctx, "character_data"):
-            ctx.character_data = await ctx.bot.pool.fetchrow(
-                'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-            )
+        await ctx.get_profile()
         classes = [
             c for i in ctx.character_data["class"] if (c := class_from_string(i))
         ]
@@ -392,10 +360,7 @@ def has_god() -> "_CheckDecorator":
     """Checks for a user to have a god."""
 
     async def predicate(ctx: Context) -> bool:
-        if not hasattr(ctx, "character_data"):
-            ctx.character_data = await ctx.bot.pool.fetchrow(
-                'SELECT * FROM profile WHERE "user"=$1;', ctx.author.id
-            )
+        await ctx.get_profile()
         if ctx.character_data["god"]:
             return True
         raise NeedsGod()
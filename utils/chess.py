@@ -148,6 +148,20 @@ class TransportAdapter(
     # control methods.
 
 
+async def connect_engine(backend: str) -> chess.engine.Protocol:
+    """Opens a UCI engine, ``host:port`` of a backend or a local binary path."""
+    host, sep, port = backend.rpartition(":")
+    if sep and port.isdigit():
+        _transport, adapter = await asyncio.get_running_loop().create_connection(
+            lambda: ProtocolAdapter(chess.engine.UciProtocol()), host, int(port)
+        )
+        engine = adapter.protocol
+        await engine.initialize()
+        return engine
+    _transport, engine = await chess.engine.popen_uci(backend)
+    return engine
+
+
 class ChessGame:
     def __init__(
         self,
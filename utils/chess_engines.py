@@ -0,0 +1,137 @@
+"""A pool of UCI engines with a shared analysis cache for the chess cog.
+
+Every AI match used to share one Stockfish connection, so moves of
+concurrent matches queued behind each other. ``EnginePool`` keeps one
+connection per configured backend and hands each search to the backend with
+the fewest searches running or waiting. Deep searches (``DEEP_DEPTH`` and
+above) may only occupy half of the backends at once, so a few master level
+games cannot stall every beginner game.
+
+Results are kept in an LRU cache keyed by the position's FEN and the search
+depth, repeated openings and positions are answered without an engine.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+log = logging.getLogger(__name__)
+
+CACHE_SIZE = 4096
+DEEP_DEPTH = 20
+
+
+class EngineSlot:
+    def __init__(self, name: str, engine: Any) -> None:
+        self.name = name
+        self.engine = engine
+        self.lock = asyncio.Lock()
+        # searches running or waiting on this engine
+        self.load = 0
+        self.searches = 0
+
+
+class EnginePool:
+    """Least-busy dispatch over engines that each run one search at a time.
+
+    ``connect`` opens the engine of one backend, the engines need ``play``
+    and ``quit`` like ``chess.engine.Protocol``.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[str], Awaitable[Any]],
+        backends: list[str],
+        *,
+        cache_size: int = CACHE_SIZE,
+    ) -> None:
+        self.connect = connect
+        self.backends = backends
+        self.cache_size = cache_size
+        self.slots: list[EngineSlot] = []
+        self.cache: OrderedDict[tuple[str, Optional[int]], Any] = OrderedDict()
+        self.deep_searches: Optional[asyncio.Semaphore] = None
+        self.hits = 0
+        self.misses = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+
+    async def start(self) -> None:
+        """Connects every backend, raises ``ConnectionError`` if none is up."""
+        for backend in self.backends:
+            try:
+                engine = await self.connect(backend)
+            except (OSError, asyncio.TimeoutError) as e:
+                log.warning("Chess engine %s is unavailable: %s", backend, e)
+                continue
+            self.slots.append(EngineSlot(backend, engine))
+        if not self.slots:
+            raise ConnectionError("no chess engine backend is reachable")
+        self.deep_searches = asyncio.Semaphore(max(1, len(self.slots) // 2))
+
+    async def quit(self) -> None:
+        for slot in self.slots:
+            try:
+                await slot.engine.quit()
+            except Exception as e:
+                log.warning("Could not stop chess engine %s: %s", slot.name, e)
+        self.slots = []
+
+    def _cached(self, key):
+        result = self.cache.get(key)
+        if result is not None:
+            self.cache.move_to_end(key)
+        return result
+
+    def _store(self, key, result) -> None:
+        self.cache[key] = result
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def play(self, board, limit):
+        """``engine.play`` on the least busy engine, cached per position."""
+        depth = getattr(limit, "depth", None)
+        key = (board.fen(), depth)
+        result = self._cached(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+
+        queued = time.perf_counter()
+        if depth is not None and depth >= DEEP_DEPTH:
+            async with self.deep_searches:
+                result = await self._search(board, limit, queued)
+        else:
+            result = await self._search(board, limit, queued)
+        self._store(key, result)
+        return result
+
+    async def _search(self, board, limit, queued: float):
+        slot = min(self.slots, key=lambda slot: slot.load)
+        slot.load += 1
+        try:
+            async with slot.lock:
+                wait = time.perf_counter() - queued
+                self.waited += wait
+                self.max_wait = max(self.max_wait, wait)
+                slot.searches += 1
+                return await slot.engine.play(board, limit)
+        finally:
+            slot.load -= 1
+
+    def stats(self) -> dict[str, Any]:
+        searches = sum(slot.searches for slot in self.slots)
+        lookups = self.hits + self.misses
+        return {
+            "engines": {slot.name: (slot.load, slot.searches) for slot in self.slots},
+            "cached": len(self.cache),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "mean_wait": self.waited / searches if searches else 0.0,
+            "max_wait": self.max_wait,
+        }
@@ -30,6 +30,7 @@ class BotSection:
         "is_custom",
         "global_cooldown",
         "donator_cooldown",
+        "profile_startup",
     }
 
     def __init__(self, data: dict[str, Any]) -> None:
@@ -41,6 +42,7 @@ class BotSection:
         self.is_custom = data.get("is_custom", False)
         self.global_cooldown = data.get("global_cooldown", 3)
         self.donator_cooldown = data.get("donator_cooldown", 2)
+        self.profile_startup = data.get("profile_startup", False)
 
 
 class DonatorRole:
@@ -71,6 +73,7 @@ class ExternalSection:
         "traviapi",
         "base_url",
         "okapi_url",
+        "stockfish_backends",
         "proxy_url",
         "r2_account_id",
         "r2_endpoint_url",
@@ -91,6 +94,7 @@ class ExternalSection:
         self.traviapi = data.get("traviapi", None)
         self.base_url = data.get("base_url", "https://idlerpg.xyz")
         self.okapi_url = data.get("okapi_url", "http://localhost:3000")
+        self.stockfish_backends = data.get("stockfish_backends", ["127.0.0.1:4000"])
         self.proxy_url = data.get("proxy_url", None)
         self.r2_account_id = data.get("r2_account_id", None)
         self.r2_endpoint_url = data.get("r2_endpoint_url", None)
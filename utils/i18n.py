@@ -38,16 +38,16 @@ Almost everything here is copied from
 https://github.com/EmoteCollector/bot/blob/master/emote_collector/utils/i18n.py
 Thanks to lambda and Scragly for precious help!
 """
-import ast
 import contextvars
 import gettext
-import inspect
 import os.path
 
 from glob import glob
 from os import getcwd
 from typing import Any, Callable
 
+from utils.startup_cache import startup_cache
+
 BASE_DIR = getcwd()
 default_locale = "en_US"
 locale_dir = "locales"
@@ -60,12 +60,23 @@ locales: frozenset[str] = frozenset(
     )
 )
 
-gettext_translations = {
-    locale: gettext.translation(
-        "idlerpg", languages=(locale,), localedir=os.path.join(BASE_DIR, locale_dir)
-    )
-    for locale in locales
-}
+
+class LazyTranslations(dict):
+    """Loads the catalog of a locale the first time it is used."""
+
+    def __missing__(self, locale: str) -> gettext.NullTranslations:
+        if locale not in locales:
+            raise KeyError(locale)
+        translation = self[locale] = gettext.translation(
+            "idlerpg",
+            languages=(locale,),
+            localedir=os.path.join(BASE_DIR, locale_dir),
+            fallback=True,
+        )
+        return translation
+
+
+gettext_translations = LazyTranslations()
 
 # source code is already in en_US.
 # we don't use default_locale as the key here
@@ -75,54 +86,25 @@ locales = locales | {"en_US"}
 
 
 def use_current_gettext(*args: Any, **kwargs: Any) -> str:
-    if not gettext_translations:
-        return gettext.gettext(*args, **kwargs)
-
     locale = current_locale.get()
-    return gettext_translations.get(
-        locale, gettext_translations[default_locale]
-    ).gettext(*args, **kwargs)
+    try:
+        translation = gettext_translations[locale]
+    except KeyError:
+        translation = gettext_translations[default_locale]
+    return translation.gettext(*args, **kwargs)
 
 
 def i18n_docstring(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    # the docstrings of a whole file are extracted at once and cached on disk
     try:
-        src = inspect.getsource(func)
-        # We heavily rely on the content of the function to be correct
-        try:
-            parsed_tree = ast.parse(src)
-        except IndentationError:
-            parsed_tree = ast.parse("class Foo:\n" + src)
-            if not parsed_tree.body or not isinstance(parsed_tree.body[0], ast.ClassDef):
-                return func
-            function_body: ast.ClassDef = parsed_tree.body[0]
-            if not function_body.body or not isinstance(function_body.body[0], ast.AsyncFunctionDef):
-                return func
-            tree: ast.AsyncFunctionDef = function_body.body[0]
-        else:
-            if not parsed_tree.body or not isinstance(parsed_tree.body[0], ast.AsyncFunctionDef):
-                return func
-            tree = parsed_tree.body[0]
-
-        if not tree.body or not isinstance(tree.body[0], ast.Expr):
-            return func
-
-        gettext_call = tree.body[0].value
-        if not isinstance(gettext_call, ast.Call):
-            return func
-
-        if not isinstance(gettext_call.func, ast.Name) or gettext_call.func.id != "_":
-            return func
-
-        if (
-            len(gettext_call.args) != 1
-            or not isinstance(gettext_call.args[0], ast.Constant)
-            or not isinstance(gettext_call.args[0].value, str)
-        ):
-            return func
-
-        func.__doc__ = gettext_call.args[0].value
+        code = func.__code__
+        docs = startup_cache.docstrings(code.co_filename)
     except Exception:
         return func
+
+    doc = docs.get(str(code.co_firstlineno))
+    if doc is not None:
+        func.__doc__ = doc
     return func
 
 
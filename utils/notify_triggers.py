@@ -0,0 +1,94 @@
+"""Creating the ``pg_notify`` triggers the in-memory caches listen on.
+
+Every cluster makes sure its triggers exist before it listens. Running
+``CREATE OR REPLACE FUNCTION`` and ``CREATE TRIGGER`` from several clusters at
+once fails with "tuple concurrently updated", and the DDL locks the tables it
+touches. ``ensure_triggers`` therefore only runs the DDL when a trigger is
+missing, in a transaction holding an advisory lock that all the installers
+share. A trigger whose function changes needs a new name to be picked up.
+
+The ``profile`` trigger is defined here because two listeners share it: the
+profile cache and the leaderboards.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+LOCK_NAME = "notify-triggers"
+
+
+async def _installed(conn, names: list[str]) -> bool:
+    count = await conn.fetchval(
+        "SELECT count(*) FROM pg_trigger WHERE tgname = ANY($1::text[]) AND NOT"
+        " tgisinternal;",
+        names,
+    )
+    return count == len(names)
+
+
+async def ensure_triggers(conn, names: Iterable[str], ddl: str) -> bool:
+    """Runs ``ddl`` unless all the triggers ``names`` exist already.
+
+    Returns whether the DDL ran.
+    """
+    names = list(names)
+    if await _installed(conn, names):
+        return False
+    async with conn.transaction():
+        await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1));", LOCK_NAME)
+        if await _installed(conn, names):
+            return False
+        await conn.execute(ddl)
+    return True
+
+
+# One trigger on profile serves the profile cache and the leaderboards. Every
+# change notifies the user id, the leaderboard columns come along on inserts
+# and on updates that change one of them.
+PROFILE_CHANNEL = "profile_changed"
+PROFILE_TRIGGERS = ("profile_notify",)
+
+_PROFILE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION profile_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('{channel}', json_build_object(
+            'user', OLD."user", 'deleted', true
+        )::text);
+        RETURN OLD;
+    END IF;
+    IF TG_OP = 'UPDATE' THEN
+        IF (OLD."money", OLD."xp", OLD."pvpwins", OLD."whored")
+            IS NOT DISTINCT FROM (NEW."money", NEW."xp", NEW."pvpwins", NEW."whored")
+        THEN
+            PERFORM pg_notify('{channel}', json_build_object('user', NEW."user")::text);
+            RETURN NEW;
+        END IF;
+    END IF;
+    PERFORM pg_notify('{channel}', json_build_object(
+        'user', NEW."user", 'money', NEW."money", 'xp', NEW."xp",
+        'pvpwins', NEW."pvpwins", 'whored', NEW."whored"
+    )::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'profile_notify') THEN
+        -- replaces the separate leaderboard and profile cache triggers
+        DROP TRIGGER IF EXISTS leaderboard_profile_notify ON profile;
+        DROP TRIGGER IF EXISTS profile_cache_notify ON profile;
+        DROP FUNCTION IF EXISTS leaderboard_profile_notify();
+        DROP FUNCTION IF EXISTS profile_cache_notify();
+        CREATE TRIGGER profile_notify
+        AFTER INSERT OR UPDATE OR DELETE ON profile
+        FOR EACH ROW EXECUTE FUNCTION profile_notify();
+    END IF;
+END;
+$$;
+""".format(channel=PROFILE_CHANNEL)
+
+
+async def ensure_profile_trigger(conn) -> bool:
+    return await ensure_triggers(conn, PROFILE_TRIGGERS, _PROFILE_TRIGGER_SQL)
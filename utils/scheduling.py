@@ -0,0 +1,233 @@
+"""Due-time primitives shared by the cluster-wide background jobs.
+
+``DeadlineQueue`` is an in-memory min-heap of deadlines, ``ClusterLease`` makes
+sure a job only runs on one cluster at a time and ``DueEventDispatcher`` glues
+both together: it sleeps until the next deadline and fires due entries in
+batches instead of polling the database.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import uuid
+
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+
+log = logging.getLogger(__name__)
+
+
+class DeadlineQueue:
+    """A min-heap keyed by deadline with O(log n) push and lazy removal.
+
+    Every key is stored at most once; pushing an existing key reschedules it
+    and removing a key only drops it from the index, the stale heap entry is
+    skipped when it reaches the top.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, int, Hashable]] = []
+        self._entries: dict[Hashable, tuple[datetime, int, Any]] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def push(self, key: Hashable, deadline: datetime, value: Any = None) -> None:
+        seq = next(self._counter)
+        self._entries[key] = (deadline, seq, value)
+        heapq.heappush(self._heap, (deadline, seq, key))
+
+    def discard(self, key: Hashable) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._entries.clear()
+
+    def _prune(self) -> None:
+        heap = self._heap
+        while heap:
+            _deadline, seq, key = heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == seq:
+                return
+            heapq.heappop(heap)
+
+    def next_deadline(self) -> datetime | None:
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(
+        self, now: datetime, limit: int | None = None
+    ) -> list[tuple[Hashable, Any]]:
+        """Removes and returns up to ``limit`` entries whose deadline passed."""
+        due = []
+        while limit is None or len(due) < limit:
+            self._prune()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _deadline, _seq, key = heapq.heappop(self._heap)
+            _deadline, _seq, value = self._entries.pop(key)
+            due.append((key, value))
+        return due
+
+
+class ClusterLease:
+    """A renewable Redis lease that elects a single owner among all clusters.
+
+    The value is a random token per process, so renewing and releasing only
+    ever touch a lease this process actually holds.
+    """
+
+    RENEW_SCRIPT = """
+    if redis.call("GET", KEYS[1]) == ARGV[1] then
+        return redis.call("EXPIRE", KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+    RELEASE_SCRIPT = """
+    if redis.call("GET", KEYS[1]) == ARGV[1] then
+        return redis.call("DEL", KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, redis, name: str, *, ttl: int = 30) -> None:
+        self.redis = redis
+        self.key = f"lease:{name}"
+        self.ttl = ttl
+        self.token = uuid.uuid4().hex
+        self.held = False
+
+    @property
+    def renew_interval(self) -> float:
+        return self.ttl / 3
+
+    async def acquire(self) -> bool:
+        """Takes the lease or renews it if we already own it."""
+        try:
+            if self.held:
+                self.held = bool(
+                    await self.redis.eval(
+                        self.RENEW_SCRIPT, 1, self.key, self.token, self.ttl
+                    )
+                )
+            if not self.held:
+                self.held = bool(
+                    await self.redis.set(self.key, self.token, ex=self.ttl, nx=True)
+                )
+        except Exception:
+            log.exception("Failed to acquire lease %s", self.key)
+            self.held = False
+        return self.held
+
+    async def release(self) -> None:
+        if not self.held:
+            return
+        self.held = False
+        try:
+            await self.redis.eval(self.RELEASE_SCRIPT, 1, self.key, self.token)
+        except Exception:
+            log.exception("Failed to release lease %s", self.key)
+
+
+class DueEventDispatcher:
+    """Fires entries of a DeadlineQueue once their deadline has passed.
+
+    Only the cluster holding ``lease`` does any work. The owner loads all
+    entries due before ``now + window`` with one ``load(horizon)`` call,
+    which must return ``(key, deadline, value)`` tuples, and is kept current
+    in between through ``schedule``/``cancel``. Due entries are handed to
+    ``fire`` in lists of at most ``batch_size`` ``(key, value)`` pairs.
+    """
+
+    def __init__(
+        self,
+        *,
+        lease: ClusterLease,
+        load: Callable[[datetime], Awaitable[Iterable[tuple[Hashable, datetime, Any]]]],
+        fire: Callable[[list[tuple[Hashable, Any]]], Awaitable[None]],
+        window: timedelta = timedelta(hours=1),
+        batch_size: int = 50,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        error_backoff: float = 5.0,
+    ) -> None:
+        self.lease = lease
+        self.queue = DeadlineQueue()
+        self._load = load
+        self._fire = fire
+        self.window = window
+        self.batch_size = batch_size
+        self.clock = clock
+        self.error_backoff = error_backoff
+        self._horizon: datetime | None = None
+        self._wakeup = asyncio.Event()
+
+    def schedule(self, key: Hashable, deadline: datetime, value: Any = None) -> None:
+        """Adds an entry created after the last window load."""
+        if not self.lease.held:
+            return
+        if self._horizon is not None and deadline >= self._horizon:
+            # the next window load will pick it up
+            return
+        head = self.queue.next_deadline()
+        self.queue.push(key, deadline, value)
+        if head is None or deadline < head:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> None:
+        self.queue.discard(key)
+
+    def invalidate(self) -> None:
+        """Forces a reload of the current window on the next iteration."""
+        self._horizon = None
+        self._wakeup.set()
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=max(seconds, 0))
+        except asyncio.TimeoutError:
+            pass
+
+    async def run_once(self) -> float:
+        """Runs a single iteration and returns how long to sleep afterwards."""
+        if not await self.lease.acquire():
+            self.queue.clear()
+            self._horizon = None
+            return self.lease.renew_interval
+
+        now = self.clock()
+        if self._horizon is None or now >= self._horizon:
+            horizon = now + self.window
+            for key, deadline, value in await self._load(horizon):
+                self.queue.push(key, deadline, value)
+            self._horizon = horizon
+
+        due = self.queue.pop_due(now, self.batch_size)
+        if due:
+            await self._fire(due)
+            return 0
+
+        wake_at = self.queue.next_deadline() or self._horizon
+        wake_at = min(wake_at, self._horizon)
+        return min((wake_at - now).total_seconds(), self.lease.renew_interval)
+
+    async def run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                delay = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Due event dispatcher iteration failed")
+                self._horizon = None
+                delay = self.error_backoff
+            if delay > 0:
+                await self._sleep(delay)
@@ -0,0 +1,129 @@
+"""Source-derived startup artifacts kept across restarts.
+
+Every cluster boot used to parse the source of each ``@locale_doc`` command
+and read every Python file for the line count. ``StartupCache`` stores those
+results per source file in ``.cache/startup.json``, keyed by the file's SHA-1.
+A file is only read again when its size or mtime changed, and only parsed
+again when its hash did.
+"""
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+CACHE_PATH = os.path.join(os.getcwd(), ".cache", "startup.json")
+VERSION = 1
+
+
+def extract_docstrings(source: str) -> dict[str, str]:
+    """Maps the first line of every ``_("...")``-documented coroutine to its doc.
+
+    The first line is the one of the first decorator, which is what
+    ``co_firstlineno`` of the function reports.
+    """
+    docs = {}
+    for node in ast.walk(ast.parse(source)):
+        if not isinstance(node, ast.AsyncFunctionDef) or not node.body:
+            continue
+        first = node.body[0]
+        if not isinstance(first, ast.Expr) or not isinstance(first.value, ast.Call):
+            continue
+        call = first.value
+        if not isinstance(call.func, ast.Name) or call.func.id != "_":
+            continue
+        if (
+            len(call.args) != 1
+            or not isinstance(call.args[0], ast.Constant)
+            or not isinstance(call.args[0].value, str)
+        ):
+            continue
+        lines = [decorator.lineno for decorator in node.decorator_list] + [node.lineno]
+        docs[str(min(lines))] = call.args[0].value
+    return docs
+
+
+class StartupCache:
+    def __init__(self, path: str = CACHE_PATH) -> None:
+        self.path = path
+        self._files: dict[str, dict] | None = None
+        self._seen: set[str] = set()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> dict[str, dict]:
+        if self._files is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                self._files = data["files"] if data.get("version") == VERSION else {}
+            except (OSError, ValueError, KeyError, AttributeError):
+                self._files = {}
+        return self._files
+
+    def _entry(self, path: str) -> dict:
+        files = self._load()
+        path = os.path.abspath(path)
+        self._seen.add(path)
+        stat = os.stat(path)
+        signature = [stat.st_mtime_ns, stat.st_size]
+        entry = files.get(path)
+        if entry is not None and entry["stat"] == signature:
+            self.hits += 1
+            return entry
+
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        self._dirty = True
+        if entry is not None and entry["sha1"] == digest:
+            self.hits += 1
+            entry["stat"] = signature
+            return entry
+
+        self.misses += 1
+        lines = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+        entry = files[path] = {
+            "stat": signature,
+            "sha1": digest,
+            "lines": lines,
+            "docs": None,
+        }
+        return entry
+
+    def line_count(self, path: str) -> int:
+        return self._entry(path)["lines"]
+
+    def docstrings(self, path: str) -> dict[str, str]:
+        entry = self._entry(path)
+        if entry["docs"] is None:
+            with open(path, encoding="utf-8") as f:
+                entry["docs"] = extract_docstrings(f.read())
+            self._dirty = True
+        return entry["docs"]
+
+    def save(self) -> None:
+        """Writes the entries of the files used since startup, if any changed."""
+        files = self._load()
+        if not self._dirty and len(files) == len(self._seen):
+            return
+        files = {path: files[path] for path in self._seen if path in files}
+        temporary = f"{self.path}.{os.getpid()}"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump({"version": VERSION, "files": files}, f)
+            os.replace(temporary, self.path)
+        except OSError:
+            log.warning("Could not write the startup cache to %s", self.path)
+            return
+        self._files = files
+        self._dirty = False
+
+
+startup_cache = StartupCache()
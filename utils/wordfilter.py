@@ -0,0 +1,128 @@
+"""Word list matching for the automoderation.
+
+``WordMatcher`` is built once per word list and finds listed words in a
+message with the same word boundary rules as ``\\bword\\b``. Text and words are
+NFKC normalized and case folded, and common leetspeak (``4$$``, ``h3ll0``) is
+mapped back to letters first. Numbers, also with a letter suffix (``455``,
+``53x``, ``2nd``), are left as they are. Words made only of word characters,
+nearly all of them, are found by splitting the message into word runs and
+looking those up in a set. The rest (``f*ck``, ``s.o.b``) go into an Aho-Corasick
+automaton, so a message is scanned once no matter how long the list is.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+
+from typing import Iterable, Optional
+
+LEET = str.maketrans(
+    {"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "@": "a", "$": "s"}
+)
+
+_WORD_RUN = re.compile(r"\w+")
+# runs of word characters, @ and $ with at least one character LEET maps
+_LEET_RUN = re.compile(r"(?<![\w@$])[\w@$]*[013457@$][\w@$]*")
+# 455, 53x, $20, 2nd: amounts and ordinals, not leetspeak
+_NUMBER = re.compile(r"\$?\d+[^\W\d_]*")
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _unleet(match: re.Match) -> str:
+    run = match.group()
+    if _NUMBER.fullmatch(run):
+        return run
+    return run.translate(LEET)
+
+
+def normalize(text: str) -> str:
+    return _LEET_RUN.sub(_unleet, unicodedata.normalize("NFKC", text).casefold())
+
+
+def _is_word_char(char: str) -> bool:
+    return _WORD_CHAR.match(char) is not None
+
+
+class _Automaton:
+    """Aho-Corasick over the words that contain non-word characters."""
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        # words ending in each state, including those of its suffix states
+        self.out: list[list[str]] = [[]]
+
+        for word in words:
+            state = 0
+            for char in word:
+                following = self.goto[state].get(char)
+                if following is None:
+                    following = len(self.goto)
+                    self.goto[state][char] = following
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = following
+            self.out[state].append(word)
+
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, following in self.goto[state].items():
+                queue.append(following)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[following] = self.goto[fallback].get(char, 0)
+                self.out[following] = (
+                    self.out[following] + self.out[self.fail[following]]
+                )
+
+    def search(self, text: str) -> Optional[str]:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for word in out[state]:
+                if _bounded(text, end - len(word), end):
+                    return word
+        return None
+
+
+def _bounded(text: str, start: int, end: int) -> bool:
+    # \b on both sides of text[start:end]
+    before = start > 0 and _is_word_char(text[start - 1])
+    after = end < len(text) and _is_word_char(text[end])
+    first, last = _is_word_char(text[start]), _is_word_char(text[end - 1])
+    return before != first and after != last
+
+
+class WordMatcher:
+    def __init__(self, words: Iterable[str]) -> None:
+        self.tokens: set[str] = set()
+        other: set[str] = set()
+        for word in words:
+            word = normalize(word.strip())
+            if not word:
+                continue
+            if _WORD_RUN.fullmatch(word):
+                self.tokens.add(word)
+            else:
+                other.add(word)
+        self.automaton = _Automaton(sorted(other)) if other else None
+        self.size = len(self.tokens) + len(other)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def search(self, text: str) -> Optional[str]:
+        """The normalized listed word found in ``text``, if any."""
+        text = normalize(text)
+        if self.tokens:
+            for token in _WORD_RUN.findall(text):
+                if token in self.tokens:
+                    return token
+        if self.automaton is not None:
+            return self.automaton.search(text)
+        return None